@@ -3,6 +3,7 @@ Feed API route for personalized issue recommendations.
 Uses combined_vector for similarity; falls back to trending when no profile.
 """
 from datetime import UTC, datetime
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query
 from gim_database.models.identity import Session, User
@@ -16,6 +17,7 @@ from gim_backend.services.feed_service import (
     MAX_PAGE_SIZE,
     FeedPage,
     get_feed,
+    get_new_issues_feed,
 )
 from gim_backend.services.recommendation_event_service import (
     generate_recommendation_batch_id,
@@ -46,6 +48,10 @@ async def get_feed_route(
     languages: list[str] = Query(default=[], description="Filter by programming languages (overrides profile preferences)"),
     labels: list[str] = Query(default=[], description="Filter by issue labels"),
     repos: list[str] = Query(default=[], description="Filter by repository full names"),
+    snapshot_id: UUID | None = Query(
+        default=None,
+        description="snapshot_id from an earlier page; pages are sliced from that ranking while it is live",
+    ),
     auth: tuple[User, Session] = Depends(require_auth),
     db: AsyncSession = Depends(get_db),
 ) -> FeedResponse:
@@ -65,12 +71,18 @@ async def get_feed_route(
     Filters:
         languages, labels, repos: When provided, override profile preferences for this request
 
+    Snapshots:
+        Personalized responses carry a snapshot_id. Passing it back on later pages
+        serves them from the same stored ranking, so results do not shift while
+        new issues are ingested. An expired or mismatched snapshot is re-ranked.
+
     Response includes:
         is_personalized: true if using profile-based ranking
         profile_cta: message shown when using trending fallback
         similarity_score: cosine similarity for personalized results (null for trending)
     """
     user, _ = auth
+    recommendation_batch_id = generate_recommendation_batch_id()
 
     feed = await get_feed(
         db=db,
@@ -80,9 +92,10 @@ async def get_feed_route(
         languages=languages or None,
         labels=labels or None,
         repos=repos or None,
+        snapshot_id=snapshot_id,
+        recommendation_batch_id=recommendation_batch_id,
     )
 
-    recommendation_batch_id = generate_recommendation_batch_id()
     served_at = datetime.now(UTC)
     issue_node_ids = [item.node_id for item in feed.results]
     await store_recommendation_batch_context(
@@ -99,3 +112,32 @@ async def get_feed_route(
         **feed.model_dump(),
     )
 
+
+
+@router.get("/new", response_model=FeedPage)
+async def get_new_issues_route(
+    page: int = Query(default=1, ge=1, description="Page number"),
+    page_size: int = Query(
+        default=DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description="Results per page",
+    ),
+    auth: tuple[User, Session] = Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+) -> FeedPage:
+    """
+    Returns issues ingested since the user's last visit that match their profile.
+
+    Precomputed by the new_issues worker job for every user with a profile
+    vector, ranked like the personalized feed. Empty until the job has run
+    for this user.
+    """
+    user, _ = auth
+
+    return await get_new_issues_feed(
+        db=db,
+        user_id=user.id,
+        page=page,
+        page_size=page_size,
+    )
@@ -8,6 +8,7 @@ import json
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from gim_database.session import async_session_factory
 from pydantic import BaseModel, Field
 from sqlalchemy import text
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -17,10 +18,11 @@ from gim_backend.core.audit import AuditEvent, log_audit_event
 from gim_backend.middleware.context import RequestContext, get_request_context
 from gim_backend.middleware.rate_limit import get_rate_limiter
 from gim_backend.services.search_cache import (
+    CACHE_HIT,
+    CACHE_STALE,
     cache_search_context,
-    cache_search_response,
-    get_cached_search,
     get_cached_search_context,
+    get_or_compute_search_body,
 )
 from gim_backend.services.search_service import (
     DEFAULT_PAGE_SIZE,
@@ -135,10 +137,13 @@ async def search(
     user_id: UUID | None = Depends(check_search_rate_limit),
     db: AsyncSession = Depends(get_db),
     ctx: RequestContext = Depends(get_request_context),
-) -> SearchResponse:
+) -> Response:
     """
     Hybrid search combining vector similarity and BM25 full-text search.
     Results are ranked using Reciprocal Rank Fusion (RRF).
+
+    Returns the cached SearchResponse JSON directly, so cache hits skip
+    deserialization, model validation and re-serialization.
     """
     # Convert input models to service models
     filters = SearchFilters(
@@ -154,17 +159,17 @@ async def search(
         page_size=body.page_size,
     )
 
-    # Check cache first
-    cached_response = await get_cached_search(request)
-    if cached_response:
-        response = cached_response
-        cache_hit = True
-    else:
-        # Execute hybrid search
-        response = await hybrid_search(db, request)
-        # Cache the response
-        await cache_search_response(request, response)
-        cache_hit = False
+    async def compute() -> SearchResponse:
+        return await hybrid_search(db, request)
+
+    async def refresh() -> SearchResponse:
+        # Background refresh outlives this request, so it cannot use the request's session
+        async with async_session_factory() as session:
+            return await hybrid_search(session, request)
+
+    # Cached response, stale-while-revalidate, or one shared computation per key
+    entry, cache_status = await get_or_compute_search_body(request, compute, refresh)
+    cache_hit = cache_status in (CACHE_HIT, CACHE_STALE)
 
     # Log search for analytics (interaction logging is separate)
     log_audit_event(
@@ -172,11 +177,12 @@ async def search(
         user_id=user_id,
         ip_address=ctx.ip_address,
         metadata={
-            "search_id": str(response.search_id),
+            "search_id": str(entry.search_id),
             "query": body.query,
-            "result_count": len(response.results),
+            "result_count": entry.result_count,
             "filters": body.filters.model_dump(),
             "cache_hit": cache_hit,
+            "cache_status": cache_status,
         },
     )
 
@@ -185,15 +191,15 @@ async def search(
     # This enables /search/interact to persist query_text, filters_json, and result_count
     # without trusting client-provided context fields.
     await cache_search_context(
-        search_id=response.search_id,
+        search_id=entry.search_id,
         query_text=body.query,
         filters_json=body.filters.model_dump(),
-        result_count=response.total,
+        result_count=entry.total,
         page=body.page,
         page_size=body.page_size,
     )
 
-    return response
+    return Response(content=entry.body, media_type="application/json")
 
 
 class InteractionInput(BaseModel):
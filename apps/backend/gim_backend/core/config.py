@@ -39,11 +39,29 @@ class Settings(BaseSettings):
     feed_freshness_weight: float = 0.25
     feed_freshness_floor: float = 0.2
     feed_debug_freshness: bool = False
+    # Personalized feed rankings are kept this long so later pages slice the same list
+    feed_snapshot_ttl_seconds: int = 1800
+    # Precomputed default feeds (feed_materialize job); served while the profile vector and preferences match
+    feed_materialization_ttl_seconds: int = 21600
 
     search_freshness_half_life_days: float = 7.0
     search_freshness_weight: float = 0.25
     search_freshness_floor: float = 0.2
 
+    # Vector candidate retrieval per call site: exact | binary (Hamming pre-filter, cosine rerank)
+    search_vector_retrieval: str = "exact"
+    feed_vector_retrieval: str = "exact"
+    similar_vector_retrieval: str = "exact"
+    # Binary mode over-fetches limit x factor candidates before the cosine rerank
+    vector_rerank_factor: int = 4
+    # Stage 1 filters: auto | pre | post; auto pre-filters below the estimated selectivity
+    search_filter_strategy: str = "auto"
+    search_prefilter_selectivity: float = 0.1
+    # Stage 1 execution: sql (one fused statement) | parallel (concurrent vector/BM25 queries, fused in process)
+    search_stage1_execution: str = "sql"
+    # Cached search responses: none | zlib | zstd (needs the zstandard package)
+    search_cache_compression: str = "none"
+
     max_auth_requests_per_minute: int = 10
     rate_limit_window_seconds: int = 60
 
@@ -59,15 +77,33 @@ class Settings(BaseSettings):
 
     gatherer_concurrency: int = 10
     max_issues_per_repo: int = 100
+    gatherer_incremental: bool = True
 
     embedder_batch_size: int = 250
+    embedder_queue_depth: int = 2
+    # Encoder processes for JOB_TYPE=embedder; each loads its own model on a share of the cores
+    embedder_processes: int = 1
+    # Intra-op threads per encoder (torch or onnxruntime); 0 uses the process's core share (2 when single-process)
+    embedder_torch_threads: int = 0
 
     janitor_min_issues: int = 10000
 
     embedding_model: str = "nomic-embed-text-v2-moe"
+    # torch | onnx | onnx_int8; ONNX exports are cached under embedding_onnx_path
+    embedding_backend: str = "torch"
+    embedding_onnx_path: str = ""
+    embedding_warmup_on_startup: bool = True
     embedding_dim: int = 256
     embedding_batch_size: int = 25
     max_concurrent_embeddings: int = 4
+    query_embedding_batch_window_ms: float = 5.0
+    query_embedding_cache_size: int = 1024
+
+    # Embedding cache: none | lru | redis | mmap (keys include model name, encoder backend and dim)
+    embedding_cache_backend: str = "none"
+    embedding_cache_max_entries: int = 10000
+    embedding_cache_ttl_seconds: int = 604800
+    embedding_cache_path: str = ""
 
     model_config = SettingsConfigDict(
         env_file=".env.local",
@@ -0,0 +1,419 @@
+
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal, Protocol
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from gim_backend.core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+PrefixType = Literal["document", "query", "raw"]
+
+CACHE_PREFIX = "emb:"
+
+
+def make_cache_key(model_name: str, prefix_type: PrefixType, dim: int, text: str) -> str:
+    """Model name and dim are part of the key, so changing either never serves stale vectors."""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model_name}:{prefix_type}:{dim}:{digest}"
+
+
+class EmbeddingCacheBackend(Protocol):
+
+    async def get_many(self, keys: list[str]) -> list[list[float] | None]:
+        ...
+
+    async def set_many(self, items: dict[str, list[float]]) -> None:
+        ...
+
+    async def clear(self) -> None:
+        ...
+
+
+class LRUEmbeddingCache:
+
+    def __init__(self, max_entries: int = 10_000):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, list[float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_many(self, keys: list[str]) -> list[list[float] | None]:
+        found: list[list[float] | None] = []
+        for key in keys:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            found.append(vector)
+        return found
+
+    async def set_many(self, items: dict[str, list[float]]) -> None:
+        for key, vector in items.items():
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class RedisEmbeddingCache:
+    """Stores float16 vectors base64-encoded; the shared client decodes responses as text."""
+
+    def __init__(self, ttl_seconds: int = 7 * 24 * 3600):
+        self._ttl_seconds = ttl_seconds
+
+    async def _client(self):
+        from gim_backend.core.redis import get_redis
+
+        return await get_redis()
+
+    async def get_many(self, keys: list[str]) -> list[list[float] | None]:
+        redis = await self._client()
+        if redis is None or not keys:
+            return [None] * len(keys)
+
+        try:
+            raw_values = await redis.mget([CACHE_PREFIX + key for key in keys])
+        except Exception as e:
+            logger.warning(f"Embedding cache read failed: {e}")
+            return [None] * len(keys)
+
+        return [_decode_vector(value) if value else None for value in raw_values]
+
+    async def set_many(self, items: dict[str, list[float]]) -> None:
+        redis = await self._client()
+        if redis is None or not items:
+            return
+
+        try:
+            pipe = redis.pipeline()
+            for key, vector in items.items():
+                pipe.setex(CACHE_PREFIX + key, self._ttl_seconds, _encode_vector(vector))
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    async def clear(self) -> None:
+        redis = await self._client()
+        if redis is None:
+            return
+
+        keys = [key async for key in redis.scan_iter(match=f"{CACHE_PREFIX}*")]
+        if keys:
+            await redis.delete(*keys)
+
+
+class MmapEmbeddingCache:
+    """
+    On-disk float16 store: a fixed-capacity memory-mapped matrix plus a key index.
+
+    Slots are reused round-robin once full. The index is a JSON snapshot plus an
+    append-only journal of slot assignments, compacted into a new snapshot once
+    it outgrows the capacity and when the store is opened. Each slot also
+    carries a tag of the key it holds, so a vector the index no longer matches
+    (e.g. after a crash mid-batch) reads as a miss. The store is tagged with
+    the model name and dim it was created for and is wiped on open if either
+    differs. Single writer only.
+    """
+
+    VECTORS_FILE = "vectors.f16"
+    TAGS_FILE = "tags.u64"
+    INDEX_FILE = "index.json"
+    JOURNAL_FILE = "index.log"
+
+    def __init__(self, path: str | Path, model_name: str, dim: int, capacity: int = 100_000):
+        self._path = Path(path)
+        self._model_name = model_name
+        self._dim = dim
+        self._capacity = capacity
+        self._path.mkdir(parents=True, exist_ok=True)
+
+        self._slots: dict[str, int] = {}
+        self._keys: list[str | None] = [None] * capacity
+        self._next_slot = 0
+        self._journal_lines = 0
+        self._pending: list[str] = []
+        self._lock = asyncio.Lock()
+
+        vectors_path = self._path / self.VECTORS_FILE
+        tags_path = self._path / self.TAGS_FILE
+        # Stores written before slot tags existed cannot be verified; start over
+        if tags_path.exists():
+            self._load_index()
+        mode = "r+" if vectors_path.exists() and self._slots else "w+"
+        self._vectors = np.memmap(vectors_path, dtype=np.float16, mode=mode, shape=(capacity, dim))
+        self._tags = np.memmap(tags_path, dtype=np.uint64, mode=mode, shape=(capacity,))
+        self._write_snapshot(self._snapshot())
+
+    @staticmethod
+    def _tag(key: str) -> int:
+        # 0 marks an empty slot
+        return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little") or 1
+
+    def _load_index(self) -> None:
+        index_path = self._path / self.INDEX_FILE
+        if not index_path.exists():
+            return
+
+        index = json.loads(index_path.read_text())
+        if (
+            index.get("model_name") != self._model_name
+            or index.get("dim") != self._dim
+            or index.get("capacity") != self._capacity
+        ):
+            logger.info(
+                f"Embedding cache at {self._path} built for {index.get('model_name')}/{index.get('dim')}; "
+                f"invalidating for {self._model_name}/{self._dim}"
+            )
+            return
+
+        self._slots = {key: int(slot) for key, slot in index["slots"].items()}
+        for key, slot in self._slots.items():
+            self._keys[slot] = key
+        self._next_slot = int(index.get("next_slot", 0))
+        self._replay_journal()
+
+    def _replay_journal(self) -> None:
+        journal_path = self._path / self.JOURNAL_FILE
+        if not journal_path.exists():
+            return
+        with journal_path.open(encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    key, slot, next_slot = json.loads(line)
+                except (ValueError, TypeError):
+                    # A torn final line from an interrupted append
+                    break
+                self._assign(key, int(slot))
+                self._next_slot = int(next_slot)
+
+    def _assign(self, key: str, slot: int) -> None:
+        evicted = self._keys[slot]
+        if evicted is not None and evicted != key:
+            del self._slots[evicted]
+        self._keys[slot] = key
+        self._slots[key] = slot
+
+    def _snapshot(self) -> dict:
+        return {
+            "model_name": self._model_name,
+            "dim": self._dim,
+            "capacity": self._capacity,
+            "next_slot": self._next_slot,
+            "slots": dict(self._slots),
+        }
+
+    def _write_snapshot(self, snapshot: dict) -> None:
+        """Flushes vectors, replaces the snapshot, then empties the journal it now covers."""
+        self._vectors.flush()
+        self._tags.flush()
+        index_path = self._path / self.INDEX_FILE
+        tmp_path = index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(snapshot))
+        os.replace(tmp_path, index_path)
+        (self._path / self.JOURNAL_FILE).write_text("")
+        self._journal_lines = 0
+
+    def _append_journal(self, lines: list[str]) -> None:
+        """Flushes vectors before the journal entries that point at them."""
+        self._vectors.flush()
+        self._tags.flush()
+        with (self._path / self.JOURNAL_FILE).open("a", encoding="utf-8") as journal:
+            journal.write("".join(lines))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    async def get_many(self, keys: list[str]) -> list[list[float] | None]:
+        found: list[list[float] | None] = []
+        for key in keys:
+            slot = self._slots.get(key)
+            if slot is None or int(self._tags[slot]) != self._tag(key):
+                found.append(None)
+            else:
+                found.append(self._vectors[slot].astype(np.float32).tolist())
+        return found
+
+    async def set_many(self, items: dict[str, list[float]]) -> None:
+        if not items:
+            return
+
+        # In-memory state and journal lines change together, before any await
+        for key, vector in items.items():
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._next_slot
+                self._next_slot = (self._next_slot + 1) % self._capacity
+                self._assign(key, slot)
+            self._vectors[slot] = np.asarray(vector, dtype=np.float16)
+            self._tags[slot] = self._tag(key)
+            self._pending.append(json.dumps([key, slot, self._next_slot]) + "\n")
+
+        await self._flush()
+
+    async def _flush(self) -> None:
+        async with self._lock:
+            if not self._pending:
+                return
+            lines, self._pending = self._pending, []
+            if self._journal_lines + len(lines) > self._capacity:
+                # The snapshot is taken now, so it covers every line drained above
+                await asyncio.to_thread(self._write_snapshot, self._snapshot())
+            else:
+                await asyncio.to_thread(self._append_journal, lines)
+                self._journal_lines += len(lines)
+
+    async def clear(self) -> None:
+        async with self._lock:
+            self._slots.clear()
+            self._keys = [None] * self._capacity
+            self._next_slot = 0
+            self._pending = []
+            self._tags[:] = 0
+            await asyncio.to_thread(self._write_snapshot, self._snapshot())
+
+
+def _encode_vector(vector: list[float]) -> str:
+    return base64.b64encode(np.asarray(vector, dtype=np.float16).tobytes()).decode("ascii")
+
+
+def _decode_vector(value: str) -> list[float]:
+    return np.frombuffer(base64.b64decode(value), dtype=np.float16).astype(np.float32).tolist()
+
+
+@dataclass
+class EmbeddingCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hit_rate, 3)}
+
+
+class CachedEmbedder:
+    """
+    Wraps an EmbeddingProvider/DocumentQueryEmbedder and serves repeated texts from a cache.
+
+    Only misses reach the wrapped embedder, deduplicated within each call.
+    """
+
+    def __init__(self, inner, backend: EmbeddingCacheBackend, model_name: str, dim: int):
+        self._inner = inner
+        self._backend = backend
+        self._model_name = model_name
+        self._dim = dim
+        self.stats = EmbeddingCacheStats()
+
+    @property
+    def BATCH_SIZE(self) -> int:  # noqa: N802 - mirrors the wrapped embedder's constant
+        return getattr(self._inner, "BATCH_SIZE", 25)
+
+    @property
+    def inner(self):
+        return self._inner
+
+    async def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await self._embed(texts, "document", self._inner.embed_documents)
+
+    async def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        return await self._embed(texts, "query", self._inner.embed_queries)
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return await self._embed(texts, "raw", self._inner.embed_batch)
+
+    async def _embed(self, texts: list[str], prefix_type: PrefixType, encode) -> list[list[float]]:
+        if not texts:
+            return []
+
+        keys = [make_cache_key(self._model_name, prefix_type, self._dim, text) for text in texts]
+        cached = await self._backend.get_many(keys)
+
+        missing: dict[str, str] = {}
+        for key, text, vector in zip(keys, texts, cached):
+            if vector is None:
+                missing.setdefault(key, text)
+
+        self.stats.hits += len(texts) - sum(1 for vector in cached if vector is None)
+        self.stats.misses += sum(1 for vector in cached if vector is None)
+
+        if missing:
+            encoded = await encode(list(missing.values()))
+            fresh = dict(zip(missing.keys(), encoded))
+            await self._backend.set_many(fresh)
+        else:
+            fresh = {}
+
+        return [vector if vector is not None else fresh[key] for key, vector in zip(keys, cached)]
+
+    def warmup(self) -> None:
+        if hasattr(self._inner, "warmup"):
+            self._inner.warmup()
+
+    def close(self) -> None:
+        logger.info("Embedding cache stats", extra=self.stats.as_dict())
+        self._inner.close()
+
+
+def build_embedding_cache(
+    settings: Settings,
+    model_name: str,
+    dim: int,
+    namespace: str = "",
+) -> EmbeddingCacheBackend | None:
+    """Backend selected by EMBEDDING_CACHE_BACKEND (none|lru|redis|mmap)."""
+    backend = settings.embedding_cache_backend.lower()
+    match backend:
+        case "none" | "":
+            return None
+        case "lru":
+            return LRUEmbeddingCache(max_entries=settings.embedding_cache_max_entries)
+        case "redis":
+            return RedisEmbeddingCache(ttl_seconds=settings.embedding_cache_ttl_seconds)
+        case "mmap":
+            if not settings.embedding_cache_path:
+                raise ValueError("EMBEDDING_CACHE_PATH is required for the mmap embedding cache")
+            path = Path(settings.embedding_cache_path)
+            return MmapEmbeddingCache(
+                path / namespace if namespace else path,
+                model_name=model_name,
+                dim=dim,
+                capacity=settings.embedding_cache_max_entries,
+            )
+        case _:
+            raise ValueError(f"Unknown embedding cache backend: {backend}")
+
+
+def with_embedding_cache(embedder, settings: Settings, model_name: str, dim: int, namespace: str = ""):
+    """
+    Returns embedder wrapped in CachedEmbedder when a cache backend is configured.
+
+    The encoder backend (torch, onnx, onnx_int8) is part of the cached model
+    name: their vectors differ slightly, so a shared cache must not mix them.
+    """
+    cache_model_name = f"{model_name}@{settings.embedding_backend.lower()}"
+    backend = build_embedding_cache(settings, cache_model_name, dim, namespace)
+    if backend is None:
+        return embedder
+    logger.info(f"Embedding cache enabled: {type(backend).__name__}")
+    return CachedEmbedder(embedder, backend, model_name=cache_model_name, dim=dim)
@@ -25,6 +25,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 GATHERER_QUERY_PATH = Path(__file__).parent / "queries" / "gatherer.graphql"
+GATHERER_INCREMENTAL_QUERY_PATH = Path(__file__).parent / "queries" / "gatherer_incremental.graphql"
 
 BODY_TRUNCATE_LENGTH: int = 4000
 
@@ -42,6 +43,21 @@ class IssueData:
     state: str
     issue_number: int | None = None
     github_url: str | None = None
+    github_updated_at: datetime | None = None
+
+
+@dataclass
+class IssueHighWaterMark:
+    """Newest issue timestamps seen for a repository on a completed harvest."""
+
+    last_created_at: datetime | None = None
+    last_updated_at: datetime | None = None
+
+    def advance(self, created_at: datetime | None, updated_at: datetime | None) -> None:
+        if created_at and (self.last_created_at is None or created_at > self.last_created_at):
+            self.last_created_at = created_at
+        if updated_at and (self.last_updated_at is None or updated_at > self.last_updated_at):
+            self.last_updated_at = updated_at
 
 
 class Gatherer:
@@ -61,12 +77,20 @@ class Gatherer:
         self._max_issues_per_repo = max_issues_per_repo
         self._concurrency = concurrency
         self._query = self._load_query()
+        self._incremental_query = self._load_incremental_query()
+        self._pending_marks: dict[str, IssueHighWaterMark] = {}
+        self._completed_marks: dict[str, IssueHighWaterMark] = {}
 
     def _load_query(self) -> str:
         if GATHERER_QUERY_PATH.exists():
             return GATHERER_QUERY_PATH.read_text()
         return self._inline_query()
 
+    def _load_incremental_query(self) -> str:
+        if GATHERER_INCREMENTAL_QUERY_PATH.exists():
+            return GATHERER_INCREMENTAL_QUERY_PATH.read_text()
+        return self._inline_incremental_query()
+
     def _inline_query(self) -> str:
         return """
         query GathererIssues($owner: String!, $name: String!, $first: Int!, $after: String) {
@@ -74,7 +98,7 @@ class Gatherer:
             issues(first: $first, after: $after, orderBy: {field: CREATED_AT, direction: DESC}) {
               pageInfo { hasNextPage endCursor }
               nodes {
-                id number url title bodyText createdAt state
+                id number url title bodyText createdAt updatedAt state
                 labels(first: 10) { nodes { name } }
               }
             }
@@ -83,13 +107,55 @@ class Gatherer:
         }
         """
 
+    def _inline_incremental_query(self) -> str:
+        return """
+        query GathererIssuesSince(
+          $owner: String!, $name: String!, $first: Int!, $after: String, $since: DateTime!
+        ) {
+          repository(owner: $owner, name: $name) {
+            issues(
+              first: $first, after: $after,
+              orderBy: {field: UPDATED_AT, direction: ASC},
+              filterBy: {since: $since}
+            ) {
+              pageInfo { hasNextPage endCursor }
+              nodes {
+                id number url title bodyText createdAt updatedAt state
+                labels(first: 10) { nodes { name } }
+              }
+            }
+          }
+          rateLimit { cost remaining resetAt nodeCount }
+        }
+        """
+
+    def get_high_water_marks(self) -> dict[str, IssueHighWaterMark]:
+        """Marks for repos whose last harvest finished; failed repos are omitted so they are re-read."""
+        return dict(self._completed_marks)
+
     async def harvest_issues(
         self,
         repos: list[RepositoryData],
+        high_water_marks: dict[str, IssueHighWaterMark] | None = None,
     ) -> AsyncIterator[IssueData]:
+        """
+        Streams quality-gated issues for all repos.
+
+        Repos with a high-water mark are fetched incrementally: only issues updated
+        since the mark are requested, oldest update first, and the mark advances
+        to the last issue read. A repo that hits max_issues_per_repo resumes
+        from there on the next run instead of re-reading its newest issues.
+        Issues updated exactly at the mark are read again, which is harmless:
+        unchanged content is not re-embedded.
+        """
+        self._pending_marks = {}
+        self._completed_marks = {}
+
         if not repos:
             return
 
+        marks = high_water_marks or {}
+
         total_repos = len(repos)
         semaphore = asyncio.Semaphore(self._concurrency)
         issue_queue: asyncio.Queue[IssueData | None] = asyncio.Queue(maxsize=100)
@@ -102,7 +168,11 @@ class Gatherer:
 
 
         tasks = [
-            asyncio.create_task(self._repo_worker(repo, issue_queue, semaphore, idx, total_repos, start_time))
+            asyncio.create_task(
+                self._repo_worker(
+                    repo, issue_queue, semaphore, idx, total_repos, start_time, marks.get(repo.node_id)
+                )
+            )
             for idx, repo in enumerate(repos)
         ]
 
@@ -152,6 +222,7 @@ class Gatherer:
         repo_idx: int,
         total_repos: int,
         job_start_time: float,
+        high_water_mark: IssueHighWaterMark | None = None,
     ) -> int:
         issue_count = 0
         acquire_start = time.monotonic()
@@ -166,11 +237,15 @@ class Gatherer:
                     )
 
                 fetch_start = time.monotonic()
-                async for issue in self._fetch_repo_issues_with_retry(repo):
+                async for issue in self._fetch_repo_issues_with_retry(repo, high_water_mark):
                     await issue_queue.put(issue)
                     issue_count += 1
                 fetch_elapsed = time.monotonic() - fetch_start
 
+                mark = self._pending_marks.pop(repo.node_id, None)
+                if mark is not None and mark.last_updated_at is not None:
+                    self._completed_marks[repo.node_id] = mark
+
                 if issue_count > 0:
                     logger.debug(
                         f"Gatherer: {repo.full_name} yielded {issue_count} issues in {fetch_elapsed:.1f}s",
@@ -197,12 +272,13 @@ class Gatherer:
     async def _fetch_repo_issues_with_retry(
         self,
         repo: RepositoryData,
+        high_water_mark: IssueHighWaterMark | None = None,
     ) -> AsyncIterator[IssueData]:
         last_error: Exception | None = None
 
         for attempt in range(self.MAX_RETRIES):
             try:
-                async for issue in self._fetch_repo_issues(repo):
+                async for issue in self._fetch_repo_issues(repo, high_water_mark):
                     yield issue
                 return  # Success? exit retry loop
             except Exception as e:
@@ -220,20 +296,33 @@ class Gatherer:
     async def _fetch_repo_issues(
         self,
         repo: RepositoryData,
+        high_water_mark: IssueHighWaterMark | None = None,
     ) -> AsyncIterator[IssueData]:
         owner, name = repo.full_name.split("/", 1)
         cursor: str | None = None
         yielded_count = 0
 
+        since = high_water_mark.last_updated_at if high_water_mark else None
+        # Start from the previous mark so a run that sees nothing new keeps it
+        seen = IssueHighWaterMark(
+            last_created_at=high_water_mark.last_created_at if high_water_mark else None,
+            last_updated_at=since,
+        )
+        self._pending_marks[repo.node_id] = seen
+
         while True:
+            variables = {
+                "owner": owner,
+                "name": name,
+                "first": self.PAGE_SIZE,
+                "after": cursor,
+            }
+            if since is not None:
+                variables["since"] = since.isoformat()
+
             data = await self._client.execute_query(
-                self._query,
-                variables={
-                    "owner": owner,
-                    "name": name,
-                    "first": self.PAGE_SIZE,
-                    "after": cursor,
-                },
+                self._incremental_query if since is not None else self._query,
+                variables=variables,
                 estimated_cost=1,
             )
 
@@ -248,6 +337,9 @@ class Gatherer:
 
             for node in nodes:
                 issue = self._parse_issue(node, repo)
+                if issue:
+                    seen.advance(issue.github_created_at, issue.github_updated_at)
+
                 if issue and passes_quality_gate(issue.q_score, self.Q_SCORE_THRESHOLD):
                     yield issue
                     yielded_count += 1
@@ -257,6 +349,7 @@ class Gatherer:
                             f"Gatherer: Reached cap of {self._max_issues_per_repo} issues for {repo.full_name}",
                             extra={"repo": repo.full_name, "cap": self._max_issues_per_repo},
                         )
+                        # Incremental pages are oldest-first, so `seen` stops at the last issue read
                         return  # Exit pagination early
 
             if not page_info.get("hasNextPage"):
@@ -293,6 +386,8 @@ class Gatherer:
             logger.warning(f"Gatherer: Invalid createdAt for issue {node_id}")
             return None
 
+        github_updated_at = self._parse_timestamp(node.get("updatedAt"))
+
         components = extract_components(title, body, repo.primary_language)
         q_score = compute_q_score(components)
 
@@ -308,4 +403,14 @@ class Gatherer:
             q_score=q_score,
             q_components=components,
             state=state,
+            github_updated_at=github_updated_at,
         )
+
+    @staticmethod
+    def _parse_timestamp(value: str | None) -> datetime | None:
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except (ValueError, AttributeError):
+            return None
@@ -6,10 +6,14 @@ import asyncio
 import logging
 import threading
 from concurrent.futures import ThreadPoolExecutor
-from typing import Literal
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal
 
 import numpy as np
 
+if TYPE_CHECKING:
+    from gim_backend.core.config import Settings
+
 try:
     from sentence_transformers import SentenceTransformer
 except ModuleNotFoundError:  # pragma: no cover
@@ -28,21 +32,83 @@ EMBEDDING_DIM: int = 256
 MAX_TOKENS: int = 512
 MODEL_NAME: str = "nomic-ai/nomic-embed-text-v2-moe"
 
+# Padded tokens (items x longest item) allowed in one forward pass; 16 full-length texts
+TOKEN_BUDGET: int = 8192
+MAX_BATCH_ITEMS: int = 256
+
+# Fallback token estimate when no tokenizer is available
+CHARS_PER_TOKEN: int = 4
+
+
+def plan_token_batches(
+    lengths: list[int],
+    token_budget: int = TOKEN_BUDGET,
+    max_items: int = MAX_BATCH_ITEMS,
+) -> list[list[int]]:
+    """
+    Groups item indices into batches of similar token length.
+
+    Items are sorted by length and a batch is closed once adding the next item would
+    push items x longest-item past token_budget, so short texts are never padded to
+    a long neighbour. An item longer than the budget gets a batch of its own.
+    """
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    batches: list[list[int]] = []
+    current: list[int] = []
+
+    for index in order:
+        longest = max(lengths[index], 1)
+        if current and ((len(current) + 1) * longest > token_budget or len(current) >= max_items):
+            batches.append(current)
+            current = []
+        current.append(index)
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def padded_token_count(lengths: list[int], batches: list[list[int]]) -> int:
+    """Tokens the model processes for a batch plan, padding included."""
+    return sum(len(batch) * max(lengths[i] for i in batch) for batch in batches)
+
+
+@dataclass
+class TokenBatchStats:
+    batches: int = 0
+    tokens: int = 0
+    padded_tokens: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "batches": self.batches,
+            "tokens": self.tokens,
+            "padded_tokens": self.padded_tokens,
+            "padding_ratio": round(1 - self.tokens / self.padded_tokens, 3) if self.padded_tokens else 0.0,
+        }
+
 
 class NomicMoEEmbedder:
 
     BATCH_SIZE: int = 25
 
-    def __init__(self, max_workers: int = 1):
+    DEFAULT_NUM_THREADS: int = 2
+
+    def __init__(self, max_workers: int = 1, num_threads: int | None = None):
         self._model = None
         self._load_lock = threading.Lock()
         self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._stats_lock = threading.Lock()
+        self.token_stats = TokenBatchStats()
+        self._configure_threads(num_threads or self.DEFAULT_NUM_THREADS)
 
+    def _configure_threads(self, num_threads: int) -> None:
+        """Caps intra-op threads for the backend; torch's setting is process-wide."""
         try:
             import torch
 
 
-            torch.set_num_threads(2)
+            torch.set_num_threads(num_threads)
         except ImportError:
             logger.warning("torch not available; thread limiting skipped")
 
@@ -56,12 +122,23 @@ class NomicMoEEmbedder:
                         MODEL_NAME,
                         trust_remote_code=True,
                     )
+                    self._model.max_seq_length = MAX_TOKENS
                     logger.info(f"Model loaded; output dim will be truncated to {EMBEDDING_DIM}")
         return self._model
 
     def warmup(self):
         self._load_model()
 
+    def memory_footprint_bytes(self) -> int | None:
+        """Parameter and buffer bytes of the loaded model, or None before load."""
+        if self._model is None:
+            return None
+        try:
+            tensors = list(self._model.parameters()) + list(self._model.buffers())
+        except AttributeError:
+            return None
+        return sum(t.numel() * t.element_size() for t in tensors)
+
     def _truncate_and_normalize(self, embeddings: np.ndarray) -> np.ndarray:
 
         truncated = embeddings[:, :EMBEDDING_DIM]
@@ -74,6 +151,34 @@ class NomicMoEEmbedder:
 
         return normalized
 
+    def _encode_prefixed(self, prefixed_texts: list[str]) -> np.ndarray:
+        """Full-width, L2-normalized embeddings; backends override this."""
+        model = self._load_model()
+        return model.encode(
+            prefixed_texts,
+            batch_size=len(prefixed_texts),
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+
+    def _token_lengths(self, prefixed_texts: list[str]) -> list[int]:
+        """Token count per text after truncation to MAX_TOKENS, special tokens included."""
+        tokenizer = getattr(self._load_model(), "tokenizer", None)
+        try:
+            encoded = tokenizer(
+                prefixed_texts,
+                add_special_tokens=True,
+                truncation=True,
+                max_length=MAX_TOKENS,
+            )["input_ids"]
+            lengths = [len(ids) for ids in encoded]
+        except Exception:
+            lengths = []
+
+        if len(lengths) != len(prefixed_texts):
+            lengths = [min(MAX_TOKENS, len(text) // CHARS_PER_TOKEN + 2) for text in prefixed_texts]
+        return lengths
+
     def _encode_sync(
         self,
         texts: list[str],
@@ -82,22 +187,24 @@ class NomicMoEEmbedder:
         if not texts:
             return []
 
-        model = self._load_model()
-
-
         prefix = "search_document: " if prefix_type == "document" else "search_query: "
         prefixed_texts = [f"{prefix}{text}" for text in texts]
 
-        embeddings = model.encode(
-            prefixed_texts,
-            convert_to_numpy=True,
-            normalize_embeddings=True,
-        )
+        lengths = self._token_lengths(prefixed_texts)
+        batches = plan_token_batches(lengths)
 
+        # Batches run in length order; results are scattered back to the caller's order
+        output = np.empty((len(texts), EMBEDDING_DIM), dtype=np.float32)
+        for batch in batches:
+            embeddings = self._encode_prefixed([prefixed_texts[i] for i in batch])
+            output[batch] = self._truncate_and_normalize(embeddings)
 
-        truncated_normalized = self._truncate_and_normalize(embeddings)
+        with self._stats_lock:
+            self.token_stats.batches += len(batches)
+            self.token_stats.tokens += sum(lengths)
+            self.token_stats.padded_tokens += padded_token_count(lengths, batches)
 
-        return truncated_normalized.tolist()
+        return output.tolist()
 
     async def embed_documents(self, texts: list[str]) -> list[list[float]]:
         if not texts:
@@ -127,4 +234,37 @@ class NomicMoEEmbedder:
         return await self.embed_documents(texts)
 
     def close(self):
+        if self.token_stats.batches:
+            logger.info("Embedding token batching stats", extra=self.token_stats.as_dict())
         self._executor.shutdown(wait=False)
+
+
+def embedding_model_tag(settings: Settings) -> str:
+    """
+    Identifies the encoder behind stored vectors: the model plus the
+    EMBEDDING_BACKEND, since torch and ONNX outputs differ slightly.
+    """
+    return f"{MODEL_NAME}@{settings.embedding_backend.lower() or 'torch'}"
+
+
+def create_nomic_embedder(
+    settings: Settings,
+    max_workers: int = 1,
+    num_threads: int | None = None,
+) -> NomicMoEEmbedder:
+    """Embedder for the backend selected by EMBEDDING_BACKEND (torch|onnx|onnx_int8)."""
+    backend = settings.embedding_backend.lower()
+    match backend:
+        case "torch" | "":
+            return NomicMoEEmbedder(max_workers=max_workers, num_threads=num_threads)
+        case "onnx" | "onnx_int8":
+            from gim_backend.ingestion.nomic_onnx_embedder import NomicOnnxEmbedder
+
+            return NomicOnnxEmbedder(
+                max_workers=max_workers,
+                num_threads=num_threads,
+                model_dir=settings.embedding_onnx_path or None,
+                quantize=backend == "onnx_int8",
+            )
+        case _:
+            raise ValueError(f"Unknown embedding backend: {backend}")
@@ -0,0 +1,197 @@
+
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+
+from gim_backend.ingestion.nomic_moe_embedder import MAX_TOKENS, MODEL_NAME, NomicMoEEmbedder
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ONNX_DIR = Path.home() / ".cache" / "gim" / "onnx"
+
+FP32_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+META_FILE = "export.json"
+
+ONNX_OPSET = 17
+
+
+class NomicOnnxEmbedder(NomicMoEEmbedder):
+    """
+    Runs the Nomic MoE encoder through onnxruntime instead of torch.
+
+    The encoder is exported once (torch and sentence-transformers are only needed for
+    the export) and optionally dynamic-int8 quantized; later loads need only
+    onnxruntime and tokenizers. Mean pooling and L2 normalization happen in NumPy, so
+    the output goes through the same _truncate_and_normalize contract as the torch path.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        num_threads: int | None = None,
+        model_dir: str | Path | None = None,
+        quantize: bool = True,
+    ):
+        self._num_threads = num_threads or self.DEFAULT_NUM_THREADS
+        self._model_dir = Path(model_dir) if model_dir else DEFAULT_ONNX_DIR
+        self._quantize = quantize
+        self._tokenizer = None
+        super().__init__(max_workers=max_workers, num_threads=num_threads)
+
+    def _configure_threads(self, num_threads: int) -> None:
+        # Threads are set per onnxruntime session; importing torch here would
+        # load it in processes that only ever run the ONNX graph
+        pass
+
+    @property
+    def model_path(self) -> Path:
+        return self._model_dir / (INT8_FILE if self._quantize else FP32_FILE)
+
+    def _load_model(self):
+        if self._model is None:
+            with self._load_lock:
+
+                if self._model is None:
+                    if not self._export_is_current():
+                        export_onnx_model(self._model_dir, quantize=self._quantize)
+
+                    logger.info(
+                        f"Loading ONNX embedding model: {self.model_path} "
+                        f"with {self._num_threads} intra-op threads"
+                    )
+                    self._tokenizer = _load_tokenizer(self._model_dir / TOKENIZER_FILE)
+                    self._model = _create_session(self.model_path, self._num_threads)
+        return self._model
+
+    def _export_is_current(self) -> bool:
+        meta_path = self._model_dir / META_FILE
+        if not self.model_path.exists() or not meta_path.exists():
+            return False
+        meta = json.loads(meta_path.read_text())
+        return meta.get("model_name") == MODEL_NAME
+
+    def memory_footprint_bytes(self) -> int | None:
+        """Size of the ONNX weights on disk, or None before load."""
+        if self._model is None:
+            return None
+        return os.path.getsize(self.model_path)
+
+    def _token_lengths(self, prefixed_texts: list[str]) -> list[int]:
+        self._load_model()
+        # The tokenizer truncates to MAX_TOKENS; padding is masked out of the count
+        return [sum(e.attention_mask) for e in self._tokenizer.encode_batch(prefixed_texts)]
+
+    def _encode_prefixed(self, prefixed_texts: list[str]) -> np.ndarray:
+        session = self._load_model()
+
+        encodings = self._tokenizer.encode_batch(prefixed_texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        input_names = {i.name for i in session.get_inputs()}
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        (hidden,) = session.run(["last_hidden_state"], feeds)
+        pooled = mean_pool(hidden, attention_mask)
+
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return pooled / np.where(norms == 0, 1, norms)
+
+
+def mean_pool(hidden: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    """Mean over non-padding tokens, matching the model's sentence-transformers pooling."""
+    mask = attention_mask[..., None].astype(np.float32)
+    summed = (hidden * mask).sum(axis=1)
+    counts = np.clip(mask.sum(axis=1), 1e-9, None)
+    return summed / counts
+
+
+def _load_tokenizer(path: Path):
+    from tokenizers import Tokenizer
+
+    tokenizer = Tokenizer.from_file(str(path))
+    tokenizer.enable_truncation(max_length=MAX_TOKENS)
+    tokenizer.enable_padding()
+    return tokenizer
+
+
+def _create_session(path: Path, num_threads: int):
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = num_threads
+    options.inter_op_num_threads = 1
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return ort.InferenceSession(str(path), sess_options=options, providers=["CPUExecutionProvider"])
+
+
+def export_onnx_model(model_dir: str | Path, quantize: bool = True) -> Path:
+    """
+    Exports the transformer under the sentence-transformers wrapper to ONNX, saves the
+    tokenizer next to it, and writes a dynamic-int8 copy when quantize is set.
+    Returns the path of the model the embedder should load.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    fp32_path = model_dir / FP32_FILE
+
+    logger.info(f"Exporting {MODEL_NAME} to ONNX at {model_dir}")
+    st_model = SentenceTransformer(MODEL_NAME, trust_remote_code=True, device="cpu")
+    st_model.tokenizer.save_pretrained(str(model_dir))
+
+    class _Encoder(torch.nn.Module):
+        def __init__(self, transformer):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, input_ids, attention_mask):
+            return self.transformer(input_ids=input_ids, attention_mask=attention_mask)[0]
+
+    encoder = _Encoder(st_model[0].auto_model).eval()
+    sample = st_model.tokenizer(
+        ["search_document: export sample", "search_query: a somewhat longer export sample text"],
+        padding=True,
+        return_tensors="pt",
+    )
+
+    with torch.inference_mode():
+        torch.onnx.export(
+            encoder,
+            (sample["input_ids"], sample["attention_mask"]),
+            str(fp32_path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "last_hidden_state": {0: "batch", 1: "sequence"},
+            },
+            opset_version=ONNX_OPSET,
+        )
+
+    model_path = fp32_path
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        model_path = model_dir / INT8_FILE
+        logger.info(f"Quantizing ONNX model to int8 at {model_path}")
+        quantize_dynamic(str(fp32_path), str(model_path), weight_type=QuantType.QInt8)
+
+    (model_dir / META_FILE).write_text(
+        json.dumps({"model_name": MODEL_NAME, "opset": ONNX_OPSET, "quantized": quantize})
+    )
+    return model_path
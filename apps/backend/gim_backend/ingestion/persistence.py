@@ -2,17 +2,20 @@
 
 from __future__ import annotations
 
+import json
 import logging
 from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
+from gim_database.vector import halfvec_array_param, vector_param
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .content_hash import compute_content_hash
 from .embeddings import EMBEDDING_DIM
+from .gatherer import IssueHighWaterMark
 from .survival_score import calculate_survival_score, days_since
 
 if TYPE_CHECKING:
@@ -35,8 +38,13 @@ class StreamingPersistence:
 
     BATCH_SIZE: int = 50
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, embedding_model: str | None = None):
+        """
+        embedding_model tags rows this instance embeds (see embedding_model_tag);
+        unchanged content is only refreshed in place when its tag matches.
+        """
         self._session = session
+        self._embedding_model = embedding_model
 
     async def upsert_repositories(self, repos: list[RepositoryData]) -> int:
         if not repos:
@@ -94,6 +102,58 @@ class StreamingPersistence:
         logger.debug(f"Upserted {len(repos)} repositories")
         return len(repos)
 
+    async def get_issue_high_water_marks(self, repo_ids: list[str]) -> dict[str, IssueHighWaterMark]:
+        if not repo_ids:
+            return {}
+
+        result = await self._session.exec(
+            text("""
+                SELECT node_id, last_issue_created_at, last_issue_updated_at
+                FROM ingestion.repository
+                WHERE node_id = ANY(:repo_ids)
+                  AND last_issue_updated_at IS NOT NULL
+            """),
+            params={"repo_ids": repo_ids},
+        )
+
+        return {
+            row.node_id: IssueHighWaterMark(
+                last_created_at=row.last_issue_created_at,
+                last_updated_at=row.last_issue_updated_at,
+            )
+            for row in result.all()
+        }
+
+    async def update_issue_high_water_marks(self, marks: dict[str, IssueHighWaterMark]) -> int:
+        """Advances stored marks; GREATEST keeps a stale or concurrent run from moving one backwards."""
+        if not marks:
+            return 0
+
+        repo_ids = list(marks.keys())
+        result = await self._session.exec(
+            text("""
+                UPDATE ingestion.repository r SET
+                    last_issue_created_at = GREATEST(r.last_issue_created_at, m.last_created_at),
+                    last_issue_updated_at = GREATEST(r.last_issue_updated_at, m.last_updated_at)
+                FROM unnest(
+                    CAST(:repo_ids AS text[]),
+                    CAST(:created_ats AS timestamptz[]),
+                    CAST(:updated_ats AS timestamptz[])
+                ) AS m(node_id, last_created_at, last_updated_at)
+                WHERE r.node_id = m.node_id
+            """),
+            params={
+                "repo_ids": repo_ids,
+                "created_ats": [marks[repo_id].last_created_at for repo_id in repo_ids],
+                "updated_ats": [marks[repo_id].last_updated_at for repo_id in repo_ids],
+            },
+        )
+        await self._session.commit()
+
+        updated = result.rowcount or 0
+        logger.debug(f"Advanced issue high-water marks for {updated} repositories")
+        return updated
+
     async def persist_stream(
         self,
         embedded_issues: AsyncIterator[EmbeddedIssue],
@@ -142,31 +202,18 @@ class StreamingPersistence:
         return total
 
     async def upsert_staged_issue(self, issue: dict[str, Any], embedding: list[float]) -> None:
-        _assert_embedding_dim(embedding, EMBEDDING_DIM, issue_id=str(issue.get("node_id")))
-
-        github_created_at = issue.get("github_created_at")
-        if isinstance(github_created_at, str):
-            dt = datetime.fromisoformat(github_created_at.replace("Z", "+00:00"))
-            github_created_at = dt.astimezone(UTC).replace(tzinfo=None)
-        elif isinstance(github_created_at, datetime):
-            github_created_at = github_created_at.replace(tzinfo=None)
-
-        q_score = float(issue.get("q_score") or 0.0)
-        days_old = days_since(github_created_at)
-        survival = calculate_survival_score(q_score, days_old)
-
         await self._session.exec(
             text("""
                 INSERT INTO ingestion.issue (
                     node_id, repo_id, has_code, has_template_headers,
                     tech_stack_weight, q_score, survival_score, title,
-                    body_text, labels, embedding, content_hash, state,
+                    body_text, labels, embedding, embedding_model, content_hash, state,
                     github_created_at
                 )
                 VALUES (
                     :node_id, :repo_id, :has_code, :has_template_headers,
                     :tech_stack_weight, :q_score, :survival_score, :title,
-                    :body_text, :labels, CAST(:embedding AS vector), :content_hash,
+                    :body_text, :labels, CAST(:embedding AS halfvec), :embedding_model, :content_hash,
                     :state, :github_created_at
                 )
                 ON CONFLICT (node_id) DO UPDATE SET
@@ -180,28 +227,177 @@ class StreamingPersistence:
                     body_text = EXCLUDED.body_text,
                     labels = EXCLUDED.labels,
                     embedding = EXCLUDED.embedding,
+                    embedding_model = EXCLUDED.embedding_model,
+                    content_hash = EXCLUDED.content_hash,
+                    state = EXCLUDED.state,
+                    github_created_at = EXCLUDED.github_created_at
+            """),
+            params={**self._staged_issue_params(issue, embedding), "embedding_model": self._embedding_model},
+        )
+
+    async def upsert_staged_issues(self, items: list[tuple[dict[str, Any], list[float]]]) -> None:
+        """Upserts a claimed staging batch in one statement; raises if any row is rejected."""
+        if not items:
+            return
+
+        rows = [self._staged_issue_params(issue, embedding) for issue, embedding in items]
+
+        await self._session.exec(
+            text("""
+                INSERT INTO ingestion.issue (
+                    node_id, repo_id, has_code, has_template_headers,
+                    tech_stack_weight, q_score, survival_score, title,
+                    body_text, labels, embedding, embedding_model, content_hash, state,
+                    github_created_at
+                )
+                SELECT
+                    b.node_id, b.repo_id, b.has_code, b.has_template_headers,
+                    b.tech_stack_weight, b.q_score, b.survival_score, b.title,
+                    b.body_text,
+                    ARRAY(SELECT jsonb_array_elements_text(CAST(b.labels AS jsonb))),
+                    b.embedding, CAST(:embedding_model AS text), b.content_hash, b.state,
+                    b.github_created_at AT TIME ZONE 'UTC'
+                FROM unnest(
+                    CAST(:node_ids AS text[]),
+                    CAST(:repo_ids AS text[]),
+                    CAST(:has_codes AS boolean[]),
+                    CAST(:has_template_headers AS boolean[]),
+                    CAST(:tech_stack_weights AS double precision[]),
+                    CAST(:q_scores AS double precision[]),
+                    CAST(:survival_scores AS double precision[]),
+                    CAST(:titles AS text[]),
+                    CAST(:body_texts AS text[]),
+                    CAST(:labels AS text[]),
+                    CAST(:embeddings AS halfvec[]),
+                    CAST(:content_hashes AS text[]),
+                    CAST(:states AS text[]),
+                    CAST(:github_created_ats AS timestamp[])
+                ) AS b(
+                    node_id, repo_id, has_code, has_template_headers,
+                    tech_stack_weight, q_score, survival_score, title,
+                    body_text, labels, embedding, content_hash, state,
+                    github_created_at
+                )
+                ON CONFLICT (node_id) DO UPDATE SET
+                    repo_id = EXCLUDED.repo_id,
+                    has_code = EXCLUDED.has_code,
+                    has_template_headers = EXCLUDED.has_template_headers,
+                    tech_stack_weight = EXCLUDED.tech_stack_weight,
+                    q_score = EXCLUDED.q_score,
+                    survival_score = EXCLUDED.survival_score,
+                    title = EXCLUDED.title,
+                    body_text = EXCLUDED.body_text,
+                    labels = EXCLUDED.labels,
+                    embedding = EXCLUDED.embedding,
+                    embedding_model = EXCLUDED.embedding_model,
                     content_hash = EXCLUDED.content_hash,
                     state = EXCLUDED.state,
                     github_created_at = EXCLUDED.github_created_at
             """),
             params={
-                "node_id": issue["node_id"],
-                "repo_id": issue["repo_id"],
-                "has_code": bool(issue.get("has_code", False)),
-                "has_template_headers": bool(issue.get("has_template_headers", False)),
-                "tech_stack_weight": float(issue.get("tech_stack_weight") or 0.0),
-                "q_score": q_score,
-                "survival_score": survival,
-                "title": issue["title"],
-                "body_text": issue["body_text"],
-                "labels": issue.get("labels") or [],
-                "embedding": str(embedding),
-                "content_hash": issue["content_hash"],
-                "state": issue.get("state") or "open",
-                "github_created_at": github_created_at,
+                "node_ids": [row["node_id"] for row in rows],
+                "repo_ids": [row["repo_id"] for row in rows],
+                "has_codes": [row["has_code"] for row in rows],
+                "has_template_headers": [row["has_template_headers"] for row in rows],
+                "tech_stack_weights": [row["tech_stack_weight"] for row in rows],
+                "q_scores": [row["q_score"] for row in rows],
+                "survival_scores": [row["survival_score"] for row in rows],
+                "titles": [row["title"] for row in rows],
+                "body_texts": [row["body_text"] for row in rows],
+                # Ragged label lists cannot ride in a 2-D array; ship each row as JSON
+                "labels": [json.dumps(row["labels"]) for row in rows],
+                "embeddings": halfvec_array_param(row["embedding"] for row in rows),
+                "embedding_model": self._embedding_model,
+                "content_hashes": [row["content_hash"] for row in rows],
+                "states": [row["state"] for row in rows],
+                "github_created_ats": [row["github_created_at"] for row in rows],
             },
         )
 
+    async def refresh_unchanged_issues(self, issues: list[dict[str, Any]]) -> set[str]:
+        """
+        Refreshes metadata for staged issues whose content_hash matches the live row
+        and whose stored embedding exists and came from this instance's encoder.
+
+        Updates state, labels, q_score and survival_score only; the embedding is kept.
+        Returns the refreshed node_ids; everything else still needs encoding, including
+        rows embedded by another model or backend (or before tags were recorded).
+        """
+        if not issues:
+            return set()
+
+        rows = [self._staged_metadata_params(issue) for issue in issues]
+
+        result = await self._session.exec(
+            text("""
+                UPDATE ingestion.issue AS i
+                SET state = u.state,
+                    labels = ARRAY(SELECT jsonb_array_elements_text(CAST(u.labels AS jsonb))),
+                    q_score = u.q_score,
+                    survival_score = u.survival_score
+                FROM unnest(
+                    CAST(:node_ids AS text[]),
+                    CAST(:content_hashes AS text[]),
+                    CAST(:states AS text[]),
+                    CAST(:labels AS text[]),
+                    CAST(:q_scores AS double precision[]),
+                    CAST(:survival_scores AS double precision[])
+                ) AS u(node_id, content_hash, state, labels, q_score, survival_score)
+                WHERE i.node_id = u.node_id
+                AND i.content_hash = u.content_hash
+                AND i.embedding IS NOT NULL
+                AND i.embedding_model = CAST(:embedding_model AS text)
+                RETURNING i.node_id
+            """),
+            params={
+                "node_ids": [row["node_id"] for row in rows],
+                "content_hashes": [row["content_hash"] for row in rows],
+                "states": [row["state"] for row in rows],
+                "labels": [json.dumps(row["labels"]) for row in rows],
+                "q_scores": [row["q_score"] for row in rows],
+                "survival_scores": [row["survival_score"] for row in rows],
+                "embedding_model": self._embedding_model,
+            },
+        )
+        return {row[0] for row in result.fetchall()}
+
+    @staticmethod
+    def _staged_issue_params(issue: dict[str, Any], embedding: list[float]) -> dict[str, Any]:
+        _assert_embedding_dim(embedding, EMBEDDING_DIM, issue_id=str(issue.get("node_id")))
+
+        params = StreamingPersistence._staged_metadata_params(issue)
+        params["embedding"] = vector_param(embedding)
+        return params
+
+    @staticmethod
+    def _staged_metadata_params(issue: dict[str, Any]) -> dict[str, Any]:
+        github_created_at = issue.get("github_created_at")
+        if isinstance(github_created_at, str):
+            dt = datetime.fromisoformat(github_created_at.replace("Z", "+00:00"))
+            github_created_at = dt.astimezone(UTC).replace(tzinfo=None)
+        elif isinstance(github_created_at, datetime):
+            github_created_at = github_created_at.replace(tzinfo=None)
+
+        q_score = float(issue.get("q_score") or 0.0)
+        days_old = days_since(github_created_at)
+        survival = calculate_survival_score(q_score, days_old)
+
+        return {
+            "node_id": issue["node_id"],
+            "repo_id": issue["repo_id"],
+            "has_code": bool(issue.get("has_code", False)),
+            "has_template_headers": bool(issue.get("has_template_headers", False)),
+            "tech_stack_weight": float(issue.get("tech_stack_weight") or 0.0),
+            "q_score": q_score,
+            "survival_score": survival,
+            "title": issue["title"],
+            "body_text": issue["body_text"],
+            "labels": issue.get("labels") or [],
+            "content_hash": issue["content_hash"],
+            "state": issue.get("state") or "open",
+            "github_created_at": github_created_at,
+        }
+
     async def _upsert_batch(self, batch: list[EmbeddedIssue]) -> None:
         if not batch:
             return
@@ -220,7 +416,7 @@ class StreamingPersistence:
                 f"(:node_id_{i}, :repo_id_{i}, :has_code_{i}, :has_template_headers_{i}, "
                 f":tech_stack_weight_{i}, :q_score_{i}, :survival_score_{i}, :title_{i}, "
                 f":body_text_{i}, :issue_number_{i}, :github_url_{i}, :labels_{i}, "
-                f"CAST(:embedding_{i} AS vector), :content_hash_{i}, "
+                f"CAST(:embedding_{i} AS halfvec), :embedding_model, :content_hash_{i}, "
                 f":github_created_at_{i}, :state_{i})"
             )
 
@@ -236,18 +432,19 @@ class StreamingPersistence:
             params[f"issue_number_{i}"] = issue.issue_number
             params[f"github_url_{i}"] = issue.github_url
             params[f"labels_{i}"] = issue.labels
-            params[f"embedding_{i}"] = str(item.embedding)
+            params[f"embedding_{i}"] = vector_param(item.embedding)
             params[f"content_hash_{i}"] = content_hash
             params[f"github_created_at_{i}"] = issue.github_created_at
             params[f"state_{i}"] = issue.state
 
+        params["embedding_model"] = self._embedding_model
         values_sql = ", ".join(values_list)
 
         query = text(f"""
             INSERT INTO ingestion.issue
                 (node_id, repo_id, has_code, has_template_headers, tech_stack_weight,
                  q_score, survival_score, title, body_text, issue_number, github_url,
-                 labels, embedding, content_hash,
+                 labels, embedding, embedding_model, content_hash,
                  github_created_at, state)
             VALUES {values_sql}
             ON CONFLICT (node_id) DO UPDATE SET
@@ -263,6 +460,7 @@ class StreamingPersistence:
                 github_url = EXCLUDED.github_url,
                 labels = EXCLUDED.labels,
                 embedding = EXCLUDED.embedding,
+                embedding_model = EXCLUDED.embedding_model,
                 content_hash = EXCLUDED.content_hash,
                 github_created_at = EXCLUDED.github_created_at,
                 state = EXCLUDED.state
@@ -14,6 +14,27 @@ if TYPE_CHECKING:
     from .gatherer import IssueData
 
 logger = logging.getLogger(__name__)
+
+_LOAD_TABLE = "pending_issue_load"
+
+_COPY_COLUMNS = [
+    "node_id",
+    "repo_id",
+    "title",
+    "body_text",
+    "labels",
+    "issue_number",
+    "github_url",
+    "github_created_at",
+    "has_code",
+    "has_template_headers",
+    "tech_stack_weight",
+    "q_score",
+    "state",
+    "content_hash",
+]
+
+
 class StagingPersistence:
 
     def __init__(self, session: AsyncSession):
@@ -23,10 +44,64 @@ class StagingPersistence:
         if not issues:
             return 0
 
+        driver = await self._get_driver_connection()
+        if hasattr(driver, "copy_records_to_table"):
+            inserted = await self._insert_via_copy(driver, issues)
+        else:
+            inserted = await self._insert_rowwise(issues)
+
+        await self._session.commit()
+
+        logger.info(
+            f"Inserted {inserted}/{len(issues)} pending issues (skipped duplicates)",
+            extra={"inserted": inserted, "total": len(issues)},
+        )
+        return inserted
+
+    async def _get_driver_connection(self):
+        connection = await self._session.connection()
+        raw = await connection.get_raw_connection()
+        return raw.driver_connection
+
+    async def _insert_via_copy(self, driver, issues: list[IssueData]) -> int:
+        # Temp table lives in the session's transaction; created through the session so
+        # the transaction is open before COPY runs on the underlying asyncpg connection
+        await self._session.execute(
+            text(f"""
+                CREATE TEMP TABLE IF NOT EXISTS {_LOAD_TABLE} (
+                    seq integer NOT NULL,
+                    LIKE staging.pending_issue INCLUDING DEFAULTS
+                ) ON COMMIT DROP
+            """)
+        )
+
+        await driver.copy_records_to_table(
+            _LOAD_TABLE,
+            records=[(seq, *self._to_row(issue)) for seq, issue in enumerate(issues)],
+            columns=["seq", *_COPY_COLUMNS],
+        )
+
+        # DISTINCT ON keeps the first occurrence of a node_id, matching the row-wise path
+        columns = ", ".join(_COPY_COLUMNS)
+        result = await self._session.execute(
+            text(f"""
+                INSERT INTO staging.pending_issue ({columns}, status, attempts)
+                SELECT {columns}, 'pending', 0
+                FROM (
+                    SELECT DISTINCT ON (node_id) *
+                    FROM {_LOAD_TABLE}
+                    ORDER BY node_id, seq
+                ) load
+                ORDER BY seq
+                ON CONFLICT (node_id) DO NOTHING
+                RETURNING node_id
+            """)
+        )
+        return len(result.fetchall())
+
+    async def _insert_rowwise(self, issues: list[IssueData]) -> int:
         inserted = 0
         for issue in issues:
-            content_hash = compute_content_hash(issue.node_id, issue.title, issue.body_text)
-
             result = await self._session.execute(
                 text("""
                     INSERT INTO staging.pending_issue (
@@ -43,33 +118,31 @@ class StagingPersistence:
                     )
                     ON CONFLICT (node_id) DO NOTHING
                 """),
-                {
-                    "node_id": issue.node_id,
-                    "repo_id": issue.repo_id,
-                    "title": issue.title,
-                    "body_text": issue.body_text,
-                    "labels": issue.labels,
-                    "issue_number": issue.issue_number,
-                    "github_url": issue.github_url,
-                    "github_created_at": issue.github_created_at,
-                    "has_code": issue.q_components.has_code,
-                    "has_template_headers": issue.q_components.has_headers,
-                    "tech_stack_weight": issue.q_components.tech_weight,
-                    "q_score": issue.q_score,
-                    "state": issue.state,
-                    "content_hash": content_hash,
-                },
+                dict(zip(_COPY_COLUMNS, self._to_row(issue))),
             )
             if result.rowcount > 0:
                 inserted += 1
+        return inserted
 
-        await self._session.commit()
-
-        logger.info(
-            f"Inserted {inserted}/{len(issues)} pending issues (skipped duplicates)",
-            extra={"inserted": inserted, "total": len(issues)},
+    @staticmethod
+    def _to_row(issue: IssueData) -> tuple:
+        """Values in _COPY_COLUMNS order."""
+        return (
+            issue.node_id,
+            issue.repo_id,
+            issue.title,
+            issue.body_text,
+            issue.labels,
+            issue.issue_number,
+            issue.github_url,
+            issue.github_created_at,
+            issue.q_components.has_code,
+            issue.q_components.has_headers,
+            issue.q_components.tech_weight,
+            issue.q_score,
+            issue.state,
+            compute_content_hash(issue.node_id, issue.title, issue.body_text),
         )
-        return inserted
 
     async def claim_pending_batch(self, batch_size: int = 100) -> list[dict]:
         result = await self._session.execute(
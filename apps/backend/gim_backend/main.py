@@ -26,7 +26,7 @@ from gim_backend.core.errors import ProfileError, profile_exception_handler
 from gim_backend.core.redis import close_redis
 from gim_backend.middleware.auth import session_cookie_sync_middleware
 from gim_backend.middleware.security_headers import SecurityHeadersMiddleware
-from gim_backend.services.embedding_service import close_embedder
+from gim_backend.services.embedding_service import close_embedder, warmup_embedder
 
 logging.basicConfig(
     level=logging.INFO,
@@ -44,6 +44,8 @@ settings = get_settings()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    if settings.embedding_warmup_on_startup:
+        await warmup_embedder()
     yield
     await close_http_client()
     await close_redis()
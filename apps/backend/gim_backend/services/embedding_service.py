@@ -1,26 +1,51 @@
 """
 Application-scoped embedding service for query vectorization.
-Wraps NomicEmbedder as a singleton to avoid reloading the model per request.
+Wraps the ingestion-side NomicMoEEmbedder as a singleton so the API process, embed_worker
+and resume_worker load one model and produce vectors in the same 256-dim space as
+ingestion.issue. Queries are encoded with the `search_query:` prefix via embed_queries.
+Single-query calls go through a micro-batcher so concurrent searches share forward passes.
 Uses asyncio.Lock with double-check pattern for thread safety in multi-worker environments.
 """
 
 import asyncio
 import logging
+import resource
+import sys
+import time
 
-from gim_backend.ingestion.embeddings import EMBEDDING_DIM, NomicEmbedder
+from gim_backend.core.config import get_settings
+from gim_backend.ingestion.embedding_cache import CachedEmbedder, with_embedding_cache
+from gim_backend.ingestion.embeddings import DocumentQueryEmbedder
+from gim_backend.ingestion.nomic_moe_embedder import EMBEDDING_DIM, MODEL_NAME, create_nomic_embedder
+from gim_backend.services.query_embedding_batcher import QueryEmbeddingBatcher
 
 logger = logging.getLogger(__name__)
 
 # Module-level singleton with lock for thread-safe initialization
-_embedder: NomicEmbedder | None = None
+_embedder: DocumentQueryEmbedder | None = None
+_batcher: QueryEmbeddingBatcher | None = None
 _embedder_lock: asyncio.Lock = asyncio.Lock()
 
 
-async def get_embedder() -> NomicEmbedder:
+def _build_embedder() -> DocumentQueryEmbedder:
+    """Embedder selected by EMBEDDING_MODE and EMBEDDING_BACKEND, wrapped in the embedding cache when configured."""
+    settings = get_settings()
+    mode = settings.embedding_mode.lower()
+
+    match mode:
+        case "nomic" | "nomic_moe":
+            embedder = create_nomic_embedder(settings, max_workers=1)
+        case _:
+            raise ValueError(f"Unknown embedding mode: {mode}")
+
+    return with_embedding_cache(embedder, settings, model_name=MODEL_NAME, dim=EMBEDDING_DIM)
+
+
+async def get_embedder() -> DocumentQueryEmbedder:
     """
-    Returns the singleton NomicEmbedder instance.
+    Returns the singleton DocumentQueryEmbedder instance.
     Uses double-check locking to prevent race conditions in multi-worker environments.
-    Model loads lazily on first embed call.
+    Model loads lazily on first embed call unless warmup_embedder ran at startup.
     """
     global _embedder
 
@@ -33,28 +58,104 @@ async def get_embedder() -> NomicEmbedder:
         # Another worker may have initialized while waiting
         if _embedder is None:
             logger.info("Initializing embedding service singleton")
-            _embedder = NomicEmbedder()
+            _embedder = _build_embedder()
 
     return _embedder
 
 
+async def get_query_batcher() -> QueryEmbeddingBatcher:
+    """Returns the singleton micro-batcher in front of the embedder."""
+    global _batcher
+
+    if _batcher is not None:
+        return _batcher
+
+    embedder = await get_embedder()
+    async with _embedder_lock:
+        if _batcher is None:
+            settings = get_settings()
+            _batcher = QueryEmbeddingBatcher(
+                embedder.embed_queries,
+                max_batch_size=settings.embedding_batch_size,
+                window_ms=settings.query_embedding_batch_window_ms,
+                cache_size=settings.query_embedding_cache_size,
+            )
+
+    return _batcher
+
+
+def _current_rss_bytes() -> int:
+    """Current resident set size; falls back to peak RSS where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except (OSError, IndexError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+async def warmup_embedder() -> dict | None:
+    """
+    Loads the model and runs one query so the first request does not pay for it.
+    Returns (and logs) load time and memory footprint. Called at process startup;
+    failures are logged and left to surface on the first real request.
+    """
+    embedder = await get_embedder()
+    model_holder = embedder.inner if isinstance(embedder, CachedEmbedder) else embedder
+
+    rss_before = _current_rss_bytes()
+    start = time.monotonic()
+    try:
+        if hasattr(model_holder, "warmup"):
+            await asyncio.to_thread(model_holder.warmup)
+        await model_holder.embed_queries(["warmup"])
+    except Exception as e:
+        logger.warning(f"Embedding model warmup failed: {e}")
+        return None
+    elapsed = time.monotonic() - start
+    rss_after = _current_rss_bytes()
+
+    footprint = getattr(model_holder, "memory_footprint_bytes", lambda: None)()
+    stats = {
+        "model": MODEL_NAME,
+        "embedding_dim": EMBEDDING_DIM,
+        "load_s": round(elapsed, 2),
+        "rss_mb": round(rss_after / 2**20, 1),
+        "rss_delta_mb": round((rss_after - rss_before) / 2**20, 1),
+        "model_mb": round(footprint / 2**20, 1) if footprint is not None else None,
+    }
+    logger.info(
+        f"Embedding model warm in {stats['load_s']}s; RSS {stats['rss_mb']} MB "
+        f"(+{stats['rss_delta_mb']} MB), weights {stats['model_mb']} MB",
+        extra=stats,
+    )
+    return stats
+
+
+def assert_vector_dim(vector: list[float], *, context: str, expected_dim: int = EMBEDDING_DIM) -> None:
+    """Raises ValueError if vector does not match the ingestion.issue embedding dimension."""
+    if len(vector) != expected_dim:
+        raise ValueError(
+            f"Embedding dimension mismatch for {context}: expected {expected_dim}, got {len(vector)}"
+        )
+
+
 async def embed_query(text: str) -> list[float] | None:
     """
-    Embeds a single search query text into a 768-dim vector.
-    Uses the singleton embedder to avoid model reload overhead.
+    Embeds a single search query text into a 256-dim vector.
+    Concurrent calls are coalesced into one batched forward pass; repeated
+    and in-flight duplicate queries are answered without re-encoding.
 
     Args:
         text: The search query to embed
 
     Returns:
-        768-dimensional normalized embedding vector, or None if embedding fails
+        256-dimensional normalized embedding vector, or None if embedding fails
     """
     try:
-        embedder = await get_embedder()
-        embeddings = await embedder.embed_batch([text])
-        if embeddings and len(embeddings) > 0:
-            return embeddings[0]
-        return None
+        batcher = await get_query_batcher()
+        return await batcher.embed(text)
     except Exception as e:
         logger.warning(f"Embedding query failed: {e}")
         return None
@@ -69,14 +170,14 @@ async def embed_queries(texts: list[str]) -> list[list[float] | None]:
         texts: List of search queries to embed
 
     Returns:
-        List of 768-dimensional normalized embedding vectors (None for failed embeddings)
+        List of 256-dimensional normalized embedding vectors (None for failed embeddings)
     """
     if not texts:
         return []
 
     try:
         embedder = await get_embedder()
-        return await embedder.embed_batch(texts)
+        return await embedder.embed_queries(texts)
     except Exception as e:
         logger.warning(f"Batch embedding failed: {e}")
         return [None] * len(texts)
@@ -87,27 +188,42 @@ async def close_embedder() -> None:
     Cleanup embedder resources. Called on application shutdown.
     Acquires lock to prevent race with initialization.
     """
-    global _embedder
+    global _embedder, _batcher
 
     async with _embedder_lock:
+        if _batcher is not None:
+            logger.info("Query embedding batcher stats", extra=_batcher.stats.as_dict())
+            _batcher.close()
+            _batcher = None
         if _embedder is not None:
             logger.info("Closing embedding service")
             _embedder.close()
             _embedder = None
 
 
+def get_embedding_cache_stats() -> dict | None:
+    """Hit/miss counters of the query embedding cache, or None when caching is off."""
+    if isinstance(_embedder, CachedEmbedder):
+        return _embedder.stats.as_dict()
+    return None
+
+
 def reset_embedder_for_testing() -> None:
     """For testing only; resets singleton state without lock (not async-safe)."""
-    global _embedder
+    global _embedder, _batcher
     _embedder = None
+    _batcher = None
 
 
 __all__ = [
     "EMBEDDING_DIM",
+    "assert_vector_dim",
     "get_embedder",
+    "get_query_batcher",
+    "warmup_embedder",
     "embed_query",
     "embed_queries",
     "close_embedder",
+    "get_embedding_cache_stats",
     "reset_embedder_for_testing",
 ]
-
@@ -0,0 +1,144 @@
+"""
+Precomputed personalized feeds in Redis, one entry per user.
+
+The feed_materialize worker job (after every embedder run) and profile vector
+updates rank each user's default feed ahead of time. get_feed serves page 1
+from the entry while it is fresh:
+
+- it was ranked from the user's current combined_vector (compared by digest,
+  so any vector change makes it stale without explicit invalidation)
+- it used the current preferred_languages and min_heat_threshold
+- it is younger than feed_materialization_ttl_seconds (the key TTL)
+
+Entries are deliberately not tied to the index generation: the janitor bumps
+it on every prune, and hydration already drops issues that were closed or
+deleted since ranking. New issues reach the entry when the post-embedder job
+re-materializes it.
+
+Anything else falls back to live ranking. Skipped if Redis is unavailable.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from uuid import UUID
+
+import numpy as np
+
+from gim_backend.core.config import get_settings
+from gim_backend.core.redis import get_redis
+from gim_backend.services.feed_snapshot import FeedSnapshot, _snapshot_from_dict, _snapshot_to_dict
+
+logger = logging.getLogger(__name__)
+
+FEED_MATERIALIZATION_PREFIX = "feedmat:"
+
+
+@dataclass(frozen=True)
+class FeedMaterialization:
+    vector_digest: str
+    min_q_score: float
+    snapshot: FeedSnapshot
+
+
+def combined_vector_digest(combined_vector) -> str:
+    """Digest of the vector at halfvec precision, so in-memory and stored vectors agree."""
+    data = np.asarray(combined_vector, dtype=np.float16).tobytes()
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def _materialization_key(user_id: UUID) -> str:
+    return f"{FEED_MATERIALIZATION_PREFIX}{user_id}"
+
+
+def _serialize_materialization(entry: FeedMaterialization) -> str:
+    return json.dumps(
+        {
+            "vector": entry.vector_digest,
+            "min_q": entry.min_q_score,
+            "snapshot": _snapshot_to_dict(entry.snapshot),
+        },
+        separators=(",", ":"),
+    )
+
+
+def _deserialize_materialization(data: str) -> FeedMaterialization:
+    parsed = json.loads(data)
+    return FeedMaterialization(
+        vector_digest=parsed["vector"],
+        min_q_score=parsed["min_q"],
+        snapshot=_snapshot_from_dict(parsed["snapshot"]),
+    )
+
+
+async def materialization_available() -> bool:
+    """False when Redis is unavailable and nothing can be stored."""
+    return await get_redis() is not None
+
+
+async def get_materialized_feed(user_id: UUID, profile) -> FeedSnapshot | None:
+    """
+    The user's precomputed default feed if it is still fresh for this profile.
+    Returns None on a miss, a stale entry or Redis unavailable.
+    """
+    redis = await get_redis()
+    if redis is None:
+        return None
+
+    try:
+        cached = await redis.get(_materialization_key(user_id))
+        if not cached:
+            return None
+        entry = _deserialize_materialization(cached)
+    except Exception as e:
+        logger.warning(f"Feed materialization read error: {e}")
+        return None
+
+    if (
+        entry.vector_digest != combined_vector_digest(profile.combined_vector)
+        or entry.min_q_score != float(profile.min_heat_threshold)
+        or not entry.snapshot.matches(
+            user_id=user_id,
+            languages=profile.preferred_languages,
+            labels=None,
+            repos=None,
+        )
+    ):
+        logger.debug(f"Feed materialization stale for user {user_id}")
+        return None
+
+    return entry.snapshot
+
+
+async def store_materialized_feed(user_id: UUID, entry: FeedMaterialization) -> bool:
+    """
+    Store a user's precomputed feed for feed_materialization_ttl_seconds.
+    Returns False if Redis is unavailable or the write failed.
+    """
+    redis = await get_redis()
+    if redis is None:
+        return False
+
+    try:
+        await redis.setex(
+            _materialization_key(user_id),
+            get_settings().feed_materialization_ttl_seconds,
+            _serialize_materialization(entry),
+        )
+        return True
+    except Exception as e:
+        logger.warning(f"Feed materialization write error: {e}")
+        return False
+
+
+__all__ = [
+    "FEED_MATERIALIZATION_PREFIX",
+    "FeedMaterialization",
+    "combined_vector_digest",
+    "get_materialized_feed",
+    "materialization_available",
+    "store_materialized_feed",
+    "_deserialize_materialization",
+    "_serialize_materialization",
+]
@@ -1,23 +1,45 @@
 """
 Feed service for personalized issue recommendations.
 Uses combined_vector for similarity search; falls back to trending when no profile.
+Personalized rankings are snapshotted in Redis so later pages slice the same list,
+and default feeds can be precomputed per user (materialize_user_feed).
 """
 import logging
 from datetime import datetime
 from uuid import UUID
 
+import numpy as np
+from gim_database.vector import vector_param
 from pydantic import BaseModel
 from sqlalchemy import text
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from gim_backend.core.config import get_settings
+from gim_backend.services.feed_materialization import (
+    FeedMaterialization,
+    combined_vector_digest,
+    get_materialized_feed,
+    materialization_available,
+    store_materialized_feed,
+)
+from gim_backend.services.feed_snapshot import FeedSnapshot, get_feed_snapshot, store_feed_snapshot
+from gim_backend.services.new_issues_digest import get_new_issues_digest
 from gim_backend.services.profile_service import get_or_create_profile
+from gim_backend.services.search_models import SearchFilters
+from gim_backend.services.search_schema_probe import _pgvector_supports_iterative_scan
+from gim_backend.services.search_sql import _build_prefilter_conditions
+from gim_backend.services.vector_retrieval import (
+    build_issue_candidates_sql,
+    prepare_vector_scan,
+    retrieval_params,
+)
 from gim_backend.services.why_this_service import WhyThisItem, compute_why_this
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_PAGE_SIZE: int = 20
 MAX_PAGE_SIZE: int = 50
+# Personalized feed: ANN candidates reranked per request; also the most pages it can serve
 CANDIDATE_LIMIT: int = 200
 
 TRENDING_CTA = "These are trending issues. Complete your profile for personalized recommendations."
@@ -62,6 +84,7 @@ class FeedPage(BaseModel):
     has_more: bool
     is_personalized: bool
     profile_cta: str | None
+    snapshot_id: str | None = None
 
 
 async def get_feed(
@@ -72,12 +95,20 @@ async def get_feed(
     languages: list[str] | None = None,
     labels: list[str] | None = None,
     repos: list[str] | None = None,
+    snapshot_id: UUID | None = None,
+    recommendation_batch_id: UUID | None = None,
 ) -> FeedPage:
     """
     Returns personalized feed using combined_vector; falls back to trending.
     Applies preferred_languages and min_heat_threshold filters when personalized.
 
     Filter params override profile preferences when provided.
+
+    snapshot_id serves the page from a stored ranking when it belongs to this
+    user and filters. Without one, the default feed (no filter params) is
+    served from the user's precomputed materialization when it is fresh.
+    A ranking served fresh or from the materialization is stored under
+    recommendation_batch_id and returned as the page's snapshot_id.
     """
     if page < 1:
         page = 1
@@ -89,16 +120,54 @@ async def get_feed(
     profile = await get_or_create_profile(db, user_id)
 
     if profile.combined_vector is not None:
+        preferred_languages = languages or profile.preferred_languages
+
+        if snapshot_id is not None:
+            snapshot = await get_feed_snapshot(snapshot_id)
+            if snapshot is not None and snapshot.matches(
+                user_id=user_id,
+                languages=preferred_languages,
+                labels=labels,
+                repos=repos,
+            ):
+                return await _get_snapshot_feed(
+                    db=db,
+                    profile=profile,
+                    snapshot=snapshot,
+                    snapshot_id=snapshot_id,
+                    page=page,
+                    page_size=page_size,
+                )
+            logger.info("Feed snapshot expired or does not match the request, re-ranking")
+
+        if languages is None and labels is None and repos is None:
+            materialized = await get_materialized_feed(user_id, profile)
+            if materialized is not None:
+                # Copy under this response's batch id so later pages survive a re-materialization
+                stored = recommendation_batch_id is not None and await store_feed_snapshot(
+                    recommendation_batch_id, materialized
+                )
+                return await _get_snapshot_feed(
+                    db=db,
+                    profile=profile,
+                    snapshot=materialized,
+                    snapshot_id=recommendation_batch_id if stored else None,
+                    page=page,
+                    page_size=page_size,
+                )
+
         return await _get_personalized_feed(
             db=db,
             profile=profile,
             combined_vector=profile.combined_vector,
-            preferred_languages=languages or profile.preferred_languages,
+            preferred_languages=preferred_languages,
             min_heat_threshold=profile.min_heat_threshold,
             page=page,
             page_size=page_size,
             labels=labels,
             repos=repos,
+            user_id=user_id,
+            snapshot_id=recommendation_batch_id,
         )
 
     return await _get_trending_feed(
@@ -111,75 +180,157 @@ async def get_feed(
     )
 
 
-async def _get_personalized_feed(
-    db: AsyncSession,
-    profile,
-    combined_vector: list[float],
-    preferred_languages: list[str] | None,
-    min_heat_threshold: float,
-    page: int,
-    page_size: int,
+def _build_feed_filters(
+    *,
+    min_q_score: float,
+    languages: list[str] | None = None,
     labels: list[str] | None = None,
     repos: list[str] | None = None,
-) -> FeedPage:
-    """Vector similarity search against issue embeddings with preference filters."""
-    settings = get_settings()
-    offset = (page - 1) * page_size
+    require_embedding: bool = False,
+) -> tuple[str, dict]:
+    """WHERE clause over issue i joined to repository r, shared by the trending and personalized feeds."""
+    conditions = ["i.state = 'open'", "i.q_score >= :min_q_score"]
+    params: dict = {"min_q_score": min_q_score}
 
-    filter_conditions = ["i.embedding IS NOT NULL", "i.state = 'open'"]
-    params: dict = {
-        "combined_vec": str(combined_vector),
-        "min_q_score": min_heat_threshold,
-        "limit": CANDIDATE_LIMIT,
-        "offset": offset,
-        "page_size": page_size,
-        "freshness_half_life_days": float(settings.feed_freshness_half_life_days),
-        "freshness_floor": float(settings.feed_freshness_floor),
-        "freshness_weight": float(settings.feed_freshness_weight),
-    }
+    if require_embedding:
+        conditions.insert(0, "i.embedding IS NOT NULL")
 
-    filter_conditions.append("i.q_score >= :min_q_score")
-
-    if preferred_languages:
-        filter_conditions.append("r.primary_language = ANY(:langs)")
-        params["langs"] = preferred_languages
+    if languages:
+        conditions.append("r.primary_language = ANY(:langs)")
+        params["langs"] = languages
 
     if labels:
-        filter_conditions.append("i.labels && :labels")
+        conditions.append("i.labels && :labels")
         params["labels"] = labels
 
     if repos:
-        filter_conditions.append("r.full_name = ANY(:repos)")
+        conditions.append("r.full_name = ANY(:repos)")
         params["repos"] = repos
 
-    where_clause = " AND ".join(filter_conditions)
+    return " AND ".join(conditions), params
+
+
+def _row_to_feed_item(row, *, include_personalized_scores: bool) -> FeedItem:
+    item = FeedItem(
+        node_id=row.node_id,
+        title=row.title,
+        body_preview=row.body_text[:500] if row.body_text else "",
+        github_url=row.github_url,
+        labels=row.labels or [],
+        q_score=float(row.q_score),
+        repo_name=row.repo_name,
+        primary_language=row.primary_language,
+        repo_topics=list(row.repo_topics or []),
+        github_created_at=row.github_created_at,
+        similarity_score=None,
+    )
+    if include_personalized_scores:
+        item.similarity_score = float(row.similarity_score) if row.similarity_score else None
+        item.freshness = float(row.freshness) if row.freshness is not None else None
+        item.final_score = float(row.final_score) if row.final_score is not None else None
+    return item
 
-    count_sql = f"""
-    SELECT COUNT(*) as total
-    FROM ingestion.issue i
-    JOIN ingestion.repository r ON i.repo_id = r.node_id
-    WHERE {where_clause}
+
+def _rerank_candidates(rows: list) -> list:
+    """
+    Phase two of the personalized feed: final_score DESC, q_score DESC,
+    node_id ASC over the ANN candidates (NULL scores first, as Postgres DESC).
     """
+    if not rows:
+        return []
 
-    count_result = await db.execute(text(count_sql), params)
-    total = count_result.scalar() or 0
+    final_score = np.array([np.nan if row.final_score is None else float(row.final_score) for row in rows])
+    q_score = np.array([float(row.q_score) for row in rows])
+    node_ids = np.array([row.node_id for row in rows])
+    # lexsort: last key is primary
+    order = np.lexsort((node_ids, -q_score, np.where(np.isnan(final_score), -np.inf, -final_score)))
+    return [rows[i] for i in order]
 
-    if total == 0:
-        return FeedPage(
-            results=[],
-            total=0,
-            page=page,
-            page_size=page_size,
-            has_more=False,
-            is_personalized=True,
-            profile_cta=None,
+
+def _attach_why_this(profile, results: list[FeedItem], *, debug_freshness: bool) -> None:
+    # Compute why_this for personalized results only, deterministic and whitelist-only.
+    # No extra DB queries, uses profile entities and issue signals already fetched.
+    for item in results:
+        item.why_this = compute_why_this(
+            profile=profile,
+            issue_title=item.title,
+            issue_body_preview=item.body_preview,
+            issue_labels=item.labels,
+            repo_primary_language=item.primary_language,
+            repo_topics=item.repo_topics,
+            top_k=3,
+        )
+        if not debug_freshness:
+            item.freshness = None
+            item.final_score = None
+
+
+async def _rank_personalized_candidates(
+    db: AsyncSession,
+    *,
+    combined_vector: list[float],
+    preferred_languages: list[str] | None,
+    min_heat_threshold: float,
+    labels: list[str] | None = None,
+    repos: list[str] | None = None,
+) -> list:
+    """
+    Both phases of the personalized feed for one vector and filter set:
+    ANN top-CANDIDATE_LIMIT with freshness scoring in SQL, then the in-process
+    rerank. Rows carry total_count (the candidate count).
+    """
+    settings = get_settings()
+
+    where_clause, params = _build_feed_filters(
+        min_q_score=min_heat_threshold,
+        languages=preferred_languages,
+        labels=labels,
+        repos=repos,
+        require_embedding=True,
+    )
+    params.update(
+        {
+            "combined_vec": vector_param(combined_vector),
+            "limit": CANDIDATE_LIMIT,
+            "freshness_half_life_days": float(settings.feed_freshness_half_life_days),
+            "freshness_floor": float(settings.feed_freshness_floor),
+            "freshness_weight": float(settings.feed_freshness_weight),
+        }
+    )
+
+    # Issue-level form of the same filters, so the HNSW scan returns matching rows
+    candidate_conditions = ["i.embedding IS NOT NULL", "i.state = 'open'", "i.q_score >= :min_q_score"]
+    candidate_conditions += _build_prefilter_conditions(
+        SearchFilters(languages=preferred_languages or [], labels=labels or [], repos=repos or [])
+    )
+
+    # A filtered HNSW scan stops after ef_search rows; with iterative scans it
+    # keeps going until CANDIDATE_LIMIT rows match, otherwise rank every match exactly
+    retrieval_mode = settings.feed_vector_retrieval
+    iterative_scan = await _pgvector_supports_iterative_scan(db)
+    candidates_sql = build_issue_candidates_sql(
+        retrieval_mode,
+        vector_param="combined_vec",
+        where=" AND ".join(candidate_conditions),
+        limit=":limit",
+        use_index=iterative_scan,
+    )
+    params.update(retrieval_params(retrieval_mode, settings.vector_rerank_factor))
+    if iterative_scan:
+        await prepare_vector_scan(
+            db,
+            retrieval_mode,
+            CANDIDATE_LIMIT,
+            settings.vector_rerank_factor,
+            iterative_scan=True,
+            min_ef_search=CANDIDATE_LIMIT,
         )
 
     sql = f"""
     SELECT
         i.node_id,
         i.title,
-        i.body_text,
+        LEFT(i.body_text, 500) AS body_text,
         i.github_url,
         i.labels,
         i.q_score,
@@ -187,7 +338,7 @@ async def _get_personalized_feed(
         r.full_name AS repo_name,
         r.primary_language,
         r.topics AS repo_topics,
-        1 - (i.embedding <=> CAST(:combined_vec AS vector)) AS similarity_score,
+        1 - (i.embedding <=> CAST(:combined_vec AS halfvec)) AS similarity_score,
         GREATEST(
             :freshness_floor,
             POWER(
@@ -198,7 +349,7 @@ async def _get_personalized_feed(
             )
         ) AS freshness,
         (
-            (1 - (i.embedding <=> CAST(:combined_vec AS vector))) +
+            (1 - (i.embedding <=> CAST(:combined_vec AS halfvec))) +
             (:freshness_weight * GREATEST(
                 :freshness_floor,
                 POWER(
@@ -208,57 +359,82 @@ async def _get_personalized_feed(
                     ) / :freshness_half_life_days
                 )
             ))
-        ) AS final_score
-    FROM ingestion.issue i
+        ) AS final_score,
+        COUNT(*) OVER() AS total_count
+    FROM ({candidates_sql}) i
     JOIN ingestion.repository r ON i.repo_id = r.node_id
     WHERE {where_clause}
-    ORDER BY final_score DESC, i.q_score DESC, i.node_id ASC
-    LIMIT :page_size
-    OFFSET :offset
     """
 
     result = await db.execute(text(sql), params)
     rows = result.fetchall()
+    return _rerank_candidates(rows)
+
 
-    results = [
-        FeedItem(
-            node_id=row.node_id,
-            title=row.title,
-            body_preview=row.body_text[:500] if row.body_text else "",
-            github_url=row.github_url,
-            labels=row.labels or [],
-            q_score=float(row.q_score),
-            repo_name=row.repo_name,
-            primary_language=row.primary_language,
-            repo_topics=list(row.repo_topics or []),
-            github_created_at=row.github_created_at,
-            similarity_score=float(row.similarity_score) if row.similarity_score else None,
-            freshness=float(row.freshness) if row.freshness is not None else None,
-            final_score=float(row.final_score) if row.final_score is not None else None,
+async def _get_personalized_feed(
+    db: AsyncSession,
+    profile,
+    combined_vector: list[float],
+    preferred_languages: list[str] | None,
+    min_heat_threshold: float,
+    page: int,
+    page_size: int,
+    labels: list[str] | None = None,
+    repos: list[str] | None = None,
+    user_id: UUID | None = None,
+    snapshot_id: UUID | None = None,
+) -> FeedPage:
+    """
+    Two-phase personalized feed with preference filters:
+
+    1. ANN top-CANDIDATE_LIMIT issues by embedding distance, filters pushed
+       into the index scan, scored with freshness in the same query
+    2. Rerank by final_score with q_score/node_id tie-breaks and paginate in process
+
+    Cost is bounded by CANDIDATE_LIMIT rather than the number of matching
+    issues, so total reports the (capped) candidate count. With user_id and
+    snapshot_id the ranked list is stored for _get_snapshot_feed.
+    """
+    settings = get_settings()
+    offset = (page - 1) * page_size
+
+    rows = await _rank_personalized_candidates(
+        db,
+        combined_vector=combined_vector,
+        preferred_languages=preferred_languages,
+        min_heat_threshold=min_heat_threshold,
+        labels=labels,
+        repos=repos,
+    )
+
+    if not rows:
+        return FeedPage(
+            results=[],
+            total=0,
+            page=page,
+            page_size=page_size,
+            has_more=False,
+            is_personalized=True,
+            profile_cta=None,
         )
-        for row in rows
-    ]
 
-    # Compute why_this for personalized results only, deterministic and whitelist-only.
-    # No extra DB queries, uses profile entities and issue signals already fetched.
-    for item in results:
-        item.why_this = compute_why_this(
-            profile=profile,
-            issue_title=item.title,
-            issue_body_preview=item.body_preview,
-            issue_labels=item.labels,
-            repo_primary_language=item.primary_language,
-            repo_topics=item.repo_topics,
-            top_k=3,
+    total = int(rows[0].total_count)
+
+    stored = False
+    if user_id is not None and snapshot_id is not None:
+        stored = await store_feed_snapshot(
+            snapshot_id,
+            _snapshot_from_rows(rows, user_id=user_id, languages=preferred_languages, labels=labels, repos=repos),
         )
-        if not settings.feed_debug_freshness:
-            item.freshness = None
-            item.final_score = None
+
+    page_rows = rows[offset : offset + page_size]
+    results = [_row_to_feed_item(row, include_personalized_scores=True) for row in page_rows]
+    _attach_why_this(profile, results, debug_freshness=settings.feed_debug_freshness)
 
     has_more = (offset + len(results)) < total
 
     logger.info(
-        f"Personalized feed: user has combined_vector, returned {len(results)} of {total}"
+        f"Personalized feed: user has combined_vector, returned {len(results)} of {total} candidates"
     )
 
     return FeedPage(
@@ -269,65 +445,226 @@ async def _get_personalized_feed(
         has_more=has_more,
         is_personalized=True,
         profile_cta=None,
+        snapshot_id=str(snapshot_id) if stored else None,
     )
 
 
-async def _get_trending_feed(
+def _optional_float(value) -> float | None:
+    return float(value) if value is not None else None
+
+
+def _snapshot_from_rows(
+    ranked: list,
+    *,
+    user_id: UUID,
+    languages: list[str] | None,
+    labels: list[str] | None,
+    repos: list[str] | None,
+) -> FeedSnapshot:
+    return FeedSnapshot(
+        user_id=user_id,
+        languages=languages,
+        labels=labels,
+        repos=repos,
+        node_ids=[row.node_id for row in ranked],
+        similarity_scores=[_optional_float(row.similarity_score) for row in ranked],
+        freshness=[_optional_float(row.freshness) for row in ranked],
+        final_scores=[_optional_float(row.final_score) for row in ranked],
+    )
+
+
+async def materialize_user_feed(db: AsyncSession, user_id: UUID, profile) -> int | None:
+    """
+    Ranks the user's default feed (profile preferences, no request filters)
+    and stores it for get_feed. Returns the number of ranked issues stored, or
+    None when the profile has no combined_vector or Redis is unavailable.
+    Query errors propagate; callers decide whether they are fatal.
+    """
+    if profile.combined_vector is None:
+        return None
+
+    if not await materialization_available():
+        return None
+
+    rows = await _rank_personalized_candidates(
+        db,
+        combined_vector=profile.combined_vector,
+        preferred_languages=profile.preferred_languages,
+        min_heat_threshold=profile.min_heat_threshold,
+    )
+    entry = FeedMaterialization(
+        vector_digest=combined_vector_digest(profile.combined_vector),
+        min_q_score=float(profile.min_heat_threshold),
+        snapshot=_snapshot_from_rows(
+            rows,
+            user_id=user_id,
+            languages=profile.preferred_languages,
+            labels=None,
+            repos=None,
+        ),
+    )
+    if not await store_materialized_feed(user_id, entry):
+        return None
+    return len(rows)
+
+
+async def refresh_user_feed_materialization(db: AsyncSession, user_id: UUID, profile) -> None:
+    """
+    materialize_user_feed for profile updates: runs in a savepoint and never
+    fails the caller, since a stale entry is simply not served.
+    """
+    if profile.combined_vector is None or not await materialization_available():
+        return
+
+    try:
+        async with db.begin_nested():
+            count = await materialize_user_feed(db, user_id, profile)
+    except Exception as e:
+        logger.warning(f"Feed materialization failed for user {user_id} (non-fatal): {e}")
+        return
+
+    if count is not None:
+        logger.info(f"Feed materialized for user {user_id}: {count} issues")
+
+
+async def _get_snapshot_feed(
     db: AsyncSession,
+    profile,
+    snapshot: FeedSnapshot,
+    snapshot_id: UUID | None,
     page: int,
     page_size: int,
-    languages: list[str] | None = None,
-    labels: list[str] | None = None,
-    repos: list[str] | None = None,
 ) -> FeedPage:
-    """Trending issues: high q_score, recent, open, with optional filters."""
+    """
+    Serves a page of a stored personalized ranking: the slice is taken from
+    the snapshot and only those issues are hydrated. Issues closed or deleted
+    since the snapshot was taken drop out of their page; nothing is re-ranked.
+    """
+    settings = get_settings()
     offset = (page - 1) * page_size
-    min_q_score = 0.6
-
-    # Build filter conditions
-    filter_conditions = ["i.q_score >= :min_q_score", "i.state = 'open'"]
-    params: dict = {
-        "min_q_score": min_q_score,
-        "limit": CANDIDATE_LIMIT,
-        "offset": offset,
-        "page_size": page_size,
-    }
-
-    if languages:
-        filter_conditions.append("r.primary_language = ANY(:langs)")
-        params["langs"] = languages
-
-    if labels:
-        filter_conditions.append("i.labels && :labels")
-        params["labels"] = labels
+    total = len(snapshot.node_ids)
+    page_ids = snapshot.node_ids[offset : offset + page_size]
+
+    results: list[FeedItem] = []
+    if page_ids:
+        sql = """
+        SELECT
+            i.node_id,
+            i.title,
+            LEFT(i.body_text, 500) AS body_text,
+            i.github_url,
+            i.labels,
+            i.q_score,
+            i.github_created_at,
+            r.full_name AS repo_name,
+            r.primary_language,
+            r.topics AS repo_topics
+        FROM ingestion.issue i
+        JOIN ingestion.repository r ON i.repo_id = r.node_id
+        WHERE i.node_id = ANY(:node_ids)
+          AND i.state = 'open'
+        """
+        result = await db.execute(text(sql), {"node_ids": page_ids})
+        rows_by_id = {row.node_id: row for row in result.fetchall()}
+
+        for index, node_id in enumerate(page_ids, start=offset):
+            row = rows_by_id.get(node_id)
+            if row is None:
+                continue
+            item = _row_to_feed_item(row, include_personalized_scores=False)
+            item.similarity_score = snapshot.similarity_scores[index] or None
+            item.freshness = snapshot.freshness[index]
+            item.final_score = snapshot.final_scores[index]
+            results.append(item)
+
+    _attach_why_this(profile, results, debug_freshness=settings.feed_debug_freshness)
+
+    has_more = (offset + len(page_ids)) < total
+
+    logger.info(f"Personalized feed: served {len(results)} of {total} from a stored ranking")
 
-    if repos:
-        filter_conditions.append("r.full_name = ANY(:repos)")
-        params["repos"] = repos
+    return FeedPage(
+        results=results,
+        total=total,
+        page=page,
+        page_size=page_size,
+        has_more=has_more,
+        is_personalized=True,
+        profile_cta=None,
+        snapshot_id=str(snapshot_id) if snapshot_id is not None else None,
+    )
 
-    where_clause = " AND ".join(filter_conditions)
 
-    count_sql = f"""
-    SELECT COUNT(*) as total
-    FROM ingestion.issue i
-    JOIN ingestion.repository r ON i.repo_id = r.node_id
-    WHERE {where_clause}
+async def get_new_issues_feed(
+    db: AsyncSession,
+    user_id: UUID,
+    page: int = 1,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> FeedPage:
     """
+    Issues ingested since the user's last visit, best matches first, from the
+    digest the new_issues job precomputed. Empty until the job has run.
+    """
+    page = max(page, 1)
+    page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
 
-    count_result = await db.execute(text(count_sql), params)
-    total = count_result.scalar() or 0
-
-    if total == 0:
+    digest = await get_new_issues_digest(user_id)
+    if digest is None:
         return FeedPage(
             results=[],
             total=0,
             page=page,
             page_size=page_size,
             has_more=False,
-            is_personalized=False,
-            profile_cta=TRENDING_CTA,
+            is_personalized=True,
+            profile_cta=None,
         )
 
+    profile = await get_or_create_profile(db, user_id)
+    snapshot = FeedSnapshot(
+        user_id=user_id,
+        languages=profile.preferred_languages,
+        labels=None,
+        repos=None,
+        node_ids=digest.node_ids,
+        similarity_scores=digest.similarity_scores,
+        freshness=[None] * len(digest.node_ids),
+        final_scores=digest.final_scores,
+    )
+    return await _get_snapshot_feed(
+        db=db,
+        profile=profile,
+        snapshot=snapshot,
+        snapshot_id=None,
+        page=page,
+        page_size=page_size,
+    )
+
+
+async def _get_trending_feed(
+    db: AsyncSession,
+    page: int,
+    page_size: int,
+    languages: list[str] | None = None,
+    labels: list[str] | None = None,
+    repos: list[str] | None = None,
+) -> FeedPage:
+    """
+    Trending issues: high q_score, recent, open, with optional filters.
+    The total rides along as COUNT(*) OVER(); only an empty page past the
+    first needs a separate count.
+    """
+    offset = (page - 1) * page_size
+    min_q_score = 0.6
+
+    where_clause, params = _build_feed_filters(
+        min_q_score=min_q_score,
+        languages=languages,
+        labels=labels,
+        repos=repos,
+    )
+    params.update({"offset": offset, "page_size": page_size})
+
     sql = f"""
     SELECT
         i.node_id,
@@ -339,7 +676,8 @@ async def _get_trending_feed(
         i.github_created_at,
         r.full_name AS repo_name,
         r.primary_language,
-        r.topics AS repo_topics
+        r.topics AS repo_topics,
+        COUNT(*) OVER() AS total_count
     FROM ingestion.issue i
     JOIN ingestion.repository r ON i.repo_id = r.node_id
     WHERE {where_clause}
@@ -351,23 +689,21 @@ async def _get_trending_feed(
     result = await db.execute(text(sql), params)
     rows = result.fetchall()
 
-    results = [
-        FeedItem(
-            node_id=row.node_id,
-            title=row.title,
-            body_preview=row.body_text[:500] if row.body_text else "",
-            github_url=row.github_url,
-            labels=row.labels or [],
-            q_score=float(row.q_score),
-            repo_name=row.repo_name,
-            primary_language=row.primary_language,
-            repo_topics=list(row.repo_topics or []),
-            github_created_at=row.github_created_at,
-            similarity_score=None,
-            why_this=None,
-        )
-        for row in rows
-    ]
+    if rows:
+        total = int(rows[0].total_count)
+    elif offset > 0:
+        count_sql = f"""
+        SELECT COUNT(*) as total
+        FROM ingestion.issue i
+        JOIN ingestion.repository r ON i.repo_id = r.node_id
+        WHERE {where_clause}
+        """
+        count_result = await db.execute(text(count_sql), params)
+        total = count_result.scalar() or 0
+    else:
+        total = 0
+
+    results = [_row_to_feed_item(row, include_personalized_scores=False) for row in rows]
 
     has_more = (offset + len(results)) < total
 
@@ -391,7 +727,11 @@ __all__ = [
     "FeedItem",
     "FeedPage",
     "get_feed",
+    "get_new_issues_feed",
     "freshness_decay",
+    "materialize_user_feed",
+    "refresh_user_feed_materialization",
+    "CANDIDATE_LIMIT",
     "DEFAULT_PAGE_SIZE",
     "MAX_PAGE_SIZE",
     "TRENDING_CTA",
@@ -0,0 +1,150 @@
+"""
+Redis snapshots of a ranked personalized feed.
+
+The first /feed request ranks the candidate set once and stores the ordered
+ids with their scores under its recommendation_batch_id. Later pages pass that
+id back as snapshot_id and only hydrate their slice, so pages stay stable
+while ingestion runs and a deep page costs the same as page 1.
+
+Snapshots are deliberately not keyed by the index generation: a user paging
+through a feed should not see it reshuffle when the embedder commits.
+Skipped if Redis is unavailable.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from uuid import UUID
+
+from gim_backend.core.config import get_settings
+from gim_backend.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+FEED_SNAPSHOT_PREFIX = "feedsnap:"
+
+
+@dataclass(frozen=True)
+class FeedSnapshot:
+    user_id: UUID
+    languages: list[str] | None
+    labels: list[str] | None
+    repos: list[str] | None
+    node_ids: list[str]
+    similarity_scores: list[float | None]
+    freshness: list[float | None]
+    final_scores: list[float | None]
+
+    def matches(
+        self,
+        *,
+        user_id: UUID,
+        languages: list[str] | None,
+        labels: list[str] | None,
+        repos: list[str] | None,
+    ) -> bool:
+        """A snapshot only serves the user and request filters it was ranked for."""
+        return (
+            self.user_id == user_id
+            and _normalize(self.languages) == _normalize(languages)
+            and _normalize(self.labels) == _normalize(labels)
+            and _normalize(self.repos) == _normalize(repos)
+        )
+
+
+def _normalize(values: list[str] | None) -> list[str]:
+    return sorted(set(values or []))
+
+
+def _snapshot_key(snapshot_id: UUID) -> str:
+    return f"{FEED_SNAPSHOT_PREFIX}{snapshot_id}"
+
+
+def _snapshot_to_dict(snapshot: FeedSnapshot) -> dict:
+    """Ordered ids with parallel score lists; no per-id dict keys."""
+    return {
+        "user_id": str(snapshot.user_id),
+        "languages": snapshot.languages,
+        "labels": snapshot.labels,
+        "repos": snapshot.repos,
+        "ids": snapshot.node_ids,
+        "similarity": snapshot.similarity_scores,
+        "freshness": snapshot.freshness,
+        "final": snapshot.final_scores,
+    }
+
+
+def _snapshot_from_dict(parsed: dict) -> FeedSnapshot:
+    node_ids = parsed["ids"]
+    if not (len(node_ids) == len(parsed["similarity"]) == len(parsed["freshness"]) == len(parsed["final"])):
+        raise ValueError("Feed snapshot score lists do not match its ids")
+    return FeedSnapshot(
+        user_id=UUID(parsed["user_id"]),
+        languages=parsed["languages"],
+        labels=parsed["labels"],
+        repos=parsed["repos"],
+        node_ids=node_ids,
+        similarity_scores=parsed["similarity"],
+        freshness=parsed["freshness"],
+        final_scores=parsed["final"],
+    )
+
+
+def _serialize_snapshot(snapshot: FeedSnapshot) -> str:
+    return json.dumps(_snapshot_to_dict(snapshot), separators=(",", ":"))
+
+
+def _deserialize_snapshot(data: str) -> FeedSnapshot:
+    return _snapshot_from_dict(json.loads(data))
+
+
+async def get_feed_snapshot(snapshot_id: UUID) -> FeedSnapshot | None:
+    """
+    Retrieve a stored feed ranking.
+    Returns None if expired, unreadable or Redis unavailable.
+    """
+    redis = await get_redis()
+    if redis is None:
+        return None
+
+    try:
+        cached = await redis.get(_snapshot_key(snapshot_id))
+        if cached:
+            return _deserialize_snapshot(cached)
+        return None
+    except Exception as e:
+        logger.warning(f"Feed snapshot read error: {e}")
+        return None
+
+
+async def store_feed_snapshot(snapshot_id: UUID, snapshot: FeedSnapshot) -> bool:
+    """
+    Store a feed ranking for feed_snapshot_ttl_seconds.
+    Returns False if Redis is unavailable or the write failed.
+    """
+    redis = await get_redis()
+    if redis is None:
+        return False
+
+    try:
+        await redis.setex(
+            _snapshot_key(snapshot_id),
+            get_settings().feed_snapshot_ttl_seconds,
+            _serialize_snapshot(snapshot),
+        )
+        return True
+    except Exception as e:
+        logger.warning(f"Feed snapshot write error: {e}")
+        return False
+
+
+__all__ = [
+    "FEED_SNAPSHOT_PREFIX",
+    "FeedSnapshot",
+    "get_feed_snapshot",
+    "store_feed_snapshot",
+    "_deserialize_snapshot",
+    "_serialize_snapshot",
+    "_snapshot_from_dict",
+    "_snapshot_to_dict",
+]
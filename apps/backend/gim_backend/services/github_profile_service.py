@@ -21,6 +21,7 @@ from gim_backend.ingestion.github_client import (
     GitHubGraphQLClient,
 )
 from gim_backend.services.cloud_tasks_service import enqueue_github_task
+from gim_backend.services.feed_service import refresh_user_feed_materialization
 from gim_backend.services.linked_account_service import (
     LinkedAccountNotFoundError,
     LinkedAccountRevokedError,
@@ -465,6 +466,7 @@ async def execute_github_fetch(
 
     await db.commit()
     await db.refresh(profile)
+    await refresh_user_feed_materialization(db, user_id, profile)
 
     return {
         "status": "ready",
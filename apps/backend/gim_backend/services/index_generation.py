@@ -0,0 +1,95 @@
+"""
+Global search index generation counter in Redis.
+
+Jobs that change ingestion.issue (embedder, janitor) bump the counter after
+committing. Search caches fold the current generation into their keys, so one
+INCR invalidates every cached search and the old entries age out via TTL.
+Reads are memoized per process for a second to keep them off the hot path.
+"""
+
+import logging
+import time
+
+from gim_backend.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+INDEX_GENERATION_KEY = "index:generation"
+GENERATION_LOCAL_TTL_SECONDS = 1.0
+
+_cached_generation: int | None = None
+_cached_at: float = 0.0
+# Last generation read or written successfully; outlives the memo so a read
+# error never falls back to a long-invalidated generation
+_last_known_generation: int | None = None
+
+
+async def get_index_generation(redis=None) -> int:
+    """
+    Current generation; 0 when Redis is unavailable or the counter was never bumped.
+    On a read error, the last generation this process read or wrote (0 if none).
+    Callers that already hold a client pass it to skip the get_redis() lookup.
+    """
+    global _cached_generation, _cached_at, _last_known_generation
+
+    now = time.monotonic()
+    if _cached_generation is not None and now - _cached_at < GENERATION_LOCAL_TTL_SECONDS:
+        return _cached_generation
+
+    if redis is None:
+        redis = await get_redis()
+    if redis is None:
+        return 0
+
+    try:
+        raw = await redis.get(INDEX_GENERATION_KEY)
+        generation = int(raw) if raw else 0
+    except Exception as e:
+        logger.warning(f"Index generation read error: {e}")
+        return _last_known_generation if _last_known_generation is not None else 0
+
+    _cached_generation = generation
+    _cached_at = now
+    _last_known_generation = generation
+    return generation
+
+
+async def bump_index_generation(reason: str) -> int | None:
+    """
+    Invalidates every generation-keyed search cache entry. Non-fatal: returns
+    the new generation, or None if Redis is unavailable or the write failed.
+    """
+    global _cached_generation, _last_known_generation
+
+    redis = await get_redis()
+    if redis is None:
+        return None
+
+    try:
+        generation = int(await redis.incr(INDEX_GENERATION_KEY))
+    except Exception as e:
+        logger.warning(f"Index generation bump failed ({reason}): {e}")
+        return None
+
+    _cached_generation = None
+    _last_known_generation = generation
+    logger.info(
+        f"Search index generation bumped to {generation} ({reason})",
+        extra={"index_generation": generation, "reason": reason},
+    )
+    return generation
+
+
+def reset_index_generation_for_testing() -> None:
+    global _cached_generation, _cached_at, _last_known_generation
+    _cached_generation = None
+    _cached_at = 0.0
+    _last_known_generation = None
+
+
+__all__ = [
+    "INDEX_GENERATION_KEY",
+    "bump_index_generation",
+    "get_index_generation",
+    "reset_index_generation_for_testing",
+]
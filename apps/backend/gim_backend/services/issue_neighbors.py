@@ -0,0 +1,217 @@
+"""
+Offline k-nearest-neighbour graph behind get_similar_issues.
+
+ingestion.issue_neighbors holds each open issue's nearest open issues
+(similarity >= MIN_SIMILARITY_THRESHOLD, best first, up to NEIGHBOR_CAPACITY).
+The issue_neighbors worker job refreshes it after embedder runs, touching only
+issues with no row or a changed content_hash: each gets one vector query, and
+because cosine similarity is symmetric its results are merged back into the
+lists of the neighbours it found, so new issues show up on existing pages
+without recomputing them. Entries for issues that later close or whose
+embedding moved are left for the read path to filter.
+"""
+
+import logging
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from gim_database.vector import vector_param
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from gim_backend.core.config import get_settings
+from gim_backend.services.issue_service import MIN_SIMILARITY_THRESHOLD, NEIGHBOR_CAPACITY
+from gim_backend.services.vector_retrieval import (
+    build_issue_candidates_sql,
+    prepare_vector_scan,
+    retrieval_params,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StaleIssue:
+    node_id: str
+    embedding: object
+    content_hash: str | None
+
+
+def merge_neighbors(
+    neighbor_ids: Sequence[str],
+    similarity_scores: Sequence[float],
+    candidates: dict[str, float],
+    capacity: int = NEIGHBOR_CAPACITY,
+) -> tuple[list[str], list[float]]:
+    """
+    Folds candidate neighbours into a stored list, best first with ties by
+    node_id. A candidate replaces an existing entry for the same issue.
+    """
+    merged = dict(zip(neighbor_ids, similarity_scores, strict=True))
+    merged.update(candidates)
+    ranked = sorted(merged.items(), key=lambda item: (-item[1], item[0]))[:capacity]
+    return [node_id for node_id, _ in ranked], [float(score) for _, score in ranked]
+
+
+async def select_stale_issues(
+    db: AsyncSession,
+    *,
+    after: str | None,
+    limit: int,
+    full_rebuild: bool = False,
+) -> list[StaleIssue]:
+    """
+    Next keyset page of open issues with an embedding whose neighbour row is
+    missing or was computed from other content. full_rebuild selects all.
+    """
+    sql = """
+    SELECT i.node_id, i.embedding, i.content_hash
+    FROM ingestion.issue i
+    LEFT JOIN ingestion.issue_neighbors n ON n.node_id = i.node_id
+    WHERE i.state = 'open'
+      AND i.embedding IS NOT NULL
+      AND (
+          CAST(:full_rebuild AS boolean)
+          OR n.node_id IS NULL
+          OR n.source_content_hash IS DISTINCT FROM i.content_hash
+      )
+      AND (CAST(:after AS text) IS NULL OR i.node_id > :after)
+    ORDER BY i.node_id
+    LIMIT :limit
+    """
+    result = await db.execute(text(sql), {"after": after, "limit": limit, "full_rebuild": full_rebuild})
+    return [
+        StaleIssue(node_id=row.node_id, embedding=row.embedding, content_hash=row.content_hash)
+        for row in result.fetchall()
+    ]
+
+
+async def find_issue_neighbors(
+    db: AsyncSession,
+    node_id: str,
+    embedding,
+    capacity: int = NEIGHBOR_CAPACITY,
+) -> dict[str, float]:
+    """Nearest open issues to `embedding` above the similarity threshold, as {node_id: similarity}."""
+    settings = get_settings()
+    retrieval_mode = settings.similar_vector_retrieval
+    candidates_sql = build_issue_candidates_sql(
+        retrieval_mode,
+        vector_param="source_vec",
+        where="i.node_id != :node_id AND i.embedding IS NOT NULL AND i.state = 'open'",
+        limit=":limit",
+    )
+    sql = f"""
+    SELECT
+        i.node_id,
+        1 - (i.embedding <=> CAST(:source_vec AS halfvec)) AS similarity_score
+    FROM ({candidates_sql}) i
+    """
+
+    await prepare_vector_scan(db, retrieval_mode, capacity, settings.vector_rerank_factor)
+    result = await db.execute(
+        text(sql),
+        {
+            "node_id": node_id,
+            "source_vec": vector_param(embedding),
+            "limit": capacity,
+            **retrieval_params(retrieval_mode, settings.vector_rerank_factor),
+        },
+    )
+    return {
+        row.node_id: float(row.similarity_score)
+        for row in result.fetchall()
+        if float(row.similarity_score) >= MIN_SIMILARITY_THRESHOLD
+    }
+
+
+async def refresh_issue_neighbors(db: AsyncSession, issues: Sequence[StaleIssue]) -> dict:
+    """
+    Recomputes the neighbour rows of `issues` and merges each result into the
+    stored lists of the neighbours it found. Does not commit.
+
+    Returns stats dict with issues (rows recomputed) and reverse_updates
+    (other rows changed by the merge).
+    """
+    if not issues:
+        return {"issues": 0, "reverse_updates": 0}
+
+    refreshed = {}
+    reverse: dict[str, dict[str, float]] = defaultdict(dict)
+    for issue in issues:
+        neighbors = await find_issue_neighbors(db, issue.node_id, issue.embedding)
+        refreshed[issue.node_id] = merge_neighbors([], [], neighbors)
+        for neighbor_id, score in neighbors.items():
+            reverse[neighbor_id][issue.node_id] = score
+
+    await db.execute(
+        text("""
+            INSERT INTO ingestion.issue_neighbors (
+                node_id, neighbor_ids, similarity_scores, source_content_hash, computed_at
+            )
+            VALUES (
+                :node_id, CAST(:neighbor_ids AS text[]), CAST(:similarity_scores AS real[]),
+                :source_content_hash, NOW()
+            )
+            ON CONFLICT (node_id) DO UPDATE SET
+                neighbor_ids = EXCLUDED.neighbor_ids,
+                similarity_scores = EXCLUDED.similarity_scores,
+                source_content_hash = EXCLUDED.source_content_hash,
+                computed_at = EXCLUDED.computed_at
+        """),
+        [
+            {
+                "node_id": issue.node_id,
+                "neighbor_ids": refreshed[issue.node_id][0],
+                "similarity_scores": refreshed[issue.node_id][1],
+                "source_content_hash": issue.content_hash,
+            }
+            for issue in issues
+        ],
+    )
+
+    # Lists recomputed above already saw every committed issue
+    for node_id in refreshed:
+        reverse.pop(node_id, None)
+    if not reverse:
+        return {"issues": len(issues), "reverse_updates": 0}
+
+    result = await db.execute(
+        text("""
+            SELECT node_id, neighbor_ids, similarity_scores
+            FROM ingestion.issue_neighbors
+            WHERE node_id = ANY(:node_ids)
+            FOR UPDATE
+        """),
+        {"node_ids": list(reverse)},
+    )
+    updates = []
+    for row in result.fetchall():
+        merged_ids, merged_scores = merge_neighbors(row.neighbor_ids, row.similarity_scores, reverse[row.node_id])
+        if merged_ids != list(row.neighbor_ids) or merged_scores != [float(s) for s in row.similarity_scores]:
+            updates.append(
+                {"node_id": row.node_id, "neighbor_ids": merged_ids, "similarity_scores": merged_scores}
+            )
+
+    if updates:
+        await db.execute(
+            text("""
+                UPDATE ingestion.issue_neighbors
+                SET neighbor_ids = CAST(:neighbor_ids AS text[]),
+                    similarity_scores = CAST(:similarity_scores AS real[])
+                WHERE node_id = :node_id
+            """),
+            updates,
+        )
+
+    return {"issues": len(issues), "reverse_updates": len(updates)}
+
+
+__all__ = [
+    "StaleIssue",
+    "find_issue_neighbors",
+    "merge_neighbors",
+    "refresh_issue_neighbors",
+    "select_stale_issues",
+]
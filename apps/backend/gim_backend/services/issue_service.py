@@ -5,16 +5,26 @@ All queries filter open state by default for user-facing endpoints.
 import logging
 from datetime import datetime
 
+from gim_database.vector import vector_param
 from pydantic import BaseModel
 from sqlalchemy import text
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from gim_backend.core.config import get_settings
+from gim_backend.services.vector_retrieval import (
+    build_issue_candidates_sql,
+    prepare_vector_scan,
+    retrieval_params,
+)
+
 logger = logging.getLogger(__name__)
 
 # Minimum cosine similarity to include in similar issues results
 MIN_SIMILARITY_THRESHOLD = 0.3
 DEFAULT_SIMILAR_LIMIT = 5
 MAX_SIMILAR_LIMIT = 10
+# Neighbours stored per issue; the slack covers neighbours that close before the next refresh
+NEIGHBOR_CAPACITY = 2 * MAX_SIMILAR_LIMIT
 
 
 class IssueDetail(BaseModel):
@@ -101,6 +111,10 @@ async def get_similar_issues(
     - No similar issues above MIN_SIMILARITY_THRESHOLD
     - All similar issues are closed
 
+    Serves the precomputed ingestion.issue_neighbors row when it was computed
+    from the issue's current content; otherwise (or when closed neighbours
+    leave a full stored list short) runs the live vector query.
+
     Note: Cosine distance is used (lower = more similar).
     Similarity score = 1 - cosine_distance.
     """
@@ -109,11 +123,17 @@ async def get_similar_issues(
     if limit > MAX_SIMILAR_LIMIT:
         limit = MAX_SIMILAR_LIMIT
 
-    # Check if issue exists and get its embedding
+    # Check if issue exists and get its embedding and stored neighbours
     embedding_sql = """
-    SELECT node_id, embedding
-    FROM ingestion.issue
-    WHERE node_id = :node_id
+    SELECT
+        i.node_id,
+        i.embedding,
+        n.neighbor_ids,
+        n.similarity_scores,
+        n.source_content_hash IS NOT DISTINCT FROM i.content_hash AS neighbors_fresh
+    FROM ingestion.issue i
+    LEFT JOIN ingestion.issue_neighbors n ON n.node_id = i.node_id
+    WHERE i.node_id = :node_id
     """
 
     result = await db.execute(text(embedding_sql), {"node_id": node_id})
@@ -127,31 +147,47 @@ async def get_similar_issues(
         logger.info(f"Issue {node_id} has no embedding, returning empty similar list")
         return []
 
+    if source_row.neighbor_ids is not None and source_row.neighbors_fresh:
+        similar = await _hydrate_stored_neighbors(
+            db,
+            source_row.neighbor_ids,
+            source_row.similarity_scores,
+            limit,
+        )
+        if len(similar) >= limit or len(source_row.neighbor_ids) < NEIGHBOR_CAPACITY:
+            return similar
+
     # Find similar open issues, excluding source issue
     # Use cosine distance operator <=> and convert to similarity
-    similarity_sql = """
+    settings = get_settings()
+    retrieval_mode = settings.similar_vector_retrieval
+    candidates_sql = build_issue_candidates_sql(
+        retrieval_mode,
+        vector_param="source_vec",
+        where="i.node_id != :node_id AND i.embedding IS NOT NULL AND i.state = 'open'",
+        limit=":limit",
+    )
+    similarity_sql = f"""
     SELECT
         i.node_id,
         i.title,
         r.full_name AS repo_name,
-        1 - (i.embedding <=> CAST(:source_vec AS vector)) AS similarity_score
-    FROM ingestion.issue i
+        1 - (i.embedding <=> CAST(:source_vec AS halfvec)) AS similarity_score
+    FROM ({candidates_sql}) i
     JOIN ingestion.repository r ON i.repo_id = r.node_id
-    WHERE i.node_id != :node_id
-      AND i.embedding IS NOT NULL
-      AND i.state = 'open'
-      AND 1 - (i.embedding <=> CAST(:source_vec AS vector)) >= :min_threshold
-    ORDER BY i.embedding <=> CAST(:source_vec AS vector)
-    LIMIT :limit
+    WHERE 1 - (i.embedding <=> CAST(:source_vec AS halfvec)) >= :min_threshold
+    ORDER BY i.embedding <=> CAST(:source_vec AS halfvec)
     """
 
+    await prepare_vector_scan(db, retrieval_mode, limit, settings.vector_rerank_factor)
     result = await db.execute(
         text(similarity_sql),
         {
             "node_id": node_id,
-            "source_vec": str(list(source_row.embedding)),
+            "source_vec": vector_param(source_row.embedding),
             "min_threshold": MIN_SIMILARITY_THRESHOLD,
             "limit": limit,
+            **retrieval_params(retrieval_mode, settings.vector_rerank_factor),
         },
     )
     rows = result.fetchall()
@@ -167,6 +203,44 @@ async def get_similar_issues(
     ]
 
 
+async def _hydrate_stored_neighbors(
+    db: AsyncSession,
+    neighbor_ids: list[str],
+    similarity_scores: list[float],
+    limit: int,
+) -> list[SimilarIssue]:
+    """Loads stored neighbours that are still open, keeping the stored order."""
+    if not neighbor_ids:
+        return []
+
+    sql = """
+    SELECT i.node_id, i.title, r.full_name AS repo_name
+    FROM ingestion.issue i
+    JOIN ingestion.repository r ON i.repo_id = r.node_id
+    WHERE i.node_id = ANY(:node_ids)
+      AND i.state = 'open'
+    """
+    result = await db.execute(text(sql), {"node_ids": list(neighbor_ids)})
+    rows_by_id = {row.node_id: row for row in result.fetchall()}
+
+    similar = []
+    for neighbor_id, score in zip(neighbor_ids, similarity_scores, strict=True):
+        row = rows_by_id.get(neighbor_id)
+        if row is None:
+            continue
+        similar.append(
+            SimilarIssue(
+                node_id=row.node_id,
+                title=row.title,
+                repo_name=row.repo_name,
+                similarity_score=round(float(score), 3),
+            )
+        )
+        if len(similar) == limit:
+            break
+    return similar
+
+
 __all__ = [
     "IssueDetail",
     "SimilarIssue",
@@ -175,4 +249,5 @@ __all__ = [
     "MIN_SIMILARITY_THRESHOLD",
     "DEFAULT_SIMILAR_LIMIT",
     "MAX_SIMILAR_LIMIT",
+    "NEIGHBOR_CAPACITY",
 ]
@@ -0,0 +1,107 @@
+"""
+"New issues for you since your last visit", precomputed per user in Redis.
+
+The new_issues worker job scores every user with a combined_vector against
+recently ingested issues in one batched pass (batch_scoring) and stores each
+user's top-K here; GET /feed/new serves it. Skipped if Redis is unavailable.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from gim_backend.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+NEW_ISSUES_PREFIX = "newissues:"
+NEW_ISSUES_TTL_SECONDS_DEFAULT = 60 * 60 * 24 * 7
+
+
+@dataclass(frozen=True)
+class NewIssuesDigest:
+    since: datetime | None
+    computed_at: datetime
+    node_ids: list[str]
+    similarity_scores: list[float]
+    final_scores: list[float]
+
+
+def _digest_key(user_id: UUID) -> str:
+    return f"{NEW_ISSUES_PREFIX}{user_id}"
+
+
+def _serialize_digest(digest: NewIssuesDigest) -> str:
+    return json.dumps(
+        {
+            "since": digest.since.isoformat() if digest.since else None,
+            "computed_at": digest.computed_at.isoformat(),
+            "ids": digest.node_ids,
+            "similarity": digest.similarity_scores,
+            "final": digest.final_scores,
+        },
+        separators=(",", ":"),
+    )
+
+
+def _deserialize_digest(data: str) -> NewIssuesDigest:
+    parsed = json.loads(data)
+    return NewIssuesDigest(
+        since=datetime.fromisoformat(parsed["since"]) if parsed["since"] else None,
+        computed_at=datetime.fromisoformat(parsed["computed_at"]),
+        node_ids=parsed["ids"],
+        similarity_scores=parsed["similarity"],
+        final_scores=parsed["final"],
+    )
+
+
+async def get_new_issues_digest(user_id: UUID) -> NewIssuesDigest | None:
+    """Returns None if no digest was computed, it expired, or Redis is unavailable."""
+    redis = await get_redis()
+    if redis is None:
+        return None
+
+    try:
+        cached = await redis.get(_digest_key(user_id))
+        if cached:
+            return _deserialize_digest(cached)
+        return None
+    except Exception as e:
+        logger.warning(f"New issues digest read error: {e}")
+        return None
+
+
+async def store_new_issues_digests(
+    digests: dict[UUID, NewIssuesDigest],
+    ttl_seconds: int = NEW_ISSUES_TTL_SECONDS_DEFAULT,
+) -> int:
+    """
+    Writes a batch of digests in one pipeline. Returns how many were stored;
+    0 if Redis is unavailable or the write failed.
+    """
+    redis = await get_redis()
+    if redis is None or not digests:
+        return 0
+
+    try:
+        pipe = redis.pipeline()
+        for user_id, digest in digests.items():
+            pipe.setex(_digest_key(user_id), ttl_seconds, _serialize_digest(digest))
+        await pipe.execute()
+        return len(digests)
+    except Exception as e:
+        logger.warning(f"New issues digest write failed: {e}")
+        return 0
+
+
+__all__ = [
+    "NEW_ISSUES_PREFIX",
+    "NEW_ISSUES_TTL_SECONDS_DEFAULT",
+    "NewIssuesDigest",
+    "get_new_issues_digest",
+    "store_new_issues_digests",
+    "_deserialize_digest",
+    "_serialize_digest",
+]
@@ -139,8 +139,12 @@ async def finalize_profile_recalculation(
     profile: Any,
     *,
     calculate_combined_vector_fn: Callable[..., Awaitable[list[float] | None]] | None = None,
+    materialize_feed_fn: Callable[[Any], Awaitable[Any]] | None = None,
 ) -> list[float] | None:
-    """Recomputes combined vector from current profile vectors and clears recalculation state."""
+    """
+    Recomputes combined vector from current profile vectors and clears recalculation state.
+    materialize_feed_fn, when given, re-ranks the user's precomputed feed for the new vector.
+    """
     calculator = calculate_combined_vector_fn or calculate_combined_vector
     combined = await calculator(
         intent_vector=profile.intent_vector,
@@ -149,6 +153,9 @@ async def finalize_profile_recalculation(
     )
     profile.combined_vector = combined
     profile.is_calculating = False
+
+    if combined is not None and materialize_feed_fn is not None:
+        await materialize_feed_fn(profile)
     return combined
 
 
@@ -62,6 +62,12 @@ async def _run_intent_mutation_with_recalculation(
     reembed_input = mutate_profile()
     await db.commit()
 
+    async def materialize_feed(updated_profile: UserProfile) -> None:
+        # Local import: feed_service reaches this module through the profile service facade
+        from gim_backend.services.feed_service import refresh_user_feed_materialization
+
+        await refresh_user_feed_materialization(db, user_id, updated_profile)
+
     try:
         if reembed_input is not None:
             stack_areas, text = reembed_input
@@ -73,6 +79,7 @@ async def _run_intent_mutation_with_recalculation(
             await finalize_profile_recalculation(
                 profile,
                 calculate_combined_vector_fn=calculate_combined_vector_fn,
+                materialize_feed_fn=materialize_feed,
             )
 
             if intent_vector is not None:
@@ -85,6 +92,7 @@ async def _run_intent_mutation_with_recalculation(
         await finalize_profile_recalculation(
             profile,
             calculate_combined_vector_fn=calculate_combined_vector_fn,
+            materialize_feed_fn=materialize_feed,
         )
     finally:
         if profile.is_calculating:
@@ -0,0 +1,160 @@
+"""
+Micro-batcher for query embeddings.
+Concurrent embed calls are held for a short window (or until the batch is full)
+and encoded in one forward pass. A bounded LRU answers repeated queries, and
+identical in-flight queries share one future.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+
+def normalize_query_text(text: str) -> str:
+    """Collapse whitespace so trivially different spellings share a cache entry."""
+    return " ".join(text.split())
+
+
+@dataclass
+class QueryBatcherStats:
+    requests: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0
+    batches: int = 0
+    encoded: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "encoded": self.encoded,
+            "avg_batch_size": round(self.encoded / self.batches, 2) if self.batches else 0.0,
+        }
+
+
+class QueryEmbeddingBatcher:
+    """
+    Batches concurrent single-query embeds into one embed_fn call.
+    Not thread-safe; all callers must share one event loop.
+    """
+
+    def __init__(
+        self,
+        embed_fn: EmbedFn,
+        max_batch_size: int = 25,
+        window_ms: float = 5.0,
+        cache_size: int = 1024,
+    ):
+        self._embed_fn = embed_fn
+        self._max_batch_size = max(1, max_batch_size)
+        self._window_s = max(0.0, window_ms) / 1000
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Future[list[float]]] = {}
+        self._pending: list[str] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.stats = QueryBatcherStats()
+
+    async def embed(self, text: str) -> list[float]:
+        key = normalize_query_text(text)
+        self.stats.requests += 1
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.stats.cache_hits += 1
+            return cached
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats.coalesced += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._in_flight[key] = future
+            self._pending.append(key)
+            self._schedule_flush()
+
+        # Shield so one cancelled caller does not cancel the shared result
+        return await asyncio.shield(future)
+
+    def _schedule_flush(self) -> None:
+        if len(self._pending) >= self._max_batch_size:
+            self._cancel_timer()
+            self._start_flush()
+        elif self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self._window_s, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._flush_handle = None
+        if self._pending:
+            self._start_flush()
+
+    def _cancel_timer(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    def _start_flush(self) -> None:
+        batch = self._pending[: self._max_batch_size]
+        self._pending = self._pending[self._max_batch_size :]
+        task = asyncio.get_running_loop().create_task(self._flush(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        if self._pending:
+            self._schedule_flush()
+
+    async def _flush(self, batch: list[str]) -> None:
+        self.stats.batches += 1
+        self.stats.encoded += len(batch)
+        try:
+            vectors = await self._embed_fn(batch)
+            if len(vectors) != len(batch):
+                raise ValueError(f"Embedding count mismatch: got {len(vectors)}, expected {len(batch)}")
+        except Exception as e:
+            for key in batch:
+                future = self._in_flight.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, vector in zip(batch, vectors):
+            self._remember(key, vector)
+            future = self._in_flight.pop(key)
+            if not future.done():
+                future.set_result(vector)
+
+    def _remember(self, key: str, vector: list[float]) -> None:
+        if self._cache_size <= 0:
+            return
+        self._cache[key] = vector
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def close(self) -> None:
+        self._cancel_timer()
+        for task in self._tasks:
+            task.cancel()
+        for future in self._in_flight.values():
+            if not future.done():
+                future.cancel()
+        self._in_flight.clear()
+        self._pending.clear()
+        self._cache.clear()
+
+
+__all__ = [
+    "QueryEmbeddingBatcher",
+    "QueryBatcherStats",
+    "normalize_query_text",
+]
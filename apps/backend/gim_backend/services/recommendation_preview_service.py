@@ -3,6 +3,7 @@ Recommendation preview service for onboarding flow.
 """
 from uuid import UUID
 
+from gim_database.vector import vector_param
 from pydantic import BaseModel
 from sqlalchemy import text
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -67,13 +68,13 @@ async def _query_by_vector_similarity(
     FROM ingestion.issue i
     JOIN ingestion.repository r ON i.repo_id = r.node_id
     WHERE i.embedding IS NOT NULL AND i.state = 'open'
-    ORDER BY i.embedding <=> CAST(:source_vec AS vector)
+    ORDER BY i.embedding <=> CAST(:source_vec AS halfvec)
     LIMIT :limit
     """
 
     result = await db.execute(
         text(sql),
-        {"source_vec": str(source_vector), "limit": PREVIEW_LIMIT},
+        {"source_vec": vector_param(source_vector), "limit": PREVIEW_LIMIT},
     )
     rows = result.fetchall()
 
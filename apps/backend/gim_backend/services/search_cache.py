@@ -1,30 +1,147 @@
 """
 Redis-based caching for search results, skipped if unavailable.
-Time to Live: 5 min
+Time to Live: 5 min fresh, then served stale for up to 10 min while one
+request refreshes the entry in the background.
+Concurrent misses for the same key share one computation per process.
+Hit/miss counters are logged as structured fields every STATS_LOG_INTERVAL
+lookups.
+Keys include the index generation, so a bump by the ingestion jobs
+invalidates every entry at once and the old keys expire on their own.
+
+Entries store the response JSON exactly as the API returns it behind a
+one-line header (schema version, codec, soft TTL, logged fields), so a hit
+is served as raw bytes without parsing or model validation.
 """
 
+import asyncio
+import base64
 import json
 import logging
+import random
+import time
+import zlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from typing import Any
 from uuid import UUID
 
+from gim_backend.core.config import get_settings
 from gim_backend.core.redis import get_redis
+from gim_backend.services.index_generation import (
+    bump_index_generation,
+    get_index_generation,
+    reset_index_generation_for_testing,
+)
 from gim_backend.services.search_service import (
     SearchRequest,
     SearchResponse,
 )
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
 CACHE_TTL_SECONDS = 300
+# Redis expiry; entries past CACHE_TTL_SECONDS but inside this window are served stale
+CACHE_HARD_TTL_SECONDS = 600
+# +/- fraction applied to both TTLs so entries written together do not expire together
+CACHE_TTL_JITTER = 0.1
+REFRESH_LOCK_TTL_SECONDS = 30
+# Counters are logged (structured) once per this many lookups
+STATS_LOG_INTERVAL = 1000
 CACHE_PREFIX = "search:"
 CONTEXT_PREFIX = "searchctx:"
-SEARCH_CACHE_SCHEMA_VERSION = 2
-
-
-def _serialize_response(response: SearchResponse) -> str:
+REFRESH_LOCK_PREFIX = "searchlock:"
+SEARCH_CACHE_SCHEMA_VERSION = 3
+# Schema 2 entries (bare JSON documents) are still readable
+LEGACY_SCHEMA_VERSION = 2
+_ENTRY_PREFIX = f"v{SEARCH_CACHE_SCHEMA_VERSION}|"
+
+CODEC_NONE = "none"
+CODEC_ZLIB = "zlib"
+CODEC_ZSTD = "zstd"
+
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
+CACHE_STALE = "stale"
+CACHE_COALESCED = "coalesced"
+
+ComputeSearchFn = Callable[[], Awaitable[SearchResponse]]
+
+
+@dataclass(frozen=True)
+class CachedSearchBody:
+    """A search response as API-ready JSON bytes plus the fields the route logs."""
+
+    body: bytes
+    search_id: UUID
+    total: int
+    result_count: int
+    # Set when computed in this process, so misses skip re-validating the body
+    response: SearchResponse | None = None
+
+    @classmethod
+    def from_response(cls, response: SearchResponse) -> "CachedSearchBody":
+        return cls(
+            body=response.model_dump_json().encode(),
+            search_id=response.search_id,
+            total=response.total,
+            result_count=len(response.results),
+            response=response,
+        )
+
+    def to_response(self) -> SearchResponse:
+        if self.response is not None:
+            return self.response
+        return SearchResponse.model_validate_json(self.body)
+
+
+@dataclass
+class SearchCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    coalesced: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses + self.stale + self.coalesced
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
+
+
+_stats = SearchCacheStats()
+# Lookup count at the last stats log line
+_stats_logged_at = 0
+# Per-process single flight: cache key -> computation shared by concurrent misses
+_inflight: dict[str, asyncio.Future] = {}
+_refreshing: set[str] = set()
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _jittered(seconds: float) -> float:
+    return seconds * random.uniform(1 - CACHE_TTL_JITTER, 1 + CACHE_TTL_JITTER)
+
+
+def _serialize_response(response: SearchResponse, fresh_until: float | None = None) -> str:
+    """Schema 2 JSON document, the format written before header-prefixed entries."""
     data = response.model_dump(mode="json")
-    data["_cache_schema_version"] = SEARCH_CACHE_SCHEMA_VERSION
+    data["_cache_schema_version"] = LEGACY_SCHEMA_VERSION
+    if fresh_until is not None:
+        data["_fresh_until"] = fresh_until
     return json.dumps(data)
 
 
@@ -54,9 +171,72 @@ def _normalize_cached_response_payload(parsed: Any) -> dict[str, Any]:
 
 
 def _deserialize_response(data: str) -> SearchResponse:
+    return _deserialize_entry(data)[0]
+
+
+def _deserialize_entry(data: str) -> tuple[SearchResponse, float | None]:
+    """Response plus its soft-expiry timestamp (None for entries written without one)."""
     parsed = json.loads(data)
     normalized = _normalize_cached_response_payload(parsed)
-    return SearchResponse.model_validate(normalized)
+    fresh_until = normalized.pop("_fresh_until", None)
+    return SearchResponse.model_validate(normalized), fresh_until
+
+
+def _compression_codec() -> str:
+    codec = get_settings().search_cache_compression
+    if codec not in (CODEC_NONE, CODEC_ZLIB, CODEC_ZSTD):
+        raise ValueError(f"Unknown search cache compression: {codec}")
+    if codec == CODEC_ZSTD and zstandard is None:
+        logger.warning("zstandard not installed; caching search responses uncompressed")
+        return CODEC_NONE
+    return codec
+
+
+def _compress(body: bytes, codec: str) -> str:
+    """Redis payload text; the shared client decodes responses, so binary codecs are base64-encoded."""
+    if codec == CODEC_NONE:
+        return body.decode()
+    if codec == CODEC_ZLIB:
+        compressed = zlib.compress(body)
+    else:
+        compressed = zstandard.ZstdCompressor().compress(body)
+    return base64.b64encode(compressed).decode("ascii")
+
+
+def _decompress(payload: str, codec: str) -> bytes:
+    if codec == CODEC_NONE:
+        return payload.encode()
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(base64.b64decode(payload))
+    if codec == CODEC_ZSTD and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(base64.b64decode(payload))
+    raise ValueError(f"Cannot decode search cache codec: {codec}")
+
+
+def _encode_entry(entry: CachedSearchBody, fresh_until: float, codec: str = CODEC_NONE) -> str:
+    header = f"{_ENTRY_PREFIX}{codec}|{fresh_until:.3f}|{entry.total}|{entry.result_count}|{entry.search_id}"
+    return f"{header}\n{_compress(entry.body, codec)}"
+
+
+def _decode_entry(data: str) -> tuple[CachedSearchBody, float | None]:
+    """Body plus its soft-expiry timestamp; only the header is parsed for current entries."""
+    if not data.startswith(_ENTRY_PREFIX):
+        response, fresh_until = _deserialize_entry(data)
+        return CachedSearchBody.from_response(response), fresh_until
+
+    header, _, payload = data.partition("\n")
+    _, codec, fresh_until, total, result_count, search_id = header.split("|")
+    entry = CachedSearchBody(
+        body=_decompress(payload, codec),
+        search_id=UUID(search_id),
+        total=int(total),
+        result_count=int(result_count),
+    )
+    return entry, float(fresh_until)
+
+
+def _response_key(request: SearchRequest, generation: int) -> str:
+    return f"{CACHE_PREFIX}g{generation}:{request.cache_key()}"
 
 
 def _context_key(search_id: UUID) -> str:
@@ -127,13 +307,13 @@ async def get_cached_search(request: SearchRequest) -> SearchResponse | None:
     if redis is None:
         return None
 
-    cache_key = f"{CACHE_PREFIX}{request.cache_key()}"
+    cache_key = _response_key(request, await get_index_generation(redis))
 
     try:
         cached = await redis.get(cache_key)
         if cached:
             logger.debug(f"Cache hit: {cache_key}")
-            return _deserialize_response(cached)
+            return _decode_entry(cached)[0].to_response()
         logger.debug(f"Cache miss: {cache_key}")
         return None
     except Exception as e:
@@ -141,69 +321,231 @@ async def get_cached_search(request: SearchRequest) -> SearchResponse | None:
         return None
 
 
+async def _store_response(redis, cache_key: str, entry: CachedSearchBody) -> None:
+    """Writes an entry fresh for ~CACHE_TTL_SECONDS that Redis keeps for ~CACHE_HARD_TTL_SECONDS."""
+    fresh_until = time.time() + _jittered(CACHE_TTL_SECONDS)
+    try:
+        serialized = _encode_entry(entry, fresh_until, _compression_codec())
+        await redis.setex(cache_key, int(_jittered(CACHE_HARD_TTL_SECONDS)), serialized)
+        logger.debug(f"Cached search: {cache_key}")
+    except Exception as e:
+        logger.warning(f"Cache write error: {e}")
+
+
 async def cache_search_response(
     request: SearchRequest,
     response: SearchResponse,
 ) -> None:
     """
-    Cache search response with 5-minute TTL.
+    Cache search response with 5-minute soft TTL.
     Silently fails if Redis unavailable.
     """
     redis = await get_redis()
     if redis is None:
         return
 
-    cache_key = f"{CACHE_PREFIX}{request.cache_key()}"
+    cache_key = _response_key(request, await get_index_generation(redis))
+    await _store_response(redis, cache_key, CachedSearchBody.from_response(response))
+
 
+async def _read_entry(redis, cache_key: str) -> tuple[CachedSearchBody, float | None] | None:
     try:
-        serialized = _serialize_response(response)
-        await redis.setex(cache_key, CACHE_TTL_SECONDS, serialized)
-        logger.debug(f"Cached search: {cache_key}")
+        cached = await redis.get(cache_key)
+        if cached:
+            return _decode_entry(cached)
+        return None
     except Exception as e:
-        logger.warning(f"Cache write error: {e}")
+        logger.warning(f"Cache read error: {e}")
+        return None
 
 
-async def invalidate_search_cache(pattern: str = "*") -> int:
+async def _refresh_in_background(redis, cache_key: str, refresh: ComputeSearchFn) -> None:
     """
-    Invalidate cached search results matching pattern.
-    Uses Redis pipeline to batch deletions in a single network round trip.
-    Returns count of deleted keys.
+    Starts at most one refresh per key: _refreshing guards this process and a
+    short-lived Redis lock guards the other instances.
     """
-    redis = await get_redis()
-    if redis is None:
-        return 0
+    if cache_key in _refreshing:
+        return
+    lock_key = f"{REFRESH_LOCK_PREFIX}{cache_key}"
+    try:
+        acquired = await redis.set(lock_key, "1", nx=True, ex=REFRESH_LOCK_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Cache refresh lock error: {e}")
+        return
+    if not acquired:
+        return
 
+    _refreshing.add(cache_key)
+
+    async def _refresh() -> None:
+        try:
+            entry = CachedSearchBody.from_response(await refresh())
+            await _store_response(redis, cache_key, entry)
+            _stats.refreshes += 1
+        except Exception as e:
+            _stats.refresh_errors += 1
+            logger.warning(f"Background search refresh failed for {cache_key}: {e}")
+        finally:
+            _refreshing.discard(cache_key)
+            try:
+                await redis.delete(lock_key)
+            except Exception:
+                pass
+
+    task = asyncio.create_task(_refresh())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _compute_single_flight(redis, cache_key: str, compute: ComputeSearchFn) -> tuple[CachedSearchBody, str]:
+    """Runs compute once per key in this process; concurrent callers await the same result."""
+    inflight = _inflight.get(cache_key)
+    if inflight is not None:
+        _stats.coalesced += 1
+        try:
+            return await asyncio.shield(inflight), CACHE_COALESCED
+        except asyncio.CancelledError:
+            if not inflight.cancelled():
+                raise
+            # The computing request was cancelled (client went away); take over
+            return await _compute_single_flight(redis, cache_key, compute)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[cache_key] = future
+    _stats.misses += 1
     try:
-        full_pattern = f"{CACHE_PREFIX}{pattern}"
+        entry = CachedSearchBody.from_response(await compute())
+        if redis is not None:
+            await _store_response(redis, cache_key, entry)
+        future.set_result(entry)
+        return entry, CACHE_MISS
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Waiters re-raise it; mark retrieved so a future nobody awaited does not log
+        future.exception()
+        raise
+    finally:
+        _inflight.pop(cache_key, None)
 
-        # Collect all matching keys
-        keys = [key async for key in redis.scan_iter(full_pattern)]
 
-        if not keys:
-            return 0
+async def get_or_compute_search_body(
+    request: SearchRequest,
+    compute: ComputeSearchFn,
+    refresh: ComputeSearchFn | None = None,
+) -> tuple[CachedSearchBody, str]:
+    """
+    Cached search response body with stampede protection. Returns (entry, status)
+    where status is one of hit, stale, miss, coalesced. Hits are never parsed.
 
-        # Use pipeline to delete all keys
-        async with redis.pipeline(transaction=True) as pipe:
-            for key in keys:
-                pipe.delete(key)
-            await pipe.execute()
+    compute runs in the caller's request on a miss. refresh, if given, runs in a
+    background task after a stale hit, so it must not use request-scoped resources
+    such as the request's DB session; without it stale entries are recomputed inline.
+    """
+    try:
+        return await _lookup_search_body(request, compute, refresh)
+    finally:
+        _log_stats_if_due()
 
-        logger.debug(f"Invalidated {len(keys)} cache keys matching {full_pattern}")
-        return len(keys)
-    except Exception as e:
-        logger.warning(f"Cache invalidation error: {e}")
-        return 0
+
+async def _lookup_search_body(
+    request: SearchRequest,
+    compute: ComputeSearchFn,
+    refresh: ComputeSearchFn | None,
+) -> tuple[CachedSearchBody, str]:
+    redis = await get_redis()
+    generation = await get_index_generation(redis) if redis is not None else 0
+    cache_key = _response_key(request, generation)
+
+    if redis is not None:
+        cached = await _read_entry(redis, cache_key)
+        if cached is not None:
+            entry, fresh_until = cached
+            if fresh_until is None or time.time() < fresh_until:
+                _stats.hits += 1
+                return entry, CACHE_HIT
+            if refresh is not None:
+                _stats.stale += 1
+                await _refresh_in_background(redis, cache_key, refresh)
+                return entry, CACHE_STALE
+
+    return await _compute_single_flight(redis, cache_key, compute)
+
+
+def _log_stats_if_due() -> None:
+    global _stats_logged_at
+    lookups = _stats.lookups
+    if lookups - _stats_logged_at < STATS_LOG_INTERVAL:
+        return
+    _stats_logged_at = lookups
+    stats = _stats.as_dict()
+    hit_rate = (stats["hits"] + stats["stale"] + stats["coalesced"]) / lookups
+    logger.info(
+        f"Search cache stats after {lookups} lookups: hit rate {hit_rate:.1%}",
+        extra={**stats, "lookups": lookups, "hit_rate": round(hit_rate, 4)},
+    )
+
+
+async def get_or_compute_search(
+    request: SearchRequest,
+    compute: ComputeSearchFn,
+    refresh: ComputeSearchFn | None = None,
+) -> tuple[SearchResponse, str]:
+    """get_or_compute_search_body for callers that need the model; cached hits are validated."""
+    entry, status = await get_or_compute_search_body(request, compute, refresh)
+    return entry.to_response(), status
+
+
+def get_search_cache_stats() -> dict:
+    """hit/miss/stale/coalesced counters for this process."""
+    return _stats.as_dict()
+
+
+def reset_search_cache_for_testing() -> None:
+    global _stats, _stats_logged_at
+    _stats = SearchCacheStats()
+    _stats_logged_at = 0
+    _inflight.clear()
+    _refreshing.clear()
+    reset_index_generation_for_testing()
+
+
+async def invalidate_search_cache(reason: str = "manual") -> int:
+    """
+    Invalidate every cached search result by bumping the index generation.
+    O(1) regardless of cache size; superseded entries expire via their TTL.
+    Returns the new generation, or 0 if Redis is unavailable.
+    """
+    return await bump_index_generation(reason) or 0
 
 
 __all__ = [
     "CACHE_TTL_SECONDS",
+    "CACHE_HARD_TTL_SECONDS",
     "CACHE_PREFIX",
     "CONTEXT_PREFIX",
+    "CACHE_HIT",
+    "CACHE_MISS",
+    "CACHE_STALE",
+    "CACHE_COALESCED",
+    "CODEC_NONE",
+    "CODEC_ZLIB",
+    "CODEC_ZSTD",
+    "CachedSearchBody",
+    "SearchCacheStats",
     "get_cached_search",
+    "get_or_compute_search",
+    "get_or_compute_search_body",
+    "get_search_cache_stats",
+    "reset_search_cache_for_testing",
     "cache_search_response",
     "cache_search_context",
     "get_cached_search_context",
     "invalidate_search_cache",
+    "_decode_entry",
+    "_encode_entry",
     "_serialize_response",
     "_deserialize_response",
     "_normalize_cached_response_payload",
@@ -1,14 +1,20 @@
 """Search orchestration and stage execution helpers."""
 
+import asyncio
 import logging
 from collections.abc import Awaitable, Callable
+from typing import Any
 from uuid import UUID, uuid4
 
+from gim_database.session import async_session_factory
+from gim_database.vector import vector_param
 from sqlalchemy import text
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from gim_backend.core.config import get_settings
 from gim_backend.services.embedding_service import assert_vector_dim, embed_query
+from gim_backend.services.search_filter_planning import _choose_filter_strategy
+from gim_backend.services.search_fusion import PARALLEL_EXECUTION, SQL_EXECUTION, _fuse_candidate_lists
 from gim_backend.services.search_models import (
     SearchFilters,
     SearchRequest,
@@ -16,8 +22,20 @@ from gim_backend.services.search_models import (
     SearchResultItem,
     Stage1Result,
 )
-from gim_backend.services.search_schema_probe import _issue_has_github_url_column
-from gim_backend.services.search_sql import CANDIDATE_LIMIT, _build_stage1_sql
+from gim_backend.services.search_schema_probe import (
+    _issue_has_github_url_column,
+    _pgvector_supports_iterative_scan,
+)
+from gim_backend.services.search_sql import (
+    BM25_PATH,
+    CANDIDATE_LIMIT,
+    PRE_FILTER,
+    VECTOR_PATH,
+    _build_candidate_list_sql,
+    _build_stage1_sql,
+)
+from gim_backend.services.search_stage1_cache import cache_stage1_result, get_cached_stage1
+from gim_backend.services.vector_retrieval import prepare_vector_scan, retrieval_params
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +43,14 @@ AsyncEmbedQueryFn = Callable[[str], Awaitable[list[float] | None]]
 AssertVectorDimFn = Callable[..., None]
 Stage1ExecutorFn = Callable[..., Awaitable[Stage1Result]]
 Stage2ExecutorFn = Callable[..., Awaitable[list[SearchResultItem]]]
-Stage1SqlBuilderFn = Callable[[SearchFilters, bool], str]
+Stage1SqlBuilderFn = Callable[..., str]
 SettingsGetterFn = Callable[[], object]
 SchemaProbeFn = Callable[[AsyncSession], Awaitable[bool]]
+FilterStrategyFn = Callable[..., Awaitable[str]]
 SearchIdFactory = Callable[[], UUID]
+Stage1CacheGetFn = Callable[[SearchRequest], Awaitable[Stage1Result | None]]
+Stage1CacheSetFn = Callable[[SearchRequest, Stage1Result], Awaitable[None]]
+SessionFactoryFn = Callable[[], Any]
 
 
 async def hybrid_search(
@@ -40,11 +62,13 @@ async def hybrid_search(
     execute_stage1_fn: Stage1ExecutorFn | None = None,
     execute_stage2_fn: Stage2ExecutorFn | None = None,
     search_id_factory: SearchIdFactory | None = None,
+    get_cached_stage1_fn: Stage1CacheGetFn | None = None,
+    cache_stage1_fn: Stage1CacheSetFn | None = None,
 ) -> SearchResponse:
     """
     Executes two-stage hybrid search using RRF to combine vector and BM25 results.
 
-    1: Get ordered candidate IDs and total count
+    1: Get ordered candidate IDs and total count (cached across pages)
     2: Hydrate current page with full metadata
 
     Args:
@@ -59,6 +83,8 @@ async def hybrid_search(
     stage1_executor = _execute_stage1 if execute_stage1_fn is None else execute_stage1_fn
     stage2_executor = _execute_stage2 if execute_stage2_fn is None else execute_stage2_fn
     new_search_id = uuid4 if search_id_factory is None else search_id_factory
+    get_cached_stage1_impl = get_cached_stage1 if get_cached_stage1_fn is None else get_cached_stage1_fn
+    cache_stage1_impl = cache_stage1_result if cache_stage1_fn is None else cache_stage1_fn
 
     search_id = new_search_id()
 
@@ -71,26 +97,17 @@ async def hybrid_search(
         f"filters={request.filters}, page={request.page}"
     )
 
-    query_embedding = await embed_query_impl(request.query)
-    use_vector_path = query_embedding is not None
-
-    if not use_vector_path:
-        logger.warning(f"Embedding failed for search_id={search_id}; using BM25-only")
-    else:
-        try:
-            assert_vector_dim_impl(query_embedding, context="search query")
-        except ValueError as e:
-            logger.warning("%s; using BM25-only", e)
-            query_embedding = None
-            use_vector_path = False
-
-    stage1_result = await stage1_executor(
-        db=db,
-        query_text=request.query,
-        query_embedding=query_embedding,
-        filters=request.filters,
-        use_vector_path=use_vector_path,
-    )
+    stage1_result = await get_cached_stage1_impl(request)
+    if stage1_result is None:
+        stage1_result = await _run_stage1(
+            db,
+            request,
+            search_id,
+            embed_query_impl=embed_query_impl,
+            assert_vector_dim_impl=assert_vector_dim_impl,
+            stage1_executor=stage1_executor,
+            cache_stage1_impl=cache_stage1_impl,
+        )
 
     if stage1_result.total == 0:
         logger.info(f"Search completed: search_id={search_id}, results=0, total=0")
@@ -157,6 +174,43 @@ async def hybrid_search(
     )
 
 
+async def _run_stage1(
+    db: AsyncSession,
+    request: SearchRequest,
+    search_id: UUID,
+    *,
+    embed_query_impl: AsyncEmbedQueryFn,
+    assert_vector_dim_impl: AssertVectorDimFn,
+    stage1_executor: Stage1ExecutorFn,
+    cache_stage1_impl: Stage1CacheSetFn,
+) -> Stage1Result:
+    """Embeds the query and runs Stage 1; caches only full hybrid (not BM25-fallback) results."""
+    query_embedding = await embed_query_impl(request.query)
+    use_vector_path = query_embedding is not None
+
+    if not use_vector_path:
+        logger.warning(f"Embedding failed for search_id={search_id}; using BM25-only")
+    else:
+        try:
+            assert_vector_dim_impl(query_embedding, context="search query")
+        except ValueError as e:
+            logger.warning("%s; using BM25-only", e)
+            query_embedding = None
+            use_vector_path = False
+
+    stage1_result = await stage1_executor(
+        db=db,
+        query_text=request.query,
+        query_embedding=query_embedding,
+        filters=request.filters,
+        use_vector_path=use_vector_path,
+    )
+
+    if use_vector_path:
+        await cache_stage1_impl(request, stage1_result)
+    return stage1_result
+
+
 async def _execute_stage1(
     db: AsyncSession,
     query_text: str,
@@ -167,19 +221,44 @@ async def _execute_stage1(
     build_stage1_sql_fn: Stage1SqlBuilderFn | None = None,
     get_settings_fn: SettingsGetterFn | None = None,
     assert_vector_dim_fn: AssertVectorDimFn | None = None,
+    choose_filter_strategy_fn: FilterStrategyFn | None = None,
+    iterative_scan_probe_fn: SchemaProbeFn | None = None,
+    session_factory_fn: SessionFactoryFn | None = None,
 ) -> Stage1Result:
     """
     Stage 1: Fetch candidate IDs from vector and BM25 paths without filters,
     perform RRF fusion, apply filters post-fusion, return ordered IDs with COUNT.
 
     Filters are applied AFTER RRF fusion to prevent recall gaps.
+    With search_stage1_execution=parallel the two paths run as concurrent
+    queries and are fused in process (_execute_stage1_parallel).
     """
     build_sql = _build_stage1_sql if build_stage1_sql_fn is None else build_stage1_sql_fn
     settings_getter = get_settings if get_settings_fn is None else get_settings_fn
     assert_vector_dim_impl = assert_vector_dim if assert_vector_dim_fn is None else assert_vector_dim_fn
+    choose_filter_strategy = _choose_filter_strategy if choose_filter_strategy_fn is None else choose_filter_strategy_fn
+    iterative_scan_probe = (
+        _pgvector_supports_iterative_scan if iterative_scan_probe_fn is None else iterative_scan_probe_fn
+    )
 
-    sql = build_sql(filters, use_vector_path)
     settings = settings_getter()
+    execution = settings.search_stage1_execution
+    if execution not in (SQL_EXECUTION, PARALLEL_EXECUTION):
+        raise ValueError(f"Unknown search Stage 1 execution: {execution}")
+    retrieval_mode = settings.search_vector_retrieval
+    filter_strategy = await choose_filter_strategy(
+        db,
+        filters,
+        settings.search_filter_strategy,
+        settings.search_prefilter_selectivity,
+    )
+    # A filtered HNSW scan without iterative scans stops after ef_search rows,
+    # so pre-filtered vector candidates fall back to exact distance ranking
+    iterative_scan = False
+    vector_index_scan = True
+    if use_vector_path and filter_strategy == PRE_FILTER:
+        iterative_scan = await iterative_scan_probe(db)
+        vector_index_scan = iterative_scan
 
     params = {
         "query_text": query_text,
@@ -196,7 +275,38 @@ async def _execute_stage1(
 
     if use_vector_path and query_embedding:
         assert_vector_dim_impl(query_embedding, context="stage1 query vector")
-        params["query_vec"] = str(query_embedding)
+        params["query_vec"] = vector_param(query_embedding)
+        params.update(retrieval_params(retrieval_mode, settings.vector_rerank_factor))
+
+    if execution == PARALLEL_EXECUTION:
+        return await _execute_stage1_parallel(
+            db,
+            filters,
+            params,
+            use_vector_path=use_vector_path,
+            retrieval_mode=retrieval_mode,
+            filter_strategy=filter_strategy,
+            vector_index_scan=vector_index_scan,
+            iterative_scan=iterative_scan,
+            rerank_factor=settings.vector_rerank_factor,
+            session_factory=async_session_factory if session_factory_fn is None else session_factory_fn,
+        )
+
+    sql = build_sql(
+        filters,
+        use_vector_path,
+        retrieval_mode,
+        filter_strategy=filter_strategy,
+        vector_index_scan=vector_index_scan,
+    )
+    if use_vector_path and query_embedding:
+        await prepare_vector_scan(
+            db,
+            retrieval_mode,
+            CANDIDATE_LIMIT,
+            settings.vector_rerank_factor,
+            iterative_scan=iterative_scan,
+        )
 
     result = await db.exec(text(sql), params=params)
     rows = result.all()
@@ -219,6 +329,64 @@ async def _execute_stage1(
     return Stage1Result(node_ids=node_ids, rrf_scores=rrf_scores, total=total, is_capped=is_capped)
 
 
+async def _execute_stage1_parallel(
+    db: AsyncSession,
+    filters: SearchFilters,
+    params: dict,
+    *,
+    use_vector_path: bool,
+    retrieval_mode: str,
+    filter_strategy: str,
+    vector_index_scan: bool,
+    iterative_scan: bool,
+    rerank_factor: int,
+    session_factory: SessionFactoryFn,
+) -> Stage1Result:
+    """
+    Runs the vector and BM25 candidate queries concurrently, BM25 on the
+    request session and vector on a second pooled session (the HNSW settings
+    are transaction-local), then fuses them with _fuse_candidate_lists.
+    Stage 1 latency is then roughly the slower scan rather than the sum.
+    """
+    bm25_sql = _build_candidate_list_sql(filters, BM25_PATH, filter_strategy=filter_strategy)
+
+    async def fetch_bm25() -> list:
+        result = await db.exec(text(bm25_sql), params=params)
+        return result.all()
+
+    async def fetch_vector() -> list:
+        if not use_vector_path:
+            return []
+        vector_sql = _build_candidate_list_sql(
+            filters,
+            VECTOR_PATH,
+            retrieval_mode,
+            filter_strategy=filter_strategy,
+            vector_index_scan=vector_index_scan,
+        )
+        async with session_factory() as session:
+            await prepare_vector_scan(
+                session,
+                retrieval_mode,
+                CANDIDATE_LIMIT,
+                rerank_factor,
+                iterative_scan=iterative_scan,
+            )
+            result = await session.exec(text(vector_sql), params=params)
+            return result.all()
+
+    vector_rows, bm25_rows = await asyncio.gather(fetch_vector(), fetch_bm25())
+
+    return _fuse_candidate_lists(
+        vector_rows,
+        bm25_rows,
+        freshness_half_life_days=params["freshness_half_life_days"],
+        freshness_floor=params["freshness_floor"],
+        freshness_weight=params["freshness_weight"],
+        candidate_limit=CANDIDATE_LIMIT,
+    )
+
+
 async def _execute_stage2(
     db: AsyncSession,
     page_ids: list[str],
@@ -280,5 +448,6 @@ async def _execute_stage2(
 __all__ = [
     "hybrid_search",
     "_execute_stage1",
+    "_execute_stage1_parallel",
     "_execute_stage2",
 ]
@@ -0,0 +1,97 @@
+"""
+Pre- vs post-filter choice for Stage 1 search filters.
+
+Post-filtering keeps recall for broad filters, but a selective filter (a small
+repo, a rare label) discards nearly all of the unfiltered candidates. The
+choice uses the Postgres planner's row estimates, so it costs one planning
+round trip and no table scan.
+"""
+
+import json
+import logging
+
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from gim_backend.services.search_models import SearchFilters
+from gim_backend.services.search_sql import POST_FILTER, PRE_FILTER, _build_prefilter_conditions
+
+logger = logging.getLogger(__name__)
+
+AUTO_FILTER_STRATEGY = "auto"
+
+
+def _has_filters(filters: SearchFilters) -> bool:
+    return bool(filters.languages or filters.labels or filters.repos)
+
+
+def _plan_rows(plan_json) -> tuple[float, float]:
+    """(open rows, filtered open rows) from the EXPLAIN of the UNION ALL probe."""
+    if isinstance(plan_json, str):
+        plan_json = json.loads(plan_json)
+    children = plan_json[0]["Plan"]["Plans"]
+    return float(children[0]["Plan Rows"]), float(children[1]["Plan Rows"])
+
+
+async def _estimate_filter_selectivity(db: AsyncSession, filters: SearchFilters) -> float:
+    """
+    Estimated fraction of open issues matching the filters. Both counts come
+    from one EXPLAIN: each UNION ALL branch is an Append child with its own
+    row estimate.
+    """
+    conditions = " AND ".join(_build_prefilter_conditions(filters))
+    sql = f"""
+    EXPLAIN (FORMAT JSON)
+    SELECT 1 FROM ingestion.issue i WHERE i.state = 'open'
+    UNION ALL
+    SELECT 1 FROM ingestion.issue i WHERE i.state = 'open' AND {conditions}
+    """
+    params = {
+        "langs": filters.languages or None,
+        "labels": filters.labels or None,
+        "repos": filters.repos or None,
+    }
+    # Savepoint so a failed EXPLAIN does not abort the search's transaction
+    async with db.begin_nested():
+        result = await db.exec(text(sql), params=params)
+    open_rows, filtered_rows = _plan_rows(result.scalar())
+    if open_rows <= 0:
+        return 1.0
+    return min(1.0, filtered_rows / open_rows)
+
+
+async def _choose_filter_strategy(
+    db: AsyncSession,
+    filters: SearchFilters,
+    strategy: str,
+    prefilter_selectivity: float,
+) -> str:
+    """
+    Resolves the configured strategy (auto | pre | post) for one request.
+    Unfiltered requests always post-filter; auto pre-filters when the
+    estimated selectivity is below prefilter_selectivity, and post-filters
+    when no estimate can be made.
+    """
+    if not _has_filters(filters):
+        return POST_FILTER
+    if strategy in (PRE_FILTER, POST_FILTER):
+        return strategy
+    if strategy != AUTO_FILTER_STRATEGY:
+        raise ValueError(f"Unknown search filter strategy: {strategy}")
+
+    try:
+        selectivity = await _estimate_filter_selectivity(db, filters)
+    except Exception as e:
+        # Unexpected plan shape (e.g. Gather over Parallel Append) or a DB error
+        logger.warning(f"Filter selectivity estimate failed, post-filtering: {e}")
+        return POST_FILTER
+    chosen = PRE_FILTER if selectivity < prefilter_selectivity else POST_FILTER
+    logger.debug(f"Filter selectivity {selectivity:.4f}; using {chosen}-filter candidates")
+    return chosen
+
+
+__all__ = [
+    "AUTO_FILTER_STRATEGY",
+    "_choose_filter_strategy",
+    "_estimate_filter_selectivity",
+]
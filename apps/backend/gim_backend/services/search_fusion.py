@@ -0,0 +1,105 @@
+"""
+In-process Stage 1 fusion for the parallel execution mode.
+
+Takes the vector and BM25 candidate lists fetched by concurrent queries
+(_build_candidate_list_sql) and reproduces the fused/filtered/ORDER BY part
+of _build_stage1_sql with NumPy:
+
+    final_score = rrf_score + freshness_weight * GREATEST(floor, 0.5 ^ (age_days / half_life))
+    ORDER BY final_score DESC, q_score DESC, node_id ASC
+
+NULL handling follows Postgres: GREATEST ignores a NULL freshness term and
+DESC puts NULL q_score first. node_id ties compare by code point, which
+matches the SQL path under the C collation.
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+from gim_backend.services.search_models import Stage1Result
+from gim_backend.services.search_sql import RRF_K
+
+# search_stage1_execution: one fused SQL statement, or concurrent per-path queries fused here
+SQL_EXECUTION = "sql"
+PARALLEL_EXECUTION = "parallel"
+
+SECONDS_PER_DAY = 86400.0
+
+
+def _fuse_candidate_lists(
+    vector_rows: Sequence[Any],
+    bm25_rows: Sequence[Any],
+    *,
+    freshness_half_life_days: float,
+    freshness_floor: float,
+    freshness_weight: float,
+    candidate_limit: int,
+) -> Stage1Result:
+    """
+    RRF-fuses two ranked candidate lists, applies the post-fusion filters and
+    returns the same Stage1Result the single-statement SQL path produces.
+
+    Rows need node_id, rank, q_score, age_seconds and passes_filter.
+    """
+    # Full outer join on node_id; vector rows win for shared metadata like COALESCE(v.*, b.*)
+    positions: dict[str, int] = {}
+    node_ids: list[str] = []
+    for row in (*vector_rows, *bm25_rows):
+        if row.node_id not in positions:
+            positions[row.node_id] = len(node_ids)
+            node_ids.append(row.node_id)
+
+    if not node_ids:
+        return Stage1Result(node_ids=[], rrf_scores={}, total=0, is_capped=False)
+
+    size = len(node_ids)
+    rrf = np.zeros(size)
+    q_score = np.full(size, np.nan)
+    age_seconds = np.full(size, np.nan)
+    passes = np.zeros(size, dtype=bool)
+    seen = np.zeros(size, dtype=bool)
+
+    for rows in (vector_rows, bm25_rows):
+        for row in rows:
+            index = positions[row.node_id]
+            rrf[index] += 1.0 / (RRF_K + row.rank)
+            if seen[index]:
+                continue
+            seen[index] = True
+            q_score[index] = np.nan if row.q_score is None else float(row.q_score)
+            age_seconds[index] = np.nan if row.age_seconds is None else float(row.age_seconds)
+            passes[index] = bool(row.passes_filter)
+
+    age_days = age_seconds / SECONDS_PER_DAY
+    with np.errstate(invalid="ignore"):
+        # fmax ignores NaN like GREATEST ignores NULL
+        freshness = np.fmax(freshness_floor, np.power(0.5, age_days / freshness_half_life_days))
+    final_score = rrf + freshness_weight * freshness
+
+    kept = np.flatnonzero(passes)
+    if kept.size == 0:
+        # The SQL path returns no rows, hence no capped flags
+        return Stage1Result(node_ids=[], rrf_scores={}, total=0, is_capped=False)
+
+    ids = np.array(node_ids)[kept]
+    q_kept = q_score[kept]
+    # lexsort: last key is primary; NULL q_score sorts first under DESC
+    order = np.lexsort((ids, np.where(np.isnan(q_kept), -np.inf, -q_kept), -final_score[kept]))
+    ordered = kept[order]
+
+    ordered_ids = [node_ids[i] for i in ordered]
+    return Stage1Result(
+        node_ids=ordered_ids,
+        rrf_scores={node_ids[i]: float(rrf[i]) for i in ordered},
+        total=len(ordered_ids),
+        is_capped=len(vector_rows) >= candidate_limit or len(bm25_rows) >= candidate_limit,
+    )
+
+
+__all__ = [
+    "SQL_EXECUTION",
+    "PARALLEL_EXECUTION",
+    "_fuse_candidate_lists",
+]
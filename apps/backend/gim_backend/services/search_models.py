@@ -63,6 +63,15 @@ class SearchRequest(BaseModel):
             key_data += f"|{self.user_id}"
         return hashlib.sha256(key_data.encode()).hexdigest()
 
+    def stage1_cache_key(self, ranking_version: str) -> str:
+        """
+        SHA256 hash identifying the Stage 1 candidate list: normalized query,
+        filters and ranking config, but not the page window.
+        """
+        normalized_query = " ".join(self.query.split())
+        key_data = f"{normalized_query}|{self.filters.to_cache_key()}|{ranking_version}"
+        return hashlib.sha256(key_data.encode()).hexdigest()
+
 
 class SearchResultItem(BaseModel):
     node_id: str
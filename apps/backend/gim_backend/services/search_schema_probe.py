@@ -3,6 +3,9 @@
 from sqlalchemy import text
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+# The pgvector version only changes with a server upgrade and restart
+_iterative_scan_supported: bool | None = None
+
 
 async def _issue_has_github_url_column(db: AsyncSession) -> bool:
     result = await db.exec(
@@ -22,4 +25,38 @@ async def _issue_has_github_url_column(db: AsyncSession) -> bool:
     return bool(row[0])
 
 
-__all__ = ["_issue_has_github_url_column"]
+async def _pgvector_supports_iterative_scan(db: AsyncSession) -> bool:
+    """hnsw.iterative_scan exists from pgvector 0.8.0. Probed once per process."""
+    global _iterative_scan_supported
+    if _iterative_scan_supported is not None:
+        return _iterative_scan_supported
+
+    result = await db.exec(
+        text(
+            """
+            SELECT COALESCE(
+                (
+                    SELECT string_to_array(split_part(extversion, '-', 1), '.')::int[] >= ARRAY[0, 8]
+                    FROM pg_extension
+                    WHERE extname = 'vector'
+                ),
+                FALSE
+            ) AS supported
+            """
+        )
+    )
+    row = result.one()
+    _iterative_scan_supported = bool(row[0])
+    return _iterative_scan_supported
+
+
+def reset_schema_probe_cache_for_testing() -> None:
+    global _iterative_scan_supported
+    _iterative_scan_supported = None
+
+
+__all__ = [
+    "_issue_has_github_url_column",
+    "_pgvector_supports_iterative_scan",
+    "reset_schema_probe_cache_for_testing",
+]
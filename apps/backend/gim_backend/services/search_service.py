@@ -16,7 +16,9 @@ from gim_backend.services.search_models import (
     SearchResultItem,
     Stage1Result,
 )
-from gim_backend.services.search_sql import CANDIDATE_LIMIT, RRF_K
+from gim_backend.services.search_sql import CANDIDATE_LIMIT, POST_FILTER, RRF_K
+from gim_backend.services.search_stage1_cache import cache_stage1_result, get_cached_stage1
+from gim_backend.services.vector_retrieval import EXACT_RETRIEVAL
 
 
 async def hybrid_search(
@@ -30,6 +32,8 @@ async def hybrid_search(
         assert_vector_dim_fn=assert_vector_dim,
         execute_stage1_fn=_execute_stage1,
         execute_stage2_fn=_execute_stage2,
+        get_cached_stage1_fn=get_cached_stage1,
+        cache_stage1_fn=cache_stage1_result,
     )
 
 
@@ -49,6 +53,7 @@ async def _execute_stage1(
         build_stage1_sql_fn=_build_stage1_sql,
         get_settings_fn=get_settings,
         assert_vector_dim_fn=assert_vector_dim,
+        iterative_scan_probe_fn=_pgvector_supports_iterative_scan,
     )
 
 
@@ -69,8 +74,24 @@ async def _issue_has_github_url_column(db: AsyncSession) -> bool:
     return await _search_schema_probe._issue_has_github_url_column(db)
 
 
-def _build_stage1_sql(filters: SearchFilters, use_vector_path: bool) -> str:
-    return _search_sql._build_stage1_sql(filters, use_vector_path)
+async def _pgvector_supports_iterative_scan(db: AsyncSession) -> bool:
+    return await _search_schema_probe._pgvector_supports_iterative_scan(db)
+
+
+def _build_stage1_sql(
+    filters: SearchFilters,
+    use_vector_path: bool,
+    retrieval_mode: str = EXACT_RETRIEVAL,
+    filter_strategy: str = POST_FILTER,
+    vector_index_scan: bool = True,
+) -> str:
+    return _search_sql._build_stage1_sql(
+        filters,
+        use_vector_path,
+        retrieval_mode,
+        filter_strategy=filter_strategy,
+        vector_index_scan=vector_index_scan,
+    )
 
 
 __all__ = [
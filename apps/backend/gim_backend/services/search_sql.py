@@ -3,12 +3,21 @@
 from textwrap import dedent, indent
 
 from gim_backend.services.search_models import SearchFilters
+from gim_backend.services.vector_retrieval import EXACT_RETRIEVAL, build_issue_candidates_sql
 
 RRF_K: int = 60
 
 # Maximum candidates from each retrieval path, increased for better recall
 CANDIDATE_LIMIT: int = 500
 
+# Where languages/labels/repos filters apply: after fusion only, or also inside the candidate CTEs
+POST_FILTER = "post"
+PRE_FILTER = "pre"
+
+# Retrieval paths fetched as separate candidate lists for in-process fusion
+VECTOR_PATH = "vector"
+BM25_PATH = "bm25"
+
 
 def _build_stage1_score_columns_sql(row_alias: str = "fused") -> str:
     """
@@ -45,34 +54,51 @@ def _build_stage1_score_columns_sql(row_alias: str = "fused") -> str:
     return indent(score_columns_sql, " " * 16)
 
 
-def _build_stage1_sql(filters: SearchFilters, use_vector_path: bool) -> str:
+def _build_prefilter_conditions(filters: SearchFilters) -> list[str]:
     """
-    Builds Stage 1 SQL: candidate retrieval without filters in CTEs,
-    RRF fusion, then post-filter application.
-
-    Key design decisions:
-        No filters in CTEs: Prevents recall gaps with selective filters
-        Post-fusion filtering: Applied in final WHERE clause
-        Tie-breaking: q_score DESC for deterministic ordering
-        COUNT(*) OVER(): Accurate total without separate query
+    Issue-level equivalents of the post-fusion filters, usable inside the
+    candidate CTEs (repo_id btree via repository lookups, labels GIN).
     """
+    conditions = []
+    if filters.languages:
+        conditions.append(
+            "i.repo_id IN (SELECT node_id FROM ingestion.repository WHERE primary_language = ANY(:langs))"
+        )
+    if filters.labels:
+        conditions.append("i.labels && :labels")
+    if filters.repos:
+        conditions.append("i.repo_id IN (SELECT node_id FROM ingestion.repository WHERE full_name = ANY(:repos))")
+    return conditions
 
-    # Post-fusion filter conditions
-    filter_conditions = []
+
+def _build_post_filter_conditions(filters: SearchFilters, row_alias: str = "fused") -> list[str]:
+    """Post-fusion filter conditions over a candidate row joined to ingestion.repository r."""
+    conditions = []
     if filters.languages:
-        filter_conditions.append("r.primary_language = ANY(:langs)")
+        conditions.append("r.primary_language = ANY(:langs)")
     if filters.labels:
-        filter_conditions.append("fused.labels && :labels")
+        conditions.append(f"{row_alias}.labels && :labels")
     if filters.repos:
-        filter_conditions.append("r.full_name = ANY(:repos)")
+        conditions.append("r.full_name = ANY(:repos)")
+    return conditions
 
-    post_filter_where = ""
-    if filter_conditions:
-        post_filter_where = "WHERE " + " AND ".join(filter_conditions)
 
-    if use_vector_path:
-        sql = f"""
-        WITH vector_results AS (
+def _candidate_filter_sql(filters: SearchFilters, filter_strategy: str) -> str:
+    if filter_strategy != PRE_FILTER:
+        return ""
+    return "".join(f" AND {c}" for c in _build_prefilter_conditions(filters))
+
+
+def _vector_candidates_sql(retrieval_mode: str, candidate_filter_sql: str, vector_index_scan: bool) -> str:
+    """Vector top-K candidates ranked by cosine distance (v_rank)."""
+    vector_candidates_sql = build_issue_candidates_sql(
+        retrieval_mode,
+        vector_param="query_vec",
+        where=f"i.embedding IS NOT NULL AND i.state = 'open'{candidate_filter_sql}",
+        limit=":candidate_limit",
+        use_index=vector_index_scan,
+    )
+    return f"""
             SELECT
                 i.node_id,
                 i.labels,
@@ -80,13 +106,13 @@ def _build_stage1_sql(filters: SearchFilters, use_vector_path: bool) -> str:
                 i.q_score,
                 i.github_created_at,
                 i.ingested_at,
-                ROW_NUMBER() OVER (ORDER BY i.embedding <=> CAST(:query_vec AS vector)) AS v_rank
-            FROM ingestion.issue i
-            WHERE i.embedding IS NOT NULL AND i.state = 'open'
-            ORDER BY i.embedding <=> CAST(:query_vec AS vector)
-            LIMIT :candidate_limit
-        ),
-        bm25_results AS (
+                ROW_NUMBER() OVER (ORDER BY i.embedding <=> CAST(:query_vec AS halfvec)) AS v_rank
+            FROM ({vector_candidates_sql}) i"""
+
+
+def _bm25_candidates_sql(candidate_filter_sql: str) -> str:
+    """BM25 top-K candidates ranked by ts_rank (b_rank); node_id breaks rank ties deterministically."""
+    return f"""
             SELECT
                 i.node_id,
                 i.labels,
@@ -95,12 +121,53 @@ def _build_stage1_sql(filters: SearchFilters, use_vector_path: bool) -> str:
                 i.github_created_at,
                 i.ingested_at,
                 ROW_NUMBER() OVER (
-                    ORDER BY ts_rank(i.search_vector, plainto_tsquery('english', :query_text)) DESC
+                    ORDER BY ts_rank(i.search_vector, plainto_tsquery('english', :query_text)) DESC, i.node_id
                 ) AS b_rank
             FROM ingestion.issue i
-            WHERE i.search_vector @@ plainto_tsquery('english', :query_text) AND i.state = 'open'
-            ORDER BY ts_rank(i.search_vector, plainto_tsquery('english', :query_text)) DESC
-            LIMIT :candidate_limit
+            WHERE i.search_vector @@ plainto_tsquery('english', :query_text) AND i.state = 'open'{candidate_filter_sql}
+            ORDER BY ts_rank(i.search_vector, plainto_tsquery('english', :query_text)) DESC, i.node_id
+            LIMIT :candidate_limit"""
+
+
+def _build_stage1_sql(
+    filters: SearchFilters,
+    use_vector_path: bool,
+    retrieval_mode: str = EXACT_RETRIEVAL,
+    filter_strategy: str = POST_FILTER,
+    vector_index_scan: bool = True,
+) -> str:
+    """
+    Builds Stage 1 SQL: candidate retrieval, RRF fusion, then post-filter
+    application. retrieval_mode selects exact or binary-quantized vector
+    candidates; filter_strategy decides whether the CTEs are filtered too.
+
+    Key design decisions:
+        POST_FILTER (default): No filters in the candidate CTEs, so the
+            candidate set and its ranks do not depend on the filters
+        PRE_FILTER: Filters also go inside both candidate CTEs, so a
+            selective filter does not discard almost every candidate
+        Post-fusion filtering: Applied in final WHERE clause under either strategy
+        Tie-breaking: q_score DESC for deterministic ordering
+        COUNT(*) OVER(): Accurate total without separate query
+
+    With PRE_FILTER, vector_index_scan=False ranks the filtered rows by exact
+    distance instead of walking the HNSW index (for pgvector without
+    iterative index scans, where a filtered HNSW scan stops after ef_search rows).
+    """
+
+    filter_conditions = _build_post_filter_conditions(filters)
+
+    post_filter_where = ""
+    if filter_conditions:
+        post_filter_where = "WHERE " + " AND ".join(filter_conditions)
+
+    candidate_filter_sql = _candidate_filter_sql(filters, filter_strategy)
+
+    if use_vector_path:
+        sql = f"""
+        WITH vector_results AS ({_vector_candidates_sql(retrieval_mode, candidate_filter_sql, vector_index_scan)}
+        ),
+        bm25_results AS ({_bm25_candidates_sql(candidate_filter_sql)}
         ),
         vector_meta AS (
             SELECT COUNT(*) AS vector_candidate_count FROM vector_results
@@ -142,21 +209,7 @@ def _build_stage1_sql(filters: SearchFilters, use_vector_path: bool) -> str:
         """
     else:
         sql = f"""
-        WITH bm25_results AS (
-            SELECT
-                i.node_id,
-                i.labels,
-                i.repo_id,
-                i.q_score,
-                i.github_created_at,
-                i.ingested_at,
-                ROW_NUMBER() OVER (
-                    ORDER BY ts_rank(i.search_vector, plainto_tsquery('english', :query_text)) DESC
-                ) AS b_rank
-            FROM ingestion.issue i
-            WHERE i.search_vector @@ plainto_tsquery('english', :query_text) AND i.state = 'open'
-            ORDER BY ts_rank(i.search_vector, plainto_tsquery('english', :query_text)) DESC
-            LIMIT :candidate_limit
+        WITH bm25_results AS ({_bm25_candidates_sql(candidate_filter_sql)}
         ),
         bm25_meta AS (
             SELECT COUNT(*) AS bm25_candidate_count FROM bm25_results
@@ -195,9 +248,56 @@ def _build_stage1_sql(filters: SearchFilters, use_vector_path: bool) -> str:
     return sql
 
 
+def _build_candidate_list_sql(
+    filters: SearchFilters,
+    path: str,
+    retrieval_mode: str = EXACT_RETRIEVAL,
+    filter_strategy: str = POST_FILTER,
+    vector_index_scan: bool = True,
+) -> str:
+    """
+    One retrieval path's ranked candidates for in-process fusion.
+
+    Uses the same candidate CTE as _build_stage1_sql and returns what the
+    fusion step needs: rank, q_score, the freshness age in seconds (against this
+    query's NOW(), so no app/DB clock skew), and whether the row passes the post-fusion filters (issues whose
+    repository row is missing never pass, as with the inner join there).
+    """
+    candidate_filter_sql = _candidate_filter_sql(filters, filter_strategy)
+    if path == VECTOR_PATH:
+        candidates_sql = _vector_candidates_sql(retrieval_mode, candidate_filter_sql, vector_index_scan)
+        rank_column = "v_rank"
+    elif path == BM25_PATH:
+        candidates_sql = _bm25_candidates_sql(candidate_filter_sql)
+        rank_column = "b_rank"
+    else:
+        raise ValueError(f"Unknown retrieval path: {path}")
+
+    passes_filter = " AND ".join(["r.node_id IS NOT NULL", *_build_post_filter_conditions(filters, "c")])
+    return f"""
+        SELECT
+            c.node_id,
+            c.{rank_column} AS rank,
+            c.q_score,
+            EXTRACT(EPOCH FROM (NOW() - GREATEST(c.ingested_at, c.github_created_at))) AS age_seconds,
+            ({passes_filter}) AS passes_filter
+        FROM ({candidates_sql}
+        ) c
+        LEFT JOIN ingestion.repository r ON c.repo_id = r.node_id
+        ORDER BY c.{rank_column}
+        """
+
+
 __all__ = [
     "RRF_K",
     "CANDIDATE_LIMIT",
+    "POST_FILTER",
+    "PRE_FILTER",
+    "VECTOR_PATH",
+    "BM25_PATH",
+    "_build_candidate_list_sql",
+    "_build_post_filter_conditions",
+    "_build_prefilter_conditions",
     "_build_stage1_sql",
     "_build_stage1_score_columns_sql",
 ]
@@ -0,0 +1,125 @@
+"""
+Redis cache of Stage 1 results, independent of the requested page.
+
+The ordered candidate ids and RRF scores are stored once per (normalized query,
+filters, ranking config), so later pages of the same search skip query
+embedding and the Stage 1 fusion SQL and only run Stage 2 hydration.
+Keys carry the index generation like the response cache.
+Skipped if Redis is unavailable.
+"""
+
+import hashlib
+import json
+import logging
+
+from gim_backend.core.config import get_settings
+from gim_backend.core.redis import get_redis
+from gim_backend.services.index_generation import get_index_generation
+from gim_backend.services.search_models import SearchRequest, Stage1Result
+from gim_backend.services.search_sql import CANDIDATE_LIMIT, RRF_K
+
+logger = logging.getLogger(__name__)
+
+STAGE1_CACHE_TTL_SECONDS = 300
+STAGE1_CACHE_PREFIX = "stage1:"
+# Bump when Stage 1 SQL changes the ordering of existing results
+STAGE1_RANKING_VERSION = 1
+
+
+def _ranking_version(settings) -> str:
+    """Stage 1 ranking version plus a digest of every setting that affects the order."""
+    config = {
+        "version": STAGE1_RANKING_VERSION,
+        "rrf_k": RRF_K,
+        "candidate_limit": CANDIDATE_LIMIT,
+        "embedding_model": settings.embedding_model,
+        "embedding_dim": settings.embedding_dim,
+        "freshness_half_life_days": settings.search_freshness_half_life_days,
+        "freshness_floor": settings.search_freshness_floor,
+        "freshness_weight": settings.search_freshness_weight,
+        "vector_retrieval": settings.search_vector_retrieval,
+        "rerank_factor": settings.vector_rerank_factor,
+        "filter_strategy": settings.search_filter_strategy,
+        "prefilter_selectivity": settings.search_prefilter_selectivity,
+    }
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+    return f"v{STAGE1_RANKING_VERSION}:{digest}"
+
+
+def _stage1_key(request: SearchRequest, generation: int) -> str:
+    version = _ranking_version(get_settings())
+    return f"{STAGE1_CACHE_PREFIX}g{generation}:{request.stage1_cache_key(version)}"
+
+
+def _serialize_stage1(result: Stage1Result) -> str:
+    """Ordered ids with a parallel score list; no per-id dict keys."""
+    return json.dumps(
+        {
+            "ids": result.node_ids,
+            "scores": [result.rrf_scores[node_id] for node_id in result.node_ids],
+            "total": result.total,
+            "capped": result.is_capped,
+        },
+        separators=(",", ":"),
+    )
+
+
+def _deserialize_stage1(data: str) -> Stage1Result:
+    parsed = json.loads(data)
+    node_ids = parsed["ids"]
+    return Stage1Result(
+        node_ids=node_ids,
+        rrf_scores=dict(zip(node_ids, parsed["scores"], strict=True)),
+        total=parsed["total"],
+        is_capped=parsed["capped"],
+    )
+
+
+async def get_cached_stage1(request: SearchRequest) -> Stage1Result | None:
+    """
+    Retrieve the cached Stage 1 result for any page of this search.
+    Returns None if cache miss or Redis unavailable.
+    """
+    redis = await get_redis()
+    if redis is None:
+        return None
+
+    cache_key = _stage1_key(request, await get_index_generation(redis))
+
+    try:
+        cached = await redis.get(cache_key)
+        if cached:
+            logger.debug(f"Stage 1 cache hit: {cache_key}")
+            return _deserialize_stage1(cached)
+        return None
+    except Exception as e:
+        logger.warning(f"Stage 1 cache read error: {e}")
+        return None
+
+
+async def cache_stage1_result(request: SearchRequest, result: Stage1Result) -> None:
+    """
+    Cache a Stage 1 result with 5-minute TTL.
+    Silently fails if Redis unavailable.
+    """
+    redis = await get_redis()
+    if redis is None:
+        return
+
+    cache_key = _stage1_key(request, await get_index_generation(redis))
+
+    try:
+        await redis.setex(cache_key, STAGE1_CACHE_TTL_SECONDS, _serialize_stage1(result))
+    except Exception as e:
+        logger.warning(f"Stage 1 cache write error: {e}")
+
+
+__all__ = [
+    "STAGE1_CACHE_PREFIX",
+    "STAGE1_CACHE_TTL_SECONDS",
+    "STAGE1_RANKING_VERSION",
+    "cache_stage1_result",
+    "get_cached_stage1",
+    "_deserialize_stage1",
+    "_serialize_stage1",
+]
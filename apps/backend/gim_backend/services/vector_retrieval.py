@@ -0,0 +1,138 @@
+"""
+Nearest-neighbour issue candidate SQL shared by search, feed and similar issues.
+
+Two retrieval modes, selected per call site:
+    exact: HNSW over the full halfvec embedding (ix_issue_embedding_hnsw)
+    binary: coarse pass over the Hamming HNSW index on binary_quantize(embedding)
+        (ix_issue_embedding_bq_hnsw) fetching limit x rerank_factor candidates,
+        then re-ranked by full halfvec cosine distance
+"""
+
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+EXACT_RETRIEVAL = "exact"
+BINARY_RETRIEVAL = "binary"
+RETRIEVAL_MODES = (EXACT_RETRIEVAL, BINARY_RETRIEVAL)
+
+# pgvector caps hnsw.ef_search at 1000; an HNSW scan returns at most ef_search rows
+MAX_EF_SEARCH = 1000
+DEFAULT_EF_SEARCH = 40
+
+
+def _require_mode(mode: str) -> str:
+    if mode not in RETRIEVAL_MODES:
+        raise ValueError(f"Unknown vector retrieval mode: {mode}")
+    return mode
+
+
+def build_issue_candidates_sql(
+    mode: str,
+    *,
+    vector_param: str,
+    where: str,
+    limit: str,
+    use_index: bool = True,
+) -> str:
+    """
+    SELECT over ingestion.issue (aliased i) returning the `limit` nearest rows
+    matching `where`, ordered by cosine distance to `:vector_param`.
+
+    Embed as a derived table: `FROM (<sql>) i`. Binary mode also binds
+    `:rerank_factor` (see retrieval_params). use_index=False ranks every row
+    matching `where` by exact distance, for selective filters the HNSW scan
+    would otherwise exhaust before finding `limit` matches.
+    """
+    distance = f"i.embedding <=> CAST(:{vector_param} AS halfvec)"
+
+    if not use_index:
+        _require_mode(mode)
+        # "+ 0" keeps the ORDER BY from matching an HNSW index, so the planner
+        # uses the filter's own indexes and sorts the (small) filtered set
+        return f"""
+            SELECT i.*
+            FROM ingestion.issue i
+            WHERE {where}
+            ORDER BY ({distance}) + 0
+            LIMIT {limit}
+        """
+
+    if _require_mode(mode) == EXACT_RETRIEVAL:
+        return f"""
+            SELECT i.*
+            FROM ingestion.issue i
+            WHERE {where}
+            ORDER BY {distance}
+            LIMIT {limit}
+        """
+
+    # The bit(256) cast must match the index expression for the planner to use it
+    return f"""
+            SELECT i.*
+            FROM (
+                SELECT i.*
+                FROM ingestion.issue i
+                WHERE {where}
+                ORDER BY binary_quantize(i.embedding)::bit(256) <~> binary_quantize(CAST(:{vector_param} AS halfvec))
+                LIMIT {limit} * :rerank_factor
+            ) i
+            ORDER BY {distance}
+            LIMIT {limit}
+        """
+
+
+def coarse_ef_search(limit: int, rerank_factor: int) -> int:
+    """hnsw.ef_search large enough for the coarse pass to return all over-fetched candidates."""
+    return max(DEFAULT_EF_SEARCH, min(limit * rerank_factor, MAX_EF_SEARCH))
+
+
+def retrieval_params(mode: str, rerank_factor: int) -> dict:
+    """Extra bind params required by build_issue_candidates_sql for `mode`."""
+    if _require_mode(mode) == BINARY_RETRIEVAL:
+        return {"rerank_factor": max(1, rerank_factor)}
+    return {}
+
+
+async def prepare_vector_scan(
+    db: AsyncSession,
+    mode: str,
+    limit: int,
+    rerank_factor: int,
+    *,
+    iterative_scan: bool = False,
+    min_ef_search: int = 0,
+) -> None:
+    """
+    Sets transaction-local HNSW options before a candidate query: a larger
+    hnsw.ef_search for binary mode (or at least min_ef_search, capped at
+    MAX_EF_SEARCH), and relaxed-order iterative scans (pgvector >= 0.8) when
+    `where` carries selective filters. No-op for an unfiltered exact query,
+    which keeps the server defaults.
+    """
+    options = []
+    params = {}
+    ef_search = 0
+    if _require_mode(mode) == BINARY_RETRIEVAL:
+        ef_search = coarse_ef_search(limit, max(1, rerank_factor))
+    if min_ef_search > 0:
+        ef_search = max(ef_search, min(min_ef_search, MAX_EF_SEARCH))
+    if ef_search:
+        options.append("set_config('hnsw.ef_search', :ef_search, true)")
+        params["ef_search"] = str(ef_search)
+    if iterative_scan:
+        # Stage results are re-ranked by exact distance, so relaxed ordering is safe
+        options.append("set_config('hnsw.iterative_scan', 'relaxed_order', true)")
+    if not options:
+        return
+    await db.execute(text(f"SELECT {', '.join(options)}"), params)
+
+
+__all__ = [
+    "BINARY_RETRIEVAL",
+    "EXACT_RETRIEVAL",
+    "RETRIEVAL_MODES",
+    "build_issue_candidates_sql",
+    "coarse_ef_search",
+    "prepare_vector_scan",
+    "retrieval_params",
+]
@@ -16,7 +16,7 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from gim_backend.core.config import get_settings
-from gim_backend.services.embedding_service import close_embedder, embed_query
+from gim_backend.services.embedding_service import close_embedder, embed_query, warmup_embedder
 from gim_backend.services.profile_embedding_service import calculate_combined_vector
 from gim_backend.services.resume_parsing_service import (
     check_minimal_data,
@@ -37,6 +37,8 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Resume worker starting up")
+    if settings.embedding_warmup_on_startup:
+        await warmup_embedder()
     yield
     await close_embedder()
     logger.info("Resume worker shut down")
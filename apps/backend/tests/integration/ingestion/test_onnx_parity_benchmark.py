@@ -0,0 +1,108 @@
+"""Parity and throughput/RSS benchmark: ONNX Runtime backends vs the torch embedder"""
+
+import importlib.util
+import resource
+import time
+
+import numpy as np
+import pytest
+
+from gim_backend.ingestion.nomic_moe_embedder import NomicMoEEmbedder
+from gim_backend.ingestion.nomic_onnx_embedder import NomicOnnxEmbedder
+
+pytestmark = [
+    pytest.mark.skipif(
+        not all(importlib.util.find_spec(m) for m in ("sentence_transformers", "onnxruntime", "onnx", "tokenizers")),
+        reason="requires sentence-transformers, onnxruntime, onnx and tokenizers",
+    ),
+    pytest.mark.slow,
+]
+
+MIN_COSINE = 0.99
+THREADS = 2
+
+PARITY_CORPUS = [
+    "Fix memory leak in websocket reconnect handler",
+    "Add dark mode toggle to settings page",
+    "TypeError: cannot read properties of undefined (reading 'map') when list is empty",
+    "Docs: clarify how to configure the retry backoff for the HTTP client",
+    "Segfault in the Rust FFI bindings on aarch64 when the buffer is larger than 4GB",
+    "Support Python 3.13 in CI matrix",
+    "good first issue: rename misleading variable in parser.py",
+    "Flaky test test_concurrent_writes times out on Windows runners",
+    "Feature request: export dashboards as PDF",
+    "Kubernetes operator does not reconcile after CRD update",
+    "Improve error message when the config file is missing a required key",
+    "Migrate from webpack 4 to vite",
+    "ラベルの翻訳が一部欠けています",
+    "El botón de enviar no funciona en Safari",
+    "react hooks",
+    "postgres vector search",
+]
+
+BENCHMARK_DOCS = 200
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize() / 2**20
+
+
+def _cosines(a: list[list[float]], b: list[list[float]]) -> np.ndarray:
+    # Both sides are unit-normalized, so the row-wise dot product is the cosine
+    return np.sum(np.asarray(a) * np.asarray(b), axis=1)
+
+
+@pytest.fixture(scope="module")
+def torch_embedder():
+    embedder = NomicMoEEmbedder(num_threads=THREADS)
+    embedder.warmup()
+    yield embedder
+    embedder.close()
+
+
+@pytest.fixture(scope="module")
+def onnx_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("onnx")
+
+
+@pytest.mark.parametrize("quantize", [False, True], ids=["fp32", "int8"])
+@pytest.mark.parametrize("prefix_type", ["document", "query"])
+def test_onnx_matches_torch(torch_embedder, onnx_dir, quantize, prefix_type):
+    onnx_embedder = NomicOnnxEmbedder(num_threads=THREADS, model_dir=onnx_dir, quantize=quantize)
+    try:
+        expected = torch_embedder._encode_sync(PARITY_CORPUS, prefix_type)
+        actual = onnx_embedder._encode_sync(PARITY_CORPUS, prefix_type)
+    finally:
+        onnx_embedder.close()
+
+    cosines = _cosines(expected, actual)
+    print(f"\n{'int8' if quantize else 'fp32'}/{prefix_type}: min cosine {cosines.min():.4f}, "
+          f"mean {cosines.mean():.4f}")
+    assert cosines.min() >= MIN_COSINE
+
+
+def test_throughput_and_rss(torch_embedder, onnx_dir):
+    docs = [PARITY_CORPUS[i % len(PARITY_CORPUS)] + f" #{i}" for i in range(BENCHMARK_DOCS)]
+    batches = [docs[i : i + NomicMoEEmbedder.BATCH_SIZE] for i in range(0, len(docs), NomicMoEEmbedder.BATCH_SIZE)]
+
+    def run(embedder) -> float:
+        start = time.perf_counter()
+        for batch in batches:
+            embedder._encode_sync(batch, "document")
+        return len(docs) / (time.perf_counter() - start)
+
+    results = {"torch": (run(torch_embedder), torch_embedder.memory_footprint_bytes())}
+    for label, quantize in (("onnx-fp32", False), ("onnx-int8", True)):
+        rss_before = _rss_mb()
+        embedder = NomicOnnxEmbedder(num_threads=THREADS, model_dir=onnx_dir, quantize=quantize)
+        embedder.warmup()
+        rss_delta = _rss_mb() - rss_before
+        results[label] = (run(embedder), embedder.memory_footprint_bytes())
+        print(f"\n{label}: RSS +{rss_delta:.0f} MB on load")
+        embedder.close()
+
+    for label, (docs_per_s, weight_bytes) in results.items():
+        print(f"{label}: {docs_per_s:.1f} docs/s, weights {weight_bytes / 2**20:.0f} MB")
+
+    assert results["onnx-int8"][1] < results["torch"][1]
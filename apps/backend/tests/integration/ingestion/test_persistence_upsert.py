@@ -10,6 +10,7 @@ try:
 except ImportError:
     TESTCONTAINERS_AVAILABLE = False
 
+from gim_database.vector import install_vector_codec
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
@@ -63,7 +64,7 @@ CREATE TABLE ingestion.issue (
     issue_number INTEGER,
     github_url TEXT,
     labels TEXT[],
-    embedding vector(256),
+    embedding halfvec(256),
     content_hash VARCHAR(64) NOT NULL,
     github_created_at TIMESTAMPTZ NOT NULL,
     state VARCHAR NOT NULL DEFAULT 'open',
@@ -144,6 +145,7 @@ async def db_session(async_connection_url, setup_schema):
         echo=False,
         pool_pre_ping=True,
     )
+    install_vector_codec(engine)
 
     async_session_factory = sessionmaker(
         engine,
@@ -0,0 +1,163 @@
+"""Benchmark and parity check for COPY vs row-wise staging inserts against PostgreSQL"""
+
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+try:
+    from testcontainers.postgres import PostgresContainer
+    TESTCONTAINERS_AVAILABLE = True
+except ImportError:
+    TESTCONTAINERS_AVAILABLE = False
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from gim_backend.ingestion.gatherer import IssueData
+from gim_backend.ingestion.quality_gate import QScoreComponents
+from gim_backend.ingestion.staging_persistence import StagingPersistence
+
+pytestmark = [
+    pytest.mark.skipif(
+        not TESTCONTAINERS_AVAILABLE,
+        reason="testcontainers[postgres] not installed; requires Docker"
+    ),
+    pytest.mark.slow,
+]
+
+BENCHMARK_ROWS = 10_000
+
+SETUP_STATEMENTS = [
+    "CREATE SCHEMA IF NOT EXISTS ingestion",
+    "CREATE SCHEMA IF NOT EXISTS staging",
+    """
+    CREATE TABLE ingestion.repository (
+        node_id VARCHAR PRIMARY KEY,
+        full_name VARCHAR NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE TABLE staging.pending_issue (
+        node_id VARCHAR PRIMARY KEY,
+        repo_id VARCHAR NOT NULL REFERENCES ingestion.repository(node_id),
+        title VARCHAR NOT NULL,
+        body_text VARCHAR NOT NULL,
+        issue_number INTEGER,
+        github_url VARCHAR,
+        labels VARCHAR[],
+        github_created_at TIMESTAMPTZ NOT NULL,
+        has_code BOOLEAN NOT NULL,
+        has_template_headers BOOLEAN NOT NULL,
+        tech_stack_weight DOUBLE PRECISION NOT NULL,
+        q_score DOUBLE PRECISION NOT NULL,
+        state VARCHAR NOT NULL,
+        content_hash VARCHAR(64) NOT NULL,
+        status VARCHAR NOT NULL,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        attempts INTEGER NOT NULL
+    )
+    """,
+    "INSERT INTO ingestion.repository (node_id, full_name) VALUES ('R_bench', 'owner/bench')",
+]
+
+
+@pytest.fixture(scope="module")
+def postgres_container():
+    with PostgresContainer(
+        image="pgvector/pgvector:pg16",
+        username="test",
+        password="test",
+        dbname="testdb",
+    ) as pg:
+        yield pg
+
+
+@pytest.fixture
+async def session_factory(postgres_container):
+    url = postgres_container.get_connection_url()
+    url = url.replace("postgresql+psycopg2://", "postgresql://")
+    url = url.replace("postgresql://", "postgresql+asyncpg://")
+    engine = create_async_engine(url, echo=False)
+
+    async with engine.begin() as conn:
+        for statement in SETUP_STATEMENTS:
+            await conn.execute(text(statement))
+
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP SCHEMA staging CASCADE"))
+        await conn.execute(text("DROP SCHEMA ingestion CASCADE"))
+    await engine.dispose()
+
+
+def make_issues(count: int, prefix: str) -> list[IssueData]:
+    components = QScoreComponents(has_code=True, has_headers=True, tech_weight=0.5, is_junk=False)
+    base = datetime(2024, 1, 1, tzinfo=UTC)
+    return [
+        IssueData(
+            node_id=f"{prefix}_{i}",
+            repo_id="R_bench",
+            title=f"Synthetic issue {i}",
+            body_text="## Description\n```python\nraise ValueError()\n```\n" * 20,
+            labels=["bug", "help wanted"],
+            github_created_at=base + timedelta(minutes=i),
+            q_score=0.8,
+            q_components=components,
+            state="open",
+            issue_number=i,
+            github_url=f"https://github.com/owner/bench/issues/{i}",
+        )
+        for i in range(count)
+    ]
+
+
+async def _count(session_factory) -> int:
+    async with session_factory() as session:
+        result = await session.execute(text("SELECT COUNT(*) FROM staging.pending_issue"))
+        return result.scalar()
+
+
+class TestStagingCopyBenchmark:
+    async def test_copy_path_matches_rowwise_and_is_faster(self, session_factory):
+        rowwise_issues = make_issues(BENCHMARK_ROWS, "I_row")
+        copy_issues = make_issues(BENCHMARK_ROWS, "I_copy")
+
+        async with session_factory() as session:
+            staging = StagingPersistence(session)
+            start = time.perf_counter()
+            rowwise_inserted = await staging._insert_rowwise(rowwise_issues)
+            await session.commit()
+            rowwise_elapsed = time.perf_counter() - start
+
+        async with session_factory() as session:
+            start = time.perf_counter()
+            copy_inserted = await StagingPersistence(session).insert_pending_issues(copy_issues)
+            copy_elapsed = time.perf_counter() - start
+
+        print(
+            f"\nStaging insert of {BENCHMARK_ROWS} rows: "
+            f"row-wise {rowwise_elapsed:.2f}s, COPY {copy_elapsed:.2f}s "
+            f"({rowwise_elapsed / copy_elapsed:.1f}x)"
+        )
+
+        assert rowwise_inserted == BENCHMARK_ROWS
+        assert copy_inserted == BENCHMARK_ROWS
+        assert await _count(session_factory) == 2 * BENCHMARK_ROWS
+        assert copy_elapsed < rowwise_elapsed
+
+    async def test_copy_path_reports_skipped_duplicates(self, session_factory):
+        existing = make_issues(100, "I_dup")
+        async with session_factory() as session:
+            assert await StagingPersistence(session).insert_pending_issues(existing) == 100
+
+        # 100 already staged, 50 new, plus an in-batch duplicate of a new row
+        batch = existing + make_issues(50, "I_new") + make_issues(1, "I_new")
+        async with session_factory() as session:
+            inserted = await StagingPersistence(session).insert_pending_issues(batch)
+
+        assert inserted == 50
+        assert await _count(session_factory) == 150
@@ -0,0 +1,160 @@
+"""
+Recall@K and latency of exact vs binary-quantized coarse-to-fine candidate retrieval,
+using the SQL the search, feed and similar-issue paths run.
+Requires Docker (testcontainers with pgvector >= 0.7).
+"""
+
+import io
+import time
+
+import numpy as np
+import pytest
+
+from gim_backend.services.vector_retrieval import (
+    BINARY_RETRIEVAL,
+    EXACT_RETRIEVAL,
+    build_issue_candidates_sql,
+    coarse_ef_search,
+)
+
+try:
+    from testcontainers.postgres import PostgresContainer
+    TESTCONTAINERS_AVAILABLE = True
+except ImportError:
+    TESTCONTAINERS_AVAILABLE = False
+
+pytestmark = [
+    pytest.mark.skipif(
+        not TESTCONTAINERS_AVAILABLE,
+        reason="testcontainers[postgres] not installed; requires Docker"
+    ),
+    pytest.mark.slow,
+]
+
+CORPUS_SIZE = 20_000
+QUERIES = 50
+K = 50
+DIM = 256
+EXACT_EF_SEARCH = 100
+RERANK_FACTORS = (1, 4, 10)
+
+
+def _clustered_unit_vectors(n: int, rng: np.random.Generator) -> np.ndarray:
+    centers = rng.standard_normal((64, DIM))
+    vectors = centers[rng.integers(0, 64, n)] + 0.6 * rng.standard_normal((n, DIM))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def _literal(vector: np.ndarray) -> str:
+    return "[" + ",".join(f"{v:.6f}" for v in vector) + "]"
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = np.random.default_rng(14)
+    data = _clustered_unit_vectors(CORPUS_SIZE, rng)
+    queries = _clustered_unit_vectors(QUERIES, rng)
+    truth = np.argsort(-(queries @ data.T), axis=1)[:, :K]
+    return data, queries, truth
+
+
+@pytest.fixture(scope="module")
+def connection(corpus):
+    import psycopg2
+
+    data, _, _ = corpus
+    with PostgresContainer(
+        image="pgvector/pgvector:pg16",
+        username="test",
+        password="test",
+        dbname="testdb",
+    ) as pg:
+        url = pg.get_connection_url().replace("postgresql+psycopg2://", "postgresql://")
+        conn = psycopg2.connect(url)
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+            cur.execute("CREATE SCHEMA ingestion")
+            cur.execute("SET maintenance_work_mem = '512MB'")
+            cur.execute(
+                "CREATE TABLE ingestion.issue (node_id integer PRIMARY KEY, state text, embedding halfvec(256))"
+            )
+            buffer = io.StringIO("".join(f"{i}\topen\t{_literal(v)}\n" for i, v in enumerate(data)))
+            cur.copy_expert("COPY ingestion.issue (node_id, state, embedding) FROM STDIN", buffer)
+            cur.execute(
+                "CREATE INDEX ix_issue_embedding_hnsw ON ingestion.issue "
+                "USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64)"
+            )
+            cur.execute(
+                "CREATE INDEX ix_issue_embedding_bq_hnsw ON ingestion.issue "
+                "USING hnsw ((binary_quantize(embedding)::bit(256)) bit_hamming_ops) "
+                "WITH (m = 16, ef_construction = 64)"
+            )
+            cur.execute("ANALYZE ingestion.issue")
+        yield conn
+        conn.close()
+
+
+def _psycopg_sql(mode: str) -> str:
+    sql = build_issue_candidates_sql(
+        mode,
+        vector_param="query_vec",
+        where="i.embedding IS NOT NULL AND i.state = 'open'",
+        limit=":k",
+    )
+    return (
+        sql.replace(":query_vec", "%(query_vec)s")
+        .replace(":rerank_factor", "%(rerank_factor)s")
+        .replace(":k", "%(k)s")
+    )
+
+
+def _run(cur, mode: str, queries: np.ndarray, truth: np.ndarray, factor: int = 1) -> dict:
+    ef_search = EXACT_EF_SEARCH if mode == EXACT_RETRIEVAL else coarse_ef_search(K, factor)
+    cur.execute(f"SET hnsw.ef_search = {ef_search}")
+    sql = f"SELECT node_id FROM ({_psycopg_sql(mode)}) i"
+
+    hits = 0
+    latencies = []
+    for query, expected in zip(queries, truth):
+        params = {"query_vec": _literal(query), "k": K, "rerank_factor": factor}
+        start = time.perf_counter()
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+        latencies.append(time.perf_counter() - start)
+        hits += len({row[0] for row in rows} & set(expected.tolist()))
+
+    cur.execute(
+        "SELECT pg_relation_size('ingestion.ix_issue_embedding_hnsw'), "
+        "pg_relation_size('ingestion.ix_issue_embedding_bq_hnsw')"
+    )
+    return {
+        "recall": hits / (len(queries) * K),
+        "p50_ms": float(np.percentile(latencies, 50) * 1e3),
+        "p95_ms": float(np.percentile(latencies, 95) * 1e3),
+        "index_bytes": cur.fetchone(),
+    }
+
+
+def test_binary_coarse_to_fine_recall_and_latency(connection, corpus):
+    _, queries, truth = corpus
+
+    with connection.cursor() as cur:
+        exact = _run(cur, EXACT_RETRIEVAL, queries, truth)
+        binary = {factor: _run(cur, BINARY_RETRIEVAL, queries, truth, factor) for factor in RERANK_FACTORS}
+
+    full_bytes, binary_bytes = exact["index_bytes"]
+    print(
+        f"\nindexes: halfvec {full_bytes / 2**20:.1f} MiB, bit(256) {binary_bytes / 2**20:.1f} MiB"
+        f"\nexact: recall@{K} {exact['recall']:.3f}, p50 {exact['p50_ms']:.2f} ms, p95 {exact['p95_ms']:.2f} ms"
+    )
+    for factor, stats in binary.items():
+        print(
+            f"binary x{factor}: recall@{K} {stats['recall']:.3f}, "
+            f"p50 {stats['p50_ms']:.2f} ms, p95 {stats['p95_ms']:.2f} ms"
+        )
+
+    assert binary_bytes < 0.5 * full_bytes
+    # Over-fetching recovers the recall lost to 1-bit quantization
+    assert binary[4]["recall"] > binary[1]["recall"]
+    assert binary[10]["recall"] >= exact["recall"] - 0.1
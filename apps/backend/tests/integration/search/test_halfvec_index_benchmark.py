@@ -0,0 +1,128 @@
+"""
+Index size, build time and recall@50 of vector vs halfvec HNSW indexes on a seeded corpus.
+Requires Docker (testcontainers with pgvector >= 0.7).
+"""
+
+import io
+import time
+
+import numpy as np
+import pytest
+
+try:
+    from testcontainers.postgres import PostgresContainer
+    TESTCONTAINERS_AVAILABLE = True
+except ImportError:
+    TESTCONTAINERS_AVAILABLE = False
+
+pytestmark = [
+    pytest.mark.skipif(
+        not TESTCONTAINERS_AVAILABLE,
+        reason="testcontainers[postgres] not installed; requires Docker"
+    ),
+    pytest.mark.slow,
+]
+
+CORPUS_SIZE = 20_000
+QUERIES = 50
+K = 50
+DIM = 256
+EF_SEARCH = 100
+
+VARIANTS = {
+    "vector": ("vector(256)", "vector_cosine_ops"),
+    "halfvec": ("halfvec(256)", "halfvec_cosine_ops"),
+}
+
+
+def _clustered_unit_vectors(n: int, rng: np.random.Generator) -> np.ndarray:
+    """Topic-clustered vectors so neighbours are meaningful, like issue embeddings."""
+    centers = rng.standard_normal((64, DIM))
+    vectors = centers[rng.integers(0, 64, n)] + 0.6 * rng.standard_normal((n, DIM))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def _literal(vector: np.ndarray) -> str:
+    return "[" + ",".join(f"{v:.6f}" for v in vector) + "]"
+
+
+@pytest.fixture(scope="module")
+def connection():
+    import psycopg2
+
+    with PostgresContainer(
+        image="pgvector/pgvector:pg16",
+        username="test",
+        password="test",
+        dbname="testdb",
+    ) as pg:
+        url = pg.get_connection_url().replace("postgresql+psycopg2://", "postgresql://")
+        conn = psycopg2.connect(url)
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+            cur.execute("SET maintenance_work_mem = '512MB'")
+        yield conn
+        conn.close()
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = np.random.default_rng(13)
+    data = _clustered_unit_vectors(CORPUS_SIZE, rng)
+    queries = _clustered_unit_vectors(QUERIES, rng)
+    # Exact cosine top-K on the float32 source vectors is the ground truth for both variants
+    truth = np.argsort(-(queries @ data.T), axis=1)[:, :K]
+    return data, queries, truth
+
+
+def _build(cur, name: str, column_type: str, opclass: str, data: np.ndarray) -> dict:
+    table = f"bench_{name}"
+    cur.execute(f"DROP TABLE IF EXISTS {table}")
+    cur.execute(f"CREATE TABLE {table} (id integer PRIMARY KEY, embedding {column_type})")
+    buffer = io.StringIO("".join(f"{i}\t{_literal(v)}\n" for i, v in enumerate(data)))
+    cur.copy_expert(f"COPY {table} (id, embedding) FROM STDIN", buffer)
+
+    start = time.perf_counter()
+    cur.execute(
+        f"CREATE INDEX {table}_hnsw ON {table} USING hnsw (embedding {opclass}) "
+        "WITH (m = 16, ef_construction = 64)"
+    )
+    build_s = time.perf_counter() - start
+
+    cur.execute(f"SELECT pg_relation_size('{table}_hnsw'), pg_table_size('{table}')")
+    index_bytes, table_bytes = cur.fetchone()
+    return {"table": table, "build_s": build_s, "index_bytes": index_bytes, "table_bytes": table_bytes}
+
+
+def _recall(cur, table: str, cast: str, queries: np.ndarray, truth: np.ndarray) -> float:
+    cur.execute(f"SET hnsw.ef_search = {EF_SEARCH}")
+    hits = 0
+    for query, expected in zip(queries, truth):
+        cur.execute(
+            f"SELECT id FROM {table} ORDER BY embedding <=> CAST(%s AS {cast}) LIMIT {K}",
+            (_literal(query),),
+        )
+        hits += len({row[0] for row in cur.fetchall()} & set(expected.tolist()))
+    return hits / (len(queries) * K)
+
+
+def test_halfvec_index_is_smaller_with_comparable_recall(connection, corpus):
+    data, queries, truth = corpus
+    results = {}
+
+    with connection.cursor() as cur:
+        for name, (column_type, opclass) in VARIANTS.items():
+            stats = _build(cur, name, column_type, opclass, data)
+            stats["recall"] = _recall(cur, stats["table"], name, queries, truth)
+            results[name] = stats
+
+    for name, stats in results.items():
+        print(
+            f"\n{name}: index {stats['index_bytes'] / 2**20:.1f} MiB, "
+            f"table {stats['table_bytes'] / 2**20:.1f} MiB, build {stats['build_s']:.2f}s, "
+            f"recall@{K} {stats['recall']:.3f}"
+        )
+
+    assert results["halfvec"]["index_bytes"] < 0.7 * results["vector"]["index_bytes"]
+    assert results["halfvec"]["recall"] >= results["vector"]["recall"] - 0.02
@@ -0,0 +1,165 @@
+"""
+Parity and latency of parallel Stage 1 execution (concurrent vector and BM25
+queries fused in process) against the single-statement SQL path.
+Requires Docker (testcontainers with pgvector).
+"""
+
+import time
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+try:
+    from testcontainers.postgres import PostgresContainer
+    TESTCONTAINERS_AVAILABLE = True
+except ImportError:
+    TESTCONTAINERS_AVAILABLE = False
+
+from gim_database.vector import install_vector_codec
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from gim_backend.services.search_execution import _execute_stage1
+from gim_backend.services.search_models import SearchFilters
+from tests.integration.search.test_search_flow import SETUP_SQL
+
+pytestmark = pytest.mark.skipif(
+    not TESTCONTAINERS_AVAILABLE,
+    reason="testcontainers[postgres] not installed; requires Docker"
+)
+
+CORPUS_SIZE = 3_000
+DIM = 256
+WORDS = [
+    "async", "crash", "memory", "leak", "timeout", "parser", "error", "build", "docs", "typo",
+    "race", "deadlock", "cache", "panic", "unicode", "windows", "linux", "install", "test", "flaky",
+]
+REPOS = [
+    ("repo_0", "org/python-lib", "Python"),
+    ("repo_1", "org/rust-core", "Rust"),
+    ("repo_2", "org/web-app", "TypeScript"),
+    ("repo_3", "org/tiny-tool", "Go"),
+]
+LABELS = ["bug", "good first issue", "help wanted", "docs"]
+QUERIES = ["async crash", "memory leak", "flaky test timeout", "unicode parser error", "install windows"]
+FILTER_CASES = [
+    SearchFilters(),
+    SearchFilters(languages=["Python"]),
+    SearchFilters(labels=["good first issue"]),
+    SearchFilters(repos=["org/tiny-tool"], labels=["bug"]),
+]
+
+
+def _literal(vector: np.ndarray) -> str:
+    return "[" + ",".join(f"{v:.6f}" for v in vector) + "]"
+
+
+@pytest.fixture(scope="module")
+def session_factory():
+    import psycopg2
+
+    rng = np.random.default_rng(20)
+    with PostgresContainer(
+        image="pgvector/pgvector:pg16",
+        username="test",
+        password="test",
+        dbname="testdb",
+    ) as pg:
+        sync_url = pg.get_connection_url().replace("postgresql+psycopg2://", "postgresql://")
+        conn = psycopg2.connect(sync_url)
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(SETUP_SQL)
+            cur.executemany(
+                "INSERT INTO ingestion.repository (node_id, full_name, primary_language) VALUES (%s, %s, %s)",
+                REPOS,
+            )
+            now = datetime.now(UTC)
+            rows = []
+            for i in range(CORPUS_SIZE):
+                vector = rng.standard_normal(DIM)
+                rows.append(
+                    (
+                        f"issue_{i:05d}",
+                        REPOS[int(rng.integers(0, len(REPOS)))][0],
+                        " ".join(rng.choice(WORDS, 4)),
+                        " ".join(rng.choice(WORDS, 30)),
+                        list(rng.choice(LABELS, int(rng.integers(0, 3)), replace=False)),
+                        float(rng.choice([0.3, 0.6, 0.9])),
+                        _literal(vector / np.linalg.norm(vector)),
+                        now - timedelta(days=float(rng.uniform(0, 60))),
+                    )
+                )
+            cur.executemany(
+                "INSERT INTO ingestion.issue "
+                "(node_id, repo_id, title, body_text, labels, q_score, embedding, github_created_at) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s::halfvec, %s)",
+                rows,
+            )
+            cur.execute("ANALYZE")
+        conn.close()
+
+        async_url = sync_url.replace("postgresql://", "postgresql+asyncpg://")
+        engine = create_async_engine(
+            async_url,
+            connect_args={"prepared_statement_cache_size": 0, "statement_cache_size": 0},
+        )
+        install_vector_codec(engine)
+        yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def _settings(execution: str):
+    return SimpleNamespace(
+        search_stage1_execution=execution,
+        search_vector_retrieval="exact",
+        vector_rerank_factor=4,
+        search_filter_strategy="post",
+        search_prefilter_selectivity=0.1,
+        search_freshness_half_life_days=7.0,
+        search_freshness_floor=0.2,
+        search_freshness_weight=0.25,
+    )
+
+
+async def _stage1(session_factory, execution: str, query: str, embedding: list[float], filters: SearchFilters):
+    async with session_factory() as db:
+        start = time.perf_counter()
+        result = await _execute_stage1(
+            db=db,
+            query_text=query,
+            query_embedding=embedding,
+            filters=filters,
+            use_vector_path=True,
+            get_settings_fn=lambda: _settings(execution),
+            session_factory_fn=session_factory,
+        )
+        return result, time.perf_counter() - start
+
+
+@pytest.mark.asyncio
+async def test_parallel_matches_sql_ordering(session_factory):
+    rng = np.random.default_rng(7)
+    latencies = {"sql": [], "parallel": []}
+
+    for query in QUERIES:
+        vector = rng.standard_normal(DIM)
+        embedding = (vector / np.linalg.norm(vector)).tolist()
+        for filters in FILTER_CASES:
+            sql_result, sql_s = await _stage1(session_factory, "sql", query, embedding, filters)
+            parallel_result, parallel_s = await _stage1(session_factory, "parallel", query, embedding, filters)
+            latencies["sql"].append(sql_s)
+            latencies["parallel"].append(parallel_s)
+
+            assert parallel_result.node_ids == sql_result.node_ids
+            assert parallel_result.total == sql_result.total
+            assert parallel_result.is_capped == sql_result.is_capped
+            assert parallel_result.rrf_scores == pytest.approx(sql_result.rrf_scores)
+
+    for execution, samples in latencies.items():
+        print(
+            f"\n{execution}: p50 {np.percentile(samples, 50) * 1e3:.1f} ms, "
+            f"p95 {np.percentile(samples, 95) * 1e3:.1f} ms"
+        )
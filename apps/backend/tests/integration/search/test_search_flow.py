@@ -13,6 +13,7 @@ try:
 except ImportError:
     TESTCONTAINERS_AVAILABLE = False
 
+from gim_database.vector import install_vector_codec
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
@@ -59,7 +60,7 @@ CREATE TABLE ingestion.issue (
     title VARCHAR NOT NULL,
     body_text VARCHAR NOT NULL,
     labels TEXT[],
-    embedding vector(256),
+    embedding halfvec(256),
     github_created_at TIMESTAMPTZ NOT NULL,
     state VARCHAR NOT NULL DEFAULT 'open',
     ingested_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
@@ -70,7 +71,7 @@ CREATE TABLE ingestion.issue (
 
 CREATE INDEX ix_ingestion_issue_repo_id ON ingestion.issue(repo_id);
 CREATE INDEX ix_issue_search_vector ON ingestion.issue USING GIN (search_vector);
-CREATE INDEX ix_issue_embedding_hnsw ON ingestion.issue USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+CREATE INDEX ix_issue_embedding_hnsw ON ingestion.issue USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64);
 """
 
 # Sample 256-dim embedding (normalized random vector for testing)
@@ -123,6 +124,7 @@ def async_engine(async_connection_url, postgres_container):
             "statement_cache_size": 0,
         },
     )
+    install_vector_codec(engine)
     return engine
 
 
@@ -177,13 +179,13 @@ async def seeded_db(db_session):
         VALUES
             ('issue_1', 'repo_1', 'Python async error handling',
              'How to handle exceptions in async Python code with asyncio',
-             ARRAY['bug', 'python'], 0.8, '{embedding_str}'::vector, NOW()),
+             ARRAY['bug', 'python'], 0.8, '{embedding_str}'::halfvec, NOW()),
             ('issue_2', 'repo_1', 'Memory leak in Python service',
              'Our Python service leaks memory when processing large files',
-             ARRAY['bug', 'performance'], 0.7, '{embedding_str}'::vector, NOW()),
+             ARRAY['bug', 'performance'], 0.7, '{embedding_str}'::halfvec, NOW()),
             ('issue_3', 'repo_2', 'Rust borrow checker issue',
              'Cannot understand why borrow checker rejects my code',
-             ARRAY['help wanted'], 0.9, '{embedding_str}'::vector, NOW())
+             ARRAY['help wanted'], 0.9, '{embedding_str}'::halfvec, NOW())
         ON CONFLICT DO NOTHING
     """))
 
@@ -0,0 +1,250 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from gim_backend.ingestion.embedding_cache import (
+    CachedEmbedder,
+    LRUEmbeddingCache,
+    MmapEmbeddingCache,
+    RedisEmbeddingCache,
+    build_embedding_cache,
+    make_cache_key,
+    with_embedding_cache,
+)
+
+
+def make_inner():
+    inner = MagicMock()
+
+    async def encode(texts):
+        return [[float(len(t))] * 4 for t in texts]
+
+    inner.embed_documents = AsyncMock(side_effect=encode)
+    inner.embed_queries = AsyncMock(side_effect=encode)
+    inner.embed_batch = AsyncMock(side_effect=encode)
+    return inner
+
+
+class TestMakeCacheKey:
+    def test_key_includes_model_prefix_and_dim(self):
+        key = make_cache_key("model-a", "query", 256, "hello")
+
+        assert key.startswith("model-a:query:256:")
+        assert len(key.rsplit(":", 1)[1]) == 64
+
+    def test_model_or_dim_change_changes_key(self):
+        base = make_cache_key("model-a", "query", 256, "hello")
+
+        assert make_cache_key("model-b", "query", 256, "hello") != base
+        assert make_cache_key("model-a", "query", 128, "hello") != base
+        assert make_cache_key("model-a", "document", 256, "hello") != base
+
+
+class TestCachedEmbedder:
+    async def test_second_call_is_served_from_cache(self):
+        inner = make_inner()
+        embedder = CachedEmbedder(inner, LRUEmbeddingCache(), model_name="m", dim=4)
+
+        first = await embedder.embed_queries(["abc"])
+        second = await embedder.embed_queries(["abc"])
+
+        assert first == second
+        inner.embed_queries.assert_awaited_once()
+        assert embedder.stats.hits == 1
+        assert embedder.stats.misses == 1
+
+    async def test_only_misses_reach_inner_and_order_is_kept(self):
+        inner = make_inner()
+        embedder = CachedEmbedder(inner, LRUEmbeddingCache(), model_name="m", dim=4)
+        await embedder.embed_documents(["aa"])
+
+        result = await embedder.embed_documents(["bbb", "aa", "c", "bbb"])
+
+        assert [v[0] for v in result] == [3.0, 2.0, 1.0, 3.0]
+        assert inner.embed_documents.await_args_list[-1].args[0] == ["bbb", "c"]
+
+    async def test_prefix_types_are_cached_separately(self):
+        inner = make_inner()
+        embedder = CachedEmbedder(inner, LRUEmbeddingCache(), model_name="m", dim=4)
+
+        await embedder.embed_documents(["same"])
+        await embedder.embed_queries(["same"])
+
+        inner.embed_documents.assert_awaited_once()
+        inner.embed_queries.assert_awaited_once()
+
+    async def test_empty_input(self):
+        inner = make_inner()
+        embedder = CachedEmbedder(inner, LRUEmbeddingCache(), model_name="m", dim=4)
+
+        assert await embedder.embed_batch([]) == []
+        inner.embed_batch.assert_not_called()
+
+
+class TestLRUEmbeddingCache:
+    async def test_evicts_least_recently_used(self):
+        cache = LRUEmbeddingCache(max_entries=2)
+        await cache.set_many({"a": [1.0], "b": [2.0]})
+        await cache.get_many(["a"])
+
+        await cache.set_many({"c": [3.0]})
+
+        assert await cache.get_many(["a", "b", "c"]) == [[1.0], None, [3.0]]
+
+
+class TestMmapEmbeddingCache:
+    async def test_round_trip_persists_across_instances(self, tmp_path):
+        cache = MmapEmbeddingCache(tmp_path, model_name="m", dim=4, capacity=8)
+        await cache.set_many({"k": [0.5, -0.25, 0.125, 1.0]})
+
+        reopened = MmapEmbeddingCache(tmp_path, model_name="m", dim=4, capacity=8)
+
+        assert await reopened.get_many(["k", "missing"]) == [[0.5, -0.25, 0.125, 1.0], None]
+
+    async def test_model_change_invalidates_store(self, tmp_path):
+        cache = MmapEmbeddingCache(tmp_path, model_name="m", dim=4, capacity=8)
+        await cache.set_many({"k": [1.0, 0.0, 0.0, 0.0]})
+
+        reopened = MmapEmbeddingCache(tmp_path, model_name="other", dim=4, capacity=8)
+
+        assert await reopened.get_many(["k"]) == [None]
+        assert len(reopened) == 0
+
+    async def test_slots_are_reused_when_full(self, tmp_path):
+        cache = MmapEmbeddingCache(tmp_path, model_name="m", dim=2, capacity=2)
+        await cache.set_many({"a": [1.0, 0.0], "b": [0.0, 1.0]})
+
+        await cache.set_many({"c": [1.0, 1.0]})
+
+        assert await cache.get_many(["a", "b", "c"]) == [None, [0.0, 1.0], [1.0, 1.0]]
+
+    async def test_stores_float16(self, tmp_path):
+        cache = MmapEmbeddingCache(tmp_path, model_name="m", dim=4, capacity=4)
+        vector = np.random.rand(4).tolist()
+        await cache.set_many({"k": vector})
+
+        [stored] = await cache.get_many(["k"])
+
+        assert np.allclose(stored, vector, atol=1e-3)
+
+
+class TestRedisEmbeddingCache:
+    async def test_round_trip_with_fakeredis(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        cache = RedisEmbeddingCache(ttl_seconds=60)
+
+        with patch("gim_backend.core.redis.get_redis", AsyncMock(return_value=client)):
+            await cache.set_many({"k": [0.5, 0.25]})
+            found = await cache.get_many(["k", "missing"])
+            ttl = await client.ttl("emb:k")
+
+        assert found == [[0.5, 0.25], None]
+        assert 0 < ttl <= 60
+
+    async def test_missing_redis_is_a_miss(self):
+        cache = RedisEmbeddingCache()
+
+        with patch("gim_backend.core.redis.get_redis", AsyncMock(return_value=None)):
+            assert await cache.get_many(["k"]) == [None]
+            await cache.set_many({"k": [1.0]})
+
+
+    async def test_batches_append_to_journal_instead_of_rewriting_index(self, tmp_path):
+        cache = MmapEmbeddingCache(tmp_path, model_name="m", dim=2, capacity=8)
+        index_before = (tmp_path / MmapEmbeddingCache.INDEX_FILE).read_text()
+
+        await cache.set_many({"a": [1.0, 0.0]})
+        await cache.set_many({"b": [0.0, 1.0]})
+
+        assert (tmp_path / MmapEmbeddingCache.INDEX_FILE).read_text() == index_before
+        assert len((tmp_path / MmapEmbeddingCache.JOURNAL_FILE).read_text().splitlines()) == 2
+        reopened = MmapEmbeddingCache(tmp_path, model_name="m", dim=2, capacity=8)
+        assert await reopened.get_many(["a", "b"]) == [[1.0, 0.0], [0.0, 1.0]]
+        # Opening compacts the journal into the snapshot
+        assert (tmp_path / MmapEmbeddingCache.JOURNAL_FILE).read_text() == ""
+
+    async def test_journal_is_compacted_once_it_outgrows_capacity(self, tmp_path):
+        cache = MmapEmbeddingCache(tmp_path, model_name="m", dim=2, capacity=2)
+
+        for i in range(3):
+            await cache.set_many({f"k{i}": [float(i), 0.0]})
+
+        assert (tmp_path / MmapEmbeddingCache.JOURNAL_FILE).read_text() == ""
+        reopened = MmapEmbeddingCache(tmp_path, model_name="m", dim=2, capacity=2)
+        assert await reopened.get_many(["k0", "k1", "k2"]) == [None, [1.0, 0.0], [2.0, 0.0]]
+
+    async def test_concurrent_batches_keep_index_and_vectors_in_step(self, tmp_path):
+        cache = MmapEmbeddingCache(tmp_path, model_name="m", dim=2, capacity=4)
+
+        await asyncio.gather(*(cache.set_many({f"k{i}": [float(i), 1.0]}) for i in range(6)))
+
+        reopened = MmapEmbeddingCache(tmp_path, model_name="m", dim=2, capacity=4)
+        keys = [f"k{i}" for i in range(6)]
+        assert await reopened.get_many(keys) == await cache.get_many(keys)
+        assert await reopened.get_many(["k5"]) == [[5.0, 1.0]]
+
+    async def test_slot_overwritten_without_journal_entry_reads_as_miss(self, tmp_path):
+        cache = MmapEmbeddingCache(tmp_path, model_name="m", dim=2, capacity=1)
+        await cache.set_many({"a": [1.0, 0.0]})
+        # Simulate a crash after "b" reused the slot but before its journal entry was written
+        cache._vectors[0] = np.asarray([0.0, 1.0], dtype=np.float16)
+        cache._tags[0] = MmapEmbeddingCache._tag("b")
+        cache._vectors.flush()
+        cache._tags.flush()
+
+        reopened = MmapEmbeddingCache(tmp_path, model_name="m", dim=2, capacity=1)
+
+        assert await reopened.get_many(["a", "b"]) == [None, None]
+
+
+class TestBuildEmbeddingCache:
+    def _settings(self, backend, path="", embedding_backend="torch"):
+        settings = MagicMock()
+        settings.embedding_backend = embedding_backend
+        settings.embedding_cache_backend = backend
+        settings.embedding_cache_max_entries = 16
+        settings.embedding_cache_ttl_seconds = 60
+        settings.embedding_cache_path = path
+        return settings
+
+    def test_none_leaves_embedder_unwrapped(self):
+        inner = make_inner()
+
+        assert with_embedding_cache(inner, self._settings("none"), "m", 4) is inner
+
+    def test_lru_wraps_embedder(self):
+        wrapped = with_embedding_cache(make_inner(), self._settings("lru"), "m", 4)
+
+        assert isinstance(wrapped, CachedEmbedder)
+
+    async def test_encoder_backends_do_not_share_keys(self):
+        shared = LRUEmbeddingCache()
+        torch_inner = make_inner()
+        onnx_inner = make_inner()
+        with patch("gim_backend.ingestion.embedding_cache.build_embedding_cache", return_value=shared):
+            torch_cached = with_embedding_cache(torch_inner, self._settings("lru"), "m", 4)
+            onnx_cached = with_embedding_cache(onnx_inner, self._settings("lru", embedding_backend="onnx_int8"), "m", 4)
+
+        await torch_cached.embed_documents(["same text"])
+        await onnx_cached.embed_documents(["same text"])
+
+        torch_inner.embed_documents.assert_awaited_once()
+        onnx_inner.embed_documents.assert_awaited_once()
+        assert len(shared) == 2
+
+    def test_mmap_requires_path(self):
+        with pytest.raises(ValueError, match="EMBEDDING_CACHE_PATH"):
+            build_embedding_cache(self._settings("mmap"), "m", 4)
+
+    def test_mmap_namespace_is_subdirectory(self, tmp_path):
+        backend = build_embedding_cache(self._settings("mmap", str(tmp_path)), "m", 4, namespace="worker-1")
+
+        assert isinstance(backend, MmapEmbeddingCache)
+        assert (tmp_path / "worker-1").is_dir()
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(ValueError, match="Unknown embedding cache backend"):
+            build_embedding_cache(self._settings("memcached"), "m", 4)
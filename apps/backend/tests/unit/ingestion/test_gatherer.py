@@ -10,6 +10,7 @@ from gim_backend.ingestion.gatherer import (
     BODY_TRUNCATE_LENGTH,
     Gatherer,
     IssueData,
+    IssueHighWaterMark,
 )
 from gim_backend.ingestion.quality_gate import QScoreComponents
 from gim_backend.ingestion.scout import RepositoryData
@@ -48,6 +49,7 @@ def make_issue_node(
     created_at: str = "2024-01-15T12:00:00Z",
     labels: list[str] | None = None,
     state: str = "OPEN",
+    updated_at: str | None = None,
 ):
     return {
         "id": node_id,
@@ -56,6 +58,7 @@ def make_issue_node(
         "title": title,
         "bodyText": body,
         "createdAt": created_at,
+        "updatedAt": updated_at or created_at,
         "state": state,
         "labels": {"nodes": [{"name": lbl} for lbl in (labels or [])]},
     }
@@ -407,6 +410,146 @@ class TestHarvestIssues:
         assert len(issues) >= 1
 
 
+class TestIncrementalHarvest:
+    def _page(self, nodes, has_next=False, cursor=None):
+        return {
+            "repository": {
+                "issues": {
+                    "pageInfo": {"hasNextPage": has_next, "endCursor": cursor},
+                    "nodes": nodes,
+                }
+            }
+        }
+
+    async def test_full_query_without_mark(self, mock_client, gatherer, sample_repo):
+        mock_client.execute_query.return_value = self._page(
+            [make_issue_node("I_1", body="## Description\n```code\n```")]
+        )
+
+        _ = [i async for i in gatherer._fetch_repo_issues(sample_repo)]
+
+        query = mock_client.execute_query.call_args.args[0]
+        variables = mock_client.execute_query.call_args.kwargs["variables"]
+        assert "filterBy" not in query
+        assert "since" not in variables
+
+    async def test_uses_since_filter_with_mark(self, mock_client, gatherer, sample_repo):
+        mark = IssueHighWaterMark(
+            last_created_at=datetime(2024, 1, 1, tzinfo=UTC),
+            last_updated_at=datetime(2024, 1, 10, tzinfo=UTC),
+        )
+        mock_client.execute_query.return_value = self._page([])
+
+        _ = [i async for i in gatherer._fetch_repo_issues(sample_repo, mark)]
+
+        query = mock_client.execute_query.call_args.args[0]
+        variables = mock_client.execute_query.call_args.kwargs["variables"]
+        assert "filterBy: {since: $since}" in query
+        assert "UPDATED_AT" in query
+        assert variables["since"] == "2024-01-10T00:00:00+00:00"
+
+    async def test_pages_oldest_update_first_to_the_end(self, mock_client, gatherer, sample_repo):
+        mark = IssueHighWaterMark(last_updated_at=datetime(2024, 1, 10, tzinfo=UTC))
+        mock_client.execute_query.side_effect = [
+            self._page(
+                [make_issue_node("I_1", body="## Description\n```code\n```", updated_at="2024-01-11T00:00:00Z")],
+                has_next=True,
+                cursor="cursor_1",
+            ),
+            self._page(
+                [make_issue_node("I_2", body="## Description\n```code\n```", updated_at="2024-01-12T00:00:00Z")]
+            ),
+        ]
+
+        issues = [i async for i in gatherer._fetch_repo_issues(sample_repo, mark)]
+
+        assert [i.node_id for i in issues] == ["I_1", "I_2"]
+        assert "direction: ASC" in mock_client.execute_query.call_args.args[0]
+        assert mock_client.execute_query.call_args.kwargs["variables"]["after"] == "cursor_1"
+
+    async def test_records_marks_for_completed_repos(self, mock_client, gatherer, sample_repo):
+        mock_client.execute_query.return_value = self._page(
+            [
+                make_issue_node(
+                    "I_1",
+                    body="## Description\n```code\n```",
+                    created_at="2024-01-15T12:00:00Z",
+                    updated_at="2024-02-01T00:00:00Z",
+                ),
+                make_issue_node(
+                    "I_2",
+                    body="## Description\n```code\n```",
+                    created_at="2024-01-20T12:00:00Z",
+                    updated_at="2024-01-21T00:00:00Z",
+                ),
+            ]
+        )
+
+        _ = [i async for i in gatherer.harvest_issues([sample_repo])]
+
+        mark = gatherer.get_high_water_marks()[sample_repo.node_id]
+        assert mark.last_created_at == datetime(2024, 1, 20, 12, 0, tzinfo=UTC)
+        assert mark.last_updated_at == datetime(2024, 2, 1, tzinfo=UTC)
+
+    async def test_keeps_previous_mark_when_nothing_new(self, mock_client, gatherer, sample_repo):
+        previous = IssueHighWaterMark(
+            last_created_at=datetime(2024, 1, 1, tzinfo=UTC),
+            last_updated_at=datetime(2024, 1, 10, tzinfo=UTC),
+        )
+        mock_client.execute_query.return_value = self._page([])
+
+        issues = [
+            i async for i in gatherer.harvest_issues([sample_repo], high_water_marks={sample_repo.node_id: previous})
+        ]
+
+        assert issues == []
+        mark = gatherer.get_high_water_marks()[sample_repo.node_id]
+        assert mark.last_updated_at == previous.last_updated_at
+        assert mark.last_created_at == previous.last_created_at
+
+    async def test_capped_repo_resumes_where_the_previous_run_stopped(self, mock_client, sample_repo):
+        previous = IssueHighWaterMark(
+            last_created_at=datetime(2024, 1, 1, tzinfo=UTC),
+            last_updated_at=datetime(2024, 1, 10, tzinfo=UTC),
+        )
+        updates = {"I_1": "2024-01-11", "I_2": "2024-01-12", "I_3": "2024-01-13", "I_4": "2024-01-14"}
+
+        async def execute(query, variables, estimated_cost):
+            # GitHub semantics: updated at or after `since`, oldest update first
+            since = datetime.fromisoformat(variables["since"])
+            nodes = [
+                make_issue_node(node_id, body="## Description\n```code\n```", updated_at=f"{day}T00:00:00Z")
+                for node_id, day in updates.items()
+                if datetime.fromisoformat(f"{day}T00:00:00+00:00") >= since
+            ]
+            return self._page(nodes)
+
+        mock_client.execute_query.side_effect = execute
+        gatherer = Gatherer(client=mock_client, max_issues_per_repo=2)
+
+        first = [
+            i async for i in gatherer.harvest_issues([sample_repo], high_water_marks={sample_repo.node_id: previous})
+        ]
+        mark = gatherer.get_high_water_marks()[sample_repo.node_id]
+        second = [i async for i in gatherer.harvest_issues([sample_repo], high_water_marks={sample_repo.node_id: mark})]
+
+        assert [i.node_id for i in first] == ["I_1", "I_2"]
+        assert mark.last_updated_at == datetime(2024, 1, 12, tzinfo=UTC)
+        # The issue at the mark is read again; the rest continue where the cap stopped
+        assert [i.node_id for i in second] == ["I_2", "I_3"]
+        assert gatherer.get_high_water_marks()[sample_repo.node_id].last_updated_at == datetime(
+            2024, 1, 13, tzinfo=UTC
+        )
+
+    async def test_failed_repo_does_not_record_mark(self, mock_client, gatherer, sample_repo):
+        mock_client.execute_query.side_effect = Exception("API Error")
+
+        with patch("asyncio.sleep", new_callable=AsyncMock):
+            _ = [i async for i in gatherer.harvest_issues([sample_repo])]
+
+        assert gatherer.get_high_water_marks() == {}
+
+
 class TestIssueData:
     def test_dataclass_fields(self):
         components = QScoreComponents(
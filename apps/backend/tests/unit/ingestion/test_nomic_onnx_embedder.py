@@ -0,0 +1,173 @@
+import json
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from gim_backend.ingestion.nomic_moe_embedder import (
+    EMBEDDING_DIM,
+    MODEL_NAME,
+    NomicMoEEmbedder,
+    create_nomic_embedder,
+    embedding_model_tag,
+)
+from gim_backend.ingestion.nomic_onnx_embedder import (
+    INT8_FILE,
+    META_FILE,
+    NomicOnnxEmbedder,
+    mean_pool,
+)
+
+
+def make_tokenizer():
+    tokenizer = MagicMock()
+
+    def encode_batch(texts):
+        width = max(len(t.split()) for t in texts)
+        return [
+            SimpleNamespace(
+                ids=list(range(1, len(t.split()) + 1)) + [0] * (width - len(t.split())),
+                attention_mask=[1] * len(t.split()) + [0] * (width - len(t.split())),
+            )
+            for t in texts
+        ]
+
+    tokenizer.encode_batch.side_effect = encode_batch
+    return tokenizer
+
+
+def make_session(hidden_dim=768):
+    session = MagicMock()
+    session.get_inputs.return_value = [SimpleNamespace(name="input_ids"), SimpleNamespace(name="attention_mask")]
+
+    def run(_, feeds):
+        ids = feeds["input_ids"].astype(np.float32)
+        hidden = np.repeat(ids[..., None], hidden_dim, axis=2)
+        hidden[..., 1] = 1.0
+        return [hidden]
+
+    session.run.side_effect = run
+    return session
+
+
+@pytest.fixture
+def embedder(tmp_path):
+    embedder = NomicOnnxEmbedder(model_dir=tmp_path)
+    embedder._model = make_session()
+    embedder._tokenizer = make_tokenizer()
+    yield embedder
+    embedder.close()
+
+
+class TestMeanPool:
+
+    def test_padding_tokens_are_ignored(self):
+        hidden = np.array([[[1.0, 2.0], [3.0, 4.0], [100.0, 100.0]]], dtype=np.float32)
+        mask = np.array([[1, 1, 0]])
+
+        assert mean_pool(hidden, mask).tolist() == [[2.0, 3.0]]
+
+
+class TestNomicOnnxEmbedder:
+
+    async def test_output_contract_matches_torch_path(self, embedder):
+        result = await embedder.embed_documents(["one", "one two three"])
+
+        assert len(result) == 2
+        assert all(len(v) == EMBEDDING_DIM for v in result)
+        assert all(abs(np.linalg.norm(v) - 1.0) < 1e-5 for v in result)
+
+    async def test_prefix_is_tokenized(self, embedder):
+        await embedder.embed_queries(["react hooks"])
+
+        assert embedder._tokenizer.encode_batch.call_args[0][0] == ["search_query: react hooks"]
+
+    async def test_token_type_ids_fed_when_graph_expects_them(self, embedder):
+        embedder._model.get_inputs.return_value.append(SimpleNamespace(name="token_type_ids"))
+
+        await embedder.embed_documents(["doc"])
+
+        feeds = embedder._model.run.call_args[0][1]
+        assert feeds["token_type_ids"].shape == feeds["input_ids"].shape
+
+    def test_construction_does_not_import_torch(self, tmp_path, monkeypatch):
+        monkeypatch.setitem(sys.modules, "torch", None)
+
+        with patch("gim_backend.ingestion.nomic_moe_embedder.logger") as logger:
+            embedder = NomicOnnxEmbedder(model_dir=tmp_path, num_threads=3)
+
+        logger.warning.assert_not_called()
+        assert embedder._num_threads == 3
+        embedder.close()
+
+    def test_defaults_to_int8_model(self, tmp_path):
+        embedder = NomicOnnxEmbedder(model_dir=tmp_path)
+
+        assert embedder.model_path == tmp_path / INT8_FILE
+        embedder.close()
+
+    def test_existing_export_is_reused(self, tmp_path):
+        (tmp_path / INT8_FILE).write_bytes(b"onnx")
+        (tmp_path / META_FILE).write_text(json.dumps({"model_name": MODEL_NAME}))
+        embedder = NomicOnnxEmbedder(model_dir=tmp_path, num_threads=3)
+
+        with (
+            patch("gim_backend.ingestion.nomic_onnx_embedder.export_onnx_model") as export,
+            patch("gim_backend.ingestion.nomic_onnx_embedder._load_tokenizer"),
+            patch("gim_backend.ingestion.nomic_onnx_embedder._create_session") as create_session,
+        ):
+            embedder.warmup()
+
+        export.assert_not_called()
+        create_session.assert_called_once_with(tmp_path / INT8_FILE, 3)
+        assert embedder.memory_footprint_bytes() == 4
+        embedder.close()
+
+    def test_export_for_other_model_is_replaced(self, tmp_path):
+        (tmp_path / INT8_FILE).write_bytes(b"onnx")
+        (tmp_path / META_FILE).write_text(json.dumps({"model_name": "nomic-ai/nomic-embed-text-v1.5"}))
+        embedder = NomicOnnxEmbedder(model_dir=tmp_path)
+
+        with (
+            patch("gim_backend.ingestion.nomic_onnx_embedder.export_onnx_model") as export,
+            patch("gim_backend.ingestion.nomic_onnx_embedder._load_tokenizer"),
+            patch("gim_backend.ingestion.nomic_onnx_embedder._create_session"),
+        ):
+            embedder.warmup()
+
+        export.assert_called_once_with(tmp_path, quantize=True)
+        embedder.close()
+
+
+class TestCreateNomicEmbedder:
+
+    def _settings(self, backend, path=""):
+        settings = MagicMock()
+        settings.embedding_backend = backend
+        settings.embedding_onnx_path = path
+        return settings
+
+    def test_torch_backend(self):
+        embedder = create_nomic_embedder(self._settings("torch"))
+
+        assert type(embedder) is NomicMoEEmbedder
+        embedder.close()
+
+    @pytest.mark.parametrize("backend, quantized", [("onnx", False), ("onnx_int8", True)])
+    def test_onnx_backends(self, tmp_path, backend, quantized):
+        embedder = create_nomic_embedder(self._settings(backend, str(tmp_path)), num_threads=4)
+
+        assert isinstance(embedder, NomicOnnxEmbedder)
+        assert embedder._quantize is quantized
+        assert embedder._num_threads == 4
+        embedder.close()
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(ValueError, match="Unknown embedding backend"):
+            create_nomic_embedder(self._settings("tensorrt"))
+
+    def test_model_tag_names_backend(self):
+        assert embedding_model_tag(self._settings("ONNX_INT8")) == f"{MODEL_NAME}@onnx_int8"
+        assert embedding_model_tag(self._settings("")) == embedding_model_tag(self._settings("torch"))
@@ -3,7 +3,9 @@
 from datetime import UTC, datetime
 from unittest.mock import AsyncMock, MagicMock
 
+import numpy as np
 import pytest
+from gim_database.vector import decode_halfvec
 
 from gim_backend.ingestion.embeddings import EmbeddedIssue
 from gim_backend.ingestion.gatherer import IssueData
@@ -186,7 +188,8 @@ class TestUpsertStagedIssue:
         assert params["q_score"] == 0.8
         assert params["content_hash"] == "hash-1"
         assert "survival_score" in params
-        assert isinstance(params["embedding"], str)
+        # Bound as float32 for the binary pgvector codec, not as a text literal
+        assert params["embedding"].dtype == np.float32
         assert params["github_created_at"].tzinfo is None
         mock_session.commit.assert_not_called()
 
@@ -205,6 +208,132 @@ class TestUpsertStagedIssue:
             await persistence.upsert_staged_issue(issue, [0.1] * 10)
 
 
+class TestUpsertStagedIssues:
+    def _staged(self, node_id: str, labels: list[str] | None = None) -> dict:
+        return {
+            "node_id": node_id,
+            "repo_id": "R_123",
+            "title": f"Staged {node_id}",
+            "body_text": "Body",
+            "labels": labels or [],
+            "github_created_at": "2026-02-25T12:00:00Z",
+            "has_code": True,
+            "has_template_headers": False,
+            "tech_stack_weight": 0.25,
+            "q_score": 0.8,
+            "state": "open",
+            "content_hash": f"hash-{node_id}",
+        }
+
+    async def test_single_statement_for_batch(self, persistence, mock_session):
+        items = [(self._staged(f"I_{i}", ["bug"]), [0.1] * 256) for i in range(3)]
+
+        await persistence.upsert_staged_issues(items)
+
+        mock_session.exec.assert_called_once()
+        params = mock_session.exec.call_args.kwargs["params"]
+        assert params["node_ids"] == ["I_0", "I_1", "I_2"]
+        assert params["labels"] == ['["bug"]'] * 3
+        assert all(decode_halfvec(e).shape == (256,) for e in params["embeddings"])
+        assert len(params["survival_scores"]) == 3
+        assert all(dt.tzinfo is None for dt in params["github_created_ats"])
+        mock_session.commit.assert_not_called()
+
+    async def test_empty_batch_skips_database(self, persistence, mock_session):
+        await persistence.upsert_staged_issues([])
+
+        mock_session.exec.assert_not_called()
+
+    async def test_raises_for_invalid_embedding_dimension(self, persistence, mock_session):
+        items = [(self._staged("I_ok"), [0.1] * 256), (self._staged("I_bad"), [0.1] * 10)]
+
+        with pytest.raises(ValueError, match="I_bad"):
+            await persistence.upsert_staged_issues(items)
+        mock_session.exec.assert_not_called()
+
+
+class TestRefreshUnchangedIssues:
+    async def test_updates_metadata_guarded_by_content_hash(self, persistence, mock_session):
+        result = MagicMock()
+        result.fetchall.return_value = [("I_same",)]
+        mock_session.exec.return_value = result
+        issue = {
+            "node_id": "I_same",
+            "repo_id": "R_123",
+            "title": "Same",
+            "body_text": "Body",
+            "labels": ["bug"],
+            "github_created_at": "2026-02-25T12:00:00Z",
+            "q_score": 0.6,
+            "state": "closed",
+            "content_hash": "hash-same",
+        }
+
+        refreshed = await persistence.refresh_unchanged_issues([issue])
+
+        assert refreshed == {"I_same"}
+        params = mock_session.exec.call_args.kwargs["params"]
+        assert params["states"] == ["closed"]
+        assert params["content_hashes"] == ["hash-same"]
+        assert params["survival_scores"][0] > 0
+        assert "embeddings" not in params
+
+    async def test_empty_list_skips_database(self, persistence, mock_session):
+        assert await persistence.refresh_unchanged_issues([]) == set()
+        mock_session.exec.assert_not_called()
+
+    async def test_requires_stored_embedding_from_the_same_encoder(self, persistence, mock_session, monkeypatch):
+        from gim_backend.ingestion.persistence import StreamingPersistence
+
+        monkeypatch.setattr("gim_backend.ingestion.persistence.text", lambda sql: sql)
+
+        result = MagicMock()
+        result.fetchall.return_value = []
+        mock_session.exec.return_value = result
+        tagged = StreamingPersistence(session=mock_session, embedding_model="nomic@onnx")
+        issue = {
+            "node_id": "I_same",
+            "repo_id": "R_123",
+            "title": "Same",
+            "body_text": "Body",
+            "github_created_at": "2026-02-25T12:00:00Z",
+            "content_hash": "hash-same",
+        }
+
+        assert await tagged.refresh_unchanged_issues([issue]) == set()
+
+        sql = " ".join(str(mock_session.exec.call_args.args[0]).split())
+        assert "AND i.embedding IS NOT NULL" in sql
+        assert "AND i.embedding_model = CAST(:embedding_model AS text)" in sql
+        assert mock_session.exec.call_args.kwargs["params"]["embedding_model"] == "nomic@onnx"
+
+    async def test_upserts_record_the_encoder(self, persistence, mock_session, monkeypatch):
+        from gim_backend.ingestion.persistence import StreamingPersistence
+
+        monkeypatch.setattr("gim_backend.ingestion.persistence.text", lambda sql: sql)
+
+        tagged = StreamingPersistence(session=mock_session, embedding_model="nomic@onnx")
+        issue = {
+            "node_id": "I_1",
+            "repo_id": "R_123",
+            "title": "New",
+            "body_text": "Body",
+            "github_created_at": "2026-02-25T12:00:00Z",
+            "content_hash": "hash-1",
+        }
+
+        await tagged.upsert_staged_issues([(issue, [0.1] * 256)])
+        bulk_sql = str(mock_session.exec.call_args.args[0])
+        bulk_params = mock_session.exec.call_args.kwargs["params"]
+        await tagged.upsert_staged_issue(issue, [0.1] * 256)
+        single_sql = str(mock_session.exec.call_args.args[0])
+
+        assert "embedding_model = EXCLUDED.embedding_model" in bulk_sql
+        assert "embedding_model = EXCLUDED.embedding_model" in single_sql
+        assert bulk_params["embedding_model"] == "nomic@onnx"
+        assert mock_session.exec.call_args.kwargs["params"]["embedding_model"] == "nomic@onnx"
+
+
 class TestSurvivalScoreInjection:
     async def test_survival_score_calculated(self, persistence, mock_session, make_embedded_issue):
 
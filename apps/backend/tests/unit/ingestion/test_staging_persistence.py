@@ -0,0 +1,109 @@
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from gim_backend.ingestion.gatherer import IssueData
+from gim_backend.ingestion.quality_gate import QScoreComponents
+from gim_backend.ingestion.staging_persistence import StagingPersistence
+
+
+def make_issue(node_id: str = "I_1") -> IssueData:
+    return IssueData(
+        node_id=node_id,
+        repo_id="R_1",
+        title="Bug report",
+        body_text="Description",
+        labels=["bug"],
+        github_created_at=datetime(2024, 1, 15, tzinfo=UTC),
+        q_score=0.75,
+        q_components=QScoreComponents(has_code=True, has_headers=False, tech_weight=0.5, is_junk=False),
+        state="open",
+    )
+
+
+def make_session(driver) -> AsyncMock:
+    raw = MagicMock()
+    raw.driver_connection = driver
+    connection = MagicMock()
+    connection.get_raw_connection = AsyncMock(return_value=raw)
+
+    session = AsyncMock()
+    session.connection = AsyncMock(return_value=connection)
+    session.commit = AsyncMock()
+    return session
+
+
+@pytest.fixture
+def copy_driver():
+    driver = MagicMock()
+    driver.copy_records_to_table = AsyncMock()
+    return driver
+
+
+class TestInsertPendingIssuesCopy:
+    async def test_empty_list_skips_database(self, copy_driver):
+        session = make_session(copy_driver)
+
+        assert await StagingPersistence(session).insert_pending_issues([]) == 0
+        session.execute.assert_not_called()
+
+    async def test_copies_all_rows_in_one_call(self, copy_driver):
+        session = make_session(copy_driver)
+        merge_result = MagicMock()
+        merge_result.fetchall.return_value = [("I_0",), ("I_1",), ("I_2",)]
+        session.execute.side_effect = [MagicMock(), merge_result]
+
+        await StagingPersistence(session).insert_pending_issues([make_issue(f"I_{i}") for i in range(3)])
+
+        copy_driver.copy_records_to_table.assert_awaited_once()
+        kwargs = copy_driver.copy_records_to_table.call_args.kwargs
+        records = kwargs["records"]
+        assert len(records) == 3
+        assert kwargs["columns"][0] == "seq"
+        assert [r[0] for r in records] == [0, 1, 2]
+        assert records[0][1] == "I_0"
+        assert len(records[0]) == len(kwargs["columns"])
+
+    async def test_returns_inserted_count_from_merge(self, copy_driver):
+        session = make_session(copy_driver)
+        merge_result = MagicMock()
+        merge_result.fetchall.return_value = [("I_0",)]
+        session.execute.side_effect = [MagicMock(), merge_result]
+
+        inserted = await StagingPersistence(session).insert_pending_issues(
+            [make_issue("I_0"), make_issue("I_existing")]
+        )
+
+        assert inserted == 1
+        session.commit.assert_awaited_once()
+
+    async def test_merge_skips_conflicts_and_keeps_first_duplicate(self, copy_driver):
+        session = make_session(copy_driver)
+        merge_result = MagicMock()
+        merge_result.fetchall.return_value = []
+        session.execute.side_effect = [MagicMock(), merge_result]
+
+        await StagingPersistence(session).insert_pending_issues([make_issue()])
+
+        merge_sql = str(session.execute.call_args_list[1].args[0])
+        assert "ON CONFLICT (node_id) DO NOTHING" in merge_sql
+        assert "RETURNING node_id" in merge_sql
+        assert "DISTINCT ON (node_id)" in merge_sql
+
+
+class TestInsertPendingIssuesRowwise:
+    async def test_falls_back_without_copy_support(self):
+        session = make_session(MagicMock(spec=[]))
+        inserted_row = MagicMock(rowcount=1)
+        skipped_row = MagicMock(rowcount=0)
+        session.execute.side_effect = [inserted_row, skipped_row]
+
+        inserted = await StagingPersistence(session).insert_pending_issues([make_issue("I_0"), make_issue("I_1")])
+
+        assert inserted == 1
+        assert session.execute.await_count == 2
+        params = session.execute.call_args_list[0].args[1]
+        assert params["node_id"] == "I_0"
+        assert params["has_code"] is True
+        assert len(params["content_hash"]) == 64
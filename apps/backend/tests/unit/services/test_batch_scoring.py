@@ -0,0 +1,150 @@
+"""Tests for batched users x issues scoring."""
+
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from gim_backend.services.batch_scoring import (
+    freshness_decay_array,
+    language_codes,
+    score_users_against_issues,
+)
+from gim_backend.services.feed_service import freshness_decay
+
+FRESHNESS = {"freshness_half_life_days": 7.0, "freshness_floor": 0.2, "freshness_weight": 0.25}
+
+
+def _data(n_users=40, n_issues=300, dim=16, seed=7):
+    rng = np.random.default_rng(seed)
+    return (
+        rng.normal(size=(n_users, dim)).astype(np.float32),
+        rng.normal(size=(n_issues, dim)).astype(np.float32),
+        rng.uniform(0, 30, size=n_issues),
+    )
+
+
+def _brute_force(users, issues, age_days, k, mask=None):
+    users = users / np.linalg.norm(users, axis=1, keepdims=True)
+    issues = issues / np.linalg.norm(issues, axis=1, keepdims=True)
+    bonus = 0.25 * np.array([freshness_decay(age_days=a, half_life_days=7.0, floor=0.2) for a in age_days])
+    scores = users @ issues.T + bonus
+    expected = []
+    for u in range(users.shape[0]):
+        eligible = np.arange(issues.shape[0]) if mask is None else np.flatnonzero(mask[u])
+        ranked = sorted(eligible, key=lambda i: (-scores[u, i], i))[:k]
+        expected.append([int(i) for i in ranked])
+    return expected, scores
+
+
+class TestFreshnessDecayArray:
+    def test_matches_scalar_freshness_decay(self):
+        ages = np.array([-1.0, 0.0, 0.5, 7.0, 30.0, 365.0])
+
+        vectorized = freshness_decay_array(ages, half_life_days=7.0, floor=0.2)
+
+        expected = [freshness_decay(age_days=a, half_life_days=7.0, floor=0.2) for a in ages]
+        assert vectorized == pytest.approx(expected, rel=1e-6)
+
+    def test_non_positive_half_life_returns_clamped_floor(self):
+        assert freshness_decay_array(np.array([0.0, 5.0]), half_life_days=0, floor=1.5).tolist() == [1.0, 1.0]
+
+
+class TestScoreUsersAgainstIssues:
+    def test_matches_brute_force_ranking(self):
+        users, issues, ages = _data()
+
+        top = score_users_against_issues(users, issues, ages, k=10, **FRESHNESS)
+
+        expected, scores = _brute_force(users, issues, ages, k=10)
+        for u in range(users.shape[0]):
+            indices, final_scores, similarity = top.for_user(u)
+            assert indices == expected[u]
+            assert final_scores == pytest.approx([scores[u, i] for i in indices], abs=1e-5)
+            assert all(-1.0 - 1e-5 <= s <= 1.0 + 1e-5 for s in similarity)
+
+    def test_small_memory_budget_tiles_to_same_result(self):
+        users, issues, ages = _data()
+
+        whole = score_users_against_issues(users, issues, ages, k=10, **FRESHNESS)
+        tiled = score_users_against_issues(
+            users, issues, ages, k=10, memory_budget_bytes=1, issue_chunk=17, **FRESHNESS
+        )
+
+        assert np.array_equal(whole.indices, tiled.indices)
+        assert np.allclose(whole.scores, tiled.scores)
+
+    def test_filters_mask_ineligible_issues(self):
+        users, issues, ages = _data(n_users=6, n_issues=50)
+        rng = np.random.default_rng(3)
+        q_scores = rng.uniform(0, 1, size=50)
+        min_q = np.array([0.0, 0.5, 0.9, 0.0, 0.0, 0.0])
+        issue_languages = [["Python", "Rust", None][i % 3] for i in range(50)]
+        user_languages = [None, None, None, ["Python"], ["Go"], None]
+        ingested = np.arange(50, dtype=np.float64)
+        since = np.array([np.nan, np.nan, np.nan, np.nan, np.nan, 39.0])
+        codes, allowed = language_codes(issue_languages, user_languages)
+
+        top = score_users_against_issues(
+            users,
+            issues,
+            ages,
+            k=50,
+            issue_q_scores=q_scores,
+            user_min_q_scores=min_q,
+            issue_language_codes=codes,
+            user_allowed_languages=allowed,
+            issue_ingested_at=ingested,
+            user_since=since,
+            **FRESHNESS,
+        )
+
+        mask = (q_scores[None, :] >= min_q[:, None]) & allowed[:, codes]
+        mask &= np.isnan(since)[:, None] | (ingested[None, :] > since[:, None])
+        expected, _ = _brute_force(users, issues, ages, k=50, mask=mask)
+        for u in range(6):
+            assert top.for_user(u)[0] == expected[u]
+        # Unknown preferred language excludes everything; cutoff keeps only ingested > 39
+        assert top.for_user(4)[0] == []
+        assert sorted(top.for_user(5)[0]) == list(range(40, 50))
+
+    def test_empty_inputs_return_empty_rows(self):
+        users, issues, ages = _data(n_users=2, n_issues=0)
+
+        top = score_users_against_issues(users, issues.reshape(0, 16), ages[:0], k=5, **FRESHNESS)
+
+        assert top.for_user(0) == ([], [], [])
+
+    @pytest.mark.parametrize("budget_mb, k", [(4, 20), (16, 200)])
+    def test_peak_working_memory_stays_within_budget(self, budget_mb, k):
+        users, issues, ages = _data(n_users=3000, n_issues=20000, dim=8)
+        rng = np.random.default_rng(5)
+        since = np.full(3000, np.nan)
+        since[::2] = 10000.0
+        codes, allowed = language_codes([["Python", "Rust", None][i % 3] for i in range(20000)], [None] * 3000)
+        budget = budget_mb * 1024 * 1024
+        # Not tiled: normalized input copies, the (U, K) results and per-issue freshness temporaries
+        fixed = users.nbytes + issues.nbytes + 3000 * k * (8 + 4 + 4) + 20000 * 8 * 6
+
+        tracemalloc.start()
+        try:
+            score_users_against_issues(
+                users,
+                issues,
+                ages,
+                k=k,
+                issue_q_scores=rng.uniform(0, 1, size=20000),
+                user_min_q_scores=rng.uniform(0, 0.5, size=3000),
+                issue_language_codes=codes,
+                user_allowed_languages=allowed,
+                issue_ingested_at=np.arange(20000, dtype=np.float64),
+                user_since=since,
+                memory_budget_bytes=budget,
+                issue_chunk=4096,
+                **FRESHNESS,
+            )
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert peak - fixed <= budget
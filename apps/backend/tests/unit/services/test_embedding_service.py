@@ -0,0 +1,88 @@
+"""Unit tests for the shared query embedding service"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from gim_backend.ingestion.embedding_cache import CachedEmbedder, LRUEmbeddingCache
+from gim_backend.services import embedding_service
+from gim_backend.services.embedding_service import EMBEDDING_DIM, assert_vector_dim
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    embedding_service.reset_embedder_for_testing()
+    yield
+    embedding_service.reset_embedder_for_testing()
+
+
+def make_model():
+    model = MagicMock()
+    model.warmup = MagicMock()
+    model.embed_queries = AsyncMock(side_effect=lambda texts: [[0.0] * EMBEDDING_DIM for _ in texts])
+    model.memory_footprint_bytes = MagicMock(return_value=2 * 2**20)
+    return model
+
+
+class TestAssertVectorDim:
+    def test_accepts_matching_dimension(self):
+        assert_vector_dim([0.0] * EMBEDDING_DIM, context="search")
+
+    def test_rejects_legacy_768_dim_vector(self):
+        with pytest.raises(ValueError, match="expected 256, got 768"):
+            assert_vector_dim([0.0] * 768, context="search")
+
+
+class TestBuildEmbedder:
+    def test_unknown_mode_raises(self):
+        settings = MagicMock()
+        settings.embedding_mode = "openai"
+
+        with patch.object(embedding_service, "get_settings", return_value=settings):
+            with pytest.raises(ValueError, match="Unknown embedding mode"):
+                embedding_service._build_embedder()
+
+    def test_nomic_mode_builds_moe_embedder(self):
+        settings = MagicMock()
+        settings.embedding_mode = "nomic"
+        settings.embedding_cache_backend = "none"
+
+        with (
+            patch.object(embedding_service, "get_settings", return_value=settings),
+            patch.object(embedding_service, "create_nomic_embedder") as create,
+        ):
+            embedder = embedding_service._build_embedder()
+
+        assert embedder is create.return_value
+        create.assert_called_once_with(settings, max_workers=1)
+
+
+class TestWarmupEmbedder:
+    async def test_loads_model_and_reports_footprint(self):
+        model = make_model()
+
+        with patch.object(embedding_service, "get_embedder", AsyncMock(return_value=model)):
+            stats = await embedding_service.warmup_embedder()
+
+        model.warmup.assert_called_once()
+        model.embed_queries.assert_awaited_once_with(["warmup"])
+        assert stats["embedding_dim"] == EMBEDDING_DIM
+        assert stats["model_mb"] == 2.0
+        assert stats["rss_mb"] > 0
+
+    async def test_bypasses_cache_wrapper(self):
+        model = make_model()
+        cached = CachedEmbedder(model, LRUEmbeddingCache(), model_name="m", dim=EMBEDDING_DIM)
+
+        with patch.object(embedding_service, "get_embedder", AsyncMock(return_value=cached)):
+            await embedding_service.warmup_embedder()
+
+        assert cached.stats.misses == 0
+        model.embed_queries.assert_awaited_once()
+
+    async def test_failure_is_not_fatal(self):
+        model = make_model()
+        model.warmup.side_effect = OSError("weights missing")
+
+        with patch.object(embedding_service, "get_embedder", AsyncMock(return_value=model)):
+            assert await embedding_service.warmup_embedder() is None
@@ -0,0 +1,245 @@
+"""Tests for precomputed per-user personalized feeds."""
+
+import json
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from gim_backend.services.feed_materialization import (
+    FEED_MATERIALIZATION_PREFIX,
+    FeedMaterialization,
+    _deserialize_materialization,
+    _serialize_materialization,
+    combined_vector_digest,
+    get_materialized_feed,
+    store_materialized_feed,
+)
+from gim_backend.services.feed_service import (
+    get_feed,
+    materialize_user_feed,
+    refresh_user_feed_materialization,
+)
+from gim_backend.services.feed_snapshot import FEED_SNAPSHOT_PREFIX, FeedSnapshot, get_feed_snapshot
+from gim_backend.services.index_generation import reset_index_generation_for_testing
+
+USER_ID = uuid4()
+VECTOR = [0.1] * 256
+
+
+class _FakeRedis:
+    def __init__(self, generation: int = 3):
+        self._kv: dict[str, tuple[int | None, str]] = {"index:generation": (None, str(generation))}
+
+    async def setex(self, key: str, ttl: int, value: str) -> None:
+        self._kv[key] = (ttl, value)
+
+    async def get(self, key: str):
+        item = self._kv.get(key)
+        return item[1] if item else None
+
+
+def _profile(**overrides):
+    values = {"combined_vector": VECTOR, "preferred_languages": ["Python"], "min_heat_threshold": 0.5}
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _entry(**snapshot_overrides) -> FeedMaterialization:
+    snapshot = {
+        "user_id": USER_ID,
+        "languages": ["Python"],
+        "labels": None,
+        "repos": None,
+        "node_ids": ["I_0", "I_1", "I_2"],
+        "similarity_scores": [0.9, 0.8, 0.7],
+        "freshness": [0.5, 0.5, 0.5],
+        "final_scores": [1.0, 0.9, 0.8],
+    }
+    snapshot.update(snapshot_overrides)
+    return FeedMaterialization(
+        vector_digest=combined_vector_digest(VECTOR),
+        min_q_score=0.5,
+        snapshot=FeedSnapshot(**snapshot),
+    )
+
+
+def _issue_row(node_id: str, **extra):
+    return SimpleNamespace(
+        node_id=node_id,
+        title=node_id,
+        body_text="Body",
+        github_url=None,
+        labels=[],
+        q_score=0.7,
+        github_created_at=datetime(2026, 1, 1, tzinfo=UTC),
+        repo_name="o/r",
+        primary_language="Python",
+        repo_topics=[],
+        **extra,
+    )
+
+
+def _result_with_rows(rows):
+    result = MagicMock()
+    result.fetchall.return_value = rows
+    return result
+
+
+def _db(rows):
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=_result_with_rows(rows))
+    savepoint = AsyncMock()
+    savepoint.__aenter__.return_value = savepoint
+    savepoint.__aexit__.return_value = None
+    db.begin_nested = MagicMock(return_value=savepoint)
+    return db
+
+
+def _settings():
+    return SimpleNamespace(
+        feed_freshness_half_life_days=7.0,
+        feed_freshness_floor=0.2,
+        feed_freshness_weight=0.25,
+        feed_debug_freshness=False,
+        feed_vector_retrieval="exact",
+        vector_rerank_factor=4,
+        feed_snapshot_ttl_seconds=1800,
+        feed_materialization_ttl_seconds=21600,
+    )
+
+
+@pytest.fixture
+def fake_redis():
+    redis = _FakeRedis()
+    reset_index_generation_for_testing()
+    get_redis = AsyncMock(return_value=redis)
+    with (
+        patch("gim_backend.services.feed_materialization.get_redis", new=get_redis),
+        patch("gim_backend.services.feed_snapshot.get_redis", new=get_redis),
+        patch("gim_backend.services.feed_materialization.get_settings", return_value=_settings()),
+        patch("gim_backend.services.feed_snapshot.get_settings", return_value=_settings()),
+        patch("gim_backend.services.feed_service.get_settings", return_value=_settings()),
+        patch("gim_backend.services.feed_service._pgvector_supports_iterative_scan", new=AsyncMock(return_value=True)),
+        patch("gim_backend.services.feed_service.compute_why_this", return_value=[]),
+    ):
+        yield redis
+    reset_index_generation_for_testing()
+
+
+class TestMaterializationEntry:
+    def test_round_trip(self):
+        assert _deserialize_materialization(_serialize_materialization(_entry())) == _entry()
+
+    def test_digest_matches_vector_read_back_from_halfvec(self):
+        stored = np.asarray([0.1] * 4, dtype=np.float16).astype(np.float32)
+
+        assert combined_vector_digest([0.1] * 4) == combined_vector_digest(stored)
+        assert combined_vector_digest([0.1] * 4) != combined_vector_digest([0.2] * 4)
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_served(self, fake_redis):
+        await store_materialized_feed(USER_ID, _entry())
+
+        ttl, _ = fake_redis._kv[f"{FEED_MATERIALIZATION_PREFIX}{USER_ID}"]
+        assert ttl == 21600
+        assert await get_materialized_feed(USER_ID, _profile()) == _entry().snapshot
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "profile",
+        [
+            _profile(combined_vector=[0.2] * 256),
+            _profile(preferred_languages=["Rust"]),
+            _profile(min_heat_threshold=0.8),
+        ],
+    )
+    async def test_profile_changes_make_entry_stale(self, fake_redis, profile):
+        await store_materialized_feed(USER_ID, _entry())
+
+        assert await get_materialized_feed(USER_ID, profile) is None
+
+    @pytest.mark.asyncio
+    async def test_generation_bump_keeps_entry_fresh(self, fake_redis):
+        await store_materialized_feed(USER_ID, _entry())
+        fake_redis._kv["index:generation"] = (None, "9")
+
+        assert await get_materialized_feed(USER_ID, _profile()) == _entry().snapshot
+
+    def test_reads_entries_stamped_with_a_generation(self):
+        stamped = json.loads(_serialize_materialization(_entry()))
+        stamped["generation"] = 2
+
+        assert _deserialize_materialization(json.dumps(stamped)) == _entry()
+
+
+class TestMaterializeUserFeed:
+    @pytest.mark.asyncio
+    async def test_ranks_default_feed(self, fake_redis):
+        rows = [
+            _issue_row(f"I_{i}", similarity_score=0.8, freshness=0.5, final_score=1.0 - i * 0.1, total_count=2)
+            for i in range(2)
+        ]
+        db = _db(rows)
+
+        count = await materialize_user_feed(db, USER_ID, _profile())
+
+        assert count == 2
+        sql, params = db.execute.await_args.args
+        assert "ORDER BY i.embedding <=>" in str(sql)
+        assert params["langs"] == ["Python"]
+        assert "labels" not in params
+        served = await get_materialized_feed(USER_ID, _profile())
+        assert served.node_ids == ["I_0", "I_1"]
+
+    @pytest.mark.asyncio
+    async def test_skips_without_redis_or_vector(self):
+        db = _db([])
+        with patch("gim_backend.services.feed_materialization.get_redis", new=AsyncMock(return_value=None)):
+            assert await materialize_user_feed(db, USER_ID, _profile()) is None
+        assert await materialize_user_feed(db, USER_ID, _profile(combined_vector=None)) is None
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_refresh_swallows_query_errors(self, fake_redis):
+        db = _db([])
+        db.execute.side_effect = RuntimeError("statement timeout")
+
+        await refresh_user_feed_materialization(db, USER_ID, _profile())
+
+        db.begin_nested.assert_called_once()
+        assert f"{FEED_MATERIALIZATION_PREFIX}{USER_ID}" not in fake_redis._kv
+
+
+class TestFeedReadsMaterialization:
+    @pytest.mark.asyncio
+    async def test_default_feed_served_without_vector_query(self, fake_redis):
+        await store_materialized_feed(USER_ID, _entry())
+        batch_id = uuid4()
+        db = _db([_issue_row("I_1"), _issue_row("I_0")])
+
+        with patch("gim_backend.services.feed_service.get_or_create_profile", new=AsyncMock(return_value=_profile())):
+            page = await get_feed(db, USER_ID, page=1, page_size=2, recommendation_batch_id=batch_id)
+
+        assert db.execute.await_count == 1
+        assert "embedding" not in str(db.execute.await_args.args[0])
+        assert [item.node_id for item in page.results] == ["I_0", "I_1"]
+        assert (page.total, page.has_more) == (3, True)
+        # Later pages slice a copy that outlives re-materialization
+        assert page.snapshot_id == str(batch_id)
+        assert f"{FEED_SNAPSHOT_PREFIX}{batch_id}" in fake_redis._kv
+        assert (await get_feed_snapshot(batch_id)).node_ids == ["I_0", "I_1", "I_2"]
+
+    @pytest.mark.asyncio
+    async def test_filter_params_bypass_materialization(self, fake_redis):
+        await store_materialized_feed(USER_ID, _entry())
+        db = _db([_issue_row("I_9", similarity_score=0.8, freshness=0.5, final_score=1.0, total_count=1)])
+
+        with patch("gim_backend.services.feed_service.get_or_create_profile", new=AsyncMock(return_value=_profile())):
+            page = await get_feed(db, USER_ID, labels=["bug"])
+
+        assert [item.node_id for item in page.results] == ["I_9"]
+        assert "ORDER BY i.embedding <=>" in str(db.execute.await_args.args[0])
@@ -7,9 +7,12 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from gim_backend.services.feed_service import (
+    CANDIDATE_LIMIT,
     _build_feed_filters,
     _get_personalized_feed,
     _get_trending_feed,
+    _rank_personalized_candidates,
+    _rerank_candidates,
     _row_to_feed_item,
 )
 
@@ -111,10 +114,16 @@ class TestPersonalizedFeedQueries:
             feed_freshness_floor=0.2,
             feed_freshness_weight=0.25,
             feed_debug_freshness=False,
+            feed_vector_retrieval="exact",
+            vector_rerank_factor=4,
         )
 
         with (
             patch("gim_backend.services.feed_service.get_settings", return_value=mock_settings),
+            patch(
+                "gim_backend.services.feed_service._pgvector_supports_iterative_scan",
+                new=AsyncMock(return_value=False),
+            ),
             patch(
                 "gim_backend.services.feed_service.compute_why_this",
                 return_value=[],
@@ -203,3 +212,146 @@ class TestFeedFilterBuilder:
         assert params["langs"] == ["Python"]
         assert params["labels"] == ["bug"]
         assert params["repos"] == ["o/r"]
+
+
+def _candidate(node_id, final_score, q_score=0.7):
+    return SimpleNamespace(
+        node_id=node_id,
+        title=node_id,
+        body_text="Body",
+        github_url=None,
+        labels=[],
+        q_score=q_score,
+        github_created_at=datetime(2026, 1, 1, tzinfo=UTC),
+        repo_name="o/r",
+        primary_language="Python",
+        repo_topics=[],
+        similarity_score=0.8,
+        freshness=0.5,
+        final_score=final_score,
+        total_count=4,
+    )
+
+
+def _two_phase_settings():
+    return SimpleNamespace(
+        feed_freshness_half_life_days=7.0,
+        feed_freshness_floor=0.2,
+        feed_freshness_weight=0.25,
+        feed_debug_freshness=False,
+        feed_vector_retrieval="exact",
+        vector_rerank_factor=4,
+    )
+
+
+class TestPersonalizedTwoPhase:
+    def test_rerank_orders_by_final_score_then_q_score_then_node_id(self):
+        rows = [
+            _candidate("ISSUE_C", 0.9),
+            _candidate("ISSUE_B", 1.1, q_score=0.5),
+            _candidate("ISSUE_A", 1.1, q_score=0.5),
+            _candidate("ISSUE_D", 1.1, q_score=0.9),
+            _candidate("ISSUE_N", None),
+        ]
+
+        ordered = _rerank_candidates(rows)
+
+        assert [row.node_id for row in ordered] == ["ISSUE_N", "ISSUE_D", "ISSUE_A", "ISSUE_B", "ISSUE_C"]
+
+    @pytest.mark.asyncio
+    async def test_pages_come_from_one_candidate_query(self):
+        mock_db = AsyncMock()
+        mock_db.execute = AsyncMock(
+            return_value=_result_with_rows([_candidate(f"ISSUE_{i}", 1.0 - i * 0.1) for i in range(4)])
+        )
+        settings = SimpleNamespace(
+            feed_freshness_half_life_days=7.0,
+            feed_freshness_floor=0.2,
+            feed_freshness_weight=0.25,
+            feed_debug_freshness=False,
+            feed_vector_retrieval="exact",
+            vector_rerank_factor=4,
+        )
+
+        with (
+            patch("gim_backend.services.feed_service.get_settings", return_value=settings),
+            patch(
+                "gim_backend.services.feed_service._pgvector_supports_iterative_scan",
+                new=AsyncMock(return_value=True),
+            ),
+            patch("gim_backend.services.feed_service.compute_why_this", return_value=[]),
+        ):
+            page = await _get_personalized_feed(
+                db=mock_db,
+                profile=SimpleNamespace(),
+                combined_vector=[0.1] * 256,
+                preferred_languages=["Python"],
+                min_heat_threshold=0.6,
+                page=2,
+                page_size=3,
+                labels=["bug"],
+            )
+
+        assert [item.node_id for item in page.results] == ["ISSUE_3"]
+        assert (page.total, page.has_more) == (4, False)
+
+        sql, params = mock_db.execute.await_args.args
+        sql = str(sql)
+        assert "COUNT(*) OVER()" in sql
+        assert "SELECT COUNT(*) as total" not in sql
+        # ANN scan over the filtered issues, limited to the candidate set
+        assert "ORDER BY i.embedding <=> CAST(:combined_vec AS halfvec)" in sql
+        assert "WHERE primary_language = ANY(:langs)" in sql
+        assert params["limit"] == CANDIDATE_LIMIT
+        assert "offset" not in params
+
+    @pytest.mark.asyncio
+    async def test_filtered_hnsw_scan_is_iterative_with_candidate_sized_ef_search(self):
+        mock_db = AsyncMock()
+        mock_db.execute = AsyncMock(return_value=_result_with_rows([_candidate("ISSUE_0", 1.0)]))
+
+        with (
+            patch("gim_backend.services.feed_service.get_settings", return_value=_two_phase_settings()),
+            patch(
+                "gim_backend.services.feed_service._pgvector_supports_iterative_scan",
+                new=AsyncMock(return_value=True),
+            ),
+        ):
+            await _rank_personalized_candidates(
+                mock_db,
+                combined_vector=[0.1] * 256,
+                preferred_languages=["Python"],
+                min_heat_threshold=0.6,
+            )
+
+        assert mock_db.execute.await_count == 2
+        scan_sql, scan_params = mock_db.execute.await_args_list[0].args
+        assert "set_config('hnsw.iterative_scan', 'relaxed_order', true)" in str(scan_sql)
+        assert "set_config('hnsw.ef_search', :ef_search, true)" in str(scan_sql)
+        assert scan_params == {"ef_search": str(CANDIDATE_LIMIT)}
+        candidate_sql = str(mock_db.execute.await_args_list[1].args[0])
+        assert "ORDER BY i.embedding <=> CAST(:combined_vec AS halfvec)" in candidate_sql
+
+    @pytest.mark.asyncio
+    async def test_without_iterative_scan_ranks_every_match_exactly(self):
+        mock_db = AsyncMock()
+        mock_db.execute = AsyncMock(return_value=_result_with_rows([_candidate("ISSUE_0", 1.0)]))
+
+        with (
+            patch("gim_backend.services.feed_service.get_settings", return_value=_two_phase_settings()),
+            patch(
+                "gim_backend.services.feed_service._pgvector_supports_iterative_scan",
+                new=AsyncMock(return_value=False),
+            ),
+        ):
+            await _rank_personalized_candidates(
+                mock_db,
+                combined_vector=[0.1] * 256,
+                preferred_languages=["Python"],
+                min_heat_threshold=0.6,
+            )
+
+        # No HNSW options are set; "+ 0" keeps the planner off the index
+        assert mock_db.execute.await_count == 1
+        candidate_sql = " ".join(str(mock_db.execute.await_args.args[0]).split())
+        assert "ORDER BY (i.embedding <=> CAST(:combined_vec AS halfvec)) + 0" in candidate_sql
@@ -0,0 +1,214 @@
+"""Tests for snapshot-consistent personalized feed pagination."""
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from gim_backend.services.feed_service import get_feed
+from gim_backend.services.feed_snapshot import (
+    FEED_SNAPSHOT_PREFIX,
+    FeedSnapshot,
+    _deserialize_snapshot,
+    _serialize_snapshot,
+    get_feed_snapshot,
+    store_feed_snapshot,
+)
+
+USER_ID = uuid4()
+
+
+class _FakeRedis:
+    def __init__(self):
+        self._kv: dict[str, tuple[int, str]] = {}
+
+    async def setex(self, key: str, ttl: int, value: str) -> None:
+        self._kv[key] = (ttl, value)
+
+    async def get(self, key: str):
+        item = self._kv.get(key)
+        return item[1] if item else None
+
+
+def _snapshot(count: int = 5, **overrides) -> FeedSnapshot:
+    values = {
+        "user_id": USER_ID,
+        "languages": ["Python"],
+        "labels": None,
+        "repos": None,
+        "node_ids": [f"I_{i}" for i in range(count)],
+        "similarity_scores": [0.9 - i * 0.1 for i in range(count)],
+        "freshness": [0.5] * count,
+        "final_scores": [1.0 - i * 0.1 for i in range(count)],
+    }
+    values.update(overrides)
+    return FeedSnapshot(**values)
+
+
+def _issue_row(node_id: str, **extra):
+    return SimpleNamespace(
+        node_id=node_id,
+        title=node_id,
+        body_text="Body",
+        github_url=None,
+        labels=[],
+        q_score=0.7,
+        github_created_at=datetime(2026, 1, 1, tzinfo=UTC),
+        repo_name="o/r",
+        primary_language="Python",
+        repo_topics=[],
+        **extra,
+    )
+
+
+def _result_with_rows(rows):
+    result = MagicMock()
+    result.fetchall.return_value = rows
+    return result
+
+
+def _settings():
+    return SimpleNamespace(
+        feed_freshness_half_life_days=7.0,
+        feed_freshness_floor=0.2,
+        feed_freshness_weight=0.25,
+        feed_debug_freshness=True,
+        feed_vector_retrieval="exact",
+        vector_rerank_factor=4,
+        feed_snapshot_ttl_seconds=1800,
+    )
+
+
+@pytest.fixture
+def fake_redis():
+    redis = _FakeRedis()
+    with (
+        patch("gim_backend.services.feed_snapshot.get_redis", new=AsyncMock(return_value=redis)),
+        patch("gim_backend.services.feed_snapshot.get_settings", return_value=_settings()),
+        patch("gim_backend.services.feed_service.get_settings", return_value=_settings()),
+        patch("gim_backend.services.feed_service._pgvector_supports_iterative_scan", new=AsyncMock(return_value=True)),
+        patch("gim_backend.services.feed_service.compute_why_this", return_value=[]),
+        patch(
+            "gim_backend.services.feed_service.get_or_create_profile",
+            new=AsyncMock(
+                return_value=SimpleNamespace(
+                    combined_vector=[0.1] * 256,
+                    preferred_languages=["Python"],
+                    min_heat_threshold=0.5,
+                )
+            ),
+        ),
+    ):
+        yield redis
+
+
+class TestSnapshotStorage:
+    def test_round_trip(self):
+        snapshot = _snapshot(similarity_scores=[0.9, None, 0.7, 0.6, 0.5])
+
+        assert _deserialize_snapshot(_serialize_snapshot(snapshot)) == snapshot
+
+    def test_mismatched_score_lists_are_rejected(self):
+        data = _serialize_snapshot(_snapshot(final_scores=[1.0]))
+
+        with pytest.raises(ValueError):
+            _deserialize_snapshot(data)
+
+    def test_matches_user_and_filters_ignoring_order(self):
+        snapshot = _snapshot(labels=["bug", "docs"])
+
+        assert snapshot.matches(user_id=USER_ID, languages=["Python"], labels=["docs", "bug"], repos=[])
+        assert not snapshot.matches(user_id=uuid4(), languages=["Python"], labels=["bug", "docs"], repos=None)
+        assert not snapshot.matches(user_id=USER_ID, languages=["Rust"], labels=["bug", "docs"], repos=None)
+
+    @pytest.mark.asyncio
+    async def test_stored_under_batch_id_with_ttl(self, fake_redis):
+        batch_id = uuid4()
+
+        assert await store_feed_snapshot(batch_id, _snapshot()) is True
+
+        ttl, _ = fake_redis._kv[f"{FEED_SNAPSHOT_PREFIX}{batch_id}"]
+        assert ttl == 1800
+        assert await get_feed_snapshot(batch_id) == _snapshot()
+
+    @pytest.mark.asyncio
+    async def test_redis_unavailable_is_a_miss(self):
+        with patch("gim_backend.services.feed_snapshot.get_redis", new=AsyncMock(return_value=None)):
+            assert await store_feed_snapshot(uuid4(), _snapshot()) is False
+            assert await get_feed_snapshot(uuid4()) is None
+
+
+class TestSnapshotPagination:
+    @pytest.mark.asyncio
+    async def test_first_page_stores_ranking_under_batch_id(self, fake_redis):
+        batch_id = uuid4()
+        rows = [
+            _issue_row(f"I_{i}", similarity_score=0.8, freshness=0.5, final_score=1.0 - i * 0.1, total_count=3)
+            for i in range(3)
+        ]
+        db = AsyncMock()
+        db.execute = AsyncMock(return_value=_result_with_rows(rows))
+
+        page = await get_feed(db, USER_ID, page=1, page_size=2, recommendation_batch_id=batch_id)
+
+        assert page.snapshot_id == str(batch_id)
+        stored = await get_feed_snapshot(batch_id)
+        assert stored.node_ids == ["I_0", "I_1", "I_2"]
+        assert stored.languages == ["Python"]
+
+    @pytest.mark.asyncio
+    async def test_later_page_hydrates_only_its_slice(self, fake_redis):
+        snapshot_id = uuid4()
+        await store_feed_snapshot(snapshot_id, _snapshot())
+        db = AsyncMock()
+        # I_3 was deleted after the snapshot; rows come back in arbitrary order
+        db.execute = AsyncMock(return_value=_result_with_rows([_issue_row("I_4"), _issue_row("I_2")]))
+
+        page = await get_feed(db, USER_ID, page=2, page_size=2, languages=["Python"], snapshot_id=snapshot_id)
+
+        assert db.execute.await_count == 1
+        sql, params = db.execute.await_args.args
+        assert "i.node_id = ANY(:node_ids)" in str(sql)
+        assert "embedding" not in str(sql)
+        assert params["node_ids"] == ["I_2", "I_3"]
+        assert [item.node_id for item in page.results] == ["I_2"]
+        assert page.results[0].final_score == pytest.approx(0.8)
+        assert page.results[0].similarity_score == pytest.approx(0.7)
+        assert (page.total, page.has_more, page.snapshot_id) == (5, True, str(snapshot_id))
+
+    @pytest.mark.asyncio
+    async def test_page_past_snapshot_end_skips_the_database(self, fake_redis):
+        snapshot_id = uuid4()
+        await store_feed_snapshot(snapshot_id, _snapshot())
+        db = AsyncMock()
+
+        page = await get_feed(db, USER_ID, page=4, page_size=2, snapshot_id=snapshot_id)
+
+        db.execute.assert_not_awaited()
+        assert page.results == []
+        assert page.has_more is False
+
+    @pytest.mark.asyncio
+    async def test_mismatched_filters_rerank_into_new_snapshot(self, fake_redis):
+        old_id, new_id = uuid4(), uuid4()
+        await store_feed_snapshot(old_id, _snapshot())
+        db = AsyncMock()
+        db.execute = AsyncMock(
+            return_value=_result_with_rows(
+                [_issue_row("I_9", similarity_score=0.8, freshness=0.5, final_score=1.0, total_count=1)]
+            )
+        )
+
+        page = await get_feed(
+            db,
+            USER_ID,
+            labels=["bug"],
+            snapshot_id=old_id,
+            recommendation_batch_id=new_id,
+        )
+
+        assert [item.node_id for item in page.results] == ["I_9"]
+        assert page.snapshot_id == str(new_id)
+        assert "ORDER BY i.embedding <=>" in str(db.execute.await_args.args[0])
@@ -0,0 +1,94 @@
+"""Tests for the Redis search index generation counter."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from gim_backend.services.index_generation import (
+    INDEX_GENERATION_KEY,
+    bump_index_generation,
+    get_index_generation,
+    reset_index_generation_for_testing,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    reset_index_generation_for_testing()
+    yield
+    reset_index_generation_for_testing()
+
+
+def _redis(value=None) -> AsyncMock:
+    redis = AsyncMock()
+    redis.get.return_value = value
+    redis.incr.return_value = 5
+    return redis
+
+
+class TestGetIndexGeneration:
+    @pytest.mark.asyncio
+    async def test_missing_counter_is_generation_zero(self):
+        assert await get_index_generation(_redis(None)) == 0
+
+    @pytest.mark.asyncio
+    async def test_reads_are_memoized_briefly(self):
+        redis = _redis("4")
+
+        assert await get_index_generation(redis) == 4
+        assert await get_index_generation(redis) == 4
+        redis.get.assert_awaited_once_with(INDEX_GENERATION_KEY)
+
+    @pytest.mark.asyncio
+    async def test_read_error_falls_back_to_zero(self):
+        redis = _redis()
+        redis.get.side_effect = ConnectionError("down")
+
+        assert await get_index_generation(redis) == 0
+
+    @pytest.mark.asyncio
+    async def test_without_redis_is_zero(self):
+        with patch("gim_backend.services.index_generation.get_redis", new=AsyncMock(return_value=None)):
+            assert await get_index_generation() == 0
+
+
+class TestBumpIndexGeneration:
+    @pytest.mark.asyncio
+    async def test_bump_clears_memo(self):
+        redis = _redis("4")
+
+        with patch("gim_backend.services.index_generation.get_redis", new=AsyncMock(return_value=redis)):
+            assert await get_index_generation() == 4
+            assert await bump_index_generation("embedder") == 5
+            redis.get.return_value = "5"
+            assert await get_index_generation() == 5
+
+        redis.incr.assert_awaited_once_with(INDEX_GENERATION_KEY)
+
+    @pytest.mark.asyncio
+    async def test_read_error_after_bump_returns_bumped_generation(self):
+        redis = _redis("4")
+
+        with patch("gim_backend.services.index_generation.get_redis", new=AsyncMock(return_value=redis)):
+            assert await get_index_generation() == 4
+            assert await bump_index_generation("embedder") == 5
+            redis.get.side_effect = ConnectionError("down")
+            assert await get_index_generation() == 5
+
+    @pytest.mark.asyncio
+    async def test_read_error_after_memo_expiry_returns_last_read(self, monkeypatch):
+        redis = _redis("7")
+        assert await get_index_generation(redis) == 7
+
+        monkeypatch.setattr("gim_backend.services.index_generation.GENERATION_LOCAL_TTL_SECONDS", 0.0)
+        redis.get.side_effect = ConnectionError("down")
+
+        assert await get_index_generation(redis) == 7
+
+    @pytest.mark.asyncio
+    async def test_bump_failure_is_non_fatal(self):
+        redis = _redis()
+        redis.incr.side_effect = ConnectionError("down")
+
+        with patch("gim_backend.services.index_generation.get_redis", new=AsyncMock(return_value=redis)):
+            assert await bump_index_generation("janitor") is None
@@ -0,0 +1,89 @@
+"""Tests for the precomputed similar-issues graph."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from gim_backend.services.issue_neighbors import (
+    StaleIssue,
+    merge_neighbors,
+    refresh_issue_neighbors,
+)
+
+
+class TestMergeNeighbors:
+    def test_orders_best_first_with_ties_by_node_id(self):
+        ids, scores = merge_neighbors(["I_b", "I_c"], [0.8, 0.5], {"I_a": 0.8, "I_d": 0.9})
+
+        assert ids == ["I_d", "I_a", "I_b", "I_c"]
+        assert scores == [0.9, 0.8, 0.8, 0.5]
+
+    def test_candidate_replaces_existing_entry_and_capacity_truncates(self):
+        ids, scores = merge_neighbors(["I_a", "I_b"], [0.9, 0.8], {"I_a": 0.4, "I_c": 0.7}, capacity=2)
+
+        assert ids == ["I_b", "I_c"]
+        assert scores == [0.8, 0.7]
+
+
+class TestRefreshIssueNeighbors:
+    @pytest.mark.asyncio
+    async def test_upserts_rows_and_merges_reverse_edges(self):
+        neighbors = {
+            "I_new1": {"I_old": 0.9, "I_new2": 0.6},
+            "I_new2": {"I_new1": 0.6},
+        }
+        stored = MagicMock()
+        stored.fetchall.return_value = [
+            SimpleNamespace(node_id="I_old", neighbor_ids=["I_x"], similarity_scores=[0.5]),
+        ]
+        db = AsyncMock()
+        db.execute = AsyncMock(side_effect=[MagicMock(), stored, MagicMock()])
+
+        async def find(db, node_id, embedding):
+            return neighbors[node_id]
+
+        with patch("gim_backend.services.issue_neighbors.find_issue_neighbors", new=find):
+            stats = await refresh_issue_neighbors(
+                db,
+                [StaleIssue("I_new1", [0.1], "h1"), StaleIssue("I_new2", [0.2], "h2")],
+            )
+
+        assert stats == {"issues": 2, "reverse_updates": 1}
+        upserts = db.execute.await_args_list[0].args[1]
+        assert upserts[0] == {
+            "node_id": "I_new1",
+            "neighbor_ids": ["I_old", "I_new2"],
+            "similarity_scores": [0.9, 0.6],
+            "source_content_hash": "h1",
+        }
+        # Rows recomputed in this batch are not reloaded for the reverse merge
+        assert db.execute.await_args_list[1].args[1] == {"node_ids": ["I_old"]}
+        assert db.execute.await_args_list[2].args[1] == [
+            {"node_id": "I_old", "neighbor_ids": ["I_new1", "I_x"], "similarity_scores": [0.9, 0.5]},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unchanged_reverse_lists_are_not_rewritten(self):
+        stored = MagicMock()
+        stored.fetchall.return_value = [
+            SimpleNamespace(node_id="I_old", neighbor_ids=["I_new"], similarity_scores=[0.75]),
+        ]
+        db = AsyncMock()
+        db.execute = AsyncMock(side_effect=[MagicMock(), stored])
+
+        with patch(
+            "gim_backend.services.issue_neighbors.find_issue_neighbors",
+            new=AsyncMock(return_value={"I_old": 0.75}),
+        ):
+            stats = await refresh_issue_neighbors(db, [StaleIssue("I_new", [0.1], "h")])
+
+        assert stats == {"issues": 1, "reverse_updates": 0}
+        assert db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_is_a_no_op(self):
+        db = AsyncMock()
+
+        assert await refresh_issue_neighbors(db, []) == {"issues": 0, "reverse_updates": 0}
+        db.execute.assert_not_awaited()
@@ -8,6 +8,7 @@ from gim_backend.services.issue_service import (
     DEFAULT_SIMILAR_LIMIT,
     MAX_SIMILAR_LIMIT,
     MIN_SIMILARITY_THRESHOLD,
+    NEIGHBOR_CAPACITY,
     IssueDetail,
     get_issue_by_node_id,
     get_similar_issues,
@@ -153,6 +154,7 @@ class TestGetSimilarIssues:
         mock_source_row = MagicMock()
         mock_source_row.node_id = "I_source"
         mock_source_row.embedding = [0.1] * 768
+        mock_source_row.neighbor_ids = None
 
         # Second call: get similar issues
         mock_similar_row1 = MagicMock()
@@ -192,6 +194,7 @@ class TestGetSimilarIssues:
         mock_source_row = MagicMock()
         mock_source_row.node_id = "I_source"
         mock_source_row.embedding = [0.1] * 768
+        mock_source_row.neighbor_ids = None
 
         # Similar issues don't include source
         mock_similar = MagicMock()
@@ -222,6 +225,7 @@ class TestGetSimilarIssues:
         mock_source_row = MagicMock()
         mock_source_row.node_id = "I_source"
         mock_source_row.embedding = [0.1] * 768
+        mock_source_row.neighbor_ids = None
 
         mock_result1 = MagicMock()
         mock_result1.fetchone.return_value = mock_source_row
@@ -244,6 +248,7 @@ class TestGetSimilarIssues:
         mock_source_row = MagicMock()
         mock_source_row.node_id = "I_source"
         mock_source_row.embedding = [0.1] * 768
+        mock_source_row.neighbor_ids = None
 
         mock_result1 = MagicMock()
         mock_result1.fetchone.return_value = mock_source_row
@@ -267,6 +272,7 @@ class TestGetSimilarIssues:
         mock_source_row = MagicMock()
         mock_source_row.node_id = "I_source"
         mock_source_row.embedding = [0.1] * 768
+        mock_source_row.neighbor_ids = None
 
         mock_result1 = MagicMock()
         mock_result1.fetchone.return_value = mock_source_row
@@ -289,6 +295,7 @@ class TestGetSimilarIssues:
         mock_source_row = MagicMock()
         mock_source_row.node_id = "I_source"
         mock_source_row.embedding = [0.1] * 768
+        mock_source_row.neighbor_ids = None
 
         mock_result1 = MagicMock()
         mock_result1.fetchone.return_value = mock_source_row
@@ -312,6 +319,7 @@ class TestGetSimilarIssues:
         mock_source_row = MagicMock()
         mock_source_row.node_id = "I_closed_source"
         mock_source_row.embedding = [0.1] * 768
+        mock_source_row.neighbor_ids = None
 
         mock_similar = MagicMock()
         mock_similar.node_id = "I_open_similar"
@@ -335,6 +343,81 @@ class TestGetSimilarIssues:
         assert result[0].node_id == "I_open_similar"
 
 
+def _source_with_neighbors(neighbor_ids, scores, fresh=True):
+    row = MagicMock()
+    row.node_id = "I_source"
+    row.embedding = [0.1] * 768
+    row.neighbor_ids = neighbor_ids
+    row.similarity_scores = scores
+    row.neighbors_fresh = fresh
+    return row
+
+
+def _open_row(node_id):
+    row = MagicMock()
+    row.node_id = node_id
+    row.title = f"Title {node_id}"
+    row.repo_name = "org/repo"
+    return row
+
+
+def _result(*, one=None, rows=None):
+    result = MagicMock()
+    result.fetchone.return_value = one
+    result.fetchall.return_value = rows or []
+    return result
+
+
+class TestStoredNeighbors:
+    """get_similar_issues serving from ingestion.issue_neighbors."""
+
+    @pytest.mark.asyncio
+    async def test_serves_fresh_row_in_stored_order(self):
+        """Fresh stored neighbours are hydrated without a vector query; closed ones are skipped."""
+        mock_db = AsyncMock()
+        source = _source_with_neighbors(["I_a", "I_closed", "I_b"], [0.91, 0.8, 0.7])
+        mock_db.execute.side_effect = [
+            _result(one=source),
+            _result(rows=[_open_row("I_b"), _open_row("I_a")]),
+        ]
+
+        result = await get_similar_issues(mock_db, "I_source", limit=5)
+
+        assert [issue.node_id for issue in result] == ["I_a", "I_b"]
+        assert result[0].similarity_score == 0.91
+        assert mock_db.execute.call_count == 2
+        assert mock_db.execute.call_args_list[1][0][1] == {"node_ids": ["I_a", "I_closed", "I_b"]}
+
+    @pytest.mark.asyncio
+    async def test_stale_row_falls_back_to_live_query(self):
+        """A row computed from other content is ignored."""
+        mock_db = AsyncMock()
+        source = _source_with_neighbors(["I_a"], [0.9], fresh=False)
+        mock_db.execute.side_effect = [_result(one=source), _result(rows=[])]
+
+        await get_similar_issues(mock_db, "I_source")
+
+        params = mock_db.execute.call_args_list[1][0][1]
+        assert params["min_threshold"] == MIN_SIMILARITY_THRESHOLD
+
+    @pytest.mark.asyncio
+    async def test_full_row_left_short_by_closures_falls_back(self):
+        """A truncated stored list that no longer fills the limit is re-queried live."""
+        mock_db = AsyncMock()
+        ids = [f"I_{i}" for i in range(NEIGHBOR_CAPACITY)]
+        source = _source_with_neighbors(ids, [0.9] * NEIGHBOR_CAPACITY)
+        mock_db.execute.side_effect = [
+            _result(one=source),
+            _result(rows=[_open_row("I_0")]),
+            _result(rows=[]),
+        ]
+
+        await get_similar_issues(mock_db, "I_source", limit=3)
+
+        assert mock_db.execute.call_count == 3
+        assert mock_db.execute.call_args_list[2][0][1]["limit"] == 3
+
+
 class TestConstants:
     """Tests for module constants."""
 
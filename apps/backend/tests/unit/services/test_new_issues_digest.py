@@ -0,0 +1,131 @@
+"""Tests for the precomputed new-issues-since-last-visit digests."""
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from gim_backend.services.feed_service import get_new_issues_feed
+from gim_backend.services.new_issues_digest import (
+    NEW_ISSUES_PREFIX,
+    NewIssuesDigest,
+    _deserialize_digest,
+    _serialize_digest,
+    get_new_issues_digest,
+    store_new_issues_digests,
+)
+
+USER_ID = uuid4()
+
+
+def _digest(**overrides) -> NewIssuesDigest:
+    values = {
+        "since": datetime(2026, 10, 1, tzinfo=UTC),
+        "computed_at": datetime(2026, 10, 2, tzinfo=UTC),
+        "node_ids": ["I_0", "I_1", "I_2"],
+        "similarity_scores": [0.9, 0.8, 0.7],
+        "final_scores": [1.1, 1.0, 0.9],
+    }
+    values.update(overrides)
+    return NewIssuesDigest(**values)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self._kv: dict[str, tuple[int, str]] = {}
+
+    def pipeline(self):
+        pipe = MagicMock()
+        pending = []
+        pipe.setex.side_effect = lambda key, ttl, value: pending.append((key, ttl, value))
+
+        async def execute():
+            for key, ttl, value in pending:
+                self._kv[key] = (ttl, value)
+
+        pipe.execute = execute
+        return pipe
+
+    async def get(self, key: str):
+        item = self._kv.get(key)
+        return item[1] if item else None
+
+
+@pytest.fixture
+def fake_redis():
+    redis = _FakeRedis()
+    with patch("gim_backend.services.new_issues_digest.get_redis", new=AsyncMock(return_value=redis)):
+        yield redis
+
+
+def _issue_row(node_id: str):
+    return SimpleNamespace(
+        node_id=node_id,
+        title=node_id,
+        body_text="Body",
+        github_url=None,
+        labels=[],
+        q_score=0.7,
+        github_created_at=datetime(2026, 10, 1, tzinfo=UTC),
+        repo_name="o/r",
+        primary_language="Python",
+        repo_topics=[],
+    )
+
+
+class TestDigestStorage:
+    def test_round_trip(self):
+        assert _deserialize_digest(_serialize_digest(_digest())) == _digest()
+        assert _deserialize_digest(_serialize_digest(_digest(since=None))).since is None
+
+    @pytest.mark.asyncio
+    async def test_batch_store_then_read(self, fake_redis):
+        other = uuid4()
+
+        stored = await store_new_issues_digests({USER_ID: _digest(), other: _digest(node_ids=[])}, ttl_seconds=60)
+
+        assert stored == 2
+        assert fake_redis._kv[f"{NEW_ISSUES_PREFIX}{USER_ID}"][0] == 60
+        assert await get_new_issues_digest(USER_ID) == _digest()
+        assert (await get_new_issues_digest(other)).node_ids == []
+
+    @pytest.mark.asyncio
+    async def test_without_redis(self):
+        with patch("gim_backend.services.new_issues_digest.get_redis", new=AsyncMock(return_value=None)):
+            assert await store_new_issues_digests({USER_ID: _digest()}) == 0
+            assert await get_new_issues_digest(USER_ID) is None
+
+
+class TestGetNewIssuesFeed:
+    @pytest.mark.asyncio
+    async def test_serves_digest_in_stored_order(self, fake_redis):
+        await store_new_issues_digests({USER_ID: _digest()})
+        db = AsyncMock()
+        result = MagicMock()
+        result.fetchall.return_value = [_issue_row("I_2"), _issue_row("I_0"), _issue_row("I_1")]
+        db.execute = AsyncMock(return_value=result)
+        profile = SimpleNamespace(combined_vector=[0.1] * 256, preferred_languages=None, min_heat_threshold=0.5)
+
+        with (
+            patch("gim_backend.services.feed_service.get_or_create_profile", new=AsyncMock(return_value=profile)),
+            patch("gim_backend.services.feed_service.compute_why_this", return_value=[]),
+        ):
+            page = await get_new_issues_feed(db, USER_ID, page=1, page_size=2)
+
+        assert [item.node_id for item in page.results] == ["I_0", "I_1"]
+        assert page.results[0].similarity_score == pytest.approx(0.9)
+        assert page.total == 3
+        assert page.has_more is True
+        assert page.is_personalized is True
+
+    @pytest.mark.asyncio
+    async def test_empty_without_digest(self, fake_redis):
+        db = AsyncMock()
+
+        page = await get_new_issues_feed(db, USER_ID)
+
+        assert page.results == []
+        assert page.total == 0
+        db.execute.assert_not_awaited()
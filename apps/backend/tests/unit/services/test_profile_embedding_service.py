@@ -377,3 +377,30 @@ class TestProfileRecalculationLifecycleHelpers:
         assert result == [0.9] * 3
         assert profile.combined_vector == [0.9] * 3
         assert profile.is_calculating is False
+
+    @pytest.mark.asyncio
+    async def test_finalize_materializes_feed_only_for_a_vector(self):
+        from gim_backend.services.profile_embedding_service import finalize_profile_recalculation
+
+        profile = SimpleNamespace(
+            intent_vector=None,
+            resume_vector=None,
+            github_vector=None,
+            combined_vector=[0.9] * 3,
+            is_calculating=True,
+        )
+        materialize = AsyncMock()
+
+        await finalize_profile_recalculation(
+            profile,
+            calculate_combined_vector_fn=AsyncMock(return_value=None),
+            materialize_feed_fn=materialize,
+        )
+        materialize.assert_not_awaited()
+
+        await finalize_profile_recalculation(
+            profile,
+            calculate_combined_vector_fn=AsyncMock(return_value=[0.5] * 3),
+            materialize_feed_fn=materialize,
+        )
+        materialize.assert_awaited_once_with(profile)
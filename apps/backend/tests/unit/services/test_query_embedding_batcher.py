@@ -0,0 +1,129 @@
+"""Unit tests for the query embedding micro-batcher"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from gim_backend.services import embedding_service
+from gim_backend.services.query_embedding_batcher import QueryEmbeddingBatcher, normalize_query_text
+
+
+def make_embed_fn(delay_s: float = 0.0):
+    calls: list[list[str]] = []
+
+    async def embed(texts: list[str]) -> list[list[float]]:
+        calls.append(list(texts))
+        if delay_s:
+            await asyncio.sleep(delay_s)
+        return [[float(len(t)), 1.0] for t in texts]
+
+    return embed, calls
+
+
+class TestNormalizeQueryText:
+    def test_collapses_whitespace(self):
+        assert normalize_query_text("  rust   async\nruntime ") == "rust async runtime"
+
+
+class TestQueryEmbeddingBatcher:
+    async def test_concurrent_calls_share_one_forward_pass(self):
+        embed, calls = make_embed_fn()
+        batcher = QueryEmbeddingBatcher(embed, max_batch_size=25, window_ms=5)
+
+        results = await asyncio.gather(*(batcher.embed(f"q{i}") for i in range(10)))
+
+        assert len(calls) == 1
+        assert len(calls[0]) == 10
+        assert results[3] == [2.0, 1.0]
+
+    async def test_full_batch_flushes_without_waiting_for_window(self):
+        embed, calls = make_embed_fn()
+        batcher = QueryEmbeddingBatcher(embed, max_batch_size=4, window_ms=10_000)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*(batcher.embed(f"q{i}") for i in range(8))),
+            timeout=1,
+        )
+
+        assert [len(c) for c in calls] == [4, 4]
+        assert len(results) == 8
+
+    async def test_duplicate_in_flight_queries_are_coalesced(self):
+        embed, calls = make_embed_fn()
+        batcher = QueryEmbeddingBatcher(embed, window_ms=5)
+
+        a, b, c = await asyncio.gather(batcher.embed("react"), batcher.embed(" react "), batcher.embed("vue"))
+
+        assert a == b
+        assert calls == [["react", "vue"]]
+        assert batcher.stats.coalesced == 1
+
+    async def test_repeated_query_served_from_lru(self):
+        embed, calls = make_embed_fn()
+        batcher = QueryEmbeddingBatcher(embed, window_ms=0)
+
+        await batcher.embed("react")
+        await batcher.embed("react")
+
+        assert len(calls) == 1
+        assert batcher.stats.cache_hits == 1
+
+    async def test_lru_is_bounded(self):
+        embed, calls = make_embed_fn()
+        batcher = QueryEmbeddingBatcher(embed, window_ms=0, cache_size=1)
+
+        await batcher.embed("a")
+        await batcher.embed("b")
+        await batcher.embed("a")
+
+        assert len(calls) == 3
+
+    async def test_failure_propagates_to_all_waiters_and_is_not_cached(self):
+        embed = AsyncMock(side_effect=RuntimeError("model down"))
+        batcher = QueryEmbeddingBatcher(embed, window_ms=0)
+
+        results = await asyncio.gather(batcher.embed("a"), batcher.embed("b"), return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        embed.side_effect = None
+        embed.return_value = [[1.0]]
+        assert await batcher.embed("a") == [1.0]
+
+    async def test_latency_does_not_scale_with_queue_depth(self):
+        embed, calls = make_embed_fn(delay_s=0.02)
+        batcher = QueryEmbeddingBatcher(embed, max_batch_size=25, window_ms=2)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(batcher.embed(f"q{i}") for i in range(50)))
+        elapsed = time.perf_counter() - start
+
+        # One pass per request would take 50 * 20ms
+        assert len(calls) == 2
+        assert elapsed < 0.5
+
+
+class TestEmbedQueryService:
+    @pytest.fixture(autouse=True)
+    def reset(self):
+        embedding_service.reset_embedder_for_testing()
+        yield
+        embedding_service.reset_embedder_for_testing()
+
+    async def test_embed_query_batches_through_singleton(self):
+        embedder = MagicMock()
+        embedder.embed_queries = AsyncMock(side_effect=lambda texts: [[0.5] * 3 for _ in texts])
+
+        with patch.object(embedding_service, "get_embedder", AsyncMock(return_value=embedder)):
+            results = await asyncio.gather(*(embedding_service.embed_query(f"q{i}") for i in range(5)))
+
+        assert results == [[0.5] * 3] * 5
+        embedder.embed_queries.assert_awaited_once()
+
+    async def test_embed_query_returns_none_on_failure(self):
+        embedder = MagicMock()
+        embedder.embed_queries = AsyncMock(side_effect=RuntimeError("boom"))
+
+        with patch.object(embedding_service, "get_embedder", AsyncMock(return_value=embedder)):
+            assert await embedding_service.embed_query("q") is None
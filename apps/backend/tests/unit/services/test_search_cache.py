@@ -4,23 +4,46 @@ Search Cache Unit Tests
 Tests cache serialization, deserialization, and key generation.
 """
 
+import asyncio
 import json
+import logging
+import time
 from datetime import UTC, datetime
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
 
+from gim_backend.services import search_cache
 from gim_backend.services.search_cache import (
+    CACHE_COALESCED,
+    CACHE_HARD_TTL_SECONDS,
+    CACHE_HIT,
+    CACHE_MISS,
     CACHE_PREFIX,
+    CACHE_STALE,
+    CACHE_TTL_JITTER,
     CACHE_TTL_SECONDS,
+    CODEC_NONE,
+    CODEC_ZLIB,
+    CODEC_ZSTD,
     CONTEXT_PREFIX,
+    CachedSearchBody,
+    _decode_entry,
     _deserialize_response,
+    _encode_entry,
     _normalize_cached_response_payload,
+    _response_key,
     _serialize_response,
     cache_search_context,
+    cache_search_response,
     get_cached_search,
     get_cached_search_context,
+    get_or_compute_search,
+    get_or_compute_search_body,
+    get_search_cache_stats,
+    invalidate_search_cache,
+    reset_search_cache_for_testing,
 )
 from gim_backend.services.search_service import (
     SearchFilters,
@@ -291,6 +314,20 @@ class _FakeRedis:
         item = self._kv.get(key)
         return item[1] if item else None
 
+    async def set(self, key: str, value: str, nx: bool = False, ex: int | None = None):
+        if nx and key in self._kv:
+            return None
+        self._kv[key] = (ex, value)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._kv.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        ttl, value = self._kv.get(key, (None, "0"))
+        self._kv[key] = (ttl, str(int(value) + 1))
+        return int(value) + 1
+
 
 class TestSearchContextCaching:
     @pytest.mark.asyncio
@@ -408,7 +445,7 @@ class TestCachedSearchReadBehavior:
     async def test_get_cached_search_returns_none_for_malformed_cached_payload(self):
         fake_redis = _FakeRedis()
         request = SearchRequest(query="test")
-        fake_redis._kv[f"{CACHE_PREFIX}{request.cache_key()}"] = (CACHE_TTL_SECONDS, '{"results": "bad"}')
+        fake_redis._kv[_response_key(request, 0)] = (CACHE_TTL_SECONDS, '{"results": "bad"}')
 
         with patch("gim_backend.services.search_cache.get_redis", new=AsyncMock(return_value=fake_redis)):
             result = await get_cached_search(request)
@@ -418,3 +455,328 @@ class TestCachedSearchReadBehavior:
     def test_normalize_cached_response_payload_rejects_non_object(self):
         with pytest.raises(ValueError):
             _normalize_cached_response_payload(["not", "an", "object"])
+
+
+def _response(query: str = "test", total: int = 0) -> SearchResponse:
+    return SearchResponse(
+        search_id=uuid4(),
+        results=[],
+        total=total,
+        page=1,
+        page_size=20,
+        has_more=False,
+        query=query,
+        filters=SearchFilters(),
+    )
+
+
+class TestStampedeProtection:
+    @pytest.fixture(autouse=True)
+    def _reset(self):
+        reset_search_cache_for_testing()
+        yield
+        reset_search_cache_for_testing()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_computation(self):
+        fake_redis = _FakeRedis()
+        request = SearchRequest(query="popular")
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return _response("popular", total=7)
+
+        with patch("gim_backend.services.search_cache.get_redis", new=AsyncMock(return_value=fake_redis)):
+            outcomes = await asyncio.gather(*(get_or_compute_search(request, compute) for _ in range(5)))
+
+        assert calls == 1
+        assert sorted(status for _, status in outcomes) == [CACHE_COALESCED] * 4 + [CACHE_MISS]
+        assert {response.search_id for response, _ in outcomes} == {outcomes[0][0].search_id}
+        assert get_search_cache_stats()["coalesced"] == 4
+        assert _response_key(request, 0) in fake_redis._kv
+
+    @pytest.mark.asyncio
+    async def test_coalesces_without_redis(self):
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return _response()
+
+        with patch("gim_backend.services.search_cache.get_redis", new=AsyncMock(return_value=None)):
+            await asyncio.gather(*(get_or_compute_search(SearchRequest(query="q"), compute) for _ in range(3)))
+
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_compute_error_reaches_every_waiter_and_clears_flight(self):
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        with patch("gim_backend.services.search_cache.get_redis", new=AsyncMock(return_value=None)):
+            outcomes = await asyncio.gather(
+                *(get_or_compute_search(SearchRequest(query="q"), compute) for _ in range(3)),
+                return_exceptions=True,
+            )
+
+        assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+        assert search_cache._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_a_hit(self):
+        fake_redis = _FakeRedis()
+        request = SearchRequest(query="q")
+        compute = AsyncMock()
+
+        with patch("gim_backend.services.search_cache.get_redis", new=AsyncMock(return_value=fake_redis)):
+            await cache_search_response(request, _response("q", total=3))
+            response, status = await get_or_compute_search(request, compute)
+
+        assert status == CACHE_HIT
+        assert response.total == 3
+        compute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_while_one_refresh_runs(self):
+        fake_redis = _FakeRedis()
+        request = SearchRequest(query="q")
+        cache_key = _response_key(request, 0)
+        stale = _response("q", total=1)
+        fake_redis._kv[cache_key] = (CACHE_HARD_TTL_SECONDS, _serialize_response(stale, fresh_until=time.time() - 1))
+        refreshed = asyncio.Event()
+
+        async def refresh():
+            await asyncio.sleep(0.01)
+            refreshed.set()
+            return _response("q", total=2)
+
+        refresh_mock = AsyncMock(side_effect=refresh)
+        compute = AsyncMock()
+
+        with patch("gim_backend.services.search_cache.get_redis", new=AsyncMock(return_value=fake_redis)):
+            outcomes = await asyncio.gather(*(get_or_compute_search(request, compute, refresh_mock) for _ in range(3)))
+            await asyncio.wait_for(refreshed.wait(), timeout=1)
+            await asyncio.sleep(0)
+            response, status = await get_or_compute_search(request, compute, refresh_mock)
+
+        assert [status for _, status in outcomes] == [CACHE_STALE] * 3
+        assert all(response.total == 1 for response, _ in outcomes)
+        assert refresh_mock.await_count == 1
+        compute.assert_not_awaited()
+        assert (status, response.total) == (CACHE_HIT, 2)
+        assert not any(key.startswith("searchlock:") for key in fake_redis._kv)
+        assert get_search_cache_stats()["refreshes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_without_refresh_recomputes_inline(self):
+        fake_redis = _FakeRedis()
+        request = SearchRequest(query="q")
+        cache_key = _response_key(request, 0)
+        fake_redis._kv[cache_key] = (CACHE_HARD_TTL_SECONDS, _serialize_response(_response(), fresh_until=0))
+
+        with patch("gim_backend.services.search_cache.get_redis", new=AsyncMock(return_value=fake_redis)):
+            response, status = await get_or_compute_search(request, AsyncMock(return_value=_response(total=9)))
+
+        assert (status, response.total) == (CACHE_MISS, 9)
+
+    @pytest.mark.asyncio
+    async def test_expirations_are_jittered(self):
+        fake_redis = _FakeRedis()
+        ttls = set()
+
+        with patch("gim_backend.services.search_cache.get_redis", new=AsyncMock(return_value=fake_redis)):
+            for i in range(20):
+                before = time.time()
+                request = SearchRequest(query=f"q{i}")
+                await cache_search_response(request, _response())
+                ttl, raw = fake_redis._kv[_response_key(request, 0)]
+                fresh_for = _decode_entry(raw)[1] - before
+                ttls.add(ttl)
+
+                assert abs(ttl - CACHE_HARD_TTL_SECONDS) <= CACHE_HARD_TTL_SECONDS * CACHE_TTL_JITTER + 1
+                assert abs(fresh_for - CACHE_TTL_SECONDS) <= CACHE_TTL_SECONDS * CACHE_TTL_JITTER + 1
+
+        assert len(ttls) > 1
+
+    @pytest.mark.asyncio
+    async def test_legacy_entries_without_soft_ttl_are_fresh(self):
+        fake_redis = _FakeRedis()
+        request = SearchRequest(query="q")
+        fake_redis._kv[_response_key(request, 0)] = (CACHE_TTL_SECONDS, _serialize_response(_response()))
+
+        with patch("gim_backend.services.search_cache.get_redis", new=AsyncMock(return_value=fake_redis)):
+            _, status = await get_or_compute_search(request, AsyncMock())
+            assert await get_cached_search(request) is not None
+
+        assert status == CACHE_HIT
+
+    @pytest.mark.asyncio
+    async def test_stats_are_logged_every_interval(self, monkeypatch, caplog):
+        monkeypatch.setattr(search_cache, "STATS_LOG_INTERVAL", 2)
+        compute = AsyncMock(return_value=_response())
+
+        with (
+            patch("gim_backend.services.search_cache.get_redis", new=AsyncMock(return_value=None)),
+            caplog.at_level(logging.INFO, logger="gim_backend.services.search_cache"),
+        ):
+            for i in range(5):
+                await get_or_compute_search(SearchRequest(query=f"q{i}"), compute)
+
+        records = [record for record in caplog.records if record.message.startswith("Search cache stats")]
+        assert [record.lookups for record in records] == [2, 4]
+        assert records[-1].misses == 4
+        assert records[-1].hit_rate == 0
+
+
+class TestGenerationInvalidation:
+    @pytest.fixture(autouse=True)
+    def _reset(self):
+        reset_search_cache_for_testing()
+        yield
+        reset_search_cache_for_testing()
+
+    def test_key_includes_generation(self):
+        request = SearchRequest(query="q")
+
+        assert _response_key(request, 3) == f"{CACHE_PREFIX}g3:{request.cache_key()}"
+        assert _response_key(request, 3) != _response_key(request, 4)
+
+    @pytest.mark.asyncio
+    async def test_bump_misses_old_entries_without_deleting_them(self):
+        fake_redis = _FakeRedis()
+        request = SearchRequest(query="q")
+        redis_patch = AsyncMock(return_value=fake_redis)
+
+        with (
+            patch("gim_backend.services.search_cache.get_redis", new=redis_patch),
+            patch("gim_backend.services.index_generation.get_redis", new=redis_patch),
+        ):
+            await cache_search_response(request, _response())
+            assert await get_cached_search(request) is not None
+
+            assert await invalidate_search_cache("test") == 1
+
+            assert await get_cached_search(request) is None
+            await cache_search_response(request, _response())
+
+        assert _response_key(request, 0) in fake_redis._kv
+        assert _response_key(request, 1) in fake_redis._kv
+
+    @pytest.mark.asyncio
+    async def test_invalidate_without_redis_returns_zero(self):
+        with patch("gim_backend.services.index_generation.get_redis", new=AsyncMock(return_value=None)):
+            assert await invalidate_search_cache() == 0
+
+
+def _page(results: int = 3) -> SearchResponse:
+    items = [
+        SearchResultItem(
+            node_id=f"I_{i}",
+            title="Crash on startup",
+            body_preview="Stack trace é " * 20,
+            labels=["bug"],
+            q_score=0.5,
+            repo_name="org/repo",
+            primary_language="Python",
+            github_created_at=datetime(2026, 1, 1, tzinfo=UTC),
+            rrf_score=0.03 - i * 0.001,
+        )
+        for i in range(results)
+    ]
+    return SearchResponse(
+        search_id=uuid4(),
+        results=items,
+        total=40,
+        page=1,
+        page_size=20,
+        has_more=True,
+        query="crash",
+        filters=SearchFilters(labels=["bug"]),
+    )
+
+
+class TestCompactEntryEncoding:
+    @pytest.fixture(autouse=True)
+    def _reset(self):
+        reset_search_cache_for_testing()
+        yield
+        reset_search_cache_for_testing()
+
+    def test_body_matches_api_json(self):
+        response = _page()
+
+        entry = CachedSearchBody.from_response(response)
+
+        assert json.loads(entry.body) == response.model_dump(mode="json")
+        assert (entry.search_id, entry.total, entry.result_count) == (response.search_id, 40, 3)
+
+    @pytest.mark.parametrize("codec", [CODEC_NONE, CODEC_ZLIB])
+    def test_round_trip_reads_header_only(self, codec):
+        entry = CachedSearchBody.from_response(_page())
+
+        decoded, fresh_until = _decode_entry(_encode_entry(entry, 1234.5, codec))
+
+        assert decoded.body == entry.body
+        assert (decoded.search_id, decoded.total, decoded.result_count) == (entry.search_id, 40, 3)
+        assert decoded.response is None
+        assert fresh_until == 1234.5
+        assert decoded.to_response() == entry.response
+
+    def test_zlib_entries_are_smaller(self):
+        entry = CachedSearchBody.from_response(_page(results=20))
+
+        assert len(_encode_entry(entry, 0, CODEC_ZLIB)) < len(_encode_entry(entry, 0, CODEC_NONE)) / 2
+
+    def test_legacy_json_entries_decode(self):
+        response = _page()
+
+        decoded, fresh_until = _decode_entry(_serialize_response(response, fresh_until=99.0))
+
+        assert json.loads(decoded.body) == response.model_dump(mode="json")
+        assert fresh_until == 99.0
+
+    @pytest.mark.asyncio
+    async def test_hit_returns_stored_bytes_without_validation(self):
+        fake_redis = _FakeRedis()
+        request = SearchRequest(query="crash")
+        response = _page()
+
+        with patch("gim_backend.services.search_cache.get_redis", new=AsyncMock(return_value=fake_redis)):
+            await cache_search_response(request, response)
+            with patch.object(SearchResponse, "model_validate_json", side_effect=AssertionError("validated")):
+                entry, status = await get_or_compute_search_body(request, AsyncMock())
+
+        assert status == CACHE_HIT
+        assert entry.body == response.model_dump_json().encode()
+
+    @pytest.mark.asyncio
+    async def test_zstd_without_package_stores_uncompressed(self):
+        fake_redis = _FakeRedis()
+        request = SearchRequest(query="crash")
+        settings = MagicMock(search_cache_compression=CODEC_ZSTD)
+
+        with (
+            patch("gim_backend.services.search_cache.get_redis", new=AsyncMock(return_value=fake_redis)),
+            patch("gim_backend.services.search_cache.get_settings", return_value=settings),
+            patch("gim_backend.services.search_cache.zstandard", None),
+        ):
+            await cache_search_response(request, _page())
+            assert await get_cached_search(request) is not None
+
+        _, raw = fake_redis._kv[_response_key(request, 0)]
+        assert raw.startswith(f"v3|{CODEC_NONE}|")
+
+    @pytest.mark.asyncio
+    async def test_undecodable_codec_is_a_miss(self):
+        fake_redis = _FakeRedis()
+        request = SearchRequest(query="crash")
+        fake_redis._kv[_response_key(request, 0)] = (CACHE_TTL_SECONDS, f"v3|brotli|0|1|1|{uuid4()}\nxx")
+
+        with patch("gim_backend.services.search_cache.get_redis", new=AsyncMock(return_value=fake_redis)):
+            assert await get_cached_search(request) is None
@@ -0,0 +1,178 @@
+"""Tests for selectivity-based pre- vs post-filter Stage 1 retrieval."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from gim_backend.services.search_execution import _execute_stage1
+from gim_backend.services.search_filter_planning import (
+    _choose_filter_strategy,
+    _estimate_filter_selectivity,
+)
+from gim_backend.services.search_models import SearchFilters
+from gim_backend.services.search_schema_probe import (
+    _pgvector_supports_iterative_scan,
+    reset_schema_probe_cache_for_testing,
+)
+from gim_backend.services.search_sql import POST_FILTER, PRE_FILTER, _build_stage1_sql
+
+
+def _explain_result(open_rows: float, filtered_rows: float) -> MagicMock:
+    plan = [{"Plan": {"Node Type": "Append", "Plans": [{"Plan Rows": open_rows}, {"Plan Rows": filtered_rows}]}}]
+    result = MagicMock()
+    result.scalar.return_value = json.dumps(plan)
+    return result
+
+
+def _db_returning(*results) -> MagicMock:
+    db = MagicMock()
+    db.exec = AsyncMock(side_effect=list(results))
+    db.execute = AsyncMock()
+    return db
+
+
+class TestPrefilterSql:
+    def test_prefilter_pushes_filters_into_both_ctes(self):
+        filters = SearchFilters(languages=["Rust"], labels=["good first issue"], repos=["org/small"])
+        sql = _build_stage1_sql(filters, use_vector_path=True, filter_strategy=PRE_FILTER)
+
+        vector_cte = sql[sql.find("vector_results AS") : sql.find("bm25_results AS")]
+        bm25_cte = sql[sql.find("bm25_results AS") : sql.find("vector_meta AS")]
+        for cte in (vector_cte, bm25_cte):
+            assert "i.labels && :labels" in cte
+            assert "full_name = ANY(:repos)" in cte
+            assert "primary_language = ANY(:langs)" in cte
+        # Post-fusion filters still apply
+        assert "fused.labels && :labels" in sql[sql.find("filtered AS") :]
+
+    def test_prefilter_bm25_only(self):
+        sql = _build_stage1_sql(SearchFilters(labels=["bug"]), use_vector_path=False, filter_strategy=PRE_FILTER)
+
+        assert "AND i.state = 'open' AND i.labels && :labels" in sql
+
+    def test_exact_distance_fallback_bypasses_hnsw(self):
+        filters = SearchFilters(repos=["org/small"])
+        sql = _build_stage1_sql(filters, use_vector_path=True, filter_strategy=PRE_FILTER, vector_index_scan=False)
+
+        assert "ORDER BY (i.embedding <=> CAST(:query_vec AS halfvec)) + 0" in sql
+
+    def test_post_filter_is_default(self):
+        filters = SearchFilters(repos=["org/small"])
+
+        assert _build_stage1_sql(filters, True) == _build_stage1_sql(filters, True, filter_strategy=POST_FILTER)
+
+
+class TestChooseFilterStrategy:
+    @pytest.mark.asyncio
+    async def test_estimate_reads_both_append_children(self):
+        db = _db_returning(_explain_result(10_000, 50))
+
+        selectivity = await _estimate_filter_selectivity(db, SearchFilters(repos=["org/small"]))
+
+        assert selectivity == pytest.approx(0.005)
+        sql = str(db.exec.await_args.args[0])
+        assert "EXPLAIN (FORMAT JSON)" in sql
+        assert "UNION ALL" in sql
+
+    @pytest.mark.asyncio
+    async def test_auto_prefilters_selective_filters(self):
+        db = _db_returning(_explain_result(10_000, 50))
+
+        assert await _choose_filter_strategy(db, SearchFilters(repos=["org/small"]), "auto", 0.1) == PRE_FILTER
+
+    @pytest.mark.asyncio
+    async def test_auto_postfilters_broad_filters(self):
+        db = _db_returning(_explain_result(10_000, 4_000))
+
+        assert await _choose_filter_strategy(db, SearchFilters(languages=["Python"]), "auto", 0.1) == POST_FILTER
+
+    @pytest.mark.asyncio
+    async def test_unfiltered_and_forced_strategies_skip_estimate(self):
+        db = _db_returning()
+
+        assert await _choose_filter_strategy(db, SearchFilters(), "auto", 0.1) == POST_FILTER
+        assert await _choose_filter_strategy(db, SearchFilters(labels=["bug"]), "pre", 0.1) == PRE_FILTER
+        db.exec.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_auto_postfilters_when_plan_shape_is_unexpected(self):
+        plan = [{"Plan": {"Node Type": "Gather", "Plans": [{"Node Type": "Parallel Append"}]}}]
+        result = MagicMock()
+        result.scalar.return_value = json.dumps(plan)
+        db = _db_returning(result)
+
+        assert await _choose_filter_strategy(db, SearchFilters(repos=["org/small"]), "auto", 0.1) == POST_FILTER
+
+    @pytest.mark.asyncio
+    async def test_auto_postfilters_when_explain_fails(self):
+        db = _db_returning(RuntimeError("canceling statement due to statement timeout"))
+
+        assert await _choose_filter_strategy(db, SearchFilters(repos=["org/small"]), "auto", 0.1) == POST_FILTER
+        db.begin_nested.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_unknown_strategy_raises(self):
+        with pytest.raises(ValueError, match="Unknown search filter strategy"):
+            await _choose_filter_strategy(_db_returning(), SearchFilters(labels=["bug"]), "sometimes", 0.1)
+
+
+class TestStage1FilterStrategy:
+    def _settings(self, **overrides):
+        values = {
+            "search_vector_retrieval": "exact",
+            "vector_rerank_factor": 4,
+            "search_filter_strategy": "pre",
+            "search_stage1_execution": "sql",
+            "search_prefilter_selectivity": 0.1,
+            "search_freshness_half_life_days": 7.0,
+            "search_freshness_floor": 0.2,
+            "search_freshness_weight": 0.25,
+        }
+        values.update(overrides)
+        return SimpleNamespace(**values)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("iterative", [True, False])
+    async def test_prefilter_uses_iterative_scan_when_available(self, iterative):
+        empty = MagicMock()
+        empty.all.return_value = []
+        db = _db_returning(empty)
+        build_sql = MagicMock(return_value="SELECT 1")
+
+        await _execute_stage1(
+            db=db,
+            query_text="crash",
+            query_embedding=[0.1] * 256,
+            filters=SearchFilters(repos=["org/small"]),
+            use_vector_path=True,
+            build_stage1_sql_fn=build_sql,
+            get_settings_fn=self._settings,
+            assert_vector_dim_fn=lambda *a, **k: None,
+            iterative_scan_probe_fn=AsyncMock(return_value=iterative),
+        )
+
+        assert build_sql.call_args.kwargs == {"filter_strategy": PRE_FILTER, "vector_index_scan": iterative}
+        if iterative:
+            assert "hnsw.iterative_scan" in str(db.execute.await_args.args[0])
+        else:
+            db.execute.assert_not_awaited()
+
+
+class TestIterativeScanProbe:
+    @pytest.fixture(autouse=True)
+    def _reset_cache(self):
+        reset_schema_probe_cache_for_testing()
+        yield
+        reset_schema_probe_cache_for_testing()
+
+    @pytest.mark.asyncio
+    async def test_probe_runs_once_per_process(self):
+        probe = MagicMock()
+        probe.one.return_value = (True,)
+        db = _db_returning(probe)
+
+        assert await _pgvector_supports_iterative_scan(db) is True
+        assert await _pgvector_supports_iterative_scan(db) is True
+        db.exec.assert_awaited_once()
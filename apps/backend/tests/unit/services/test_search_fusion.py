@@ -0,0 +1,226 @@
+"""Tests for concurrent Stage 1 retrieval with in-process RRF fusion."""
+
+import asyncio
+import math
+import random
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from gim_backend.services.search_execution import _execute_stage1
+from gim_backend.services.search_fusion import _fuse_candidate_lists
+from gim_backend.services.search_models import SearchFilters
+from gim_backend.services.search_sql import BM25_PATH, RRF_K, VECTOR_PATH, _build_candidate_list_sql
+
+FRESHNESS = {"freshness_half_life_days": 7.0, "freshness_floor": 0.2, "freshness_weight": 0.25}
+
+
+def _row(node_id, rank, q_score=0.5, age_days=1.0, passes=True):
+    return SimpleNamespace(
+        node_id=node_id,
+        rank=rank,
+        q_score=q_score,
+        age_seconds=None if age_days is None else age_days * 86400.0,
+        passes_filter=passes,
+    )
+
+
+def _sql_reference(vector_rows, bm25_rows):
+    """Row-at-a-time transcription of the fused/filtered/ORDER BY part of _build_stage1_sql."""
+    fused = {}
+    for rows, key in ((vector_rows, "v"), (bm25_rows, "b")):
+        for row in rows:
+            fused.setdefault(row.node_id, {"row": row})[key] = row.rank
+
+    ranked = []
+    for node_id, entry in fused.items():
+        row = entry["row"]
+        if not row.passes_filter:
+            continue
+        rrf = sum(1.0 / (RRF_K + entry[k]) for k in ("v", "b") if k in entry)
+        if row.age_seconds is None:
+            freshness = FRESHNESS["freshness_floor"]
+        else:
+            decay = 0.5 ** (row.age_seconds / 86400.0 / FRESHNESS["freshness_half_life_days"])
+            freshness = max(FRESHNESS["freshness_floor"], decay)
+        final = rrf + FRESHNESS["freshness_weight"] * freshness
+        q_key = -math.inf if row.q_score is None else -row.q_score
+        ranked.append(((-final, q_key, node_id), node_id, rrf))
+
+    ranked.sort()
+    return [node_id for _, node_id, _ in ranked], {node_id: rrf for _, node_id, rrf in ranked}
+
+
+class TestFuseCandidateLists:
+    def test_matches_sql_ordering_on_random_corpus(self):
+        rng = random.Random(20)
+        ids = [f"I_{i:04d}" for i in range(400)]
+        vector_ids = rng.sample(ids, 150)
+        bm25_ids = rng.sample(ids, 150)
+        meta = {
+            node_id: {
+                "q_score": None if rng.random() < 0.05 else rng.choice([0.2, 0.5, 0.8]),
+                "age_days": None if rng.random() < 0.05 else rng.choice([0.5, 3.0, 30.0, 90.0]),
+                "passes": rng.random() < 0.7,
+            }
+            for node_id in ids
+        }
+        vector_rows = [_row(n, r, **meta[n]) for r, n in enumerate(vector_ids, start=1)]
+        bm25_rows = [_row(n, r, **meta[n]) for r, n in enumerate(bm25_ids, start=1)]
+
+        result = _fuse_candidate_lists(vector_rows, bm25_rows, candidate_limit=500, **FRESHNESS)
+
+        expected_ids, expected_scores = _sql_reference(vector_rows, bm25_rows)
+        assert result.node_ids == expected_ids
+        assert result.total == len(expected_ids)
+        assert result.rrf_scores == pytest.approx(expected_scores)
+        assert result.is_capped is False
+
+    def test_ties_break_on_q_score_then_node_id(self):
+        # Same rank pair and age: equal final scores
+        vector_rows = [_row("I_b", 1, q_score=0.5), _row("I_a", 2, q_score=0.5), _row("I_c", 3, q_score=0.9)]
+        bm25_rows = [_row("I_c", 3, q_score=0.9), _row("I_a", 1, q_score=0.5), _row("I_b", 2, q_score=0.5)]
+
+        result = _fuse_candidate_lists(vector_rows, bm25_rows, candidate_limit=500, **FRESHNESS)
+
+        assert result.node_ids == ["I_a", "I_b", "I_c"]
+
+    def test_filtered_rows_drop_out_of_total(self):
+        result = _fuse_candidate_lists(
+            [_row("I_1", 1), _row("I_2", 2, passes=False)],
+            [_row("I_3", 1, passes=None)],
+            candidate_limit=2,
+            **FRESHNESS,
+        )
+
+        assert result.node_ids == ["I_1"]
+        assert result.total == 1
+        assert result.is_capped is True
+
+    def test_nothing_passing_is_empty_and_uncapped(self):
+        result = _fuse_candidate_lists([_row("I_1", 1, passes=False)], [], candidate_limit=1, **FRESHNESS)
+
+        assert (result.node_ids, result.total, result.is_capped) == ([], 0, False)
+
+
+class TestCandidateListSql:
+    def test_lists_carry_fusion_columns_and_filter_flag(self):
+        sql = _build_candidate_list_sql(SearchFilters(labels=["bug"], repos=["o/r"]), VECTOR_PATH)
+
+        assert "c.v_rank AS rank" in sql
+        assert "AS age_seconds" in sql
+        assert "(r.node_id IS NOT NULL AND c.labels && :labels AND r.full_name = ANY(:repos)) AS passes_filter" in sql
+        assert "LEFT JOIN ingestion.repository r" in sql
+
+    def test_bm25_list_uses_stage1_ranking(self):
+        sql = _build_candidate_list_sql(SearchFilters(), BM25_PATH)
+
+        assert "c.b_rank AS rank" in sql
+        assert "DESC, i.node_id" in sql
+
+    def test_unknown_path_raises(self):
+        with pytest.raises(ValueError, match="Unknown retrieval path"):
+            _build_candidate_list_sql(SearchFilters(), "sparse")
+
+
+def _settings(**overrides):
+    values = {
+        "search_stage1_execution": "parallel",
+        "search_vector_retrieval": "exact",
+        "vector_rerank_factor": 4,
+        "search_filter_strategy": "post",
+        "search_prefilter_selectivity": 0.1,
+        "search_freshness_half_life_days": 7.0,
+        "search_freshness_floor": 0.2,
+        "search_freshness_weight": 0.25,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class _Session:
+    """Session whose query only returns once both paths have started."""
+
+    def __init__(self, rows, started: list, both_started: asyncio.Event):
+        self._rows = rows
+        self._started = started
+        self._both_started = both_started
+        self.execute = AsyncMock()
+
+    async def exec(self, statement, params=None):
+        self._started.append(self)
+        if len(self._started) == 2:
+            self._both_started.set()
+        await self._both_started.wait()
+        result = MagicMock()
+        result.all.return_value = self._rows
+        return result
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+
+class TestParallelStage1:
+    @pytest.mark.asyncio
+    async def test_paths_run_concurrently_on_separate_sessions(self):
+        started: list = []
+        both_started = asyncio.Event()
+        db = _Session([_row("I_2", 1)], started, both_started)
+        vector_session = _Session([_row("I_1", 1), _row("I_2", 2)], started, both_started)
+
+        result = await asyncio.wait_for(
+            _execute_stage1(
+                db=db,
+                query_text="crash",
+                query_embedding=[0.1] * 256,
+                filters=SearchFilters(),
+                use_vector_path=True,
+                get_settings_fn=lambda: _settings(search_vector_retrieval="binary"),
+                assert_vector_dim_fn=lambda *a, **k: None,
+                session_factory_fn=lambda: vector_session,
+            ),
+            timeout=1,
+        )
+
+        assert set(started) == {db, vector_session}
+        assert result.node_ids == ["I_2", "I_1"]
+        # Transaction-local hnsw.ef_search goes to the session running the vector query
+        vector_session.execute.assert_awaited()
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_bm25_only_uses_request_session(self):
+        started: list = []
+        ready = asyncio.Event()
+        ready.set()
+        db = _Session([_row("I_1", 1)], started, ready)
+        session_factory = MagicMock()
+
+        result = await _execute_stage1(
+            db=db,
+            query_text="crash",
+            query_embedding=None,
+            filters=SearchFilters(),
+            use_vector_path=False,
+            get_settings_fn=_settings,
+            session_factory_fn=session_factory,
+        )
+
+        assert result.node_ids == ["I_1"]
+        session_factory.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unknown_execution_mode_raises(self):
+        with pytest.raises(ValueError, match="Unknown search Stage 1 execution"):
+            await _execute_stage1(
+                db=MagicMock(),
+                query_text="crash",
+                query_embedding=None,
+                filters=SearchFilters(),
+                use_vector_path=False,
+                get_settings_fn=lambda: _settings(search_stage1_execution="threads"),
+            )
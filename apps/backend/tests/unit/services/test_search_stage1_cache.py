@@ -0,0 +1,158 @@
+"""Tests for the page-independent Stage 1 result cache."""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from gim_backend.core.config import get_settings
+from gim_backend.services.search_execution import hybrid_search
+from gim_backend.services.search_models import (
+    SearchFilters,
+    SearchRequest,
+    SearchResultItem,
+    Stage1Result,
+)
+from gim_backend.services.search_stage1_cache import (
+    STAGE1_CACHE_PREFIX,
+    STAGE1_CACHE_TTL_SECONDS,
+    _deserialize_stage1,
+    _serialize_stage1,
+    cache_stage1_result,
+    get_cached_stage1,
+)
+
+STAGE1 = Stage1Result(
+    node_ids=[f"I_{i}" for i in range(45)],
+    rrf_scores={f"I_{i}": 0.03 - i * 0.0001 for i in range(45)},
+    total=45,
+    is_capped=False,
+)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self._kv: dict[str, tuple[int, str]] = {}
+
+    async def setex(self, key: str, ttl: int, value: str) -> None:
+        self._kv[key] = (ttl, value)
+
+    async def get(self, key: str):
+        item = self._kv.get(key)
+        return item[1] if item else None
+
+
+def _item(node_id: str) -> SearchResultItem:
+    return SearchResultItem(
+        node_id=node_id,
+        title=node_id,
+        body_preview="",
+        labels=[],
+        q_score=0.5,
+        repo_name="o/r",
+        primary_language="Python",
+        github_created_at=datetime(2026, 1, 1, tzinfo=UTC),
+        rrf_score=STAGE1.rrf_scores[node_id],
+    )
+
+
+class TestStage1CacheKey:
+    def test_key_ignores_page_and_whitespace(self):
+        first = SearchRequest(query="async  crash ", filters=SearchFilters(labels=["bug"]), page=1, page_size=20)
+        later = SearchRequest(query="async crash", filters=SearchFilters(labels=["bug"]), page=3, page_size=10)
+
+        assert first.stage1_cache_key("v1") == later.stage1_cache_key("v1")
+        assert first.cache_key() != later.cache_key()
+
+    def test_key_changes_with_filters_and_ranking_version(self):
+        request = SearchRequest(query="crash", filters=SearchFilters(labels=["bug"]))
+        other_filters = SearchRequest(query="crash", filters=SearchFilters(labels=["docs"]))
+
+        assert request.stage1_cache_key("v1") != other_filters.stage1_cache_key("v1")
+        assert request.stage1_cache_key("v1") != request.stage1_cache_key("v2")
+
+
+class TestStage1Serialization:
+    def test_round_trip_preserves_order_and_scores(self):
+        assert _deserialize_stage1(_serialize_stage1(STAGE1)) == STAGE1
+
+    @pytest.mark.asyncio
+    async def test_cached_under_stage1_prefix(self):
+        fake_redis = _FakeRedis()
+        request = SearchRequest(query="crash")
+
+        with patch("gim_backend.services.search_stage1_cache.get_redis", new=AsyncMock(return_value=fake_redis)):
+            await cache_stage1_result(request, STAGE1)
+            cached = await get_cached_stage1(SearchRequest(query="crash", page=2))
+
+        [(key, (ttl, _))] = fake_redis._kv.items()
+        assert key.startswith(f"{STAGE1_CACHE_PREFIX}g0:")
+        assert ttl == STAGE1_CACHE_TTL_SECONDS
+        assert cached == STAGE1
+
+    @pytest.mark.asyncio
+    async def test_ranking_settings_change_misses(self):
+        fake_redis = _FakeRedis()
+        request = SearchRequest(query="crash")
+        changed = get_settings().model_copy(update={"search_freshness_weight": 0.5})
+
+        with patch("gim_backend.services.search_stage1_cache.get_redis", new=AsyncMock(return_value=fake_redis)):
+            await cache_stage1_result(request, STAGE1)
+            with patch("gim_backend.services.search_stage1_cache.get_settings", return_value=changed):
+                assert await get_cached_stage1(request) is None
+
+    @pytest.mark.asyncio
+    async def test_returns_none_without_redis(self):
+        with patch("gim_backend.services.search_stage1_cache.get_redis", new=AsyncMock(return_value=None)):
+            assert await get_cached_stage1(SearchRequest(query="crash")) is None
+
+
+class TestHybridSearchPagination:
+    @pytest.mark.asyncio
+    async def test_later_pages_only_run_stage2(self):
+        cache: dict[str, Stage1Result] = {}
+
+        async def get_cached(request):
+            return cache.get(request.stage1_cache_key("test"))
+
+        async def store(request, result):
+            cache[request.stage1_cache_key("test")] = result
+
+        embed = AsyncMock(return_value=[0.1] * 256)
+        stage1 = AsyncMock(return_value=STAGE1)
+
+        async def stage2(db, page_ids, rrf_scores):
+            return [_item(node_id) for node_id in page_ids]
+
+        kwargs = {
+            "embed_query_fn": embed,
+            "assert_vector_dim_fn": lambda *a, **k: None,
+            "execute_stage1_fn": stage1,
+            "execute_stage2_fn": stage2,
+            "get_cached_stage1_fn": get_cached,
+            "cache_stage1_fn": store,
+        }
+
+        page1 = await hybrid_search(None, SearchRequest(query="crash", page=1, page_size=20), **kwargs)
+        page3 = await hybrid_search(None, SearchRequest(query="crash", page=3, page_size=20), **kwargs)
+
+        embed.assert_awaited_once()
+        stage1.assert_awaited_once()
+        assert [r.node_id for r in page1.results] == STAGE1.node_ids[:20]
+        assert [r.node_id for r in page3.results] == STAGE1.node_ids[40:45]
+        assert page3.has_more is False
+
+    @pytest.mark.asyncio
+    async def test_bm25_fallback_results_are_not_cached(self):
+        store = AsyncMock()
+
+        await hybrid_search(
+            None,
+            SearchRequest(query="crash"),
+            embed_query_fn=AsyncMock(return_value=None),
+            execute_stage1_fn=AsyncMock(return_value=Stage1Result(node_ids=[], rrf_scores={}, total=0)),
+            get_cached_stage1_fn=AsyncMock(return_value=None),
+            cache_stage1_fn=store,
+        )
+
+        store.assert_not_awaited()
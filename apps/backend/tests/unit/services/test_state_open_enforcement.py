@@ -4,13 +4,26 @@ import inspect
 def test_feed_personalized_enforces_open_state():
     from gim_backend.services import feed_service
     src = inspect.getsource(feed_service._get_personalized_feed)
+    assert "_rank_personalized_candidates(" in src
+    src = inspect.getsource(feed_service._rank_personalized_candidates)
     assert "i.state = 'open'" in src
 
 
 def test_feed_trending_enforces_open_state():
     from gim_backend.services import feed_service
     src = inspect.getsource(feed_service._get_trending_feed)
+    assert "_build_feed_filters(" in src
+    where_clause, _ = feed_service._build_feed_filters(min_q_score=0.6)
+    assert "i.state = 'open'" in where_clause
+
+
+def test_feed_snapshot_hydration_enforces_open_state():
+    from gim_backend.services import feed_service
+    src = inspect.getsource(feed_service._get_snapshot_feed)
     assert "i.state = 'open'" in src
+    # Materialized feeds and new-issues digests are served through the same hydration
+    assert "_get_snapshot_feed(" in inspect.getsource(feed_service.get_feed)
+    assert "_get_snapshot_feed(" in inspect.getsource(feed_service.get_new_issues_feed)
 
 
 def test_preview_enforces_open_state():
@@ -0,0 +1,116 @@
+"""Tests for exact vs binary-quantized vector candidate retrieval."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from gim_backend.services.search_models import SearchFilters
+from gim_backend.services.search_sql import _build_stage1_sql
+from gim_backend.services.vector_retrieval import (
+    BINARY_RETRIEVAL,
+    EXACT_RETRIEVAL,
+    build_issue_candidates_sql,
+    coarse_ef_search,
+    prepare_vector_scan,
+    retrieval_params,
+)
+
+
+def _normalize(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+class TestBuildIssueCandidatesSql:
+    def test_exact_orders_by_cosine_distance_only(self):
+        sql = _normalize(
+            build_issue_candidates_sql(EXACT_RETRIEVAL, vector_param="q", where="i.state = 'open'", limit=":k")
+        )
+
+        assert "ORDER BY i.embedding <=> CAST(:q AS halfvec) LIMIT :k" in sql
+        assert "<~>" not in sql
+        assert ":rerank_factor" not in sql
+
+    def test_binary_overfetches_by_hamming_then_reranks_by_cosine(self):
+        sql = _normalize(
+            build_issue_candidates_sql(BINARY_RETRIEVAL, vector_param="q", where="i.state = 'open'", limit=":k")
+        )
+
+        coarse = "ORDER BY binary_quantize(i.embedding)::bit(256) <~> binary_quantize(CAST(:q AS halfvec))"
+        assert coarse in sql
+        assert "LIMIT :k * :rerank_factor" in sql
+        assert sql.index(coarse) < sql.rindex("ORDER BY i.embedding <=> CAST(:q AS halfvec) LIMIT :k")
+        assert "WHERE i.state = 'open'" in sql
+
+    def test_unknown_mode_raises(self):
+        with pytest.raises(ValueError, match="Unknown vector retrieval mode"):
+            build_issue_candidates_sql("pq", vector_param="q", where="TRUE", limit=":k")
+
+
+class TestRetrievalParams:
+    def test_only_binary_mode_binds_rerank_factor(self):
+        assert retrieval_params(EXACT_RETRIEVAL, 4) == {}
+        assert retrieval_params(BINARY_RETRIEVAL, 4) == {"rerank_factor": 4}
+        assert retrieval_params(BINARY_RETRIEVAL, 0) == {"rerank_factor": 1}
+
+    def test_coarse_ef_search_is_clamped(self):
+        assert coarse_ef_search(5, 4) == 40
+        assert coarse_ef_search(200, 4) == 800
+        assert coarse_ef_search(500, 4) == 1000
+
+    @pytest.mark.asyncio
+    async def test_prepare_vector_scan_sets_ef_search_for_binary_only(self):
+        db = MagicMock()
+        db.execute = AsyncMock()
+
+        await prepare_vector_scan(db, EXACT_RETRIEVAL, 200, 4)
+        db.execute.assert_not_awaited()
+
+        await prepare_vector_scan(db, BINARY_RETRIEVAL, 200, 4)
+        assert db.execute.await_args.args[1] == {"ef_search": "800"}
+
+    @pytest.mark.asyncio
+    async def test_prepare_vector_scan_min_ef_search_is_clamped(self):
+        db = MagicMock()
+        db.execute = AsyncMock()
+
+        await prepare_vector_scan(db, EXACT_RETRIEVAL, 200, 4, min_ef_search=200)
+        assert db.execute.await_args.args[1] == {"ef_search": "200"}
+
+        await prepare_vector_scan(db, EXACT_RETRIEVAL, 200, 4, min_ef_search=5000)
+        assert db.execute.await_args.args[1] == {"ef_search": "1000"}
+
+        await prepare_vector_scan(db, BINARY_RETRIEVAL, 200, 4, min_ef_search=200)
+        assert db.execute.await_args.args[1] == {"ef_search": "800"}
+
+
+class TestCallSites:
+    def test_stage1_uses_selected_mode(self):
+        exact_sql = _build_stage1_sql(SearchFilters(), use_vector_path=True)
+        binary_sql = _build_stage1_sql(SearchFilters(), use_vector_path=True, retrieval_mode=BINARY_RETRIEVAL)
+
+        assert "<~>" not in exact_sql
+        assert "<~>" in binary_sql
+        assert "LIMIT :candidate_limit * :rerank_factor" in binary_sql
+
+    @pytest.mark.asyncio
+    async def test_similar_issues_binary_mode(self):
+        from gim_backend.services.issue_service import get_similar_issues
+
+        source = MagicMock(node_id="I_source", embedding=[0.1] * 256, neighbor_ids=None)
+        source_result = MagicMock()
+        source_result.fetchone.return_value = source
+        similar_result = MagicMock()
+        similar_result.fetchall.return_value = []
+
+        db = AsyncMock()
+        db.execute.side_effect = [source_result, MagicMock(), similar_result]
+        settings = SimpleNamespace(similar_vector_retrieval=BINARY_RETRIEVAL, vector_rerank_factor=3)
+
+        with patch("gim_backend.services.issue_service.get_settings", return_value=settings):
+            await get_similar_issues(db, "I_source", limit=5)
+
+        sql, params = db.execute.call_args_list[2].args
+        assert "<~>" in str(sql)
+        assert params["rerank_factor"] == 3
+        assert db.execute.call_args_list[1].args[1] == {"ef_search": "40"}
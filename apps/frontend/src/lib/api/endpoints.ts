@@ -54,12 +54,14 @@ export async function fetchTrending(
 export async function fetchFeed(
   page = 1,
   pageSize = 20,
-  filters?: { languages?: string[]; labels?: string[]; repos?: string[] }
+  filters?: { languages?: string[]; labels?: string[]; repos?: string[] },
+  snapshotId?: string | null
 ) {
   const params: Record<string, any> = { page, page_size: pageSize };
   if (filters?.languages?.length) params.languages = filters.languages;
   if (filters?.labels?.length) params.labels = filters.labels;
   if (filters?.repos?.length) params.repos = filters.repos;
+  if (snapshotId) params.snapshot_id = snapshotId;
 
   const { data } = await api.get<FeedResponse>("/feed", { params });
   return data;
@@ -72,9 +72,11 @@ export function useFeed(
 ) {
   return useInfiniteQuery({
     queryKey: ["feed", pageSize, filters],
-    queryFn: ({ pageParam }) => fetchFeed(pageParam, pageSize, filters),
-    initialPageParam: 1,
-    getNextPageParam: (lastPage) => (lastPage.has_more ? lastPage.page + 1 : undefined),
+    // Later pages are sliced from the ranking snapshot taken by the previous page
+    queryFn: ({ pageParam }) => fetchFeed(pageParam.page, pageSize, filters, pageParam.snapshotId),
+    initialPageParam: { page: 1, snapshotId: null as string | null },
+    getNextPageParam: (lastPage) =>
+      lastPage.has_more ? { page: lastPage.page + 1, snapshotId: lastPage.snapshot_id } : undefined,
     staleTime: 1000 * 30,
   });
 }
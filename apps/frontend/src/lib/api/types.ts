@@ -45,6 +45,7 @@ export type FeedResponse = {
   has_more: boolean;
   is_personalized: boolean;
   profile_cta: string | null;
+  snapshot_id: string | null;
   recommendation_batch_id: string;
 };
 
@@ -136,6 +136,7 @@ export const handlers = [
       has_more: end < filtered.length,
       is_personalized: true,
       profile_cta: null,
+      snapshot_id: null,
       recommendation_batch_id: `mock-batch-${Date.now()}`,
     });
   }),
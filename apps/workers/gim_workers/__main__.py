@@ -6,8 +6,15 @@ Usage:
     JOB_TYPE=embedder python -m gim_workers     # staging table -> Nomic MoE -> DB
     JOB_TYPE=janitor python -m gim_workers      # Prune low-survival issues
     JOB_TYPE=reco_flush python -m gim_workers   # Flush recommendation events to analytics
+    JOB_TYPE=feed_materialize python -m gim_workers  # Precompute per-user feeds into Redis
+    JOB_TYPE=new_issues python -m gim_workers   # Per-user "new since last visit" digests
+    JOB_TYPE=issue_neighbors python -m gim_workers  # Refresh the similar-issues graph
 
-Embedder job needs 8GB+ memory for the Nomic model.
+The embedder (standalone or chained after the collector) also refreshes the
+similar-issues graph and re-materializes feeds after a run that wrote issues.
+
+Embedder job needs 8GB+ memory for the Nomic model; with EMBEDDER_PROCESSES=N
+each encoder process loads its own copy.
 """
 
 import asyncio
@@ -19,6 +26,7 @@ import sys
 
 
 from gim_workers.logging_config import setup_logging
+from gim_backend.ingestion.embedding_cache import CachedEmbedder
 from gim_backend.ingestion.nomic_moe_embedder import NomicMoEEmbedder
 
 
@@ -49,7 +57,7 @@ class GracefulShutdown:
 async def run_worker_task(
     job_type: str, 
     shutdown: GracefulShutdown, 
-    embedder: NomicMoEEmbedder | None = None
+    embedder: NomicMoEEmbedder | CachedEmbedder | None = None
 ) -> dict:
     """Run the specified worker job."""
     
@@ -59,8 +67,9 @@ async def run_worker_task(
             return await run_collector_job()
         
         case "embedder":
-            if not embedder:
-                raise ValueError("Embedder job requires embedder instance")
+            if embedder is None:
+                from gim_workers.jobs.embedder_job import run_configured_embedder_job
+                return await run_configured_embedder_job()
             from gim_workers.jobs.embedder_job import run_embedder_job
             return await run_embedder_job(embedder)
         
@@ -71,6 +80,18 @@ async def run_worker_task(
         case "reco_flush":
             from gim_workers.jobs.reco_flush_job import run_reco_flush_job
             return await run_reco_flush_job()
+
+        case "feed_materialize":
+            from gim_workers.jobs.feed_materialize_job import run_feed_materialize_job
+            return await run_feed_materialize_job()
+
+        case "new_issues":
+            from gim_workers.jobs.new_issues_job import run_new_issues_job
+            return await run_new_issues_job()
+
+        case "issue_neighbors":
+            from gim_workers.jobs.issue_neighbors_job import run_issue_neighbors_job
+            return await run_issue_neighbors_job()
         
         case _:
             raise ValueError(f"Unknown job type: {job_type}")
@@ -88,7 +109,6 @@ async def main() -> None:
     )
     
     shutdown = GracefulShutdown()
-    embedder: NomicMoEEmbedder | None = None
     
     # Register signal handlers
     loop = asyncio.get_running_loop()
@@ -96,16 +116,12 @@ async def main() -> None:
         loop.add_signal_handler(sig, lambda s=sig: shutdown.signal_handler(s))
 
     try:
+        # The embedder job loads (and closes) its own model, or a pool of them
+        result = await run_worker_task(job_type, shutdown)
+
         if job_type == "embedder":
-            # Initialize singleton embedder model (shared state)
-            # Large size (~1GB)
-            logger.info("Initializing shared NomicMoEEmbedder")
-            embedder = NomicMoEEmbedder(max_workers=2)
-            embedder.warmup()
-            
-            result = await run_worker_task(job_type, shutdown, embedder)
-        else:
-            result = await run_worker_task(job_type, shutdown)
+            from gim_workers.jobs.post_embedder import run_post_embedder_jobs
+            await run_post_embedder_jobs(result)
 
         logger.info(
             "Job completed successfully",
@@ -120,12 +136,6 @@ async def main() -> None:
                 extra={"job_type": job_type},
             )
         sys.exit(1)
-        
-    finally:
-        # Clean up shared resources
-        if embedder:
-            logger.info("Cleaning up shared embedder")
-            embedder.close()
 
 
 if __name__ == "__main__":
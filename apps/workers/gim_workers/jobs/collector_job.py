@@ -24,6 +24,31 @@ from gim_database.session import async_session_factory
 logger = logging.getLogger(__name__)
 
 
+async def run_chained_embedder(pending_count: int) -> dict:
+    """
+    Embeds what the collector staged, configured exactly like JOB_TYPE=embedder
+    (process pool, embedding cache), then runs the post-embedder refreshes.
+    Returns the embedder's stats, or {} when nothing is pending.
+    """
+    if pending_count <= 0:
+        return {}
+
+    logger.info(
+        f"Triggering chained embedder job for {pending_count} pending issues",
+        extra={"pending_count": pending_count},
+    )
+    from gim_workers.jobs.embedder_job import run_configured_embedder_job
+    from gim_workers.jobs.post_embedder import run_post_embedder_jobs
+
+    embedder_result = await run_configured_embedder_job()
+    logger.info(
+        f"Chained embedder complete: {embedder_result.get('issues_processed', 0)} processed",
+        extra=embedder_result,
+    )
+    await run_post_embedder_jobs(embedder_result)
+    return embedder_result
+
+
 async def run_collector_job() -> dict:
     """
     Executes the collection pipeline:
@@ -45,6 +70,7 @@ async def run_collector_job() -> dict:
         extra={
             "gatherer_concurrency": settings.gatherer_concurrency,
             "max_issues_per_repo": settings.max_issues_per_repo,
+            "gatherer_incremental": settings.gatherer_incremental,
         },
     )
 
@@ -88,14 +114,24 @@ async def run_collector_job() -> dict:
 
         # Persist repositories (FK constraint for issues)
         persist_start = time.monotonic()
+        high_water_marks = {}
         async with async_session_factory() as session:
             persistence = StreamingPersistence(session)
             repos_upserted = await persistence.upsert_repositories(repos)
+            if settings.gatherer_incremental:
+                high_water_marks = await persistence.get_issue_high_water_marks(
+                    [repo.node_id for repo in repos]
+                )
         persist_elapsed = time.monotonic() - persist_start
             
         logger.info(
-            f"Repositories upserted in {persist_elapsed:.1f}s: {repos_upserted}",
-            extra={"repos_upserted": repos_upserted, "persist_duration_s": round(persist_elapsed, 1)},
+            f"Repositories upserted in {persist_elapsed:.1f}s: {repos_upserted}, "
+            f"{len(high_water_marks)} with issue high-water marks",
+            extra={
+                "repos_upserted": repos_upserted,
+                "repos_incremental": len(high_water_marks),
+                "persist_duration_s": round(persist_elapsed, 1),
+            },
         )
 
         # Gather issues (fetch from GitHub)
@@ -114,7 +150,7 @@ async def run_collector_job() -> dict:
         
         # Collect issues into batches for staging insert
         issues_collected = []
-        async for issue in gatherer.harvest_issues(repos):
+        async for issue in gatherer.harvest_issues(repos, high_water_marks=high_water_marks):
             issues_collected.append(issue)
             
             # Insert in batches of 100 for memory efficiency
@@ -130,6 +166,15 @@ async def run_collector_job() -> dict:
                 staging = StagingPersistence(session)
                 await staging.insert_pending_issues(issues_collected)
 
+        # Advance marks only after every harvested issue is staged
+        marks_advanced = 0
+        if settings.gatherer_incremental:
+            async with async_session_factory() as session:
+                persistence = StreamingPersistence(session)
+                marks_advanced = await persistence.update_issue_high_water_marks(
+                    gatherer.get_high_water_marks()
+                )
+
         gather_elapsed = time.monotonic() - gather_start
 
         # Count total staged issues
@@ -142,6 +187,7 @@ async def run_collector_job() -> dict:
             extra={
                 "gather_duration_s": round(gather_elapsed, 1),
                 "pending_count": pending_count,
+                "high_water_marks_advanced": marks_advanced,
             },
         )
 
@@ -158,23 +204,12 @@ async def run_collector_job() -> dict:
         )
 
         # Chain embedder job to run immediately after collector
-        if pending_count > 0:
-            logger.info(
-                f"Triggering chained embedder job for {pending_count} pending issues",
-                extra={"pending_count": pending_count},
-            )
-            from gim_workers.jobs.embedder_job import run_embedder_job
-            embedder_result = await run_embedder_job()
-            logger.info(
-                f"Chained embedder complete: {embedder_result.get('issues_processed', 0)} processed",
-                extra=embedder_result,
-            )
-        else:
-            embedder_result = {}
+        embedder_result = await run_chained_embedder(pending_count)
 
         return {
             "repos_discovered": len(repos),
             "pending_count": pending_count,
+            "high_water_marks_advanced": marks_advanced,
             "duration_s": round(job_elapsed, 1),
             "embedder_result": embedder_result,
         }
@@ -5,157 +5,286 @@ Reads from staging.pending_issue, generates embeddings, writes to ingestion.issu
 Designed to run as a Cloud Run Job, scheduled after the Collector.
 """
 
+import asyncio
 import logging
 import time
-from datetime import datetime
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 
-from sqlalchemy import text
-from sqlmodel.ext.asyncio.session import AsyncSession
-
-from gim_backend.core.config import get_settings
-from gim_backend.ingestion.nomic_moe_embedder import NomicMoEEmbedder
+from gim_backend.core.config import Settings, get_settings
+from gim_backend.ingestion.embedding_cache import CachedEmbedder, with_embedding_cache
+from gim_backend.ingestion.nomic_moe_embedder import (
+    EMBEDDING_DIM,
+    MODEL_NAME,
+    NomicMoEEmbedder,
+    create_nomic_embedder,
+    embedding_model_tag,
+)
+from gim_backend.ingestion.persistence import StreamingPersistence
 from gim_backend.ingestion.staging_persistence import StagingPersistence
-from gim_backend.ingestion.survival_score import calculate_survival_score, days_since
+from gim_backend.services.index_generation import bump_index_generation
 from gim_database.session import async_session_factory
 
 logger = logging.getLogger(__name__)
 
 
-async def run_embedder_job(embedder: NomicMoEEmbedder | None = None) -> dict:
+@dataclass
+class StageStats:
+    """Throughput and idle-time counters for one embedder pipeline stage."""
+
+    batches: int = 0
+    items: int = 0
+    busy_s: float = 0.0
+    idle_s: float = 0.0
+
+    @contextmanager
+    def busy(self) -> Iterator[None]:
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.busy_s += time.monotonic() - start
+
+    @contextmanager
+    def idle(self) -> Iterator[None]:
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.idle_s += time.monotonic() - start
+
+    def as_dict(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "busy_s": round(self.busy_s, 2),
+            "idle_s": round(self.idle_s, 2),
+            "items_per_s": round(self.items / self.busy_s, 1) if self.busy_s > 0 else 0.0,
+        }
+
+
+def create_job_embedder(
+    settings: Settings,
+    *,
+    max_workers: int = 2,
+    num_threads: int | None = None,
+    namespace: str = "",
+) -> NomicMoEEmbedder | CachedEmbedder:
+    """
+    The encoder every embedder entry point uses: the configured backend
+    behind the configured embedding cache. Not warmed up.
+    """
+    return with_embedding_cache(
+        create_nomic_embedder(settings, max_workers=max_workers, num_threads=num_threads),
+        settings,
+        model_name=MODEL_NAME,
+        dim=EMBEDDING_DIM,
+        namespace=namespace,
+    )
+
+
+async def run_configured_embedder_job() -> dict:
+    """
+    Runs the embedder job as configured: EMBEDDER_PROCESSES > 1 fans it out
+    over the process pool, otherwise one in-process encoder is loaded for the
+    run. Used by JOB_TYPE=embedder and the collector's chained run.
+    """
+    settings = get_settings()
+    if settings.embedder_processes > 1:
+        # Each pool process loads its own model; nothing shared in the supervisor
+        from gim_workers.jobs.embedder_pool import run_embedder_pool
+
+        return await run_embedder_pool(settings.embedder_processes, settings.embedder_torch_threads)
+    return await run_embedder_job()
+
+
+async def run_embedder_job(
+    embedder: NomicMoEEmbedder | CachedEmbedder | None = None,
+    cleanup_staging: bool = True,
+) -> dict:
     """
     Process pending issues from staging table.
     
+    Runs three overlapping stages joined by bounded queues, so the model
+    encodes one batch while the next is claimed and the previous is written:
+    
     1. Claim batch of pending issues (atomic lock)
     2. Generate embeddings in batches
-    3. Persist to ingestion.issue with survival score
-    4. Mark staging records as completed
+    3. Persist to ingestion.issue with survival score and mark staging
+       records as completed
     
-    Returns stats dict with issues_processed and issues_failed.
+    Returns stats dict with issues_processed, issues_failed and per-stage
+    throughput/idle counters under "stages". Pool workers pass
+    cleanup_staging=False and leave cleanup and the search index generation
+    bump to the supervisor.
     """
     job_start = time.monotonic()
     settings = get_settings()
     batch_size = settings.embedder_batch_size
+    queue_depth = settings.embedder_queue_depth
     
     logger.info(
-        f"Embedder job starting with batch_size={batch_size}",
-        extra={"batch_size": batch_size},
+        f"Embedder job starting with batch_size={batch_size}, queue_depth={queue_depth}",
+        extra={"batch_size": batch_size, "queue_depth": queue_depth},
     )
     
-    # Initialize embedder if not provided (for standalone testing)
+    # Initialize embedder if not provided
     close_embedder = False
     if embedder is None:
         logger.info("Initializing NomicMoEEmbedder")
-        embedder = NomicMoEEmbedder(max_workers=2)
+        embedder = create_job_embedder(settings, num_threads=settings.embedder_torch_threads or None)
         embedder.warmup()
         close_embedder = True
     
-    total_processed = 0
-    total_failed = 0
-    
-    try:
-        # Process multiple batches until no pending issues remain
+    claimed_queue: asyncio.Queue[list[dict] | None] = asyncio.Queue(maxsize=queue_depth)
+    encoded_queue: asyncio.Queue[tuple[list[dict], list[list[float]]] | None] = asyncio.Queue(
+        maxsize=queue_depth
+    )
+    stats = {name: StageStats() for name in ("claim", "encode", "write")}
+    totals = {"processed": 0, "failed": 0, "encodes_avoided": 0}
+
+    async def claimer() -> None:
+        stage = stats["claim"]
         while True:
-            # Claim batch
-            async with async_session_factory() as session:
-                staging = StagingPersistence(session)
-                pending_issues = await staging.claim_pending_batch(batch_size)
-            
+            with stage.busy():
+                async with async_session_factory() as session:
+                    staging = StagingPersistence(session)
+                    pending_issues = await staging.claim_pending_batch(batch_size)
+
             if not pending_issues:
                 logger.info("No pending issues to process")
                 break
-            
+
+            stage.batches += 1
+            stage.items += len(pending_issues)
+
+            # Dedupe stage: unchanged content keeps its embedding, only metadata is refreshed
+            with stage.busy():
+                pending_issues, refreshed = await _refresh_unchanged(pending_issues)
+            totals["processed"] += refreshed
+            totals["encodes_avoided"] += refreshed
+            if not pending_issues:
+                continue
+
+            # Time blocked on a full queue is backpressure from the encoder
+            with stage.idle():
+                await claimed_queue.put(pending_issues)
+
+        await claimed_queue.put(None)
+
+    async def encoder() -> None:
+        stage = stats["encode"]
+        while True:
+            with stage.idle():
+                pending_issues = await claimed_queue.get()
+            if pending_issues is None:
+                break
+
             logger.info(
                 f"Processing batch of {len(pending_issues)} issues",
                 extra={"batch_size": len(pending_issues)},
             )
-            
-            # Generate embeddings
+
             texts = [
                 f"{issue['title']}\n{issue['body_text']}"
                 for issue in pending_issues
             ]
-            
-            try:
-                embeddings = await embedder.embed_documents(texts)
-            except Exception as e:
-                logger.error(f"Embedding generation failed: {e}")
-                # Mark all as failed (will retry)
-                async with async_session_factory() as session:
-                    staging = StagingPersistence(session)
-                    await staging.mark_failed([i["node_id"] for i in pending_issues])
-                total_failed += len(pending_issues)
-                continue
-            
-            if len(embeddings) != len(pending_issues):
+
+            with stage.busy():
+                try:
+                    embeddings = await embedder.embed_documents(texts)
+                except Exception as e:
+                    logger.error(f"Embedding generation failed: {e}")
+                    embeddings = None
+
+            if embeddings is not None and len(embeddings) != len(pending_issues):
                 logger.error(
                     f"Embedding count mismatch: got {len(embeddings)}, expected {len(pending_issues)}"
                 )
+                embeddings = None
+
+            if embeddings is None:
+                # Mark all as failed (will retry)
                 async with async_session_factory() as session:
                     staging = StagingPersistence(session)
                     await staging.mark_failed([i["node_id"] for i in pending_issues])
-                total_failed += len(pending_issues)
+                totals["failed"] += len(pending_issues)
                 continue
-            
-            # Persist to ingestion.issue
-            succeeded_ids = []
-            failed_ids = []
-            
-            async with async_session_factory() as session:
-                for issue, embedding in zip(pending_issues, embeddings):
-                    try:
-                        await _persist_issue(session, issue, embedding)
-                        succeeded_ids.append(issue["node_id"])
-                    except Exception as e:
-                        logger.warning(f"Failed to persist issue {issue['node_id']}: {e}")
-                        failed_ids.append(issue["node_id"])
-                
-                await session.commit()
-            
-            # Update staging status
-            async with async_session_factory() as session:
-                staging = StagingPersistence(session)
-                if succeeded_ids:
-                    await staging.mark_completed(succeeded_ids)
-                if failed_ids:
-                    await staging.mark_failed(failed_ids)
-            
-            total_processed += len(succeeded_ids)
-            total_failed += len(failed_ids)
-            
+
+            stage.batches += 1
+            stage.items += len(pending_issues)
+            with stage.idle():
+                await encoded_queue.put((pending_issues, embeddings))
+
+        await encoded_queue.put(None)
+
+    async def writer() -> None:
+        stage = stats["write"]
+        while True:
+            with stage.idle():
+                encoded = await encoded_queue.get()
+            if encoded is None:
+                break
+
+            pending_issues, embeddings = encoded
+            with stage.busy():
+                # Persist to ingestion.issue
+                succeeded_ids, failed_ids = await _persist_batch(pending_issues, embeddings)
+
+                # Update staging status
+                async with async_session_factory() as session:
+                    staging = StagingPersistence(session)
+                    if succeeded_ids:
+                        await staging.mark_completed(succeeded_ids)
+                    if failed_ids:
+                        await staging.mark_failed(failed_ids)
+
+            stage.batches += 1
+            stage.items += len(succeeded_ids)
+            totals["processed"] += len(succeeded_ids)
+            totals["failed"] += len(failed_ids)
+
             logger.info(
                 f"Batch complete: {len(succeeded_ids)} succeeded, {len(failed_ids)} failed",
                 extra={
                     "batch_succeeded": len(succeeded_ids),
                     "batch_failed": len(failed_ids),
-                    "total_processed": total_processed,
+                    "total_processed": totals["processed"],
                 },
             )
-    
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            group.create_task(claimer())
+            group.create_task(encoder())
+            group.create_task(writer())
+    except ExceptionGroup as eg:
+        # A failed stage cancels the others; surface the original error
+        raise eg.exceptions[0] from eg
     finally:
         if close_embedder:
             embedder.close()
-    
-    # Clean up completed staging rows older than 24 hours
-    staging_cleaned = 0
-    try:
-        async with async_session_factory() as session:
-            staging = StagingPersistence(session)
-            staging_cleaned = await staging.cleanup_completed(older_than_hours=24)
-        if staging_cleaned > 0:
-            logger.info(
-                f"Staging cleanup: removed {staging_cleaned} completed rows",
-                extra={"staging_cleaned": staging_cleaned},
-            )
-    except Exception as e:
-        logger.warning(f"Staging cleanup failed (non-fatal): {e}")
+
+    total_processed = totals["processed"]
+    total_failed = totals["failed"]
+    encodes_avoided = totals["encodes_avoided"]
+
+    staging_cleaned = await cleanup_staging_rows() if cleanup_staging else 0
+    # New or re-embedded issues are committed; cached searches are now stale
+    index_generation = None
+    if cleanup_staging and total_processed > 0:
+        index_generation = await bump_index_generation("embedder")
     
     elapsed = time.monotonic() - job_start
     
     logger.info(
-        f"Embedder job complete in {elapsed:.1f}s - {total_processed} processed, {total_failed} failed",
+        f"Embedder job complete in {elapsed:.1f}s - {total_processed} processed, {total_failed} failed, "
+        f"{encodes_avoided} unchanged (not re-embedded)",
         extra={
             "total_processed": total_processed,
             "total_failed": total_failed,
+            "encodes_avoided": encodes_avoided,
             "duration_s": round(elapsed, 1),
         },
     )
@@ -163,75 +292,96 @@ async def run_embedder_job(embedder: NomicMoEEmbedder | None = None) -> dict:
     return {
         "issues_processed": total_processed,
         "issues_failed": total_failed,
+        "encodes_avoided": encodes_avoided,
         "staging_cleaned": staging_cleaned,
+        "index_generation": index_generation,
         "duration_s": round(elapsed, 1),
+        "stages": {name: stage.as_dict() for name, stage in stats.items()},
     }
 
 
-async def _persist_issue(
-    session: AsyncSession,
-    issue: dict,
-    embedding: list[float],
-) -> None:
-    """Persist single issue with embedding to ingestion.issue table."""
-    # Parse github_created_at
-    github_created_at = issue.get("github_created_at")
-    if isinstance(github_created_at, str):
-        from datetime import UTC
-        dt = datetime.fromisoformat(github_created_at.replace("Z", "+00:00"))
-        github_created_at = dt.astimezone(UTC).replace(tzinfo=None)
-    elif hasattr(github_created_at, 'replace'):
-        # Already a datetime, ensure naive UTC
-        github_created_at = github_created_at.replace(tzinfo=None)
-    
-    # Calculate survival score
-    days_old = days_since(github_created_at)
-    q_score = issue.get("q_score", 0.0)
-    survival = calculate_survival_score(q_score, days_old)
-    
-    await session.execute(
-        text("""
-            INSERT INTO ingestion.issue (
-                node_id, repo_id, has_code, has_template_headers,
-                tech_stack_weight, q_score, survival_score, title,
-                body_text, labels, embedding, content_hash, state,
-                github_created_at
-            )
-            VALUES (
-                :node_id, :repo_id, :has_code, :has_template_headers,
-                :tech_stack_weight, :q_score, :survival_score, :title,
-                :body_text, :labels, CAST(:embedding AS vector), :content_hash,
-                :state, :github_created_at
+async def cleanup_staging_rows() -> int:
+    """Clean up completed staging rows older than 24 hours (non-fatal)."""
+    staging_cleaned = 0
+    try:
+        async with async_session_factory() as session:
+            staging = StagingPersistence(session)
+            staging_cleaned = await staging.cleanup_completed(older_than_hours=24)
+        if staging_cleaned > 0:
+            logger.info(
+                f"Staging cleanup: removed {staging_cleaned} completed rows",
+                extra={"staging_cleaned": staging_cleaned},
             )
-            ON CONFLICT (node_id) DO UPDATE SET
-                repo_id = EXCLUDED.repo_id,
-                has_code = EXCLUDED.has_code,
-                has_template_headers = EXCLUDED.has_template_headers,
-                tech_stack_weight = EXCLUDED.tech_stack_weight,
-                q_score = EXCLUDED.q_score,
-                survival_score = EXCLUDED.survival_score,
-                title = EXCLUDED.title,
-                body_text = EXCLUDED.body_text,
-                labels = EXCLUDED.labels,
-                embedding = EXCLUDED.embedding,
-                content_hash = EXCLUDED.content_hash,
-                state = EXCLUDED.state,
-                github_created_at = EXCLUDED.github_created_at
-        """),
-        {
-            "node_id": issue["node_id"],
-            "repo_id": issue["repo_id"],
-            "has_code": issue.get("has_code", False),
-            "has_template_headers": issue.get("has_template_headers", False),
-            "tech_stack_weight": issue.get("tech_stack_weight", 0.0),
-            "q_score": q_score,
-            "survival_score": survival,
-            "title": issue["title"],
-            "body_text": issue["body_text"],
-            "labels": issue.get("labels", []),
-            "embedding": str(embedding),
-            "content_hash": issue["content_hash"],
-            "state": issue.get("state", "open"),
-            "github_created_at": github_created_at,
-        },
+    except Exception as e:
+        logger.warning(f"Staging cleanup failed (non-fatal): {e}")
+    return staging_cleaned
+
+
+async def _refresh_unchanged(pending_issues: list[dict]) -> tuple[list[dict], int]:
+    """
+    Refresh metadata for claimed rows whose content_hash matches ingestion.issue
+    and whose stored embedding came from the configured encoder, and mark them
+    completed. Returns (rows still needing encoding, rows refreshed).
+
+    The hash comparison happens inside the UPDATE, so a row whose content changed
+    since it was claimed falls through to encoding.
+    """
+    async with async_session_factory() as session:
+        persistence = StreamingPersistence(session, embedding_model=embedding_model_tag(get_settings()))
+        refreshed_ids = await persistence.refresh_unchanged_issues(pending_issues)
+        await session.commit()
+
+    if not refreshed_ids:
+        return pending_issues, 0
+
+    async with async_session_factory() as session:
+        staging = StagingPersistence(session)
+        await staging.mark_completed(list(refreshed_ids))
+
+    logger.info(
+        f"Skipped encoding for {len(refreshed_ids)}/{len(pending_issues)} unchanged issues",
+        extra={"encodes_avoided": len(refreshed_ids), "batch_size": len(pending_issues)},
     )
+    return [i for i in pending_issues if i["node_id"] not in refreshed_ids], len(refreshed_ids)
+
+
+async def _persist_batch(
+    pending_issues: list[dict],
+    embeddings: list[list[float]],
+) -> tuple[list[str], list[str]]:
+    """
+    Persist a claimed batch to ingestion.issue with one set-based upsert.
+
+    If the bulk statement is rejected, rows are retried one by one inside
+    savepoints so only the poison rows are reported as failed.
+    Returns (succeeded_ids, failed_ids).
+    """
+    items = list(zip(pending_issues, embeddings))
+
+    async with async_session_factory() as session:
+        persistence = StreamingPersistence(session, embedding_model=embedding_model_tag(get_settings()))
+        try:
+            await persistence.upsert_staged_issues(items)
+            await session.commit()
+            return [issue["node_id"] for issue in pending_issues], []
+        except Exception as e:
+            await session.rollback()
+            logger.warning(
+                f"Bulk upsert of {len(items)} issues failed, isolating rows: {e}",
+                extra={"batch_size": len(items)},
+            )
+
+        succeeded_ids = []
+        failed_ids = []
+        for issue, embedding in items:
+            try:
+                async with session.begin_nested():
+                    await persistence.upsert_staged_issue(issue, embedding)
+                succeeded_ids.append(issue["node_id"])
+            except Exception as e:
+                logger.warning(f"Failed to persist issue {issue['node_id']}: {e}")
+                failed_ids.append(issue["node_id"])
+
+        await session.commit()
+
+    return succeeded_ids, failed_ids
@@ -0,0 +1,151 @@
+"""
+Embedder pool: fan the embedder job out over several encoder processes.
+
+Each process loads its own NomicMoEEmbedder, is pinned to a disjoint share
+of the available cores and runs the regular pipelined embedder job. Batches
+are split between processes by the FOR UPDATE SKIP LOCKED claim in
+StagingPersistence.claim_pending_batch, so no coordination is needed beyond
+collecting each process's stats.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from gim_backend.services.index_generation import bump_index_generation
+
+from gim_workers.jobs.embedder_job import cleanup_staging_rows
+
+logger = logging.getLogger(__name__)
+
+
+def available_cores() -> list[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def partition_cores(cores: list[int], processes: int) -> list[list[int]]:
+    """Split cores into contiguous, near-equal shares; every process gets at least one core."""
+    if processes <= 0:
+        raise ValueError("processes must be positive")
+    if processes >= len(cores):
+        return [[cores[i % len(cores)]] for i in range(processes)]
+
+    share, extra = divmod(len(cores), processes)
+    shares = []
+    start = 0
+    for i in range(processes):
+        end = start + share + (1 if i < extra else 0)
+        shares.append(cores[start:end])
+        start = end
+    return shares
+
+
+def _run_worker(worker_index: int, cores: list[int], torch_threads: int) -> dict:
+    """Process entrypoint: pin, load a private model and drain the staging table."""
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    threads = torch_threads or len(cores)
+    # Set before torch is imported so OpenMP/MKL pools match the core share
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["MKL_NUM_THREADS"] = str(threads)
+
+    from gim_workers.logging_config import setup_logging
+
+    setup_logging()
+
+    from gim_backend.core.config import get_settings
+
+    from gim_workers.jobs.embedder_job import create_job_embedder, run_embedder_job
+
+    logger.info(
+        f"Embedder worker {worker_index} starting on cores {cores} with {threads} threads",
+        extra={"worker_index": worker_index, "cores": cores, "torch_threads": threads},
+    )
+
+    # The mmap cache is single-writer, so each worker keeps its own store
+    settings = get_settings()
+    embedder = create_job_embedder(
+        settings,
+        max_workers=1,
+        num_threads=threads,
+        namespace=f"worker-{worker_index}",
+    )
+    try:
+        embedder.warmup()
+        result = asyncio.run(run_embedder_job(embedder, cleanup_staging=False))
+    finally:
+        embedder.close()
+
+    result["worker_index"] = worker_index
+    result["cores"] = cores
+    return result
+
+
+def aggregate_worker_results(results: list[dict]) -> dict:
+    stages: dict[str, dict] = {}
+    for result in results:
+        for name, stage in result.get("stages", {}).items():
+            total = stages.setdefault(name, {"batches": 0, "items": 0, "busy_s": 0.0, "idle_s": 0.0})
+            total["batches"] += stage["batches"]
+            total["items"] += stage["items"]
+            total["busy_s"] = round(total["busy_s"] + stage["busy_s"], 2)
+            total["idle_s"] = round(total["idle_s"] + stage["idle_s"], 2)
+
+    return {
+        "issues_processed": sum(r.get("issues_processed", 0) for r in results),
+        "issues_failed": sum(r.get("issues_failed", 0) for r in results),
+        "encodes_avoided": sum(r.get("encodes_avoided", 0) for r in results),
+        "stages": stages,
+        "workers": results,
+    }
+
+
+async def run_embedder_pool(processes: int, torch_threads: int = 0) -> dict:
+    """
+    Run the embedder job in `processes` encoder processes and aggregate their stats.
+
+    torch_threads=0 gives each process one thread per core in its share.
+    """
+    job_start = time.monotonic()
+    shares = partition_cores(available_cores(), processes)
+
+    logger.info(
+        f"Embedder pool starting {processes} processes",
+        extra={"processes": processes, "core_shares": shares, "torch_threads": torch_threads},
+    )
+
+    loop = asyncio.get_running_loop()
+    # spawn: torch and the asyncpg engine must not be inherited through fork
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(pool, _run_worker, index, cores, torch_threads)
+                for index, cores in enumerate(shares)
+            )
+        )
+
+    result = aggregate_worker_results(list(results))
+    result["staging_cleaned"] = await cleanup_staging_rows()
+    result["index_generation"] = await bump_index_generation("embedder") if result["issues_processed"] > 0 else None
+
+    elapsed = time.monotonic() - job_start
+    result["duration_s"] = round(elapsed, 1)
+    result["issues_per_s"] = round(result["issues_processed"] / elapsed, 1) if elapsed > 0 else 0.0
+
+    logger.info(
+        f"Embedder pool complete in {elapsed:.1f}s - "
+        f"{result['issues_processed']} processed, {result['issues_failed']} failed",
+        extra={
+            "processes": processes,
+            "total_processed": result["issues_processed"],
+            "total_failed": result["issues_failed"],
+            "duration_s": result["duration_s"],
+        },
+    )
+    return result
@@ -0,0 +1,103 @@
+"""
+Precompute the default personalized feed for every user with a combined_vector.
+
+Runs after each embedder run (and standalone as JOB_TYPE=feed_materialize) so
+/feed serves page 1 from Redis instead of ranking against the issue table.
+Users are read in keyset-paginated batches; each user's ranking runs in its
+own savepoint so one failure does not abort the batch.
+"""
+
+import logging
+import os
+import time
+
+from gim_backend.core.redis import get_redis
+from gim_backend.services.feed_service import materialize_user_feed
+from gim_database.session import async_session_factory
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+_FIRST_BATCH_SQL = text("""
+    SELECT user_id, combined_vector, preferred_languages, min_heat_threshold
+    FROM public.userprofile
+    WHERE combined_vector IS NOT NULL
+    ORDER BY user_id
+    LIMIT :limit
+""")
+
+_NEXT_BATCH_SQL = text("""
+    SELECT user_id, combined_vector, preferred_languages, min_heat_threshold
+    FROM public.userprofile
+    WHERE combined_vector IS NOT NULL AND user_id > :after
+    ORDER BY user_id
+    LIMIT :limit
+""")
+
+
+async def run_feed_materialize_job() -> dict:
+    """
+    Returns stats dict with users, materialized, skipped and failed counts.
+    Does nothing when Redis is unavailable, since there is nowhere to store feeds.
+    """
+    batch_size = int(os.getenv("FEED_MATERIALIZE_BATCH_SIZE", "500"))
+
+    if await get_redis() is None:
+        logger.warning("Feed materialization skipped: Redis unavailable")
+        return {"users": 0, "materialized": 0, "skipped": 0, "failed": 0, "redis_available": False}
+
+    start = time.time()
+    users = 0
+    materialized = 0
+    skipped = 0
+    failed = 0
+    after = None
+
+    async with async_session_factory() as db:
+        while True:
+            if after is None:
+                result = await db.execute(_FIRST_BATCH_SQL, {"limit": batch_size})
+            else:
+                result = await db.execute(_NEXT_BATCH_SQL, {"after": after, "limit": batch_size})
+            profiles = result.fetchall()
+            if not profiles:
+                break
+
+            for profile in profiles:
+                users += 1
+                try:
+                    async with db.begin_nested():
+                        count = await materialize_user_feed(db, profile.user_id, profile)
+                except Exception as e:
+                    failed += 1
+                    logger.warning(f"Feed materialization failed for user {profile.user_id}: {e}")
+                    continue
+
+                if count is None:
+                    skipped += 1
+                else:
+                    materialized += 1
+
+            after = profiles[-1].user_id
+            # Release the read snapshot between batches
+            await db.commit()
+
+    duration = time.time() - start
+    logger.info(
+        f"Feed materialization complete: {materialized}/{users} users in {duration:.1f}s",
+        extra={
+            "users": users,
+            "materialized": materialized,
+            "skipped": skipped,
+            "failed": failed,
+            "duration_s": round(duration, 2),
+        },
+    )
+
+    return {
+        "users": users,
+        "materialized": materialized,
+        "skipped": skipped,
+        "failed": failed,
+        "redis_available": True,
+    }
@@ -0,0 +1,53 @@
+"""
+Refresh the precomputed similar-issues graph (ingestion.issue_neighbors).
+
+Runs after each embedder run that wrote issues (and standalone as
+JOB_TYPE=issue_neighbors). Only open issues whose neighbour row is missing or
+was computed from other content are recomputed; ISSUE_NEIGHBORS_FULL_REBUILD=1
+recomputes every row, e.g. after an embedding model change. Each batch is
+committed on its own, so an interrupted run resumes where it stopped.
+"""
+
+import logging
+import os
+import time
+
+from gim_backend.services.issue_neighbors import (
+    refresh_issue_neighbors,
+    select_stale_issues,
+)
+from gim_database.session import async_session_factory
+
+logger = logging.getLogger(__name__)
+
+
+async def run_issue_neighbors_job() -> dict:
+    """Returns stats dict with issues recomputed, reverse_updates and batches."""
+    batch_size = int(os.getenv("ISSUE_NEIGHBORS_BATCH_SIZE", "200"))
+    full_rebuild = os.getenv("ISSUE_NEIGHBORS_FULL_REBUILD", "").lower() in ("1", "true", "yes")
+
+    start = time.time()
+    stats = {"issues": 0, "reverse_updates": 0, "batches": 0}
+    after = None
+
+    async with async_session_factory() as db:
+        while True:
+            stale = await select_stale_issues(db, after=after, limit=batch_size, full_rebuild=full_rebuild)
+            if not stale:
+                break
+
+            batch_stats = await refresh_issue_neighbors(db, stale)
+            await db.commit()
+
+            stats["issues"] += batch_stats["issues"]
+            stats["reverse_updates"] += batch_stats["reverse_updates"]
+            stats["batches"] += 1
+            after = stale[-1].node_id
+
+    duration = time.time() - start
+    logger.info(
+        f"Issue neighbours refreshed: {stats['issues']} issues, "
+        f"{stats['reverse_updates']} reverse updates in {duration:.1f}s",
+        extra={**stats, "full_rebuild": full_rebuild, "duration_s": round(duration, 2)},
+    )
+    return {**stats, "full_rebuild": full_rebuild, "duration_s": round(duration, 2)}
@@ -9,6 +9,7 @@ import logging
 
 from gim_backend.ingestion.janitor import Janitor
 from gim_backend.ingestion.staging_persistence import StagingPersistence
+from gim_backend.services.index_generation import bump_index_generation
 from gim_database.session import async_session_factory
 
 logger = logging.getLogger(__name__)
@@ -20,7 +21,11 @@ async def run_janitor_job() -> dict:
     1. Prune bottom 20% of ingestion.issue by survival_score
     2. Delete completed staging rows older than 24 hours
 
-    Returns stats dict with deleted_count, remaining_count, and staging_cleaned.
+    Bumps the search index generation when issues were pruned, so cached
+    searches stop returning them.
+
+    Returns stats dict with deleted_count, remaining_count, staging_cleaned
+    and index_generation.
     """
     logger.info("Starting Janitor: pruning low-survival issues")
 
@@ -38,6 +43,10 @@ async def run_janitor_job() -> dict:
         },
     )
 
+    index_generation = None
+    if result["deleted_count"] > 0:
+        index_generation = await bump_index_generation("janitor")
+
     # Clean up completed staging rows
     staging_cleaned = 0
     try:
@@ -56,4 +65,5 @@ async def run_janitor_job() -> dict:
         "deleted_count": result["deleted_count"],
         "remaining_count": result["remaining_count"],
         "staging_cleaned": staging_cleaned,
+        "index_generation": index_generation,
     }
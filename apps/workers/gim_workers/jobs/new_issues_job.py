@@ -0,0 +1,158 @@
+"""
+Precompute "new issues for you since your last visit" for every user with a
+combined_vector.
+
+Loads the issues ingested within the lookback window once as a float32
+matrix, then scores users in keyset-paginated batches with the batched
+users x issues engine (one chunked matrix multiply per batch instead of one
+pgvector query per user). Each user only sees issues ingested after their
+last visit: the latest session activity, or the whole window without one.
+Ranking and filters match the personalized feed. Digests go to Redis for
+GET /feed/new.
+"""
+
+import logging
+import os
+import time
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+from gim_backend.core.config import get_settings
+from gim_backend.core.redis import get_redis
+from gim_backend.services.batch_scoring import (
+    language_codes,
+    score_users_against_issues,
+)
+from gim_backend.services.new_issues_digest import (
+    NewIssuesDigest,
+    store_new_issues_digests,
+)
+from gim_database.session import async_session_factory
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+_ISSUES_SQL = text("""
+    SELECT
+        i.node_id,
+        i.embedding,
+        i.q_score,
+        r.primary_language,
+        EXTRACT(EPOCH FROM i.ingested_at) AS ingested_epoch,
+        EXTRACT(EPOCH FROM (NOW() - GREATEST(i.ingested_at, i.github_created_at))) / 86400.0 AS age_days
+    FROM ingestion.issue i
+    JOIN ingestion.repository r ON i.repo_id = r.node_id
+    WHERE i.state = 'open'
+      AND i.embedding IS NOT NULL
+      AND i.ingested_at > :since
+""")
+
+_USERS_SELECT = """
+    SELECT
+        p.user_id,
+        p.combined_vector,
+        p.preferred_languages,
+        p.min_heat_threshold,
+        (
+            SELECT EXTRACT(EPOCH FROM MAX(s.last_active_at))
+            FROM public.session s
+            WHERE s.user_id = p.user_id
+        ) AS last_visit_epoch
+    FROM public.userprofile p
+    WHERE p.combined_vector IS NOT NULL
+"""
+_FIRST_USERS_SQL = text(_USERS_SELECT + " ORDER BY p.user_id LIMIT :limit")
+_NEXT_USERS_SQL = text(_USERS_SELECT + " AND p.user_id > :after ORDER BY p.user_id LIMIT :limit")
+
+
+async def run_new_issues_job() -> dict:
+    """
+    Returns stats dict with users, issues, digests_stored, users_with_results
+    and duration_s. Does nothing when Redis is unavailable.
+    """
+    lookback_days = float(os.getenv("NEW_ISSUES_LOOKBACK_DAYS", "7"))
+    top_k = int(os.getenv("NEW_ISSUES_TOP_K", "20"))
+    user_batch_size = int(os.getenv("NEW_ISSUES_USER_BATCH_SIZE", "5000"))
+    memory_budget_bytes = int(os.getenv("NEW_ISSUES_MEMORY_MB", "512")) * 1024 * 1024
+
+    stats = {"users": 0, "issues": 0, "digests_stored": 0, "users_with_results": 0}
+    if await get_redis() is None:
+        logger.warning("New issues digest skipped: Redis unavailable")
+        return {**stats, "redis_available": False}
+
+    settings = get_settings()
+    start = time.time()
+    computed_at = datetime.now(UTC)
+    window_start = computed_at - timedelta(days=lookback_days)
+
+    async with async_session_factory() as db:
+        issue_rows = (await db.execute(_ISSUES_SQL, {"since": window_start})).fetchall()
+        stats["issues"] = len(issue_rows)
+        if not issue_rows:
+            logger.info("New issues digest: nothing ingested in the lookback window")
+            return {**stats, "redis_available": True, "duration_s": round(time.time() - start, 2)}
+
+        issue_ids = [row.node_id for row in issue_rows]
+        issue_vectors = np.stack([np.asarray(row.embedding, dtype=np.float32) for row in issue_rows])
+        issue_q_scores = np.array([float(row.q_score) for row in issue_rows], dtype=np.float32)
+        issue_ingested = np.array([float(row.ingested_epoch) for row in issue_rows])
+        issue_age_days = np.array([float(row.age_days) for row in issue_rows])
+        issue_languages = [row.primary_language for row in issue_rows]
+        del issue_rows
+
+        after = None
+        while True:
+            if after is None:
+                result = await db.execute(_FIRST_USERS_SQL, {"limit": user_batch_size})
+            else:
+                result = await db.execute(_NEXT_USERS_SQL, {"after": after, "limit": user_batch_size})
+            users = result.fetchall()
+            if not users:
+                break
+
+            codes, allowed = language_codes(issue_languages, [user.preferred_languages for user in users])
+            top = score_users_against_issues(
+                np.stack([np.asarray(user.combined_vector, dtype=np.float32) for user in users]),
+                issue_vectors,
+                issue_age_days,
+                k=top_k,
+                freshness_half_life_days=settings.feed_freshness_half_life_days,
+                freshness_floor=settings.feed_freshness_floor,
+                freshness_weight=settings.feed_freshness_weight,
+                issue_q_scores=issue_q_scores,
+                user_min_q_scores=np.array([float(user.min_heat_threshold) for user in users]),
+                issue_language_codes=codes,
+                user_allowed_languages=allowed,
+                issue_ingested_at=issue_ingested,
+                user_since=np.array(
+                    [np.nan if user.last_visit_epoch is None else float(user.last_visit_epoch) for user in users]
+                ),
+                memory_budget_bytes=memory_budget_bytes,
+            )
+
+            # Users with nothing new still get an (empty) digest, replacing the previous one
+            digests: dict = {}
+            for row, user in enumerate(users):
+                indices, final_scores, similarity = top.for_user(row)
+                since = None
+                if user.last_visit_epoch is not None:
+                    since = max(datetime.fromtimestamp(float(user.last_visit_epoch), UTC), window_start)
+                digests[user.user_id] = NewIssuesDigest(
+                    since=since,
+                    computed_at=computed_at,
+                    node_ids=[issue_ids[index] for index in indices],
+                    similarity_scores=similarity,
+                    final_scores=final_scores,
+                )
+                stats["users_with_results"] += bool(indices)
+
+            stats["users"] += len(users)
+            stats["digests_stored"] += await store_new_issues_digests(digests)
+            after = users[-1].user_id
+
+    duration = time.time() - start
+    logger.info(
+        f"New issues digest complete: {stats['users']} users x {stats['issues']} issues in {duration:.1f}s",
+        extra={**stats, "duration_s": round(duration, 2)},
+    )
+    return {**stats, "redis_available": True, "duration_s": round(duration, 2)}
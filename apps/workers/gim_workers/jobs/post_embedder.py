@@ -0,0 +1,38 @@
+"""
+Jobs that refresh what depends on ingestion.issue after an embedder run.
+
+Run after both JOB_TYPE=embedder and the collector's chained embedder (the
+deployed path), whenever the run wrote issues.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def run_post_embedder_jobs(result: dict) -> None:
+    """
+    Refreshes the similar-issues graph and re-materializes feeds, recording
+    their stats on the embedder's result. Each job is non-fatal and handles a
+    missing Redis itself, so neither depends on the index generation bump
+    succeeding.
+    """
+    if result.get("issues_processed", 0) <= 0:
+        return
+
+    # Only new or re-embedded issues are recomputed; /similar falls back to the live query meanwhile
+    try:
+        from gim_workers.jobs.issue_neighbors_job import run_issue_neighbors_job
+
+        result["issue_neighbors"] = await run_issue_neighbors_job()
+    except Exception as e:
+        logger.warning(f"Issue neighbours refresh after embedder failed (non-fatal): {e}")
+
+    # Feeds ranked before this run are now stale; non-fatal, /feed falls back to live ranking
+    try:
+        from gim_workers.jobs.feed_materialize_job import run_feed_materialize_job
+
+        result["feed_materialization"] = await run_feed_materialize_job()
+    except Exception as e:
+        logger.warning(f"Feed materialization after embedder failed (non-fatal): {e}")
+
@@ -0,0 +1,51 @@
+"""Unit tests for the embedder run chained after the collector"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from gim_workers.jobs import collector_job, embedder_job, post_embedder
+
+
+@pytest.fixture
+def post_jobs(monkeypatch):
+    post = AsyncMock()
+    monkeypatch.setattr(post_embedder, "run_post_embedder_jobs", post)
+    return post
+
+
+class TestRunChainedEmbedder:
+    async def test_runs_configured_embedder(self, monkeypatch, post_jobs):
+        run_embedder = AsyncMock(return_value={"issues_processed": 3})
+        monkeypatch.setattr(embedder_job, "run_configured_embedder_job", run_embedder)
+
+        result = await collector_job.run_chained_embedder(3)
+
+        assert result == {"issues_processed": 3}
+        run_embedder.assert_awaited_once_with()
+
+    async def test_nothing_pending_skips_embedder(self, monkeypatch, post_jobs):
+        run_embedder = AsyncMock()
+        monkeypatch.setattr(embedder_job, "run_configured_embedder_job", run_embedder)
+
+        assert await collector_job.run_chained_embedder(0) == {}
+        run_embedder.assert_not_awaited()
+        post_jobs.assert_not_awaited()
+
+    async def test_refreshes_neighbors_and_feeds_after_chained_embedder(self, monkeypatch):
+        monkeypatch.setattr(
+            embedder_job,
+            "run_configured_embedder_job",
+            AsyncMock(return_value={"issues_processed": 3, "index_generation": 8}),
+        )
+        neighbors = AsyncMock(return_value={"issues": 3})
+        feeds = AsyncMock(return_value={"users": 5})
+        monkeypatch.setattr("gim_workers.jobs.issue_neighbors_job.run_issue_neighbors_job", neighbors)
+        monkeypatch.setattr("gim_workers.jobs.feed_materialize_job.run_feed_materialize_job", feeds)
+
+        result = await collector_job.run_chained_embedder(3)
+
+        neighbors.assert_awaited_once_with()
+        feeds.assert_awaited_once_with()
+        assert result["issue_neighbors"] == {"issues": 3}
+        assert result["feed_materialization"] == {"users": 5}
@@ -0,0 +1,249 @@
+"""Unit tests for embedder job batch persistence"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from gim_backend.ingestion.embedding_cache import CachedEmbedder
+
+from gim_workers.jobs import embedder_job
+
+
+@pytest.fixture
+def mock_session(monkeypatch):
+    session = AsyncMock()
+    session.__aenter__.return_value = session
+    session.__aexit__.return_value = None
+    session.begin_nested = MagicMock(side_effect=lambda: _savepoint())
+    monkeypatch.setattr(embedder_job, "async_session_factory", MagicMock(return_value=session))
+    return session
+
+
+def _savepoint():
+    savepoint = AsyncMock()
+    savepoint.__aenter__.return_value = savepoint
+    savepoint.__aexit__.return_value = None
+    return savepoint
+
+
+@pytest.fixture
+def mock_persistence(monkeypatch):
+    persistence = AsyncMock()
+    monkeypatch.setattr(embedder_job, "StreamingPersistence", MagicMock(return_value=persistence))
+    return persistence
+
+
+def _issues(count: int) -> list[dict]:
+    return [{"node_id": f"I_{i}"} for i in range(count)]
+
+
+class TestPersistBatch:
+    async def test_bulk_upsert_succeeds_for_whole_batch(self, mock_session, mock_persistence):
+        issues = _issues(3)
+
+        succeeded, failed = await embedder_job._persist_batch(issues, [[0.1]] * 3)
+
+        assert succeeded == ["I_0", "I_1", "I_2"]
+        assert failed == []
+        mock_persistence.upsert_staged_issues.assert_awaited_once()
+        mock_persistence.upsert_staged_issue.assert_not_called()
+        mock_session.commit.assert_awaited_once()
+
+    async def test_falls_back_to_rows_to_isolate_poison(self, mock_session, mock_persistence):
+        issues = _issues(3)
+        mock_persistence.upsert_staged_issues.side_effect = Exception("bad row")
+
+        async def upsert_one(issue, embedding):
+            if issue["node_id"] == "I_1":
+                raise ValueError("dimension mismatch")
+
+        mock_persistence.upsert_staged_issue.side_effect = upsert_one
+
+        succeeded, failed = await embedder_job._persist_batch(issues, [[0.1]] * 3)
+
+        assert succeeded == ["I_0", "I_2"]
+        assert failed == ["I_1"]
+        mock_session.rollback.assert_awaited_once()
+        assert mock_session.begin_nested.call_count == 3
+
+
+@pytest.fixture
+def pipeline(monkeypatch, mock_session):
+    settings = MagicMock(embedder_batch_size=2, embedder_queue_depth=1)
+    monkeypatch.setattr(embedder_job, "get_settings", MagicMock(return_value=settings))
+
+    staging = AsyncMock()
+    staging.cleanup_completed.return_value = 0
+    monkeypatch.setattr(embedder_job, "StagingPersistence", MagicMock(return_value=staging))
+
+    persist = AsyncMock(side_effect=lambda issues, embeddings: ([i["node_id"] for i in issues], []))
+    monkeypatch.setattr(embedder_job, "_persist_batch", persist)
+
+    refresh = AsyncMock(side_effect=lambda issues: (issues, 0))
+    monkeypatch.setattr(embedder_job, "_refresh_unchanged", refresh)
+    monkeypatch.setattr(embedder_job, "bump_index_generation", AsyncMock(return_value=7))
+
+    embedder = AsyncMock()
+    embedder.embed_documents.side_effect = lambda texts: [[0.1] * 256 for _ in texts]
+    return staging, persist, embedder
+
+
+def _claimable(count: int) -> list[dict]:
+    return [{"node_id": f"I_{i}", "title": "t", "body_text": "b"} for i in range(count)]
+
+
+class TestRefreshUnchanged:
+    async def test_returns_only_changed_rows(self, mock_session, mock_persistence, monkeypatch):
+        staging = AsyncMock()
+        monkeypatch.setattr(embedder_job, "StagingPersistence", MagicMock(return_value=staging))
+        mock_persistence.refresh_unchanged_issues.return_value = {"I_0", "I_2"}
+
+        remaining, refreshed = await embedder_job._refresh_unchanged(_issues(3))
+
+        assert remaining == [{"node_id": "I_1"}]
+        assert refreshed == 2
+        assert sorted(staging.mark_completed.call_args.args[0]) == ["I_0", "I_2"]
+
+    async def test_nothing_unchanged_skips_staging_update(self, mock_session, mock_persistence, monkeypatch):
+        staging = AsyncMock()
+        monkeypatch.setattr(embedder_job, "StagingPersistence", MagicMock(return_value=staging))
+        mock_persistence.refresh_unchanged_issues.return_value = set()
+
+        remaining, refreshed = await embedder_job._refresh_unchanged(_issues(2))
+
+        assert len(remaining) == 2
+        assert refreshed == 0
+        staging.mark_completed.assert_not_called()
+
+
+class TestRunEmbedderJob:
+    async def test_processes_all_claimed_batches(self, pipeline):
+        staging, persist, embedder = pipeline
+        staging.claim_pending_batch.side_effect = [_claimable(2), _claimable(1), []]
+
+        result = await embedder_job.run_embedder_job(embedder=embedder)
+
+        assert result["issues_processed"] == 3
+        assert result["issues_failed"] == 0
+        assert persist.await_count == 2
+        assert staging.mark_completed.await_count == 2
+
+    async def test_reports_stage_counters(self, pipeline):
+        staging, _, embedder = pipeline
+        staging.claim_pending_batch.side_effect = [_claimable(2), []]
+
+        result = await embedder_job.run_embedder_job(embedder=embedder)
+
+        assert set(result["stages"]) == {"claim", "encode", "write"}
+        for stage in result["stages"].values():
+            assert stage["batches"] == 1
+            assert stage["items"] == 2
+            assert {"busy_s", "idle_s", "items_per_s"} <= set(stage)
+
+    async def test_encode_failure_marks_batch_failed(self, pipeline):
+        staging, persist, embedder = pipeline
+        staging.claim_pending_batch.side_effect = [_claimable(2), []]
+        embedder.embed_documents.side_effect = RuntimeError("model crashed")
+
+        result = await embedder_job.run_embedder_job(embedder=embedder)
+
+        assert result["issues_failed"] == 2
+        staging.mark_failed.assert_awaited_once_with(["I_0", "I_1"])
+        persist.assert_not_called()
+
+    async def test_unchanged_issues_skip_encoding(self, pipeline, monkeypatch):
+        staging, persist, embedder = pipeline
+        staging.claim_pending_batch.side_effect = [_claimable(2), _claimable(2), []]
+        # First batch fully unchanged, second batch has one changed row
+        refresh = AsyncMock(side_effect=[([], 2), (_claimable(1), 1)])
+        monkeypatch.setattr(embedder_job, "_refresh_unchanged", refresh)
+
+        result = await embedder_job.run_embedder_job(embedder=embedder)
+
+        assert result["encodes_avoided"] == 3
+        assert result["issues_processed"] == 4
+        embedder.embed_documents.assert_awaited_once()
+        assert persist.await_count == 1
+
+    async def test_stage_error_propagates(self, pipeline):
+        staging, _, embedder = pipeline
+        staging.claim_pending_batch.side_effect = RuntimeError("db down")
+
+        with pytest.raises(RuntimeError, match="db down"):
+            await embedder_job.run_embedder_job(embedder=embedder)
+
+
+class TestIndexGenerationBump:
+    async def test_bumps_after_processing(self, pipeline):
+        staging, _, embedder = pipeline
+        staging.claim_pending_batch.side_effect = [_claimable(2), []]
+
+        result = await embedder_job.run_embedder_job(embedder=embedder)
+
+        assert result["index_generation"] == 7
+        embedder_job.bump_index_generation.assert_awaited_once_with("embedder")
+
+    async def test_no_bump_when_nothing_processed(self, pipeline):
+        staging, _, embedder = pipeline
+        staging.claim_pending_batch.side_effect = [[]]
+
+        result = await embedder_job.run_embedder_job(embedder=embedder)
+
+        assert result["index_generation"] is None
+        embedder_job.bump_index_generation.assert_not_awaited()
+
+    async def test_pool_workers_leave_bump_to_supervisor(self, pipeline):
+        staging, _, embedder = pipeline
+        staging.claim_pending_batch.side_effect = [_claimable(2), []]
+
+        await embedder_job.run_embedder_job(embedder=embedder, cleanup_staging=False)
+
+        embedder_job.bump_index_generation.assert_not_awaited()
+
+
+class TestRunConfiguredEmbedderJob:
+    async def test_fans_out_to_pool_when_processes_configured(self, monkeypatch):
+        settings = MagicMock(embedder_processes=3, embedder_torch_threads=2)
+        monkeypatch.setattr(embedder_job, "get_settings", MagicMock(return_value=settings))
+        run_pool = AsyncMock(return_value={"issues_processed": 5})
+        monkeypatch.setattr("gim_workers.jobs.embedder_pool.run_embedder_pool", run_pool)
+        run_job = AsyncMock()
+        monkeypatch.setattr(embedder_job, "run_embedder_job", run_job)
+
+        result = await embedder_job.run_configured_embedder_job()
+
+        assert result == {"issues_processed": 5}
+        run_pool.assert_awaited_once_with(3, 2)
+        run_job.assert_not_awaited()
+
+    async def test_single_process_runs_in_process(self, monkeypatch):
+        settings = MagicMock(embedder_processes=1)
+        monkeypatch.setattr(embedder_job, "get_settings", MagicMock(return_value=settings))
+        run_job = AsyncMock(return_value={"issues_processed": 2})
+        monkeypatch.setattr(embedder_job, "run_embedder_job", run_job)
+
+        assert await embedder_job.run_configured_embedder_job() == {"issues_processed": 2}
+        run_job.assert_awaited_once_with()
+
+
+class TestCreateJobEmbedder:
+    def test_wraps_encoder_in_configured_cache(self, monkeypatch):
+        encoder = MagicMock()
+        monkeypatch.setattr(embedder_job, "create_nomic_embedder", MagicMock(return_value=encoder))
+        settings = MagicMock(
+            embedding_cache_backend="lru",
+            embedding_cache_max_entries=10,
+            embedding_backend="torch",
+        )
+
+        embedder = embedder_job.create_job_embedder(settings, num_threads=4)
+
+        assert isinstance(embedder, CachedEmbedder)
+        assert embedder.inner is encoder
+        embedder_job.create_nomic_embedder.assert_called_once_with(settings, max_workers=2, num_threads=4)
+
+    def test_no_cache_backend_returns_bare_encoder(self, monkeypatch):
+        encoder = MagicMock()
+        monkeypatch.setattr(embedder_job, "create_nomic_embedder", MagicMock(return_value=encoder))
+        settings = MagicMock(embedding_cache_backend="none", embedding_backend="torch")
+
+        assert embedder_job.create_job_embedder(settings) is encoder
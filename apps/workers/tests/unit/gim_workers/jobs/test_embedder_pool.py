@@ -0,0 +1,45 @@
+"""Unit tests for embedder pool core partitioning and stats aggregation"""
+
+import pytest
+
+from gim_workers.jobs.embedder_pool import aggregate_worker_results, partition_cores
+
+
+class TestPartitionCores:
+    def test_even_split(self):
+        assert partition_cores(list(range(8)), 4) == [[0, 1], [2, 3], [4, 5], [6, 7]]
+
+    def test_uneven_split_gives_remainder_to_first_shares(self):
+        assert partition_cores(list(range(7)), 3) == [[0, 1, 2], [3, 4], [5, 6]]
+
+    def test_more_processes_than_cores_share_cores(self):
+        assert partition_cores([0, 1], 3) == [[0], [1], [0]]
+
+    def test_single_process_gets_all_cores(self):
+        assert partition_cores([2, 3, 5], 1) == [[2, 3, 5]]
+
+    def test_rejects_zero_processes(self):
+        with pytest.raises(ValueError):
+            partition_cores([0, 1], 0)
+
+
+class TestAggregateWorkerResults:
+    def test_sums_counts_and_stage_counters(self):
+        stage = {"batches": 2, "items": 10, "busy_s": 1.5, "idle_s": 0.25, "items_per_s": 6.7}
+        results = [
+            {"issues_processed": 10, "issues_failed": 1, "stages": {"encode": stage}},
+            {"issues_processed": 5, "issues_failed": 0, "stages": {"encode": stage}},
+        ]
+
+        aggregated = aggregate_worker_results(results)
+
+        assert aggregated["issues_processed"] == 15
+        assert aggregated["issues_failed"] == 1
+        assert aggregated["stages"]["encode"] == {"batches": 4, "items": 20, "busy_s": 3.0, "idle_s": 0.5}
+        assert aggregated["workers"] == results
+
+    def test_empty_results(self):
+        aggregated = aggregate_worker_results([])
+
+        assert aggregated["issues_processed"] == 0
+        assert aggregated["stages"] == {}
@@ -0,0 +1,64 @@
+"""Unit tests for the per-user feed materialization job"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from gim_workers.jobs import feed_materialize_job
+
+
+def _savepoint():
+    savepoint = AsyncMock()
+    savepoint.__aenter__.return_value = savepoint
+    savepoint.__aexit__.return_value = None
+    return savepoint
+
+
+def _rows(*user_ids):
+    result = MagicMock()
+    result.fetchall.return_value = [
+        SimpleNamespace(user_id=user_id, combined_vector=[0.1], preferred_languages=None, min_heat_threshold=0.6)
+        for user_id in user_ids
+    ]
+    return result
+
+
+@pytest.fixture
+def mock_session(monkeypatch):
+    session = AsyncMock()
+    session.__aenter__.return_value = session
+    session.__aexit__.return_value = None
+    session.begin_nested = MagicMock(side_effect=lambda: _savepoint())
+    monkeypatch.setattr(feed_materialize_job, "async_session_factory", MagicMock(return_value=session))
+    monkeypatch.setattr(feed_materialize_job, "get_redis", AsyncMock(return_value=object()))
+    monkeypatch.setenv("FEED_MATERIALIZE_BATCH_SIZE", "2")
+    return session
+
+
+class TestFeedMaterializeJob:
+    async def test_pages_through_users_and_counts_outcomes(self, mock_session, monkeypatch):
+        mock_session.execute = AsyncMock(side_effect=[_rows("u1", "u2"), _rows("u3"), _rows()])
+
+        async def materialize(db, user_id, profile):
+            if user_id == "u2":
+                raise RuntimeError("statement timeout")
+            return None if user_id == "u3" else 50
+
+        monkeypatch.setattr(feed_materialize_job, "materialize_user_feed", materialize)
+
+        result = await feed_materialize_job.run_feed_materialize_job()
+
+        assert result == {"users": 3, "materialized": 1, "skipped": 1, "failed": 1, "redis_available": True}
+        # Keyset pagination continues after the last user of each batch
+        second_params = mock_session.execute.await_args_list[1].args[1]
+        assert second_params == {"after": "u2", "limit": 2}
+        assert mock_session.begin_nested.call_count == 3
+
+    async def test_skips_everything_without_redis(self, mock_session, monkeypatch):
+        monkeypatch.setattr(feed_materialize_job, "get_redis", AsyncMock(return_value=None))
+
+        result = await feed_materialize_job.run_feed_materialize_job()
+
+        assert result["redis_available"] is False
+        mock_session.execute.assert_not_called()
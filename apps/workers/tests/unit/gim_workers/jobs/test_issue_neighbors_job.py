@@ -0,0 +1,51 @@
+"""Unit tests for the similar-issues graph refresh job"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from gim_workers.jobs import issue_neighbors_job
+
+
+@pytest.fixture
+def mock_session(monkeypatch):
+    session = AsyncMock()
+    session.__aenter__.return_value = session
+    session.__aexit__.return_value = None
+    monkeypatch.setattr(issue_neighbors_job, "async_session_factory", MagicMock(return_value=session))
+    monkeypatch.setenv("ISSUE_NEIGHBORS_BATCH_SIZE", "2")
+    return session
+
+
+class TestIssueNeighborsJob:
+    async def test_refreshes_stale_issues_batch_by_batch(self, mock_session, monkeypatch):
+        pages = [
+            [SimpleNamespace(node_id="I_1"), SimpleNamespace(node_id="I_2")],
+            [SimpleNamespace(node_id="I_3")],
+            [],
+        ]
+        select = AsyncMock(side_effect=pages)
+        refresh = AsyncMock(side_effect=lambda db, stale: {"issues": len(stale), "reverse_updates": 1})
+        monkeypatch.setattr(issue_neighbors_job, "select_stale_issues", select)
+        monkeypatch.setattr(issue_neighbors_job, "refresh_issue_neighbors", refresh)
+
+        result = await issue_neighbors_job.run_issue_neighbors_job()
+
+        assert result["issues"] == 3
+        assert result["reverse_updates"] == 2
+        assert result["batches"] == 2
+        assert result["full_rebuild"] is False
+        # Keyset pagination continues after the last issue of each batch
+        assert select.await_args_list[1].kwargs == {"after": "I_2", "limit": 2, "full_rebuild": False}
+        assert mock_session.commit.await_count == 2
+
+    async def test_full_rebuild_flag(self, mock_session, monkeypatch):
+        monkeypatch.setenv("ISSUE_NEIGHBORS_FULL_REBUILD", "1")
+        select = AsyncMock(return_value=[])
+        monkeypatch.setattr(issue_neighbors_job, "select_stale_issues", select)
+
+        result = await issue_neighbors_job.run_issue_neighbors_job()
+
+        assert result["full_rebuild"] is True
+        assert select.await_args.kwargs["full_rebuild"] is True
@@ -0,0 +1,104 @@
+"""Unit tests for the new-issues-since-last-visit digest job"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from gim_workers.jobs import new_issues_job
+
+
+def _result(rows):
+    result = MagicMock()
+    result.fetchall.return_value = rows
+    return result
+
+
+def _issue(node_id, vector, ingested_epoch, language="Python"):
+    return SimpleNamespace(
+        node_id=node_id,
+        embedding=vector,
+        q_score=0.8,
+        primary_language=language,
+        ingested_epoch=ingested_epoch,
+        age_days=1.0,
+    )
+
+
+def _user(user_id, vector, last_visit_epoch=None, languages=None):
+    return SimpleNamespace(
+        user_id=user_id,
+        combined_vector=vector,
+        preferred_languages=languages,
+        min_heat_threshold=0.5,
+        last_visit_epoch=last_visit_epoch,
+    )
+
+
+@pytest.fixture
+def job_env(monkeypatch):
+    session = AsyncMock()
+    session.__aenter__.return_value = session
+    session.__aexit__.return_value = None
+    store = AsyncMock(side_effect=lambda digests: len(digests))
+    monkeypatch.setattr(new_issues_job, "async_session_factory", MagicMock(return_value=session))
+    monkeypatch.setattr(new_issues_job, "get_redis", AsyncMock(return_value=object()))
+    monkeypatch.setattr(new_issues_job, "store_new_issues_digests", store)
+    monkeypatch.setattr(
+        new_issues_job,
+        "get_settings",
+        lambda: SimpleNamespace(feed_freshness_half_life_days=7.0, feed_freshness_floor=0.2, feed_freshness_weight=0.25),
+    )
+    monkeypatch.setenv("NEW_ISSUES_USER_BATCH_SIZE", "2")
+    return session, store
+
+
+class TestNewIssuesJob:
+    async def test_scores_users_in_batches_since_last_visit(self, job_env):
+        session, store = job_env
+        issues = [
+            _issue("I_old", [1.0, 0.0], 1_000.0),
+            _issue("I_new", [1.0, 0.1], 3_000.0),
+            _issue("I_rust", [1.0, 0.0], 3_000.0, language="Rust"),
+        ]
+        session.execute = AsyncMock(
+            side_effect=[
+                _result(issues),
+                _result([_user("u1", [1.0, 0.0]), _user("u2", [1.0, 0.0], last_visit_epoch=2_000.0)]),
+                _result([_user("u3", [0.0, 1.0], languages=["Go"])]),
+                _result([]),
+            ]
+        )
+
+        result = await new_issues_job.run_new_issues_job()
+
+        assert result["users"] == 3
+        assert result["issues"] == 3
+        assert result["digests_stored"] == 3
+        assert result["users_with_results"] == 2
+        first, second = (call.args[0] for call in store.await_args_list)
+        assert set(first["u1"].node_ids) == {"I_old", "I_new", "I_rust"}
+        assert sorted(first["u2"].node_ids) == ["I_new", "I_rust"]
+        assert first["u2"].since is not None
+        assert second["u3"].node_ids == []
+        # Keyset pagination continues after the last user of each batch
+        assert session.execute.await_args_list[2].args[1] == {"after": "u2", "limit": 2}
+
+    async def test_no_recent_issues_skips_users(self, job_env):
+        session, store = job_env
+        session.execute = AsyncMock(return_value=_result([]))
+
+        result = await new_issues_job.run_new_issues_job()
+
+        assert result["issues"] == 0
+        assert session.execute.await_count == 1
+        store.assert_not_awaited()
+
+    async def test_skips_everything_without_redis(self, job_env, monkeypatch):
+        session, _ = job_env
+        monkeypatch.setattr(new_issues_job, "get_redis", AsyncMock(return_value=None))
+
+        result = await new_issues_job.run_new_issues_job()
+
+        assert result["redis_available"] is False
+        session.execute.assert_not_called()
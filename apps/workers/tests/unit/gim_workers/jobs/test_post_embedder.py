@@ -0,0 +1,47 @@
+"""Unit tests for the jobs chained after an embedder run"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from gim_workers.jobs import feed_materialize_job, issue_neighbors_job, post_embedder
+
+
+@pytest.fixture
+def refresh_jobs(monkeypatch):
+    neighbors = AsyncMock(return_value={"issues": 4})
+    feeds = AsyncMock(return_value={"users": 2})
+    monkeypatch.setattr(issue_neighbors_job, "run_issue_neighbors_job", neighbors)
+    monkeypatch.setattr(feed_materialize_job, "run_feed_materialize_job", feeds)
+    return neighbors, feeds
+
+
+class TestPostEmbedderJobs:
+    async def test_runs_refreshes_even_when_generation_bump_failed(self, refresh_jobs):
+        neighbors, feeds = refresh_jobs
+        result = {"issues_processed": 4, "index_generation": None}
+
+        await post_embedder.run_post_embedder_jobs(result)
+
+        neighbors.assert_awaited_once_with()
+        feeds.assert_awaited_once_with()
+        assert result["issue_neighbors"] == {"issues": 4}
+        assert result["feed_materialization"] == {"users": 2}
+
+    async def test_skips_when_nothing_was_written(self, refresh_jobs):
+        neighbors, feeds = refresh_jobs
+
+        await post_embedder.run_post_embedder_jobs({"issues_processed": 0})
+
+        neighbors.assert_not_awaited()
+        feeds.assert_not_awaited()
+
+    async def test_failed_refresh_does_not_stop_the_next(self, refresh_jobs):
+        neighbors, _ = refresh_jobs
+        neighbors.side_effect = RuntimeError("db down")
+        result = {"issues_processed": 1}
+
+        await post_embedder.run_post_embedder_jobs(result)
+
+        assert "issue_neighbors" not in result
+        assert result["feed_materialization"] == {"users": 2}
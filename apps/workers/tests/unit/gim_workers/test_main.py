@@ -0,0 +1,30 @@
+"""Unit tests for the worker entrypoint's embedder path"""
+
+from unittest.mock import AsyncMock
+
+import gim_workers.__main__ as worker_main
+from gim_workers.jobs import post_embedder
+
+
+class TestEmbedderEntrypoint:
+    async def test_runs_post_embedder_jobs_with_embedder_result(self, monkeypatch):
+        monkeypatch.setenv("JOB_TYPE", "embedder")
+        monkeypatch.setattr(worker_main, "setup_logging", lambda: "job")
+        monkeypatch.setattr(worker_main, "run_worker_task", AsyncMock(return_value={"issues_processed": 2}))
+        post = AsyncMock()
+        monkeypatch.setattr(post_embedder, "run_post_embedder_jobs", post)
+
+        await worker_main.main()
+
+        post.assert_awaited_once_with({"issues_processed": 2})
+
+    async def test_other_jobs_skip_post_embedder_jobs(self, monkeypatch):
+        monkeypatch.setenv("JOB_TYPE", "janitor")
+        monkeypatch.setattr(worker_main, "setup_logging", lambda: "job")
+        monkeypatch.setattr(worker_main, "run_worker_task", AsyncMock(return_value={"deleted_count": 3}))
+        post = AsyncMock()
+        monkeypatch.setattr(post_embedder, "run_post_embedder_jobs", post)
+
+        await worker_main.main()
+
+        post.assert_not_awaited()
@@ -1,7 +1,7 @@
 """Database models for IssueIndex."""
 
 from gim_database.models.identity import LinkedAccount, Session, User
-from gim_database.models.ingestion import Issue, Repository
+from gim_database.models.ingestion import Issue, IssueNeighbors, Repository
 from gim_database.models.persistence import BookmarkedIssue, PersonalNote
 from gim_database.models.profiles import UserProfile
 from gim_database.models.analytics import RecommendationEvent
@@ -14,6 +14,7 @@ __all__ = [
     "LinkedAccount",
     # Ingestion
     "Issue",
+    "IssueNeighbors",
     "Repository",
     # Staging
     "PendingIssue",
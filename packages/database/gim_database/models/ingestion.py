@@ -3,7 +3,7 @@ from datetime import datetime
 import sqlalchemy as sa
 from sqlmodel import SQLModel, Field, Relationship, Column
 from sqlalchemy.dialects.postgresql import JSONB, ARRAY, REAL
-from pgvector.sqlalchemy import Vector
+from gim_database.vector import HalfVector
 
 VECTOR_DIM = 256
 
@@ -27,6 +27,16 @@ class Repository(SQLModel, table=True):
         sa_column=sa.Column(sa.DateTime(timezone=True), index=True),
     )
 
+    # Issue high-water marks for incremental Gatherer runs (newest issue seen)
+    last_issue_created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=sa.Column(sa.DateTime(timezone=True)),
+    )
+    last_issue_updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=sa.Column(sa.DateTime(timezone=True)),
+    )
+
     issues: List["Issue"] = Relationship(back_populates="repository")
 
 
@@ -34,6 +44,8 @@ class Issue(SQLModel, table=True):
     __table_args__ = (
         # Composite index for clean-up bottom-20% pruning query
         sa.Index("ix_issue_survival_vacuum", "survival_score", "ingested_at"),
+        # Label overlap (labels && :labels) for pre-filtered search candidates
+        sa.Index("ix_issue_labels_gin", "labels", postgresql_using="gin"),
         {"schema": "ingestion"},
     )
 
@@ -59,8 +71,10 @@ class Issue(SQLModel, table=True):
     github_url: Optional[str] = Field(default=None)
     labels: List[str] = Field(default_factory=list, sa_column=Column(ARRAY(sa.String)))
 
-    # 256-dim Nomic embeddings: cast to halfvec at DB level for 10GB optimization
-    embedding: List[float] = Field(sa_column=Column(Vector(VECTOR_DIM)))
+    # 256-dim Nomic embeddings stored as halfvec (2 bytes/dim) with a halfvec_cosine_ops HNSW index
+    embedding: List[float] = Field(sa_column=Column(HalfVector(VECTOR_DIM)))
+    # Encoder that produced the embedding (model@backend); unchanged content is only skipped on a match
+    embedding_model: Optional[str] = Field(default=None, max_length=128)
 
     # Idempotency
     content_hash: Optional[str] = Field(default=None, index=True, max_length=64)
@@ -76,3 +90,41 @@ class Issue(SQLModel, table=True):
     )
 
     repository: Repository = Relationship(back_populates="issues")
+
+
+class IssueNeighbors(SQLModel, table=True):
+    """Precomputed nearest open issues for one issue, best first.
+
+    The issue_neighbors worker job fills it after embedder runs; the similar
+    issues endpoint serves from it and falls back to a live vector query.
+    """
+
+    __tablename__ = "issue_neighbors"
+    __table_args__ = {"schema": "ingestion"}
+
+    node_id: str = Field(
+        sa_column=sa.Column(
+            sa.String,
+            sa.ForeignKey("ingestion.issue.node_id", ondelete="CASCADE"),
+            primary_key=True,
+        )
+    )
+    neighbor_ids: List[str] = Field(
+        default_factory=list,
+        sa_column=Column(ARRAY(sa.String), nullable=False),
+    )
+    similarity_scores: List[float] = Field(
+        default_factory=list,
+        sa_column=Column(ARRAY(REAL), nullable=False),
+    )
+
+    # Source issue's content_hash when computed; a mismatch marks the row for recompute
+    source_content_hash: Optional[str] = Field(default=None, max_length=64)
+
+    computed_at: datetime = Field(
+        sa_column=sa.Column(
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        )
+    )
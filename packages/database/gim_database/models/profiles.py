@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING, List, Optional, Dict, Any
 from sqlmodel import SQLModel, Field, Relationship, Column
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 import sqlalchemy as sa
-from pgvector.sqlalchemy import Vector
+from gim_database.vector import HalfVector, Vector
 
 if TYPE_CHECKING:
     from .identity import User
@@ -16,7 +16,8 @@ class UserProfile(SQLModel, table=True):
 
     user_id: UUID = Field(primary_key=True, foreign_key="public.users.id")
 
-    # Vector fields (4 total); combined_vector is the only one used for recommendations
+    # Vector fields (4 total); combined_vector is the only one used for recommendations,
+    # stored as halfvec to match ingestion.issue.embedding
     intent_vector: Optional[List[float]] = Field(
         default=None, sa_column=Column(Vector(256))
     )
@@ -27,7 +28,7 @@ class UserProfile(SQLModel, table=True):
         default=None, sa_column=Column(Vector(256))
     )
     combined_vector: Optional[List[float]] = Field(
-        default=None, sa_column=Column(Vector(256))
+        default=None, sa_column=Column(HalfVector(256))
     )
 
     # Manual intent fields (Quick Start)
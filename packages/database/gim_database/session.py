@@ -7,6 +7,8 @@ from sqlalchemy.orm import sessionmaker
 from sqlmodel.ext.asyncio.session import AsyncSession
 from dotenv import load_dotenv
 
+from gim_database.vector import install_vector_codec
+
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
 
 _init_lock = threading.RLock()
@@ -55,6 +57,7 @@ def get_engine():
                     "statement_cache_size": 0,
                 },
             )
+            install_vector_codec(_engine)
     return _engine
 
 
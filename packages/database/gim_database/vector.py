@@ -0,0 +1,155 @@
+"""
+Binary pgvector codecs for asyncpg.
+
+Registers encoders/decoders for the `vector` and `halfvec` types that speak
+pgvector's binary wire format (uint16 dim, uint16 unused, dim big-endian float32
+or float16) straight from and into NumPy, so query and ingestion vectors skip the
+text formatting and parsing of `str(list)` + `CAST(... AS vector)`.
+"""
+
+import logging
+import struct
+
+import numpy as np
+from pgvector.sqlalchemy import HALFVEC, VECTOR
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">HH")
+_VECTOR_DTYPE = np.dtype(">f4")
+_HALFVEC_DTYPE = np.dtype(">f2")
+
+
+def _encode(value, wire_dtype: np.dtype) -> bytes:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    if isinstance(value, str):
+        array = np.array(value.strip("[]").split(","), dtype=np.float32).astype(wire_dtype)
+    else:
+        array = np.asarray(value, dtype=wire_dtype)
+    if array.ndim != 1:
+        raise ValueError(f"Expected a 1-D vector, got shape {array.shape}")
+    return _HEADER.pack(array.shape[0], 0) + array.tobytes()
+
+
+def _decode(data: bytes, wire_dtype: np.dtype) -> np.ndarray:
+    dim, _ = _HEADER.unpack_from(data)
+    return np.frombuffer(data, dtype=wire_dtype, count=dim, offset=_HEADER.size).astype(np.float32)
+
+
+def encode_vector(value) -> bytes:
+    """
+    pgvector binary encoding of an array, list, text literal or pre-encoded bytes.
+    Text is accepted so ORM columns, which bind the text form, keep working.
+    """
+    return _encode(value, _VECTOR_DTYPE)
+
+
+def decode_vector(data: bytes) -> np.ndarray:
+    """Native-endian float32 array from pgvector binary data."""
+    return _decode(data, _VECTOR_DTYPE)
+
+
+def encode_halfvec(value) -> bytes:
+    """halfvec counterpart of encode_vector; values are rounded to float16."""
+    return _encode(value, _HALFVEC_DTYPE)
+
+
+def decode_halfvec(data: bytes) -> np.ndarray:
+    """float32 array from halfvec binary data."""
+    return _decode(data, _HALFVEC_DTYPE)
+
+
+def vector_param(value) -> np.ndarray:
+    """Bind value for a `CAST(:x AS vector)` or `CAST(:x AS halfvec)` parameter."""
+    return np.asarray(value, dtype=np.float32)
+
+
+def vector_array_param(values) -> list[bytes]:
+    """
+    Bind value for a `CAST(:x AS vector[])` parameter. Elements are pre-encoded
+    because asyncpg would otherwise read each array as a nested dimension.
+    """
+    return [encode_vector(value) for value in values]
+
+
+def halfvec_array_param(values) -> list[bytes]:
+    """Bind value for a `CAST(:x AS halfvec[])` parameter."""
+    return [encode_halfvec(value) for value in values]
+
+
+_CODECS = (
+    ("vector", encode_vector, decode_vector),
+    ("halfvec", encode_halfvec, decode_halfvec),
+)
+
+
+async def register_vector_codec(connection) -> None:
+    """Installs the binary vector and halfvec codecs on a raw asyncpg connection."""
+    for type_name, encoder, decoder in _CODECS:
+        try:
+            await connection.set_type_codec(
+                type_name,
+                schema="public",
+                encoder=encoder,
+                decoder=decoder,
+                format="binary",
+            )
+        except ValueError as e:
+            # Fresh database without the extension (or pgvector < 0.7 for halfvec); text casts still work
+            logger.warning(f"pgvector {type_name} codec not registered: {e}")
+
+
+def install_vector_codec(engine) -> None:
+    """Registers the codec on every new connection of an asyncpg-backed async engine."""
+    if engine.dialect.driver != "asyncpg":
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, _connection_record):
+        dbapi_connection.run_async(register_vector_codec)
+
+
+def _list_result(value):
+    if value is None:
+        return None
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return [float(v) for v in value.strip("[]").split(",")]
+
+
+class Vector(VECTOR):
+    """
+    pgvector column whose ORM values stay plain lists whether the driver returns
+    text or, with the binary codec installed, NumPy arrays.
+    """
+
+    cache_ok = True
+
+    def result_processor(self, dialect, coltype):
+        return _list_result
+
+
+class HalfVector(HALFVEC):
+    """halfvec column with the same list-valued ORM contract as Vector."""
+
+    cache_ok = True
+
+    def result_processor(self, dialect, coltype):
+        return _list_result
+
+
+__all__ = [
+    "HalfVector",
+    "Vector",
+    "decode_halfvec",
+    "decode_vector",
+    "encode_halfvec",
+    "encode_vector",
+    "halfvec_array_param",
+    "install_vector_codec",
+    "register_vector_codec",
+    "vector_array_param",
+    "vector_param",
+]
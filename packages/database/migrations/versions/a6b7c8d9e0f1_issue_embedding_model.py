@@ -0,0 +1,38 @@
+"""issue_embedding_model
+
+Revision ID: a6b7c8d9e0f1
+Revises: z5a6b7c8d9e0
+Create Date: 2026-10-16 20:00:00.000000
+
+Adds ingestion.issue.embedding_model, the encoder (model@backend) that
+produced each stored embedding. The embedder only skips re-encoding
+unchanged content when the tag matches its own, so switching model or
+EMBEDDING_BACKEND re-encodes issues as they are staged again. Existing rows
+start untagged and are re-encoded the next time they are staged.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a6b7c8d9e0f1"
+down_revision: Union[str, Sequence[str], None] = "z5a6b7c8d9e0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "issue",
+        sa.Column("embedding_model", sa.String(length=128), nullable=True),
+        schema="ingestion",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("issue", "embedding_model", schema="ingestion")
@@ -0,0 +1,41 @@
+"""add_repository_issue_high_water_marks
+
+Revision ID: v1w2x3y4z5a6
+Revises: 6e5f7730595d
+Create Date: 2026-10-16 09:00:00.000000
+
+Adds per-repository issue high-water marks used by incremental Gatherer runs:
+- ingestion.repository.last_issue_created_at
+- ingestion.repository.last_issue_updated_at
+
+Rows start NULL, so the first collector run after this migration does a full
+fetch for each repository and records its marks.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "v1w2x3y4z5a6"
+down_revision: Union[str, Sequence[str], None] = "6e5f7730595d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        ALTER TABLE ingestion.repository
+        ADD COLUMN IF NOT EXISTS last_issue_created_at TIMESTAMPTZ,
+        ADD COLUMN IF NOT EXISTS last_issue_updated_at TIMESTAMPTZ
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE ingestion.repository DROP COLUMN IF EXISTS last_issue_updated_at")
+    op.execute("ALTER TABLE ingestion.repository DROP COLUMN IF EXISTS last_issue_created_at")
@@ -0,0 +1,66 @@
+"""halfvec_embeddings
+
+Revision ID: w2x3y4z5a6b7
+Revises: v1w2x3y4z5a6
+Create Date: 2026-10-16 12:00:00.000000
+
+Stores the ANN-searched embeddings as halfvec(256) instead of vector(256):
+- ingestion.issue.embedding
+- public.userprofile.combined_vector
+
+halfvec halves heap and index storage (2 bytes per dimension). Both HNSW
+indexes are rebuilt with halfvec_cosine_ops so `<=>` against a
+`CAST(... AS halfvec)` parameter stays index-backed. Requires pgvector >= 0.7.0.
+The column rewrite converts existing values in place; nothing is re-embedded.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "w2x3y4z5a6b7"
+down_revision: Union[str, Sequence[str], None] = "v1w2x3y4z5a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _retype_issue_embedding(column_type: str, opclass: str) -> None:
+    op.execute("DROP INDEX IF EXISTS ingestion.ix_issue_embedding_hnsw")
+    op.execute(
+        f"ALTER TABLE ingestion.issue ALTER COLUMN embedding TYPE {column_type} "
+        f"USING embedding::{column_type}"
+    )
+    op.execute(f"""
+        CREATE INDEX ix_issue_embedding_hnsw
+        ON ingestion.issue
+        USING hnsw (embedding {opclass})
+        WITH (m = 16, ef_construction = 64)
+    """)
+
+
+def _retype_combined_vector(column_type: str, opclass: str) -> None:
+    op.execute("DROP INDEX IF EXISTS public.ix_userprofile_combined_vector")
+    op.execute(
+        f"ALTER TABLE public.userprofile ALTER COLUMN combined_vector TYPE {column_type} "
+        f"USING combined_vector::{column_type}"
+    )
+    op.execute(f"""
+        CREATE INDEX ix_userprofile_combined_vector
+        ON public.userprofile
+        USING hnsw (combined_vector {opclass})
+        WITH (m = 16, ef_construction = 64)
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _retype_issue_embedding("halfvec(256)", "halfvec_cosine_ops")
+    _retype_combined_vector("halfvec(256)", "halfvec_cosine_ops")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _retype_combined_vector("vector(256)", "vector_cosine_ops")
+    _retype_issue_embedding("vector(256)", "vector_cosine_ops")
@@ -0,0 +1,38 @@
+"""binary_quantized_issue_index
+
+Revision ID: x3y4z5a6b7c8
+Revises: w2x3y4z5a6b7
+Create Date: 2026-10-16 15:00:00.000000
+
+Adds a Hamming-distance HNSW expression index over the binary-quantized issue
+embedding (`binary_quantize(embedding)::bit(256)`, 32 bytes per issue) for the
+coarse first pass of "binary" vector retrieval. Candidates are re-ranked by
+full halfvec cosine distance, so the existing ix_issue_embedding_hnsw stays for
+"exact" retrieval. No column is added; the index is derived from embedding.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "x3y4z5a6b7c8"
+down_revision: Union[str, Sequence[str], None] = "w2x3y4z5a6b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_issue_embedding_bq_hnsw
+        ON ingestion.issue
+        USING hnsw ((binary_quantize(embedding)::bit(256)) bit_hamming_ops)
+        WITH (m = 16, ef_construction = 64)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ingestion.ix_issue_embedding_bq_hnsw")
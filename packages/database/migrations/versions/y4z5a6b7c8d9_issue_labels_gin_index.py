@@ -0,0 +1,34 @@
+"""issue_labels_gin_index
+
+Revision ID: y4z5a6b7c8d9
+Revises: x3y4z5a6b7c8
+Create Date: 2026-10-16 16:00:00.000000
+
+Adds a GIN index on ingestion.issue.labels so `labels && :labels` can be
+answered from the index when search pre-filters candidates for a rare label.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "y4z5a6b7c8d9"
+down_revision: Union[str, Sequence[str], None] = "x3y4z5a6b7c8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_issue_labels_gin
+        ON ingestion.issue
+        USING gin (labels)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ingestion.ix_issue_labels_gin")
@@ -0,0 +1,48 @@
+"""issue_neighbors
+
+Revision ID: z5a6b7c8d9e0
+Revises: y4z5a6b7c8d9
+Create Date: 2026-10-16 18:00:00.000000
+
+Adds ingestion.issue_neighbors: each issue's precomputed nearest open
+issues, so the similar issues endpoint is a primary key lookup instead of a
+vector query per detail view. Rows are removed with their issue.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "z5a6b7c8d9e0"
+down_revision: Union[str, Sequence[str], None] = "y4z5a6b7c8d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "issue_neighbors",
+        sa.Column("node_id", sa.String(), nullable=False),
+        sa.Column("neighbor_ids", postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column("similarity_scores", postgresql.ARRAY(postgresql.REAL()), nullable=False),
+        sa.Column("source_content_hash", sa.String(length=64), nullable=True),
+        sa.Column(
+            "computed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["node_id"], ["ingestion.issue.node_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("node_id"),
+        schema="ingestion",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("issue_neighbors", schema="ingestion")